@@ -4,11 +4,13 @@ Controlador para la gestión de facturas en FormaGestPro_MVC
 """
 
 import logging
+import threading
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, Callable
 
 from app.models.facturas_model import FacturaModel
+from app.models.exportador_model import ExportadorModel
 from app.models.usuarios_model import UsuariosModel
 from app.models.movimiento_caja_model import MovimientoCajaModel
 
@@ -506,6 +508,117 @@ class FacturaController:
             )
             return False, f"Error interno: {str(e)}", None
 
+    # ==================== OPERACIONES EN LOTE ====================
+
+    def marcar_exportadas_siat_lote(
+        self,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Marcar varias facturas como exportadas al SIAT en una sola operación
+
+        Args:
+            factura_ids: IDs de las facturas
+            filtro: Filtros alternativos (fecha_inicio, fecha_fin, estado)
+
+        Returns:
+            Tuple (éxito, mensaje, resultado con IDs actualizados y omitidos)
+        """
+        if not self._tiene_permisos_siat():
+            return False, "No tiene permisos para exportar facturas al SIAT", {}
+
+        resultado = FacturaModel().marcar_exportadas_siat_lote(
+            factura_ids, filtro, usuario_id=self._id_usuario_actual()
+        )
+        return self._mensaje_lote(resultado, "marcadas como exportadas al SIAT")
+
+    def marcar_como_pagadas_lote(
+        self,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+        forma_pago: Optional[str] = None,
+        referencia: Optional[str] = None,
+    ) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Marcar varias facturas como pagadas en una sola operación
+
+        Registra el movimiento de caja de cada factura que aún no lo tenga.
+
+        Args:
+            factura_ids: IDs de las facturas
+            filtro: Filtros alternativos (fecha_inicio, fecha_fin, estado)
+            forma_pago: Forma de pago (opcional)
+            referencia: Referencia del pago (opcional)
+
+        Returns:
+            Tuple (éxito, mensaje, resultado con IDs actualizados y omitidos)
+        """
+        if not self._tiene_permisos_facturacion():
+            return False, "No tiene permisos para marcar facturas como pagadas", {}
+
+        resultado = FacturaModel().marcar_pagadas_lote(
+            factura_ids,
+            filtro,
+            forma_pago=forma_pago,
+            referencia=referencia,
+            usuario_id=self._id_usuario_actual(),
+        )
+        return self._mensaje_lote(resultado, "marcadas como pagadas")
+
+    def anular_facturas_lote(
+        self,
+        motivo: str,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Anular varias facturas en una sola operación
+
+        Revierte en caja los movimientos de ingreso de las facturas anuladas.
+
+        Args:
+            motivo: Motivo de anulación
+            factura_ids: IDs de las facturas
+            filtro: Filtros alternativos (fecha_inicio, fecha_fin, estado)
+
+        Returns:
+            Tuple (éxito, mensaje, resultado con IDs actualizados y omitidos)
+        """
+        if not self._tiene_permisos_facturacion():
+            return False, "No tiene permisos para anular facturas", {}
+
+        if not motivo or len(motivo.strip()) < 5:
+            return False, "El motivo debe tener al menos 5 caracteres", {}
+
+        resultado = FacturaModel().anular_facturas_lote(
+            motivo.strip(),
+            factura_ids,
+            filtro,
+            usuario_id=self._id_usuario_actual(),
+        )
+        return self._mensaje_lote(resultado, "anuladas")
+
+    def _id_usuario_actual(self) -> Optional[int]:
+        """ID del usuario actual (para caja y auditoría)"""
+        return getattr(self._current_usuario, "id", None)
+
+    def _mensaje_lote(
+        self, resultado: Dict[str, Any], accion: str
+    ) -> Tuple[bool, str, Dict[str, Any]]:
+        """Construye la respuesta de una operación en lote"""
+        if not resultado.get("exito"):
+            return False, "Error al procesar el lote de facturas", resultado
+
+        actualizadas = len(resultado["actualizadas"])
+        omitidas = len(resultado["omitidas"])
+        mensaje = f"{actualizadas} facturas {accion}"
+        if omitidas:
+            mensaje += f" ({omitidas} omitidas: inexistentes o en otro estado)"
+
+        logger.info(f"✅ {mensaje}")
+        return True, mensaje, resultado
+
     # ==================== CÁLCULOS Y TOTALES ====================
 
     def calcular_totales(
@@ -1485,44 +1598,91 @@ class FacturaController:
         fecha_inicio: Union[str, date],
         fecha_fin: Union[str, date],
         ruta_archivo: str,
+        progreso: Optional[Callable[[int, Optional[int]], None]] = None,
+        cancelar: Optional[threading.Event] = None,
     ) -> Tuple[bool, str]:
         """
-        Exportar facturas a archivo CSV
+        Exportar facturas a archivo CSV o XLSX (según la extensión)
+
+        Las filas se escriben en streaming desde la base de datos, sin
+        límite de cantidad.
 
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
-            ruta_archivo: Ruta del archivo CSV
+            ruta_archivo: Ruta del archivo CSV o XLSX
+            progreso: Callback (filas_escritas, total) opcional
+            cancelar: Evento opcional para cancelar la exportación
 
         Returns:
             Tuple (éxito, mensaje)
         """
         try:
-            import csv
-
-            # Obtener facturas
-            facturas = self.obtener_todas(
-                fecha_inicio=fecha_inicio, fecha_fin=fecha_fin, limite=1000
+            query, params = self._consulta_exportacion_facturas(fecha_inicio, fecha_fin)
+
+            resultado = ExportadorModel().exportar(
+                query,
+                params,
+                ruta_archivo,
+                progreso=progreso,
+                cancelar=cancelar,
+                contar=progreso is not None,
+                nombre_hoja="Facturas",
             )
 
-            # Preparar datos
-            datos = []
-            for factura in facturas:
-                fila = factura.to_dict()
-                datos.append(fila)
-
-            # Escribir archivo CSV
-            with open(ruta_archivo, "w", newline="", encoding="utf-8") as csvfile:
-                if datos:
-                    fieldnames = datos[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                    writer.writeheader()
-                    writer.writerows(datos)
+            if resultado["exito"]:
+                logger.info(f"Facturas exportadas a {ruta_archivo}")
+                return (
+                    True,
+                    f"{resultado['filas']} facturas exportadas exitosamente a {ruta_archivo}",
+                )
 
-            logger.info(f"Facturas exportadas a {ruta_archivo}")
-            return True, f"Facturas exportadas exitosamente a {ruta_archivo}"
+            return False, resultado["mensaje"]
 
         except Exception as e:
-            logger.error(f"Error al exportar facturas a CSV: {e}")
+            logger.error(f"Error al exportar facturas: {e}")
             return False, f"Error al exportar: {str(e)}"
+
+    def exportar_facturas_en_segundo_plano(
+        self,
+        fecha_inicio: Union[str, date],
+        fecha_fin: Union[str, date],
+        ruta_archivo: str,
+        al_terminar: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progreso: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> Tuple[threading.Thread, threading.Event]:
+        """
+        Exportar facturas en un hilo de trabajo
+
+        Args:
+            fecha_inicio: Fecha de inicio
+            fecha_fin: Fecha de fin
+            ruta_archivo: Ruta del archivo CSV o XLSX
+            al_terminar: Callback con el resultado de la exportación
+            progreso: Callback (filas_escritas, total) opcional
+
+        Returns:
+            Tuple (hilo, evento para cancelar)
+        """
+        query, params = self._consulta_exportacion_facturas(fecha_inicio, fecha_fin)
+
+        return ExportadorModel().exportar_en_segundo_plano(
+            query,
+            params,
+            ruta_archivo,
+            al_terminar=al_terminar,
+            progreso=progreso,
+            contar=progreso is not None,
+            nombre_hoja="Facturas",
+        )
+
+    def _consulta_exportacion_facturas(
+        self, fecha_inicio: Union[str, date], fecha_fin: Union[str, date]
+    ) -> Tuple[str, Tuple]:
+        """Consulta de exportación de facturas por rango de fecha de emisión"""
+        query = f"""
+            SELECT * FROM {FacturaModel.TABLE_NAME}
+            WHERE fecha_emision >= %s::date AND fecha_emision <= %s::date
+            ORDER BY fecha_emision, id
+        """
+        return query, (str(fecha_inicio), str(fecha_fin))
@@ -4,9 +4,10 @@ Controlador para la gestión de movimientos de caja en FormaGestPro_MVC
 """
 
 import logging
+import threading
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Tuple, Any, Union, Callable
 
 from app.models.movimiento_caja_model import MovimientoCajaModel
 from app.models.programa_academico_model import ProgramasAcademicosModel
@@ -14,6 +15,8 @@ from app.models.usuarios_model import UsuariosModel
 from app.models.ingreso_model import IngresoModel
 from app.models.gasto_model import GastoModel
 from app.models.facturas_model import FacturaModel
+from app.models.exportador_model import ExportadorModel
+from app.models.resumen_financiero_model import ResumenFinancieroModel
 
 logger = logging.getLogger(__name__)
 
@@ -674,36 +677,28 @@ class MovimientoCajaController:
             else:
                 fecha_fin = date(año, mes + 1, 1) - timedelta(days=1)
 
-            # Obtener movimientos del mes
-            movimientos = self.obtener_movimientos_rango(
-                fecha_inicio.strftime("%Y-%m-%d"), fecha_fin.strftime("%Y-%m-%d")
+            # Totales por día desde los acumulados (no recorre movimientos_caja)
+            filas = ResumenFinancieroModel().resumen_diario(
+                "MOVIMIENTO", fecha_inicio, fecha_fin, agrupar=["tipo"]
             )
 
             # Calcular totales
+            total_movimientos = 0
             total_ingresos = 0.0
             total_egresos = 0.0
             por_dia = {}
 
-            for mov in movimientos:
-                # Determinar día
-                if isinstance(mov.fecha, str):
-                    try:
-                        fecha_mov = datetime.strptime(mov.fecha[:10], "%Y-%m-%d").date()
-                        dia = fecha_mov.day
-                    except:
-                        dia = 1
-                elif hasattr(mov.fecha, "day"):
-                    dia = mov.fecha.day
-                else:
-                    dia = 1
+            for fila in filas:
+                dia = fila["fecha"].day
 
                 # Inicializar día si no existe
                 if dia not in por_dia:
                     por_dia[dia] = {"ingresos": 0.0, "egresos": 0.0, "saldo": 0.0}
 
                 # Acumular
-                monto = float(mov.monto)
-                if mov.tipo == "INGRESO":
+                total_movimientos += fila["cantidad"]
+                monto = float(fila["total"])
+                if fila["tipo"] == "INGRESO":
                     total_ingresos += monto
                     por_dia[dia]["ingresos"] += monto
                     por_dia[dia]["saldo"] += monto
@@ -732,7 +727,7 @@ class MovimientoCajaController:
                 "mes_nombre": fecha_inicio.strftime("%B"),
                 "fecha_inicio": fecha_inicio.strftime("%Y-%m-%d"),
                 "fecha_fin": fecha_fin.strftime("%Y-%m-%d"),
-                "total_movimientos": len(movimientos),
+                "total_movimientos": total_movimientos,
                 "total_ingresos": total_ingresos,
                 "total_egresos": total_egresos,
                 "saldo_mes": saldo_mes,
@@ -1345,59 +1340,107 @@ class MovimientoCajaController:
         fecha_inicio: Union[str, date],
         fecha_fin: Union[str, date],
         ruta_archivo: str,
+        progreso: Optional[Callable[[int, Optional[int]], None]] = None,
+        cancelar: Optional[threading.Event] = None,
     ) -> Tuple[bool, str]:
         """
-        Exportar movimientos a archivo CSV
+        Exportar movimientos a archivo CSV o XLSX (según la extensión)
+
+        Las filas se escriben en streaming desde la base de datos, sin
+        límite de cantidad.
 
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
-            ruta_archivo: Ruta del archivo CSV
+            ruta_archivo: Ruta del archivo CSV o XLSX
+            progreso: Callback (filas_escritas, total) opcional
+            cancelar: Evento opcional para cancelar la exportación
 
         Returns:
             Tuple (éxito, mensaje)
         """
         try:
-            import csv
+            query, params = self._consulta_exportacion_movimientos(
+                fecha_inicio, fecha_fin
+            )
 
-            # Obtener movimientos
-            movimientos = self.obtener_movimientos_rango(fecha_inicio, fecha_fin)
+            resultado = ExportadorModel().exportar(
+                query,
+                params,
+                ruta_archivo,
+                progreso=progreso,
+                cancelar=cancelar,
+                contar=progreso is not None,
+                nombre_hoja="Movimientos",
+            )
 
-            # Preparar datos
-            datos = []
-            for mov in movimientos:
-                fila = {
-                    "ID": mov.id,
-                    "Fecha": mov.fecha,
-                    "Tipo": mov.tipo,
-                    "Monto": float(mov.monto),
-                    "Descripción": mov.descripcion,
-                    "Referencia_Tipo": mov.referencia_tipo or "",
-                    "Referencia_ID": mov.referencia_id or "",
-                    "Forma_Pago": getattr(mov, "forma_pago", "") or "",
-                    "Usuario_ID": mov.usuario_id or "",
-                    "Anulado": "SI" if mov.anulado else "NO",
-                    "Creado": mov.created_at,
-                    "Actualizado": mov.updated_at or "",
-                }
-                datos.append(fila)
-
-            # Escribir archivo CSV
-            with open(ruta_archivo, "w", newline="", encoding="utf-8") as csvfile:
-                if datos:
-                    fieldnames = datos[0].keys()
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                    writer.writeheader()
-                    writer.writerows(datos)
-
-            logger.info(f"Movimientos exportados a {ruta_archivo}")
-            return True, f"Movimientos exportados exitosamente a {ruta_archivo}"
+            if resultado["exito"]:
+                logger.info(f"Movimientos exportados a {ruta_archivo}")
+                return (
+                    True,
+                    f"{resultado['filas']} movimientos exportados exitosamente a {ruta_archivo}",
+                )
+
+            return False, resultado["mensaje"]
 
         except Exception as e:
-            logger.error(f"Error al exportar movimientos a CSV: {e}")
+            logger.error(f"Error al exportar movimientos: {e}")
             return False, f"Error al exportar: {str(e)}"
 
+    def exportar_movimientos_en_segundo_plano(
+        self,
+        fecha_inicio: Union[str, date],
+        fecha_fin: Union[str, date],
+        ruta_archivo: str,
+        al_terminar: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progreso: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> Tuple[threading.Thread, threading.Event]:
+        """
+        Exportar movimientos en un hilo de trabajo
+
+        Args:
+            fecha_inicio: Fecha de inicio
+            fecha_fin: Fecha de fin
+            ruta_archivo: Ruta del archivo CSV o XLSX
+            al_terminar: Callback con el resultado de la exportación
+            progreso: Callback (filas_escritas, total) opcional
+
+        Returns:
+            Tuple (hilo, evento para cancelar)
+        """
+        query, params = self._consulta_exportacion_movimientos(fecha_inicio, fecha_fin)
+
+        return ExportadorModel().exportar_en_segundo_plano(
+            query,
+            params,
+            ruta_archivo,
+            al_terminar=al_terminar,
+            progreso=progreso,
+            contar=progreso is not None,
+            nombre_hoja="Movimientos",
+        )
+
+    def _consulta_exportacion_movimientos(
+        self, fecha_inicio: Union[str, date], fecha_fin: Union[str, date]
+    ) -> Tuple[str, Tuple]:
+        """Consulta de exportación de movimientos por rango de fechas"""
+        # Rango semiabierto sobre fecha para aprovechar la poda de particiones
+        query = """
+            SELECT
+                id AS "ID",
+                fecha AS "Fecha",
+                tipo AS "Tipo",
+                monto AS "Monto",
+                descripcion AS "Descripción",
+                origen_tipo AS "Referencia_Tipo",
+                origen_id AS "Referencia_ID",
+                registrado_por AS "Usuario_ID"
+            FROM movimientos_caja
+            WHERE fecha >= %s::date AND fecha < %s::date + 1
+            ORDER BY fecha, id
+        """
+        return query, (str(fecha_inicio), str(fecha_fin))
+
     def realizar_cierre_caja(
         self, fecha: Optional[Union[str, date]] = None
     ) -> Tuple[bool, str, Dict[str, Any]]:
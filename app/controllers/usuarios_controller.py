@@ -4,8 +4,9 @@ Controlador para la gestión de usuarios del sistema en FormaGestPro_MVC
 """
 
 import logging
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
 
 from app.models.usuarios_model import UsuariosModel
@@ -26,6 +27,10 @@ class UsuariosController:
         self.db_path = db_path
         self._current_user = None  # Usuario actualmente autenticado
 
+        # Modelo de autenticación (lo usa el hilo de login de authenticate_async)
+        self._usuarios_model = UsuariosModel()
+        self._usuarios_model.precalcular_hash_ficticio()
+
     # ==================== PROPIEDADES ====================
 
     @property
@@ -75,14 +80,16 @@ class UsuariosController:
     # ==================== AUTENTICACIÓN ====================
 
     def login(
-        self, username: str, password: str
-    ) -> Tuple[bool, str, Optional[UsuariosModel]]:
+        self, username: str, password: str, ip: Optional[str] = None
+    ) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
         """
-        Autenticar usuario
+        Autenticar usuario (bloquea mientras se verifica la contraseña;
+        desde la GUI usar login_async)
 
         Args:
             username: Nombre de usuario
             password: Contraseña
+            ip: Dirección de origen del intento (opcional)
 
         Returns:
             Tuple (éxito, mensaje, usuario)
@@ -92,27 +99,67 @@ class UsuariosController:
             if not username or not password:
                 return False, "Nombre de usuario y contraseña son requeridos", None
 
-            # Autenticar
-            usuario = UsuariosModel.authenticate(username, password)
+            usuario = self._usuarios_model.authenticate(username, password, ip)
+            return self._resultado_login(usuario)
 
-            if not usuario:
-                return False, "Nombre de usuario o contraseña incorrectos", None
+        except Exception as e:
+            logger.error(f"Error en login para usuario {username}: {e}")
+            return False, f"Error interno: {str(e)}", None
 
-            if not usuario.activo:
-                return False, "La cuenta de usuario está desactivada", None
+    def login_async(
+        self,
+        username: str,
+        password: str,
+        callback: Callable[[bool, str, Optional[Dict[str, Any]]], None],
+        ip: Optional[str] = None,
+    ) -> Optional[Future]:
+        """
+        Autenticar usuario sin bloquear el hilo que llama
 
-            # Actualizar último login
-            usuario.update_last_login()
+        La verificación se hace con UsuariosModel.authenticate_async y, al
+        terminar, se llama a callback(éxito, mensaje, usuario) desde el hilo
+        de login. Una vista Qt debe reenviar el resultado a su hilo con una
+        señal antes de tocar widgets.
 
-            # Establecer como usuario actual
-            self._current_user = usuario
+        Args:
+            username: Nombre de usuario
+            password: Contraseña
+            callback: Recibe la misma tupla que retorna login()
+            ip: Dirección de origen del intento (opcional)
 
-            mensaje = f"Bienvenido, {usuario.nombre_completo}"
-            return True, mensaje, usuario
+        Returns:
+            Optional[Future]: Futuro de la autenticación, o None si la entrada
+            no es válida (el callback ya se llamó)
+        """
+        if not username or not password:
+            callback(False, "Nombre de usuario y contraseña son requeridos", None)
+            return None
 
-        except Exception as e:
-            logger.error(f"Error en login para usuario {username}: {e}")
-            return False, f"Error interno: {str(e)}", None
+        def terminar(futuro: Future) -> None:
+            try:
+                resultado = self._resultado_login(futuro.result())
+            except Exception as e:
+                logger.error(f"Error en login para usuario {username}: {e}")
+                resultado = (False, f"Error interno: {str(e)}", None)
+            callback(*resultado)
+
+        futuro = self._usuarios_model.authenticate_async(username, password, ip)
+        futuro.add_done_callback(terminar)
+        return futuro
+
+    def _resultado_login(
+        self, usuario: Optional[Dict[str, Any]]
+    ) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+        """Convierte el resultado de authenticate en (éxito, mensaje, usuario)"""
+        # authenticate ya descarta cuentas inactivas y actualiza el último login
+        if not usuario:
+            return False, "Nombre de usuario o contraseña incorrectos", None
+
+        # Establecer como usuario actual
+        self._current_user = usuario
+
+        mensaje = f"Bienvenido, {usuario['nombre_completo']}"
+        return True, mensaje, usuario
 
     def logout(self) -> Tuple[bool, str]:
         """
@@ -9,6 +9,10 @@ from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
 import configparser
 import threading
+import time
+
+from app.database.instrumentacion import instrumentacion
+from app.database.sentencias_preparadas import sentencias_preparadas
 
 
 class DatabaseConnection:
@@ -30,6 +34,7 @@ class DatabaseConnection:
 
     def _initialize(self):
         """Inicializa la configuración de la base de datos"""
+        self._ini = configparser.ConfigParser()
         try:
             config = configparser.ConfigParser()
 
@@ -51,6 +56,9 @@ class DatabaseConnection:
                 raise FileNotFoundError("No se encontró el archivo database.ini")
 
             config.read(config_file, encoding="utf-8")
+            self._ini = config
+            instrumentacion.configurar_desde_ini(config)
+            sentencias_preparadas.configurar_desde_ini(config)
 
             self._config = {
                 "host": config.get("postgresql", "host", fallback="localhost"),
@@ -74,6 +82,10 @@ class DatabaseConnection:
             }
             print("⚠ Usando configuración por defecto para desarrollo")
 
+    def get_config_ini(self) -> configparser.ConfigParser:
+        """Contenido de database.ini (vacío si no se encontró el archivo)"""
+        return self._ini
+
     def get_connection_pool(self, minconn=1, maxconn=10):
         """Obtiene o crea el pool de conexiones"""
         if self._pool is None:
@@ -227,6 +239,9 @@ class DatabaseConnection:
         """
         own_connection = False
         cursor = None
+        inicio = None
+        filas = None
+        error = None
 
         try:
             # Obtener conexión si no se proporciona
@@ -245,6 +260,7 @@ class DatabaseConnection:
                 cursor = connection.cursor()
 
             # Ejecutar consulta
+            inicio = time.perf_counter()
             if params:
                 cursor.execute(query, params)
             else:
@@ -253,8 +269,10 @@ class DatabaseConnection:
             # Procesar resultados
             if fetch and cursor.description:
                 results = cursor.fetchall()
+                filas = len(results)
             else:
                 results = cursor.rowcount
+                filas = results
 
             # Confirmar transacción si es necesario
             if commit and own_connection:
@@ -263,6 +281,7 @@ class DatabaseConnection:
             return results
 
         except Exception as e:
+            error = e
             print(f"✗ Error ejecutando consulta: {e}")
             print(f"  Consulta: {query}")
 
@@ -283,6 +302,12 @@ class DatabaseConnection:
                 except:
                     pass
 
+            # Registrar duración, filas y origen de la consulta
+            if inicio is not None:
+                instrumentacion.registrar(
+                    query, inicio, filas, error, connection, params
+                )
+
             # Devolver conexión al pool si era propia
             if own_connection and connection:
                 self.return_connection(connection)
@@ -0,0 +1,504 @@
+# app/database/instrumentacion.py
+"""
+Instrumentación de consultas SQL.
+
+BaseModel.execute_query y DatabaseConnection.execute_query registran cada
+consulta aquí: huella de la SQL (literales y parámetros normalizados),
+duración, filas, origen (modelo/controlador que la llamó) y pantalla
+activa. Los registros se guardan en un buffer circular en memoria y se
+acumulan por huella, por origen y por pantalla.
+
+- Consultas lentas: las que superan umbral_lento_ms se registran con
+  logger.warning y, si capturar_explain está activo, se captura una vez su
+  plan con EXPLAIN ANALYZE (solo SELECT, dentro de un SAVEPOINT).
+- Presupuestos por pantalla: "with pantalla('Estudiantes', max_consultas=20)"
+  cuenta las consultas de una carga y avisa si se excede.
+- Volcado: resumen() / formatear_resumen() en proceso, o volcar_json() al
+  salir (archivo_volcado) para leerlo con scripts/estadisticas_consultas.py.
+
+La configuración se lee de la sección [instrumentacion] de database.ini.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import hashlib
+import logging
+import threading
+from collections import deque, Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+# Patrones de normalización para la huella
+_RE_CADENA = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_RE_PARAMETRO = re.compile(r"%\(\w+\)s|%s")
+_RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+# Archivos de infraestructura que no cuentan como origen de la consulta
+_INFRAESTRUCTURA = (
+    os.path.join("app", "database") + os.sep,
+    os.path.join("app", "models", "base_model.py"),
+)
+_CAPAS_ORIGEN = ("models", "controllers", "views")
+_CAPAS_PANTALLA = ("views", "controllers")
+
+
+def _capa(archivo: str) -> Optional[str]:
+    """Capa (models, controllers, views) a la que pertenece un archivo"""
+    partes = os.path.normpath(archivo).split(os.sep)
+    for capa in ("views", "controllers", "models"):
+        if capa in partes[:-1]:
+            return capa
+    return None
+
+
+def huella_consulta(query: str) -> str:
+    """
+    Normaliza una consulta para agrupar ejecuciones equivalentes
+
+    Reemplaza literales, números y parámetros por "?" y colapsa listas
+    IN (?, ?, ...) a IN (...).
+    """
+    texto = _RE_CADENA.sub("?", query)
+    texto = _RE_PARAMETRO.sub("?", texto)
+    texto = _RE_NUMERO.sub("?", texto)
+    texto = _RE_LISTA.sub("(...)", texto)
+    return _RE_ESPACIOS.sub(" ", texto).strip()
+
+
+def _es_solo_lectura(query: str) -> bool:
+    """
+    True si la consulta es un SELECT sin escrituras (apto para EXPLAIN ANALYZE)
+
+    Es un filtro previo: el plan se captura siempre en una transacción que se
+    revierte. nextval/setval se excluyen porque su efecto no se revierte.
+    """
+    texto = query.lstrip().upper()
+    if not (texto.startswith("SELECT") or texto.startswith("WITH")):
+        return False
+    return not re.search(
+        r"\b(INSERT|UPDATE|DELETE|MERGE|FOR UPDATE|NEXTVAL|SETVAL)\b", texto
+    )
+
+
+class InstrumentacionConsultas:
+    """Registro en memoria de consultas, con acumulados y presupuestos"""
+
+    def __init__(self):
+        self.habilitada = True
+        self.umbral_lento_ms = 200.0
+        self.capturar_explain = False
+        self.archivo_volcado = None
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._registros = deque(maxlen=2000)
+        self._por_huella = {}
+        self._por_origen = {}
+        self._por_pantalla = {}
+        self._inicio = datetime.now()
+        self._volcado_registrado = False
+
+    # ============ CONFIGURACIÓN ============
+
+    def configurar(
+        self,
+        habilitada: Optional[bool] = None,
+        capacidad: Optional[int] = None,
+        umbral_lento_ms: Optional[float] = None,
+        capturar_explain: Optional[bool] = None,
+        archivo_volcado: Optional[str] = None,
+    ) -> None:
+        """Ajusta la configuración (los valores None no se modifican)"""
+        with self._lock:
+            if habilitada is not None:
+                self.habilitada = habilitada
+            if capacidad is not None and capacidad != self._registros.maxlen:
+                self._registros = deque(self._registros, maxlen=max(capacidad, 1))
+            if umbral_lento_ms is not None:
+                self.umbral_lento_ms = umbral_lento_ms
+            if capturar_explain is not None:
+                self.capturar_explain = capturar_explain
+            if archivo_volcado:
+                self.archivo_volcado = archivo_volcado
+                if not self._volcado_registrado:
+                    atexit.register(self._volcar_al_salir)
+                    self._volcado_registrado = True
+
+    def configurar_desde_ini(self, config) -> None:
+        """Lee la sección [instrumentacion] de un ConfigParser"""
+        if not config.has_section("instrumentacion"):
+            return
+        seccion = "instrumentacion"
+        self.configurar(
+            habilitada=config.getboolean(seccion, "habilitada", fallback=True),
+            capacidad=config.getint(seccion, "capacidad", fallback=2000),
+            umbral_lento_ms=config.getfloat(seccion, "umbral_lento_ms", fallback=200.0),
+            capturar_explain=config.getboolean(
+                seccion, "capturar_explain", fallback=False
+            ),
+            archivo_volcado=config.get(seccion, "archivo_volcado", fallback="") or None,
+        )
+
+    def reiniciar(self) -> None:
+        """Descarta todos los registros y acumulados"""
+        with self._lock:
+            self._registros.clear()
+            self._por_huella.clear()
+            self._por_origen.clear()
+            self._por_pantalla.clear()
+            self._inicio = datetime.now()
+
+    # ============ REGISTRO ============
+
+    def registrar(
+        self,
+        query: str,
+        inicio: float,
+        filas: Optional[int] = None,
+        error: Optional[Exception] = None,
+        connection=None,
+        params=None,
+    ) -> None:
+        """
+        Registra una consulta ejecutada
+
+        Args:
+            query: SQL ejecutada
+            inicio: time.perf_counter() tomado antes de ejecutar
+            filas: Filas retornadas o afectadas
+            error: Excepción si la consulta falló
+            connection: Conexión usada (para EXPLAIN ANALYZE de consultas lentas)
+            params: Parámetros de la consulta (solo para EXPLAIN, no se guardan)
+        """
+        if not self.habilitada:
+            return
+
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        try:
+            if isinstance(query, bytes):
+                texto = query.decode("utf-8", "replace")
+            else:
+                texto = str(query)
+            normalizada = huella_consulta(texto)
+            huella = hashlib.sha1(normalizada.encode("utf-8")).hexdigest()[:12]
+            origen, pantalla_pila = self._detectar_origen()
+            pantalla = self._pantalla_actual() or pantalla_pila
+            lenta = duracion_ms >= self.umbral_lento_ms
+
+            with self._lock:
+                self._registros.append(
+                    {
+                        "momento": time.time(),
+                        "huella": huella,
+                        "duracion_ms": round(duracion_ms, 3),
+                        "filas": filas,
+                        "origen": origen,
+                        "pantalla": pantalla,
+                        "error": str(error) if error else None,
+                    }
+                )
+
+                stats = self._por_huella.get(huella)
+                if stats is None:
+                    stats = self._por_huella[huella] = {
+                        "huella": huella,
+                        "consulta": normalizada[:500],
+                        "llamadas": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "filas": 0,
+                        "errores": 0,
+                        "lentas": 0,
+                        "origenes": Counter(),
+                        "plan": None,
+                    }
+                self._acumular(stats, duracion_ms, filas, error)
+                stats["lentas"] += 1 if lenta else 0
+                stats["origenes"][origen] += 1
+
+                por_origen = self._por_origen.setdefault(
+                    origen,
+                    {"origen": origen, "llamadas": 0, "total_ms": 0.0,
+                     "max_ms": 0.0, "filas": 0, "errores": 0},
+                )
+                self._acumular(por_origen, duracion_ms, filas, error)
+                capturar = lenta and self.capturar_explain and stats["plan"] is None
+
+            contexto = self._contexto_pantalla()
+            if contexto is not None:
+                contexto["consultas"] += 1
+                contexto["ms"] += duracion_ms
+
+            if lenta:
+                logger.warning(
+                    f"Consulta lenta ({duracion_ms:.1f} ms, {filas} filas) "
+                    f"[{huella}] desde {origen}: {normalizada[:200]}"
+                )
+                if capturar and error is None and connection is not None:
+                    self._capturar_plan(stats, texto, params, connection)
+
+        except Exception as e:
+            # La instrumentación nunca debe interrumpir la consulta
+            logger.debug(f"Error registrando consulta: {e}")
+
+    @staticmethod
+    def _acumular(stats: Dict[str, Any], duracion_ms: float, filas, error) -> None:
+        """Suma una ejecución a un acumulado"""
+        stats["llamadas"] += 1
+        stats["total_ms"] += duracion_ms
+        stats["max_ms"] = max(stats["max_ms"], duracion_ms)
+        stats["filas"] += filas if isinstance(filas, int) and filas > 0 else 0
+        stats["errores"] += 1 if error else 0
+
+    def _detectar_origen(self):
+        """Primer llamador fuera de la infraestructura y primera vista/controlador"""
+        origen = "desconocido"
+        pantalla = None
+        frame = sys._getframe(2)
+        profundidad = 0
+
+        while frame is not None and profundidad < 40:
+            archivo = frame.f_code.co_filename
+            if not any(parte in archivo for parte in _INFRAESTRUCTURA):
+                capa = _capa(archivo)
+                nombre = (
+                    f"{os.path.splitext(os.path.basename(archivo))[0]}."
+                    f"{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}"
+                )
+                if origen == "desconocido" and capa in _CAPAS_ORIGEN:
+                    origen = nombre
+                if capa in _CAPAS_PANTALLA:
+                    pantalla = nombre
+                    if capa == "views":
+                        break
+            frame = frame.f_back
+            profundidad += 1
+
+        return origen, pantalla
+
+    def _capturar_plan(self, stats: Dict[str, Any], query: str, params, connection) -> None:
+        """
+        Captura EXPLAIN ANALYZE de una consulta de solo lectura
+
+        EXPLAIN ANALYZE ejecuta la consulta de nuevo; para no conservar sus
+        efectos (funciones que escriben, bloqueos) se ejecuta en un SAVEPOINT
+        o en una transacción propia que siempre se revierten.
+        """
+        if not _es_solo_lectura(query) or connection.closed:
+            return
+
+        estado = connection.get_transaction_status()
+        if estado == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            return
+        en_transaccion = (
+            not connection.autocommit
+            and estado == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+
+        def revertir():
+            if en_transaccion:
+                cursor.execute(
+                    "ROLLBACK TO SAVEPOINT instrumentacion_explain; "
+                    "RELEASE SAVEPOINT instrumentacion_explain"
+                )
+            elif connection.autocommit:
+                cursor.execute("ROLLBACK")
+            else:
+                connection.rollback()
+
+        cursor = connection.cursor()
+        try:
+            if en_transaccion:
+                cursor.execute("SAVEPOINT instrumentacion_explain")
+            elif connection.autocommit:
+                cursor.execute("BEGIN")
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params or None)
+            plan = "\n".join(fila[0] for fila in cursor.fetchall())
+            revertir()
+
+            with self._lock:
+                stats["plan"] = plan
+            logger.warning(f"Plan de la consulta lenta [{stats['huella']}]:\n{plan}")
+
+        except Exception as e:
+            logger.debug(f"No se pudo capturar EXPLAIN: {e}")
+            try:
+                revertir()
+            except Exception:
+                pass
+        finally:
+            cursor.close()
+
+    # ============ PRESUPUESTOS POR PANTALLA ============
+
+    def _contexto_pantalla(self) -> Optional[Dict[str, Any]]:
+        pila = getattr(self._local, "pantallas", None)
+        return pila[-1] if pila else None
+
+    def _pantalla_actual(self) -> Optional[str]:
+        contexto = self._contexto_pantalla()
+        return contexto["nombre"] if contexto else None
+
+    @contextmanager
+    def pantalla(
+        self,
+        nombre: str,
+        max_consultas: Optional[int] = None,
+        max_ms: Optional[float] = None,
+    ):
+        """
+        Atribuye las consultas del bloque a una pantalla y controla su presupuesto
+
+        Args:
+            nombre: Nombre de la pantalla o acción
+            max_consultas: Consultas máximas esperadas en el bloque
+            max_ms: Tiempo máximo de base de datos esperado en el bloque
+        """
+        pila = getattr(self._local, "pantallas", None)
+        if pila is None:
+            pila = self._local.pantallas = []
+
+        contexto = {"nombre": nombre, "consultas": 0, "ms": 0.0}
+        pila.append(contexto)
+        try:
+            yield contexto
+        finally:
+            pila.pop()
+            excedida = (max_consultas is not None and contexto["consultas"] > max_consultas) or (
+                max_ms is not None and contexto["ms"] > max_ms
+            )
+
+            with self._lock:
+                stats = self._por_pantalla.setdefault(
+                    nombre,
+                    {"pantalla": nombre, "cargas": 0, "consultas": 0,
+                     "total_ms": 0.0, "max_consultas": 0, "excedidas": 0},
+                )
+                stats["cargas"] += 1
+                stats["consultas"] += contexto["consultas"]
+                stats["total_ms"] += contexto["ms"]
+                stats["max_consultas"] = max(stats["max_consultas"], contexto["consultas"])
+                stats["excedidas"] += 1 if excedida else 0
+
+            if excedida:
+                logger.warning(
+                    f"Pantalla '{nombre}' excedió su presupuesto: "
+                    f"{contexto['consultas']} consultas (máx {max_consultas}), "
+                    f"{contexto['ms']:.1f} ms (máx {max_ms})"
+                )
+
+            # Anidadas: la pantalla exterior también cuenta estas consultas
+            exterior = self._contexto_pantalla()
+            if exterior is not None:
+                exterior["consultas"] += contexto["consultas"]
+                exterior["ms"] += contexto["ms"]
+
+    # ============ CONSULTA Y VOLCADO ============
+
+    def registros_recientes(self, limite: int = 100) -> List[Dict[str, Any]]:
+        """Últimos registros del buffer circular, más recientes primero"""
+        with self._lock:
+            return list(self._registros)[-limite:][::-1]
+
+    def resumen(self, limite: int = 20, orden: str = "total_ms") -> Dict[str, Any]:
+        """
+        Acumulados ordenados por el criterio indicado
+
+        Args:
+            limite: Filas por sección
+            orden: total_ms, llamadas, max_ms o filas
+
+        Returns:
+            Dict: consultas, origenes y pantallas
+        """
+        with self._lock:
+            consultas = [
+                dict(s, origenes=dict(s["origenes"].most_common(5)))
+                for s in self._por_huella.values()
+            ]
+            origenes = [dict(s) for s in self._por_origen.values()]
+            pantallas = [dict(s) for s in self._por_pantalla.values()]
+
+        def ordenar(filas, clave):
+            return sorted(filas, key=lambda f: f.get(clave, 0), reverse=True)[:limite]
+
+        return {
+            "desde": self._inicio.isoformat(),
+            "generado": datetime.now().isoformat(),
+            "umbral_lento_ms": self.umbral_lento_ms,
+            "consultas": ordenar(consultas, orden),
+            "origenes": ordenar(origenes, orden if orden != "max_ms" else "total_ms"),
+            "pantallas": ordenar(pantallas, "total_ms"),
+        }
+
+    def volcar_json(self, ruta: str, limite: int = 200) -> str:
+        """Escribe el resumen en un archivo JSON (escritura atómica)"""
+        datos = self.resumen(limite=limite)
+        datos["pid"] = os.getpid()
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(temporal, ruta)
+        return ruta
+
+    def _volcar_al_salir(self) -> None:
+        if self.archivo_volcado and self._por_huella:
+            try:
+                self.volcar_json(self.archivo_volcado)
+            except Exception as e:
+                logger.debug(f"No se pudo volcar estadísticas de consultas: {e}")
+
+
+def formatear_resumen(datos: Dict[str, Any]) -> str:
+    """Texto legible de un resumen (en proceso o leído de un volcado)"""
+    lineas = [
+        f"Estadísticas de consultas desde {datos.get('desde')} "
+        f"(lenta >= {datos.get('umbral_lento_ms')} ms)",
+        "",
+        f"{'huella':<13}{'llamadas':>9}{'total ms':>11}{'prom ms':>9}"
+        f"{'máx ms':>9}{'filas':>9}{'lentas':>7}  consulta",
+    ]
+    for c in datos.get("consultas", []):
+        promedio = c["total_ms"] / c["llamadas"] if c["llamadas"] else 0
+        lineas.append(
+            f"{c['huella']:<13}{c['llamadas']:>9}{c['total_ms']:>11.1f}{promedio:>9.1f}"
+            f"{c['max_ms']:>9.1f}{c['filas']:>9}{c['lentas']:>7}  {c['consulta'][:80]}"
+        )
+
+    lineas += ["", f"{'origen':<60}{'llamadas':>9}{'total ms':>11}{'errores':>8}"]
+    for o in datos.get("origenes", []):
+        lineas.append(
+            f"{o['origen'][:59]:<60}{o['llamadas']:>9}{o['total_ms']:>11.1f}{o['errores']:>8}"
+        )
+
+    if datos.get("pantallas"):
+        lineas += [
+            "",
+            f"{'pantalla':<40}{'cargas':>7}{'consultas':>10}{'máx':>6}"
+            f"{'total ms':>11}{'excedidas':>10}",
+        ]
+        for p in datos["pantallas"]:
+            lineas.append(
+                f"{p['pantalla'][:39]:<40}{p['cargas']:>7}{p['consultas']:>10}"
+                f"{p['max_consultas']:>6}{p['total_ms']:>11.1f}{p['excedidas']:>10}"
+            )
+
+    return "\n".join(lineas)
+
+
+# Instancia única del proceso
+instrumentacion = InstrumentacionConsultas()
+pantalla = instrumentacion.pantalla
@@ -0,0 +1,300 @@
+# app/database/sentencias_preparadas.py
+"""
+Sentencias preparadas por conexión para las consultas más frecuentes.
+
+psycopg2 envía cada consulta como texto y el servidor la analiza y planifica
+en cada ejecución. Para las búsquedas que se repiten miles de veces por
+sesión (get_by_id, exists, exists_by_field, count_records) BaseModel las
+ejecuta con PREPARE / EXECUTE:
+
+- La consulta se traduce una vez (%s -> $1, $2, ...) y se nombra por su
+  huella (hash del texto), de modo que la misma SQL comparte nombre en todas
+  las conexiones.
+- Cada conexión recuerda qué sentencias preparó (registro débil por objeto
+  conexión); una conexión nueva, p. ej. tras reconectar, vuelve a preparar
+  en el primer uso.
+- Si el servidor ya no tiene la sentencia (DISCARD ALL, reinicio de sesión)
+  o la tabla cambió de columnas, se prepara de nuevo y se reintenta.
+- Dentro de una transacción abierta solo la primera ejecución de cada
+  sentencia va precedida de un SAVEPOINT, para que el reintento vuelva a él
+  sin descartar el trabajo pendiente. Una vez ejecutada, la transacción
+  conserva el bloqueo de sus tablas (nadie puede cambiarles las columnas) y
+  DISCARD ALL no se admite dentro de una transacción, así que las siguientes
+  ejecuciones van sin SAVEPOINT. Lo verificado se olvida al ver la conexión
+  sin transacción o cuando BaseModel llama a fin_transaccion() (commit,
+  rollback o vuelta a un savepoint). Un ALTER TABLE en la misma transacción
+  sobre una tabla ya consultada no se recupera: el error se propaga.
+- Las consultas que PostgreSQL no puede preparar (tipos de parámetro no
+  deducibles) se recuerdan y se ejecutan de la forma habitual.
+
+La configuración se lee de la sección [sentencias_preparadas] de
+database.ini.
+"""
+
+import re
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict, Counter
+from typing import Optional, Dict, Any, Tuple
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+# Marcadores de parámetros de psycopg2 ("%(" = parámetros con nombre, no soportados)
+_RE_MARCADOR = re.compile(r"%%|%s|%\(")
+
+
+class SentenciasPreparadas:
+    """Registro de sentencias preparadas por conexión"""
+
+    def __init__(self):
+        self.habilitada = True
+        self.max_por_conexion = 200
+
+        self._lock = threading.Lock()
+        # conexión -> OrderedDict(nombre -> None), en orden de uso
+        self._por_conexion: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        # conexión -> nombres ya ejecutados en la transacción en curso
+        self._verificadas: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        # query -> (nombre, texto para PREPARE) o None si no es preparable
+        self._traducciones: Dict[str, Optional[Tuple[str, str]]] = {}
+        self.estadisticas = Counter()
+
+    # ============ CONFIGURACIÓN ============
+
+    def configurar(
+        self,
+        habilitada: Optional[bool] = None,
+        max_por_conexion: Optional[int] = None,
+    ) -> None:
+        """Ajusta la configuración (los valores None no se modifican)"""
+        if habilitada is not None:
+            self.habilitada = habilitada
+        if max_por_conexion is not None:
+            self.max_por_conexion = max(max_por_conexion, 1)
+
+    def configurar_desde_ini(self, config) -> None:
+        """Lee la sección [sentencias_preparadas] de un ConfigParser"""
+        if not config.has_section("sentencias_preparadas"):
+            return
+        seccion = "sentencias_preparadas"
+        self.configurar(
+            habilitada=config.getboolean(seccion, "habilitada", fallback=True),
+            max_por_conexion=config.getint(seccion, "max_por_conexion", fallback=200),
+        )
+
+    # ============ TRADUCCIÓN ============
+
+    def _traducir(self, query: str, num_params: int) -> Optional[Tuple[str, str]]:
+        """(nombre, texto para PREPARE) de una consulta, o None si no es preparable"""
+        clave = f"{num_params}:{query}"
+        if clave in self._traducciones:
+            return self._traducciones[clave]
+
+        traduccion = None
+        if num_params == 0:
+            # Sin parámetros psycopg2 no interpreta los %: el texto va tal cual
+            texto = query
+        else:
+            contador = 0
+            con_nombre = False
+
+            def reemplazar(coincidencia):
+                nonlocal contador, con_nombre
+                marcador = coincidencia.group()
+                if marcador == "%%":
+                    return "%"
+                if marcador == "%(":
+                    con_nombre = True
+                    return marcador
+                contador += 1
+                return f"${contador}"
+
+            texto = _RE_MARCADOR.sub(reemplazar, query)
+            if con_nombre or contador != num_params:
+                texto = None
+
+        if texto is not None:
+            huella = hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+            traduccion = (f"fgp_{huella}", texto)
+
+        with self._lock:
+            self._traducciones[clave] = traduccion
+        return traduccion
+
+    def _preparadas(self, conexion) -> "OrderedDict[str, None]":
+        with self._lock:
+            preparadas = self._por_conexion.get(conexion)
+            if preparadas is None:
+                preparadas = OrderedDict()
+                self._por_conexion[conexion] = preparadas
+            return preparadas
+
+    def _verificadas_en(self, conexion) -> set:
+        with self._lock:
+            verificadas = self._verificadas.get(conexion)
+            if verificadas is None:
+                verificadas = set()
+                self._verificadas[conexion] = verificadas
+            return verificadas
+
+    def olvidar_conexion(self, conexion) -> None:
+        """Descarta lo registrado para una conexión (p. ej. tras DISCARD ALL)"""
+        with self._lock:
+            self._por_conexion.pop(conexion, None)
+            self._verificadas.pop(conexion, None)
+
+    def fin_transaccion(self, conexion) -> None:
+        """La transacción de la conexión terminó o volvió a un savepoint"""
+        with self._lock:
+            verificadas = self._verificadas.get(conexion)
+            if verificadas:
+                verificadas.clear()
+
+    # ============ EJECUCIÓN ============
+
+    def ejecutar(self, cursor, query: str, params=None) -> bool:
+        """
+        Ejecuta la consulta con EXECUTE, preparándola si hace falta
+
+        Returns:
+            bool: True si se ejecutó; False si la consulta debe ejecutarse de
+            la forma habitual (deshabilitado o no preparable)
+        """
+        if not self.habilitada:
+            return False
+
+        params = tuple(params) if params else ()
+        traduccion = self._traducir(query, len(params))
+        if traduccion is None:
+            return False
+        nombre, texto = traduccion
+
+        conexion = cursor.connection
+        preparadas = self._preparadas(conexion)
+        verificadas = self._verificadas_en(conexion)
+        en_transaccion = (
+            not conexion.autocommit
+            and conexion.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+        if not en_transaccion:
+            # Sin transacción abierta no queda ningún bloqueo de antes
+            verificadas.clear()
+
+        if nombre not in preparadas and not self._preparar(cursor, nombre, texto):
+            return False
+
+        # Con trabajo pendiente un error anularía la transacción: solo la
+        # primera ejecución de la sentencia en ella se protege (ver módulo)
+        con_savepoint = en_transaccion and nombre not in verificadas
+
+        sentencia = f"EXECUTE {nombre}"
+        if params:
+            sentencia += f" ({', '.join(['%s'] * len(params))})"
+
+        try:
+            if con_savepoint:
+                cursor.execute(f"SAVEPOINT fgp_ejecutar; {sentencia}", params or None)
+            else:
+                cursor.execute(sentencia, params or None)
+        except (
+            psycopg2.errors.InvalidSqlStatementName,
+            psycopg2.errors.FeatureNotSupported,
+        ) as e:
+            # La sesión perdió sus sentencias o la tabla cambió de columnas
+            # ("cached plan must not change result type")
+            self.olvidar_conexion(conexion)
+            if en_transaccion and not con_savepoint:
+                raise
+            if con_savepoint:
+                cursor.execute(
+                    "ROLLBACK TO SAVEPOINT fgp_ejecutar; RELEASE SAVEPOINT fgp_ejecutar"
+                )
+            else:
+                conexion.rollback()
+            if isinstance(e, psycopg2.errors.FeatureNotSupported):
+                cursor.execute("DEALLOCATE ALL")
+            self.estadisticas["repreparadas"] += 1
+            if not self._preparar(cursor, nombre, texto):
+                return False
+            cursor.execute(sentencia, params or None)
+            preparadas = self._preparadas(conexion)
+            verificadas = self._verificadas_en(conexion)
+        else:
+            if con_savepoint:
+                # En otro cursor, para no perder el resultado del EXECUTE
+                with conexion.cursor() as liberar:
+                    liberar.execute("RELEASE SAVEPOINT fgp_ejecutar")
+
+        if not conexion.autocommit:
+            verificadas.add(nombre)
+        preparadas.move_to_end(nombre)
+        self.estadisticas["ejecutadas"] += 1
+        return True
+
+    def _preparar(self, cursor, nombre: str, texto: str) -> bool:
+        """
+        PREPARE dentro de un SAVEPOINT para que un fallo no anule la
+        transacción en curso (PREPARE no es transaccional: la sentencia
+        sobrevive al RELEASE o a un rollback posterior)
+        """
+        conexion = cursor.connection
+        preparadas = self._preparadas(conexion)
+        en_transaccion = not conexion.autocommit
+        bloqueada = en_transaccion
+
+        try:
+            if en_transaccion:
+                cursor.execute(
+                    f"SAVEPOINT fgp_preparar; PREPARE {nombre} AS {texto}; "
+                    "RELEASE SAVEPOINT fgp_preparar"
+                )
+            else:
+                cursor.execute(f"PREPARE {nombre} AS {texto}")
+        except psycopg2.errors.DuplicatePreparedStatement:
+            # Ya existía en el servidor (registro perdido): se reutiliza
+            bloqueada = False
+            if en_transaccion:
+                cursor.execute("ROLLBACK TO SAVEPOINT fgp_preparar")
+        except psycopg2.Error as e:
+            if en_transaccion:
+                cursor.execute("ROLLBACK TO SAVEPOINT fgp_preparar")
+            logger.debug(f"Consulta no preparable, se ejecuta sin preparar: {e}")
+            with self._lock:
+                for clave, traduccion in self._traducciones.items():
+                    if traduccion and traduccion[0] == nombre:
+                        self._traducciones[clave] = None
+            self.estadisticas["rechazadas"] += 1
+            return False
+
+        preparadas[nombre] = None
+        if bloqueada:
+            # El análisis de PREPARE ya bloqueó las tablas en esta transacción
+            self._verificadas_en(conexion).add(nombre)
+        self.estadisticas["preparadas"] += 1
+
+        # Acotar las sentencias vivas por conexión
+        while len(preparadas) > self.max_por_conexion:
+            antigua, _ = preparadas.popitem(last=False)
+            self._verificadas_en(conexion).discard(antigua)
+            try:
+                cursor.execute(f"DEALLOCATE {antigua}")
+            except psycopg2.Error:
+                break
+        return True
+
+    def resumen(self) -> Dict[str, Any]:
+        """Contadores y número de conexiones con sentencias registradas"""
+        with self._lock:
+            conexiones = len(self._por_conexion)
+        return dict(self.estadisticas, conexiones=conexiones)
+
+
+# Instancia única del proceso
+sentencias_preparadas = SentenciasPreparadas()
@@ -6,7 +6,7 @@ Módulo de modelos - Todas las clases de modelos disponibles
 from .base_model import BaseModel
 from .auditoria_transacciones_model import AuditoriaTransaccionesModel
 from .comprobantes_adjuntos_model import ComprobantesAdjuntosModel
-from .configuracion_model import ConfiguracionesModel
+from .configuracion_model import ConfiguracionesModel, RegistroConfiguraciones
 from .cuota_model import CuotaModel
 from .dashboard_model import DashboardModel
 from .docente_model import DocenteModel
@@ -17,9 +17,18 @@ from .gasto_model import GastoModel
 from .ingreso_model import IngresoModel
 from .matricula_model import MatriculaModel
 from .movimiento_caja_model import MovimientoCajaModel
+from .particion_model import ParticionModel
+from .archivador_model import ArchivadorModel
+from .numeracion_model import NumeracionModel
+from .exportador_model import ExportadorModel
+from .importador_model import ImportadorModel
+from .resumen_financiero_model import ResumenFinancieroModel
+from .vista_materializada_model import VistaMaterializadaModel
 from .plan_pago_model import PlanPagoModel
 from .programa_academico_model import ProgramasAcademicosModel
 from .usuarios_model import UsuariosModel
+from .sesiones_model import AlmacenSesionesMemoria, AlmacenSesionesPostgres
+from .cargador_registros import CargadorRegistros, alcance_carga
 
 # Lista de todos los modelos para fácil importación
 __all__ = [
@@ -38,6 +47,18 @@ __all__ = [
     "IngresoModel",
     "MovimientoCajaModel",
     "ConfiguracionesModel",
+    "RegistroConfiguraciones",
     "AuditoriaTransaccionesModel",
     "ComprobantesAdjuntosModel",
+    "ParticionModel",
+    "ArchivadorModel",
+    "NumeracionModel",
+    "ExportadorModel",
+    "ImportadorModel",
+    "ResumenFinancieroModel",
+    "VistaMaterializadaModel",
+    "AlmacenSesionesMemoria",
+    "AlmacenSesionesPostgres",
+    "CargadorRegistros",
+    "alcance_carga",
 ]
@@ -0,0 +1,396 @@
+# app/models/archivador_model.py
+"""
+Modelo para el archivado histórico de tablas antes de su depuración.
+
+Exporta filas en streaming desde un cursor del lado del servidor a archivos
+comprimidos (JSONL o CSV, gzip o zstd) divididos en partes, y escribe un
+manifiesto con el conteo, el rango de IDs y el SHA-256 de cada parte. La
+memoria usada es constante: nunca se cargan todas las filas a la vez.
+
+La depuración posterior se hace en lotes acotados, cada uno en su propia
+transacción, y solo sobre filas cuyo ID quedó cubierto por el archivo.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import csv
+import gzip
+import io
+import json
+import uuid
+import hashlib
+import logging
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import RealDictCursor
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+
+    ZSTD_SUPPORT = True
+except ImportError:
+    ZSTD_SUPPORT = False
+
+
+class _ArchivoConChecksum:
+    """Envoltorio de archivo binario que calcula SHA-256 y bytes escritos"""
+
+    def __init__(self, ruta: str):
+        self._archivo = open(ruta, "wb")
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._archivo.closed
+
+    def write(self, datos: bytes) -> int:
+        self.sha256.update(datos)
+        self.bytes += len(datos)
+        return self._archivo.write(datos)
+
+    def flush(self) -> None:
+        self._archivo.flush()
+
+    def close(self) -> None:
+        # Idempotente: el compresor zstd cierra también el archivo subyacente
+        if self._archivo.closed:
+            return
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._archivo.close()
+
+
+class ArchivadorModel(BaseModel):
+    """Modelo para exportar en streaming y depurar por lotes"""
+
+    FORMATOS = ["jsonl", "csv"]
+    COMPRESIONES = ["gzip", "zstd"]
+
+    def __init__(self):
+        """Inicializa el archivador"""
+        super().__init__()
+
+        # Filas leídas del servidor por viaje de red
+        self.TAMANO_CHUNK = 2000
+
+        # Filas máximas por archivo de parte
+        self.FILAS_POR_PARTE = 100000
+
+        # Filas eliminadas por transacción al depurar
+        self.TAMANO_LOTE_BORRADO = 5000
+
+    # ============ EXPORTACIÓN ============
+
+    def exportar(
+        self,
+        tabla: str,
+        condicion: str,
+        params: Tuple,
+        directorio: str,
+        formato: str = "jsonl",
+        compresion: str = "gzip",
+        columna_id: str = "id",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Exporta en streaming las filas que cumplen la condición
+
+        Args:
+            tabla: Tabla a exportar
+            condicion: Condición WHERE (sin la palabra WHERE)
+            params: Parámetros de la condición
+            directorio: Directorio destino (se crea un subdirectorio por exportación)
+            formato: "jsonl" o "csv"
+            compresion: "gzip" o "zstd"
+            columna_id: Columna de orden y de rango de IDs del manifiesto
+
+        Returns:
+            Optional[Dict]: Manifiesto de la exportación (incluye "ruta_manifiesto")
+            o None si hubo error
+        """
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato inválido. Válidos: {', '.join(self.FORMATOS)}")
+        if compresion not in self.COMPRESIONES:
+            raise ValueError(
+                f"Compresión inválida. Válidas: {', '.join(self.COMPRESIONES)}"
+            )
+        if compresion == "zstd" and not ZSTD_SUPPORT:
+            raise ValueError("Compresión zstd no disponible: instale 'zstandard'")
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        destino = os.path.join(directorio, f"{tabla}_{timestamp}")
+        os.makedirs(destino, exist_ok=True)
+
+        manifiesto = {
+            "tabla": tabla,
+            "condicion": condicion,
+            "parametros": [str(p) for p in params],
+            "formato": formato,
+            "compresion": compresion,
+            "columna_id": columna_id,
+            "inicio": datetime.now().isoformat(),
+            "partes": [],
+            "total_filas": 0,
+            "id_min": None,
+            "id_max": None,
+        }
+
+        connection = self.get_connection()
+        if connection is None:
+            logger.error("No hay conexión disponible para exportar")
+            return None
+
+        # Cursor del lado del servidor: el resultado se consume por chunks
+        cursor = connection.cursor(
+            name=f"archivo_{uuid.uuid4().hex[:12]}", cursor_factory=RealDictCursor
+        )
+        cursor.itersize = self.TAMANO_CHUNK
+        parte = None
+
+        try:
+            # Snapshot consistente y de solo lectura para toda la exportación
+            connection.rollback()
+            connection.set_session(
+                isolation_level="REPEATABLE READ", readonly=True
+            )
+            cursor.execute(
+                f"SELECT * FROM {tabla} WHERE {condicion} ORDER BY {columna_id}",
+                params,
+            )
+
+            while True:
+                filas = cursor.fetchmany(self.TAMANO_CHUNK)
+                if not filas:
+                    break
+
+                for fila in filas:
+                    if parte is None:
+                        parte = self._abrir_parte(
+                            destino, tabla, len(manifiesto["partes"]) + 1,
+                            formato, compresion, list(fila.keys()),
+                        )
+
+                    parte["escribir"](fila)
+                    parte["filas"] += 1
+                    fila_id = fila.get(columna_id)
+                    if parte["id_min"] is None:
+                        parte["id_min"] = fila_id
+                    parte["id_max"] = fila_id
+
+                    if parte["filas"] >= self.FILAS_POR_PARTE:
+                        manifiesto["partes"].append(self._cerrar_parte(parte))
+                        parte = None
+
+            if parte is not None:
+                manifiesto["partes"].append(self._cerrar_parte(parte))
+                parte = None
+
+            cursor.close()
+            connection.rollback()
+
+        except Exception as e:
+            logger.error(f"Error exportando {tabla}: {e}", exc_info=True)
+            if parte is not None:
+                try:
+                    parte["cerrar"]()
+                except Exception:
+                    pass
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            return None
+
+        finally:
+            try:
+                connection.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+            except Exception:
+                pass
+            self.return_connection(connection)
+
+        partes = manifiesto["partes"]
+        manifiesto["total_filas"] = sum(p["filas"] for p in partes)
+        if partes:
+            manifiesto["id_min"] = partes[0]["id_min"]
+            manifiesto["id_max"] = partes[-1]["id_max"]
+        manifiesto["fin"] = datetime.now().isoformat()
+
+        ruta_manifiesto = self._escribir_manifiesto(destino, manifiesto)
+        manifiesto["ruta_manifiesto"] = ruta_manifiesto
+
+        logger.info(
+            f"✓ Exportadas {manifiesto['total_filas']} filas de {tabla} en "
+            f"{len(partes)} partes: {ruta_manifiesto}"
+        )
+        return manifiesto
+
+    def _abrir_parte(
+        self,
+        destino: str,
+        tabla: str,
+        numero: int,
+        formato: str,
+        compresion: str,
+        columnas: List[str],
+    ) -> Dict[str, Any]:
+        """Abre el archivo comprimido de una parte y prepara su escritor"""
+        extension = "gz" if compresion == "gzip" else "zst"
+        nombre = f"{tabla}_parte{numero:04d}.{formato}.{extension}"
+        crudo = _ArchivoConChecksum(os.path.join(destino, nombre))
+
+        if compresion == "gzip":
+            comprimido = gzip.GzipFile(fileobj=crudo, mode="wb")
+        else:
+            comprimido = zstandard.ZstdCompressor().stream_writer(crudo)
+
+        texto = io.TextIOWrapper(comprimido, encoding="utf-8", newline="")
+
+        if formato == "csv":
+            writer = csv.DictWriter(texto, fieldnames=columnas)
+            writer.writeheader()
+
+            def escribir(fila):
+                writer.writerow({k: "" if v is None else v for k, v in fila.items()})
+
+        else:
+
+            def escribir(fila):
+                texto.write(json.dumps(fila, ensure_ascii=False, default=str) + "\n")
+
+        def cerrar():
+            texto.flush()
+            texto.detach()
+            comprimido.close()
+            crudo.close()
+
+        return {
+            "archivo": nombre,
+            "crudo": crudo,
+            "escribir": escribir,
+            "cerrar": cerrar,
+            "filas": 0,
+            "id_min": None,
+            "id_max": None,
+        }
+
+    def _cerrar_parte(self, parte: Dict[str, Any]) -> Dict[str, Any]:
+        """Cierra una parte y retorna su entrada del manifiesto"""
+        parte["cerrar"]()
+        return {
+            "archivo": parte["archivo"],
+            "filas": parte["filas"],
+            "bytes": parte["crudo"].bytes,
+            "sha256": parte["crudo"].sha256.hexdigest(),
+            "id_min": parte["id_min"],
+            "id_max": parte["id_max"],
+        }
+
+    def _escribir_manifiesto(self, destino: str, manifiesto: Dict[str, Any]) -> str:
+        """Escribe el manifiesto de forma atómica (archivo temporal + rename)"""
+        ruta = os.path.join(destino, "manifest.json")
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+        return ruta
+
+    def verificar_manifiesto(self, ruta_manifiesto: str) -> Dict[str, Any]:
+        """
+        Verifica los checksums de todas las partes de un manifiesto
+
+        Args:
+            ruta_manifiesto: Ruta del manifest.json
+
+        Returns:
+            Dict: valido (bool) y partes con error
+        """
+        with open(ruta_manifiesto, "r", encoding="utf-8") as f:
+            manifiesto = json.load(f)
+
+        directorio = os.path.dirname(ruta_manifiesto)
+        errores = []
+
+        for parte in manifiesto.get("partes", []):
+            sha = hashlib.sha256()
+            try:
+                with open(os.path.join(directorio, parte["archivo"]), "rb") as f:
+                    for bloque in iter(lambda: f.read(1024 * 1024), b""):
+                        sha.update(bloque)
+            except OSError as e:
+                errores.append({"archivo": parte["archivo"], "error": str(e)})
+                continue
+
+            if sha.hexdigest() != parte["sha256"]:
+                errores.append({"archivo": parte["archivo"], "error": "checksum"})
+
+        return {"valido": not errores, "errores": errores}
+
+    # ============ DEPURACIÓN ============
+
+    def eliminar_por_lotes(
+        self,
+        tabla: str,
+        condicion: str,
+        params: Tuple,
+        id_max: int,
+        columna_id: str = "id",
+    ) -> int:
+        """
+        Elimina filas en lotes acotados, cada uno en su propia transacción
+
+        Solo elimina filas con ID <= id_max, es decir, las cubiertas por un
+        archivo previo. Cada lote marca su transacción con
+        formagest.archivando = 'on', de modo que los triggers de resumen no
+        descuenten las filas archivadas (ver fn_resumen_movimientos_caja).
+
+        Args:
+            tabla: Tabla a depurar
+            condicion: Condición WHERE (sin la palabra WHERE)
+            params: Parámetros de la condición
+            id_max: Mayor ID archivado
+            columna_id: Columna de ID
+
+        Returns:
+            int: Total de filas eliminadas
+        """
+        query = f"""
+            SET LOCAL formagest.archivando = 'on';
+            DELETE FROM {tabla}
+            WHERE {columna_id} IN (
+                SELECT {columna_id} FROM {tabla}
+                WHERE {condicion} AND {columna_id} <= %s
+                ORDER BY {columna_id}
+                LIMIT %s
+            )
+        """
+        total = 0
+
+        while True:
+            eliminados = self.execute_query(
+                query,
+                tuple(params) + (id_max, self.TAMANO_LOTE_BORRADO),
+                fetch=False,
+                commit=True,
+            )
+            if eliminados is None:
+                logger.error(
+                    f"Depuración de {tabla} interrumpida tras {total} filas"
+                )
+                break
+
+            total += eliminados
+            if eliminados < self.TAMANO_LOTE_BORRADO:
+                break
+
+        return total
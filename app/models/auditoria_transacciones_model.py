@@ -6,13 +6,19 @@ Este modelo registra todas las acciones críticas del sistema (creación, modifi
 eliminación, anulación) sobre ingresos y gastos para fines de auditoría, trazabilidad
 y pericia informática.
 
+Los registros son de solo inserción y forman una cadena de hash (prev_hash -> hash)
+verificable de forma incremental. La escritura se hace por lotes mediante
+AuditoriaWriter.
+
 Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
 """
 
 import sys
 import os
 import json
+import atexit
 import logging
+import threading
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any, Tuple, Union
 from decimal import Decimal
@@ -20,14 +26,367 @@ import hashlib
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import psycopg2
+from psycopg2.extras import execute_values, RealDictCursor
+
 from .base_model import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Hash inicial de la cadena de auditoría (registro sin predecesor)
+HASH_GENESIS = "0" * 64
+
+# Campos que participan en el hash de cada registro, en orden fijo
+CAMPOS_HASH = [
+    "id",
+    "fecha_hora",
+    "usuario_id",
+    "origen_tipo",
+    "origen_id",
+    "accion",
+    "motivo",
+    "responsable_autoriza",
+    "ruta_resolucion",
+    "datos_anteriores",
+    "datos_nuevos",
+]
+
+
+def calcular_hash_registro(registro: Dict[str, Any], prev_hash: str) -> str:
+    """
+    Calcula el hash SHA-256 de un registro de auditoría encadenado al anterior
+
+    El contenido se serializa en forma canónica para que el mismo registro
+    leído desde la base de datos produzca exactamente el mismo hash.
+
+    Args:
+        registro: Datos del registro (debe incluir los campos de CAMPOS_HASH)
+        prev_hash: Hash del registro anterior en la cadena
+
+    Returns:
+        str: Hash hexadecimal del registro
+    """
+    valores = []
+    for campo in CAMPOS_HASH:
+        valor = registro.get(campo)
+        if isinstance(valor, datetime):
+            valor = valor.strftime("%Y-%m-%d %H:%M:%S")
+        elif valor is not None and campo in ("id", "usuario_id", "origen_id"):
+            valor = int(valor)
+        elif valor is not None:
+            valor = str(valor)
+        valores.append(valor)
+
+    contenido = json.dumps(
+        [prev_hash] + valores, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+class AuditoriaWriter:
+    """
+    Escritor de auditoría con buffer y escritura por lotes
+
+    Acumula eventos en memoria y los inserta con un único INSERT multi-fila
+    por lote. Cada lote se escribe bajo un advisory lock de transacción, de
+    modo que la cadena de hash (prev_hash -> hash) no se bifurca aunque varias
+    instancias de la aplicación escriban a la vez.
+
+    El escritor usa su propia conexión del pool, no la de un ámbito
+    transaction() abierto en el hilo que dispara el flush: cada lote se
+    confirma por su cuenta y no se pierde si esa transacción se revierte.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Clave del advisory lock que serializa la escritura de la cadena
+    LOCK_KEY = "auditoria_transacciones"
+
+    def __init__(
+        self,
+        tamano_lote: int = 100,
+        intervalo_flush: float = 2.0,
+        max_reintentos: int = 3,
+    ):
+        """
+        Inicializa el escritor
+
+        Args:
+            tamano_lote: Eventos acumulados que disparan un flush inmediato
+            intervalo_flush: Segundos máximos que un evento espera en el buffer
+            max_reintentos: Intentos de escritura antes de descartar un lote
+        """
+        self.tamano_lote = tamano_lote
+        self.intervalo_flush = intervalo_flush
+        self.max_reintentos = max_reintentos
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._reintentos = 0
+        self._model = None
+
+    @classmethod
+    def get_instance(cls) -> "AuditoriaWriter":
+        """Obtiene el escritor compartido del proceso"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    atexit.register(cls._instance.flush)
+        return cls._instance
+
+    def registrar(self, data: Dict[str, Any], reintentar: bool = True) -> Dict[str, Any]:
+        """
+        Agrega un evento al buffer
+
+        Args:
+            data: Datos del registro de auditoría (ya validados)
+            reintentar: Si es False y el lote que lo contiene falla, el evento
+                no vuelve al buffer y queda con la clave "error" (para quien
+                informa el fallo a su llamador, que puede reintentar)
+
+        Returns:
+            Dict: Evento encolado; tras el flush contiene la clave "id" o "error"
+        """
+        evento = self._normalizar_evento(data)
+        evento["reintentar"] = reintentar
+
+        with self._buffer_lock:
+            self._buffer.append(evento)
+            pendientes = len(self._buffer)
+            if pendientes == 1 and self.intervalo_flush > 0:
+                self._programar_flush()
+
+        if pendientes >= self.tamano_lote:
+            self.flush()
+
+        return evento
+
+    def pendientes(self) -> int:
+        """Número de eventos en el buffer"""
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def _programar_flush(self) -> None:
+        """Programa un flush diferido (llamar con _buffer_lock tomado)"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.intervalo_flush, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _normalizar_evento(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Normaliza tipos para que el hash coincida con lo almacenado"""
+        evento = {}
+
+        fecha_hora = data.get("fecha_hora") or datetime.now()
+        if isinstance(fecha_hora, datetime):
+            fecha_hora = fecha_hora.strftime("%Y-%m-%d %H:%M:%S")
+        evento["fecha_hora"] = str(fecha_hora)
+
+        evento["usuario_id"] = int(data["usuario_id"])
+        evento["origen_tipo"] = str(data["origen_tipo"])
+        evento["origen_id"] = int(data["origen_id"])
+        evento["accion"] = str(data["accion"])
+        evento["motivo"] = str(data["motivo"])
+
+        for campo in ["responsable_autoriza", "ruta_resolucion"]:
+            valor = data.get(campo)
+            evento[campo] = str(valor) if valor is not None else None
+
+        for campo in ["datos_anteriores", "datos_nuevos"]:
+            valor = data.get(campo)
+            if isinstance(valor, (dict, list)):
+                valor = json.dumps(valor, ensure_ascii=False, default=str)
+            evento[campo] = str(valor) if valor is not None else None
+
+        return evento
+
+    def flush(self) -> List[int]:
+        """
+        Escribe todos los eventos pendientes en un único INSERT multi-fila
+
+        Returns:
+            List[int]: IDs asignados a los eventos escritos (vacía si no hubo
+            eventos o si la escritura falló)
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                lote = self._buffer
+                self._buffer = []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not lote:
+                return []
+
+            try:
+                try:
+                    ids = self._escribir_lote(lote)
+                except psycopg2.IntegrityError as e:
+                    diag = getattr(e, "diag", None)
+                    if getattr(diag, "constraint_name", None) != "fk_auditoria_usuario":
+                        raise
+                    # Un usuario inexistente no debe bloquear al resto del lote
+                    lote = self._rechazar_usuarios_inexistentes(lote)
+                    ids = self._escribir_lote(lote) if lote else []
+                self._reintentos = 0
+                logger.debug(f"Auditoría: lote de {len(ids)} eventos escrito")
+                return ids
+
+            except Exception as e:
+                self._reintentos += 1
+                if self._reintentos >= self.max_reintentos:
+                    logger.critical(
+                        f"Auditoría: lote de {len(lote)} eventos descartado tras "
+                        f"{self._reintentos} intentos: {e} - Eventos: "
+                        f"{json.dumps(lote, ensure_ascii=False, default=str)}"
+                    )
+                    self._reintentos = 0
+                    fallidos, reintentables = lote, []
+                else:
+                    # Los eventos sin reintento se informan como fallidos a
+                    # su llamador; reencolarlos los duplicaría si este reintenta
+                    fallidos = [ev for ev in lote if not ev["reintentar"]]
+                    reintentables = [ev for ev in lote if ev["reintentar"]]
+                    logger.error(
+                        f"Auditoría: error escribiendo lote de {len(lote)} "
+                        f"eventos, se reintentarán {len(reintentables)}: {e}"
+                    )
+                    with self._buffer_lock:
+                        self._buffer = reintentables + self._buffer
+                        if reintentables and self.intervalo_flush > 0:
+                            self._programar_flush()
+
+                for evento in fallidos:
+                    evento["error"] = f"No se pudo escribir el registro: {e}"
+                return []
+
+    def _rechazar_usuarios_inexistentes(
+        self, lote: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Separa los eventos cuyo usuario no existe
+
+        Los eventos rechazados quedan con la clave "error" y no se reintentan.
+
+        Returns:
+            List[Dict]: Eventos con usuario existente
+        """
+        usuarios = sorted({evento["usuario_id"] for evento in lote})
+        conexion = self._conexion()
+        try:
+            with conexion.cursor() as cursor:
+                cursor.execute("SELECT id FROM usuarios WHERE id = ANY(%s)", (usuarios,))
+                existentes = {fila[0] for fila in cursor.fetchall()}
+            conexion.commit()
+        except Exception:
+            conexion.rollback()
+            raise
+
+        validos = []
+        for evento in lote:
+            if evento["usuario_id"] in existentes:
+                validos.append(evento)
+            else:
+                evento["error"] = f"Usuario con ID {evento['usuario_id']} no existe"
+                logger.error(f"Auditoría: evento rechazado - {evento['error']}")
+        return validos
+
+    def _conexion(self):
+        """Conexión propia del escritor (ignora el ámbito transaction() activo)"""
+        if self._model is None:
+            self._model = AuditoriaTransaccionesModel()
+        model = self._model
+
+        if model.connection is None or model.connection.closed:
+            model._connect()
+        if model.connection is None:
+            raise RuntimeError("No hay conexión disponible para auditoría")
+        return model.connection
+
+    def _escribir_lote(self, lote: List[Dict[str, Any]]) -> List[int]:
+        """Inserta el lote encadenado en una sola transacción propia"""
+        conexion = self._conexion()
+        model = self._model
+        cursor = conexion.cursor(cursor_factory=RealDictCursor)
+
+        try:
+            # Serializar escritores para que la cadena sea lineal
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))", (self.LOCK_KEY,)
+            )
+
+            cursor.execute(
+                f"""
+                SELECT hash FROM {model.table_name}
+                WHERE hash IS NOT NULL
+                ORDER BY id DESC
+                LIMIT 1
+                """
+            )
+            ultimo = cursor.fetchone()
+            prev_hash = ultimo["hash"] if ultimo else HASH_GENESIS
+
+            # Reservar IDs para que formen parte del hash
+            cursor.execute(
+                "SELECT nextval(%s) AS id FROM generate_series(1, %s)",
+                (model.sequence_name, len(lote)),
+            )
+            ids = sorted(row["id"] for row in cursor.fetchall())
+
+            columnas = CAMPOS_HASH + ["prev_hash", "hash"]
+            filas = []
+            for evento, registro_id in zip(lote, ids):
+                registro = dict(evento, id=registro_id)
+                registro["prev_hash"] = prev_hash
+                registro["hash"] = calcular_hash_registro(registro, prev_hash)
+                prev_hash = registro["hash"]
+                filas.append(tuple(registro[c] for c in columnas))
+
+            execute_values(
+                cursor,
+                f"INSERT INTO {model.table_name} ({', '.join(columnas)}) VALUES %s",
+                filas,
+                page_size=len(filas),
+            )
+
+            conexion.commit()
+
+        except Exception:
+            conexion.rollback()
+            raise
+
+        finally:
+            cursor.close()
+
+        for evento, registro_id in zip(lote, ids):
+            evento["id"] = registro_id
+
+        return ids
+
 
 class AuditoriaTransaccionesModel(BaseModel):
     """Modelo que representa un registro de auditoría de transacciones"""
 
+    # Listados sin los JSON de datos ni la cadena de hash (se leen con read())
+    column_sets = {
+        "lista": (
+            "id",
+            "fecha_hora",
+            "usuario_id",
+            "origen_tipo",
+            "origen_id",
+            "accion",
+            "motivo",
+            "responsable_autoriza",
+        ),
+    }
+
     def __init__(self):
         """Inicializa el modelo de auditoría"""
         super().__init__()
@@ -35,7 +394,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         self.sequence_name = "seq_auditoria_transacciones_id"
 
         # Tipos de origen según CHECK constraint
-        self.ORIGEN_TIPOS = ["INGRESO", "GASTO"]
+        self.ORIGEN_TIPOS = ["INGRESO", "GASTO", "FACTURA"]
 
         # Acciones según CHECK constraint
         self.ACCIONES = ["CREACION", "MODIFICACION", "ELIMINACION", "ANULACION"]
@@ -81,13 +440,24 @@ class AuditoriaTransaccionesModel(BaseModel):
         # Configuración de retención (días)
         self.RETENCION_DIAS = 365  # 1 año por defecto
 
+        # Directorio de archivos históricos exportados antes de depurar
+        self.RUTA_ARCHIVO = "archivos/auditoria/"
+
+        # Registros máximos en el detalle del reporte de auditoría
+        self.LIMITE_DETALLE_REPORTE = 1000
+
+        # Umbrales de detección de anomalías en reportes
+        self.UMBRAL_ELIMINACIONES = 3
+        self.UMBRAL_NOCTURNAS = 1
+        self.UMBRAL_MODIFICACIONES = 5
+
         # Límites de consulta
         self.LIMITE_CONSULTA = 1000
 
     # ============ MÉTODOS DE VALIDACIÓN ============
 
     def _validate_auditoria_data(
-        self, data: Dict[str, Any], for_update: bool = False
+        self, data: Dict[str, Any], for_update: bool = False, verificar_bd: bool = True
     ) -> Tuple[bool, str]:
         """
         Valida los datos del registro de auditoría
@@ -95,6 +465,8 @@ class AuditoriaTransaccionesModel(BaseModel):
         Args:
             data: Diccionario con datos de auditoría
             for_update: Si es True, valida para actualización
+            verificar_bd: Si es False, omite las consultas de usuario y origen
+                (la FK fk_auditoria_usuario se comprueba al escribir)
 
         Returns:
             Tuple[bool, str]: (es_válido, mensaje_error)
@@ -119,12 +491,17 @@ class AuditoriaTransaccionesModel(BaseModel):
                 return (False, f"Acción inválida. Válidas: {', '.join(self.ACCIONES)}")
 
         # Validar usuario_id
-        if "usuario_id" in data and data["usuario_id"]:
+        if verificar_bd and "usuario_id" in data and data["usuario_id"]:
             if not self._usuario_exists(data["usuario_id"]):
                 return False, f"Usuario con ID {data['usuario_id']} no existe"
 
         # Validar origen_id según tipo
-        if "origen_id" in data and data["origen_id"] and "origen_tipo" in data:
+        if (
+            verificar_bd
+            and "origen_id" in data
+            and data["origen_id"]
+            and "origen_tipo" in data
+        ):
             origen_tipo = data["origen_tipo"]
             origen_id = data["origen_id"]
 
@@ -192,6 +569,8 @@ class AuditoriaTransaccionesModel(BaseModel):
                 query = "SELECT COUNT(*) as count FROM ingresos WHERE id = %s"
             elif origen_tipo == "GASTO":
                 query = "SELECT COUNT(*) as count FROM gastos WHERE id = %s"
+            elif origen_tipo == "FACTURA":
+                query = "SELECT COUNT(*) as count FROM facturas WHERE id = %s"
             else:
                 return False
 
@@ -205,23 +584,26 @@ class AuditoriaTransaccionesModel(BaseModel):
 
     # ============ MÉTODOS CRUD PRINCIPALES ============
 
-    def create(self, data: Dict[str, Any], calcular_hash: bool = True) -> Optional[int]:
+    def create(self, data: Dict[str, Any], diferido: bool = False) -> Optional[int]:
         """
-        Crea un nuevo registro de auditoría
+        Crea un nuevo registro de auditoría encadenado
+
+        El registro se escribe a través del AuditoriaWriter compartido. Con
+        diferido=False el buffer se vacía en el acto y se retorna el ID; con
+        diferido=True el evento se escribe en el siguiente lote.
 
         Args:
             data: Diccionario con datos de auditoría
-            calcular_hash: Si es True, calcula hash de integridad para datos anteriores/nuevos
+            diferido: Si es True, encola el evento sin esperar la escritura
 
         Returns:
-            Optional[int]: ID del registro de auditoría creado o None si hay error
+            Optional[int]: ID del registro de auditoría creado (None si hay
+            error o si el registro es diferido)
         """
-        # Preparar datos
-        insert_data = data.copy()
-
-        # Validar datos
+        # Validar datos en memoria; el usuario lo comprueba su FK al escribir
+        # y el origen solo generaba una advertencia
         is_valid, error_msg = self._validate_auditoria_data(
-            insert_data, for_update=False
+            data, for_update=False, verificar_bd=False
         )
 
         if not is_valid:
@@ -229,34 +611,22 @@ class AuditoriaTransaccionesModel(BaseModel):
             return None
 
         try:
-            # Iniciar transacción
-            self.begin_transaction()
-
-            # Establecer valores por defecto
-            defaults = {"fecha_hora": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-            for key, value in defaults.items():
-                if key not in insert_data or insert_data[key] is None:
-                    insert_data[key] = value
+            writer = AuditoriaWriter.get_instance()
+            # Sin diferir, un fallo se informa y no se reintenta en segundo
+            # plano: si el llamador reintenta, el evento no se duplica
+            evento = writer.registrar(data, reintentar=diferido)
 
-            # Procesar datos_anteriores y datos_nuevos
-            for campo in ["datos_anteriores", "datos_nuevos"]:
-                if campo in insert_data and insert_data[campo] is not None:
-                    # Convertir a JSON string si es dict/list
-                    if isinstance(insert_data[campo], (dict, list)):
-                        insert_data[campo] = json.dumps(
-                            insert_data[campo], ensure_ascii=False, default=str
-                        )
+            if diferido:
+                return None
 
-            # Calcular hash de integridad si se solicita
-            if calcular_hash:
-                self._agregar_hash_integridad(insert_data)
+            writer.flush()
+            auditoria_id = evento.get("id")
 
-            # Insertar en base de datos
-            auditoria_id = self.insert(self.table_name, insert_data, returning="id")
+            if evento.get("error"):
+                logger.error(f"Error creando registro de auditoría: {evento['error']}")
+                return None
 
             if not auditoria_id:
-                self.rollback()
                 logger.error("No se pudo insertar el registro de auditoría")
                 return None
 
@@ -264,49 +634,93 @@ class AuditoriaTransaccionesModel(BaseModel):
                 f"✓ Registro de auditoría creado exitosamente con ID: {auditoria_id}"
             )
 
-            # Commit de la transacción
-            self.commit()
-
             # Log de auditoría (meta-auditoría)
-            self._log_auditoria_creada(auditoria_id, insert_data)
+            self._log_auditoria_creada(auditoria_id, evento)
 
             return auditoria_id
 
         except Exception as e:
-            self.rollback()
             logger.error(f"Error creando registro de auditoría: {e}", exc_info=True)
             return None
 
-    def _agregar_hash_integridad(self, data: Dict[str, Any]) -> None:
+    def registrar_diferido(self, data: Dict[str, Any]) -> bool:
         """
-        Agrega hash de integridad a los datos de auditoría
+        Encola un registro de auditoría para escritura por lotes
 
         Args:
-            data: Datos de auditoría
+            data: Diccionario con datos de auditoría
+
+        Returns:
+            bool: True si el evento fue validado y encolado
         """
+        is_valid, error_msg = self._validate_auditoria_data(
+            data, for_update=False, verificar_bd=False
+        )
+        if not is_valid:
+            logger.error(f"Error validando datos de auditoría: {error_msg}")
+            return False
+
         try:
-            # Crear cadena para hash
-            cadena_hash = ""
+            AuditoriaWriter.get_instance().registrar(data)
+            return True
+        except Exception as e:
+            logger.error(f"Error encolando registro de auditoría: {e}")
+            return False
+
+    def registrar_lote(self, eventos: List[Dict[str, Any]]) -> List[int]:
+        """
+        Registra varios eventos de auditoría en un único lote
+
+        Pensado para operaciones masivas cuyos orígenes provienen de la
+        misma sentencia que los modificó: se valida cada evento en memoria,
+        los usuarios se verifican con una sola consulta y todos los eventos
+        se escriben con un único INSERT encadenado.
 
-            if data.get("datos_anteriores"):
-                cadena_hash += str(data["datos_anteriores"])
+        Args:
+            eventos: Lista de diccionarios con datos de auditoría
+
+        Returns:
+            List[int]: IDs de los registros creados (vacía si hubo error)
+        """
+        if not eventos:
+            return []
 
-            if data.get("datos_nuevos"):
-                cadena_hash += str(data["datos_nuevos"])
+        for data in eventos:
+            for field in self.required_columns:
+                if data.get(field) is None:
+                    logger.error(f"Lote de auditoría inválido: falta {field}")
+                    return []
+            if data["origen_tipo"] not in self.ORIGEN_TIPOS:
+                logger.error(f"Lote de auditoría inválido: origen {data['origen_tipo']}")
+                return []
+            if data["accion"] not in self.ACCIONES:
+                logger.error(f"Lote de auditoría inválido: acción {data['accion']}")
+                return []
+            if len(str(data["motivo"]).strip()) < 5:
+                logger.error("Lote de auditoría inválido: motivo demasiado corto")
+                return []
 
-            if cadena_hash:
-                # Calcular hash SHA-256
-                hash_obj = hashlib.sha256(cadena_hash.encode("utf-8"))
-                data_hash = hash_obj.hexdigest()
+        usuarios = sorted({int(e["usuario_id"]) for e in eventos})
+        existentes = self.fetch_all(
+            "SELECT id FROM usuarios WHERE id = ANY(%s)", (usuarios,)
+        )
+        if existentes is not None and len(existentes) < len(usuarios):
+            faltantes = set(usuarios) - {u["id"] for u in existentes}
+            logger.error(f"Lote de auditoría inválido: usuarios {sorted(faltantes)}")
+            return []
 
-                # Agregar al motivo
-                motivo_original = data.get("motivo", "")
-                data["motivo"] = f"{motivo_original} [HASH:{data_hash[:16]}]"
+        try:
+            writer = AuditoriaWriter.get_instance()
+            registrados = [writer.registrar(data) for data in eventos]
+            writer.flush()
 
-                logger.debug(f"Hash de integridad calculado: {data_hash[:16]}")
+            ids = [e["id"] for e in registrados if e.get("id")]
+            logger.info(f"✓ Lote de auditoría registrado: {len(ids)} eventos")
+            return ids
 
         except Exception as e:
-            logger.warning(f"No se pudo calcular hash de integridad: {e}")
+            logger.error(f"Error registrando lote de auditoría: {e}", exc_info=True)
+            return []
 
     def _log_auditoria_creada(self, auditoria_id: int, data: Dict[str, Any]) -> None:
         """
@@ -436,57 +850,25 @@ class AuditoriaTransaccionesModel(BaseModel):
 
     def update(self, auditoria_id: int, data: Dict[str, Any]) -> bool:
         """
-        Actualiza un registro de auditoría (uso limitado para correcciones)
+        Los registros de auditoría no se actualizan
 
-        Nota: Los registros de auditoría generalmente no deben actualizarse
-        excepto para correcciones administrativas.
+        La tabla es de solo inserción: cada registro forma parte de la cadena
+        de hash y modificarlo invalidaría la verificación. Las correcciones
+        administrativas se registran como un evento nuevo con create().
 
         Args:
-            auditoria_id: ID del registro a actualizar
-            data: Datos a actualizar
+            auditoria_id: ID del registro
+            data: Datos que se intentaron actualizar
 
         Returns:
-            bool: True si se actualizó correctamente
+            bool: Siempre False
         """
-        try:
-            logger.warning(
-                f"Actualizando registro de auditoría {auditoria_id} - "
-                "Esta operación debe estar justificada"
-            )
-
-            # Obtener registro actual
-            registro_actual = self.read(auditoria_id)
-            if not registro_actual:
-                return False
-
-            # Solo permitir actualizar ciertos campos
-            campos_permitidos = ["motivo", "responsable_autoriza", "ruta_resolucion"]
-            data_filtrado = {k: v for k, v in data.items() if k in campos_permitidos}
-
-            if not data_filtrado:
-                logger.error("No se permiten actualizar los campos solicitados")
-                return False
-
-            # Agregar timestamp de actualización
-            data_filtrado["fecha_hora"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Actualizar en base de datos usando el método de BaseModel
-            result = super().update(  # ¡CUIDADO! Esto causaría recursión infinita
-                self.table_name, data_filtrado, "id = %s", (auditoria_id,)
-            )
-
-            if result:
-                logger.warning(
-                    f"✓ Registro de auditoría {auditoria_id} actualizado "
-                    f"(campos: {', '.join(data_filtrado.keys())})"
-                )
-                return True
-
-            return False
-
-        except Exception as e:
-            logger.error(f"Error actualizando registro de auditoría: {e}")
-            return False
+        logger.error(
+            f"Intento de actualizar registro de auditoría {auditoria_id} "
+            f"(campos: {', '.join(data.keys())}) - la auditoría es de solo "
+            "inserción; registre la corrección como un evento nuevo"
+        )
+        return False
 
     def delete(self, auditoria_id: int) -> bool:
         """
@@ -583,6 +965,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         usuario_id: Optional[int] = None,
         limit: int = 1000,
         offset: int = 0,
+        columns: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Busca registros de auditoría por rango de fechas
@@ -595,34 +978,41 @@ class AuditoriaTransaccionesModel(BaseModel):
             usuario_id: ID de usuario (opcional)
             limit: Límite de resultados
             offset: Desplazamiento para paginación
+            columns: Columnas a leer (None para todas, "lista" para listados)
 
         Returns:
             List[Dict]: Lista de registros de auditoría
         """
+        select_list = self._select_list(columns, alias="a")
         try:
-            # Convertir fechas a string
-            fecha_inicio_str = self._formatear_fecha_consulta(fecha_inicio)
-            fecha_fin_str = self._formatear_fecha_consulta(fecha_fin, es_fin=True)
+            # Rango semiabierto con límites tipados: el planificador descarta
+            # las particiones mensuales fuera del rango
+            fecha_inicio_str, fecha_fin_excl = self._rango_consulta(
+                fecha_inicio, fecha_fin
+            )
 
-            condiciones = ["fecha_hora >= %s", "fecha_hora <= %s"]
-            params = [fecha_inicio_str, fecha_fin_str]
+            condiciones = [
+                "a.fecha_hora >= %s::timestamp",
+                "a.fecha_hora < %s::timestamp",
+            ]
+            params = [fecha_inicio_str, fecha_fin_excl]
 
             if origen_tipo:
-                condiciones.append("origen_tipo = %s")
+                condiciones.append("a.origen_tipo = %s")
                 params.append(origen_tipo)
 
             if accion:
-                condiciones.append("accion = %s")
+                condiciones.append("a.accion = %s")
                 params.append(accion)
 
             if usuario_id:
-                condiciones.append("usuario_id = %s")
-                params.append(str(usuario_id))  # Convertir int a str
+                condiciones.append("a.usuario_id = %s")
+                params.append(int(usuario_id))
 
             where_clause = "WHERE " + " AND ".join(condiciones)
 
             query = f"""
-                    SELECT a.*,
+                    SELECT {select_list},
                            u.username as usuario_username,
                            u.nombre_completo as usuario_nombre
                     FROM {self.table_name} a
@@ -632,8 +1022,7 @@ class AuditoriaTransaccionesModel(BaseModel):
                     LIMIT %s OFFSET %s
                 """
 
-            # Agregar limit y offset como strings
-            params.extend([str(limit), str(offset)])
+            params.extend([int(limit), int(offset)])
 
             results = self.fetch_all(query, tuple(params))
 
@@ -649,7 +1038,11 @@ class AuditoriaTransaccionesModel(BaseModel):
             return []
 
     def buscar_por_origen(
-        self, origen_tipo: str, origen_id: int, limit: int = 100
+        self,
+        origen_tipo: str,
+        origen_id: int,
+        limit: int = 100,
+        columns: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Busca todos los registros de auditoría para un origen específico
@@ -658,16 +1051,18 @@ class AuditoriaTransaccionesModel(BaseModel):
             origen_tipo: Tipo de origen (INGRESO/GASTO)
             origen_id: ID del origen
             limit: Límite de resultados
+            columns: Columnas a leer (None para todas, "lista" para listados)
 
         Returns:
             List[Dict]: Lista de registros de auditoría para el origen
         """
+        select_list = self._select_list(columns, alias="a")
         try:
             if origen_tipo not in self.ORIGEN_TIPOS:
                 return []
 
             query = f"""
-                SELECT a.*,
+                SELECT {select_list},
                        u.username as usuario_username,
                        u.nombre_completo as usuario_nombre
                 FROM {self.table_name} a
@@ -691,7 +1086,11 @@ class AuditoriaTransaccionesModel(BaseModel):
             return []
 
     def buscar_por_usuario(
-        self, usuario_id: int, dias_atras: int = 30, limit: int = 500
+        self,
+        usuario_id: int,
+        dias_atras: int = 30,
+        limit: int = 500,
+        columns: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Busca registros de auditoría para un usuario específico
@@ -700,17 +1099,19 @@ class AuditoriaTransaccionesModel(BaseModel):
             usuario_id: ID del usuario
             dias_atras: Días hacia atrás para buscar
             limit: Límite de resultados
+            columns: Columnas a leer (None para todas, "lista" para listados)
 
         Returns:
             List[Dict]: Lista de registros de auditoría del usuario
         """
+        select_list = self._select_list(columns, alias="a")
         try:
             fecha_limite = (datetime.now() - timedelta(days=dias_atras)).strftime(
                 "%Y-%m-%d %H:%M:%S"
             )
 
             query = f"""
-                SELECT a.*,
+                SELECT {select_list},
                        u.username as usuario_username,
                        u.nombre_completo as usuario_nombre
                 FROM {self.table_name} a
@@ -824,12 +1225,137 @@ class AuditoriaTransaccionesModel(BaseModel):
         except Exception:
             return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    def _rango_consulta(
+        self,
+        fecha_inicio: Union[str, datetime, date],
+        fecha_fin: Union[str, datetime, date],
+    ) -> Tuple[str, str]:
+        """
+        Convierte un rango de fechas inclusivo en uno semiabierto
+
+        Args:
+            fecha_inicio: Fecha de inicio (inclusive)
+            fecha_fin: Fecha de fin (inclusive, día completo)
+
+        Returns:
+            Tuple[str, str]: (inicio, inicio del día siguiente a fecha_fin)
+        """
+        inicio = self._formatear_fecha_consulta(fecha_inicio)
+        fin = datetime.strptime(
+            self._formatear_fecha_consulta(fecha_fin)[:10], "%Y-%m-%d"
+        ) + timedelta(days=1)
+        return inicio, fin.strftime("%Y-%m-%d %H:%M:%S")
+
     # ============ MÉTODOS DE REPORTES Y ESTADÍSTICAS ============
 
+    def _obtener_agregados(
+        self,
+        fecha_inicio: Union[str, datetime, date],
+        fecha_fin: Union[str, datetime, date],
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Calcula en una sola pasada todos los agregados de auditoría del período
+
+        Un único GROUP BY GROUPING SETS sobre el rango (semiabierto, con poda
+        de particiones) produce las filas general, por acción, por origen, por
+        usuario, por día y por registro modificado; la tabla base se recorre
+        una sola vez. Las filas por registro se filtran en el servidor y solo
+        llegan las que superan el umbral de modificaciones.
+
+        Args:
+            fecha_inicio: Fecha de inicio
+            fecha_fin: Fecha de fin
+
+        Returns:
+            Optional[Dict]: Filas agrupadas por sección (general, accion,
+            origen, usuario, dia, registro) o None si hubo error
+        """
+        inicio, fin = self._rango_consulta(fecha_inicio, fecha_fin)
+
+        query = f"""
+            WITH base AS (
+                SELECT
+                    usuario_id,
+                    origen_tipo,
+                    origen_id,
+                    accion,
+                    fecha_hora,
+                    fecha_hora::date AS dia,
+                    (EXTRACT(HOUR FROM fecha_hora) >= 22
+                     OR EXTRACT(HOUR FROM fecha_hora) < 6) AS nocturna
+                FROM {self.table_name}
+                WHERE fecha_hora >= %s::timestamp AND fecha_hora < %s::timestamp
+            ),
+            agregados AS (
+                SELECT
+                    CASE
+                        WHEN GROUPING(origen_id) = 0 THEN 'registro'
+                        WHEN GROUPING(origen_tipo) = 0 THEN 'origen'
+                        WHEN GROUPING(accion) = 0 THEN 'accion'
+                        WHEN GROUPING(usuario_id) = 0 THEN 'usuario'
+                        WHEN GROUPING(dia) = 0 THEN 'dia'
+                        ELSE 'general'
+                    END AS seccion,
+                    accion,
+                    origen_tipo,
+                    origen_id,
+                    usuario_id,
+                    dia,
+                    COUNT(*) AS cantidad,
+                    COUNT(DISTINCT usuario_id) AS usuarios_unicos,
+                    COUNT(DISTINCT origen_tipo) AS tipos_origen,
+                    MIN(fecha_hora) AS primera_fecha,
+                    MAX(fecha_hora) AS ultima_fecha,
+                    COUNT(*) FILTER (
+                        WHERE accion IN ('ELIMINACION', 'ANULACION')
+                    ) AS criticas,
+                    COUNT(*) FILTER (WHERE accion = 'ELIMINACION') AS eliminaciones,
+                    MIN(fecha_hora) FILTER (
+                        WHERE accion = 'ELIMINACION'
+                    ) AS primera_eliminacion,
+                    MAX(fecha_hora) FILTER (
+                        WHERE accion = 'ELIMINACION'
+                    ) AS ultima_eliminacion,
+                    COUNT(*) FILTER (WHERE nocturna) AS nocturnas,
+                    COUNT(*) FILTER (WHERE accion = 'MODIFICACION') AS modificaciones
+                FROM base
+                GROUP BY GROUPING SETS (
+                    (),
+                    (accion),
+                    (origen_tipo),
+                    (origen_tipo, origen_id),
+                    (usuario_id),
+                    (dia)
+                )
+                HAVING GROUPING(origen_id) = 1
+                    OR COUNT(*) FILTER (WHERE accion = 'MODIFICACION') > %s
+            )
+            SELECT ag.*, u.username, u.nombre_completo
+            FROM agregados ag
+            LEFT JOIN usuarios u
+                ON ag.seccion = 'usuario' AND u.id = ag.usuario_id
+        """
+
+        resultados = self.fetch_all(
+            query, (inicio, fin, self.UMBRAL_MODIFICACIONES)
+        )
+        if resultados is None:
+            return None
+
+        agregados = {
+            seccion: []
+            for seccion in ["general", "accion", "origen", "usuario", "dia", "registro"]
+        }
+        for fila in resultados:
+            agregados[fila["seccion"]].append(fila)
+
+        return agregados
+
     def obtener_estadisticas(
         self,
         fecha_inicio: Union[str, datetime, date],
         fecha_fin: Union[str, datetime, date],
+        agregados: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Dict[str, Any]:
         """
         Obtiene estadísticas de auditoría para un período
@@ -837,6 +1363,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
+            agregados: Resultado previo de _obtener_agregados (evita recalcular)
 
         Returns:
             Dict[str, Any]: Estadísticas de auditoría
@@ -845,93 +1372,61 @@ class AuditoriaTransaccionesModel(BaseModel):
             fecha_inicio_str = self._formatear_fecha_consulta(fecha_inicio)
             fecha_fin_str = self._formatear_fecha_consulta(fecha_fin, es_fin=True)
 
-            # Estadísticas generales
-            query_general = f"""
-                SELECT 
-                    COUNT(*) as total_registros,
-                    COUNT(DISTINCT usuario_id) as usuarios_unicos,
-                    COUNT(DISTINCT origen_tipo) as tipos_origen,
-                    MIN(fecha_hora) as primera_fecha,
-                    MAX(fecha_hora) as ultima_fecha
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-            """
-
-            general = self.fetch_one(query_general, (fecha_inicio_str, fecha_fin_str))
-
-            # Por acción
-            query_acciones = f"""
-                SELECT 
-                    accion,
-                    COUNT(*) as cantidad
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                GROUP BY accion
-                ORDER BY cantidad DESC
-            """
-
-            por_accion = self.fetch_all(
-                query_acciones, (fecha_inicio_str, fecha_fin_str)
-            )
-
-            # Por origen
-            query_origenes = f"""
-                SELECT 
-                    origen_tipo,
-                    COUNT(*) as cantidad
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                GROUP BY origen_tipo
-                ORDER BY cantidad DESC
-            """
+            if agregados is None:
+                agregados = self._obtener_agregados(fecha_inicio, fecha_fin)
+            if agregados is None:
+                return {}
 
-            por_origen = self.fetch_all(
-                query_origenes, (fecha_inicio_str, fecha_fin_str)
-            )
+            general = {}
+            if agregados["general"]:
+                fila = agregados["general"][0]
+                general = {
+                    "total_registros": fila["cantidad"],
+                    "usuarios_unicos": fila["usuarios_unicos"],
+                    "tipos_origen": fila["tipos_origen"],
+                    "primera_fecha": fila["primera_fecha"],
+                    "ultima_fecha": fila["ultima_fecha"],
+                }
 
-            # Por usuario
-            query_usuarios = f"""
-                SELECT 
-                    a.usuario_id,
-                    u.username,
-                    u.nombre_completo,
-                    COUNT(*) as cantidad
-                FROM {self.table_name} a
-                LEFT JOIN usuarios u ON a.usuario_id = u.id
-                WHERE a.fecha_hora >= %s AND a.fecha_hora <= %s
-                GROUP BY a.usuario_id, u.username, u.nombre_completo
-                ORDER BY cantidad DESC
-                LIMIT 10
-            """
+            por_accion = [
+                {"accion": f["accion"], "cantidad": f["cantidad"]}
+                for f in sorted(agregados["accion"], key=lambda f: -f["cantidad"])
+            ]
 
-            por_usuario = self.fetch_all(
-                query_usuarios, (fecha_inicio_str, fecha_fin_str)
-            )
+            por_origen = [
+                {"origen_tipo": f["origen_tipo"], "cantidad": f["cantidad"]}
+                for f in sorted(agregados["origen"], key=lambda f: -f["cantidad"])
+            ]
 
-            # Actividad por día
-            query_diaria = f"""
-                SELECT 
-                    DATE(fecha_hora) as fecha,
-                    COUNT(*) as registros
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                GROUP BY DATE(fecha_hora)
-                ORDER BY fecha DESC
-                LIMIT 30
-            """
-
-            diaria = self.fetch_all(query_diaria, (fecha_inicio_str, fecha_fin_str))
+            por_usuario = [
+                {
+                    "usuario_id": f["usuario_id"],
+                    "username": f["username"],
+                    "nombre_completo": f["nombre_completo"],
+                    "cantidad": f["cantidad"],
+                }
+                for f in sorted(agregados["usuario"], key=lambda f: -f["cantidad"])[
+                    :10
+                ]
+            ]
+
+            diaria = [
+                {"fecha": f["dia"], "registros": f["cantidad"]}
+                for f in sorted(agregados["dia"], key=lambda f: f["dia"], reverse=True)[
+                    :30
+                ]
+            ]
 
             return {
                 "periodo": {
                     "fecha_inicio": fecha_inicio_str,
                     "fecha_fin": fecha_fin_str,
                 },
-                "general": general if general else {},
-                "por_accion": por_accion if por_accion else [],
-                "por_origen": por_origen if por_origen else [],
-                "top_usuarios": por_usuario if por_usuario else [],
-                "actividad_diaria": diaria if diaria else [],
+                "general": general,
+                "por_accion": por_accion,
+                "por_origen": por_origen,
+                "top_usuarios": por_usuario,
+                "actividad_diaria": diaria,
                 "generado_en": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             }
 
@@ -948,33 +1443,50 @@ class AuditoriaTransaccionesModel(BaseModel):
         """
         Genera un reporte completo de auditoría
 
+        Estadísticas, tendencias y anomalías salen de una única consulta
+        agregada (_obtener_agregados). El formato "detallado" hace una
+        segunda lectura, acotada por índice, de como máximo
+        LIMITE_DETALLE_REPORTE registros del período: no es el listado
+        completo si el período tiene más.
+
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
             formato: Formato del reporte (detallado, resumen, csv)
 
         Returns:
-            Dict[str, Any]: Reporte de auditoría
+            Dict[str, Any]: Reporte de auditoría. registros_detallados_limite
+            indica el máximo de registros del detalle y
+            registros_detallados_truncado si el período tiene más registros
+            que los incluidos
         """
         try:
             fecha_inicio_str = self._formatear_fecha_consulta(fecha_inicio)
             fecha_fin_str = self._formatear_fecha_consulta(fecha_fin, es_fin=True)
 
-            # Obtener estadísticas
-            estadisticas = self.obtener_estadisticas(fecha_inicio, fecha_fin)
+            agregados = self._obtener_agregados(fecha_inicio, fecha_fin)
+            if agregados is None:
+                return {"error": "No se pudieron calcular los agregados de auditoría"}
+
+            estadisticas = self.obtener_estadisticas(
+                fecha_inicio, fecha_fin, agregados=agregados
+            )
 
             # Obtener registros detallados si se solicita
             registros_detallados = []
             if formato == "detallado":
                 registros_detallados = self.buscar_por_rango_fechas(
-                    fecha_inicio, fecha_fin, limit=1000
+                    fecha_inicio, fecha_fin, limit=self.LIMITE_DETALLE_REPORTE
                 )
+            total_registros = estadisticas.get("general", {}).get("total_registros", 0)
 
-            # Calcular tendencias
-            tendencias = self._calcular_tendencias(fecha_inicio, fecha_fin)
+            tendencias = self._calcular_tendencias(
+                fecha_inicio, fecha_fin, agregados=agregados
+            )
 
-            # Identificar anomalías
-            anomalias = self._identificar_anomalias(fecha_inicio, fecha_fin)
+            anomalias = self._identificar_anomalias(
+                fecha_inicio, fecha_fin, agregados=agregados
+            )
 
             return {
                 "metadatos": {
@@ -990,6 +1502,11 @@ class AuditoriaTransaccionesModel(BaseModel):
                 "registros_detallados": (
                     registros_detallados if formato == "detallado" else []
                 ),
+                "registros_detallados_limite": self.LIMITE_DETALLE_REPORTE,
+                "registros_detallados_truncado": (
+                    formato == "detallado"
+                    and total_registros > len(registros_detallados)
+                ),
                 "resumen_ejecutivo": self._generar_resumen_ejecutivo(
                     estadisticas, anomalias
                 ),
@@ -1003,6 +1520,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         self,
         fecha_inicio: Union[str, datetime, date],
         fecha_fin: Union[str, datetime, date],
+        agregados: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> Dict[str, Any]:
         """
         Calcula tendencias de actividad de auditoría
@@ -1010,59 +1528,30 @@ class AuditoriaTransaccionesModel(BaseModel):
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
+            agregados: Resultado previo de _obtener_agregados (evita recalcular)
 
         Returns:
             Dict[str, Any]: Tendencias identificadas
         """
         try:
-            # Implementación simplificada
-            # En una implementación real, usarías análisis más sofisticado
-
-            fecha_inicio_dt = (
-                datetime.strptime(fecha_inicio, "%Y-%m-%d")
-                if isinstance(fecha_inicio, str)
-                else fecha_inicio
+            fecha_inicio_dt = datetime.strptime(
+                self._formatear_fecha_consulta(fecha_inicio)[:10], "%Y-%m-%d"
             )
-            fecha_fin_dt = (
-                datetime.strptime(fecha_fin, "%Y-%m-%d")
-                if isinstance(fecha_fin, str)
-                else fecha_fin
+            fecha_fin_dt = datetime.strptime(
+                self._formatear_fecha_consulta(fecha_fin)[:10], "%Y-%m-%d"
             )
 
-            # dias_periodo = (fecha_fin_dt - fecha_inicio_dt).days + 1
-            if isinstance(fecha_inicio_dt, date) and not isinstance(
-                fecha_inicio_dt, datetime
-            ):
-                fecha_inicio_dt = datetime.combine(fecha_inicio_dt, datetime.min.time())
-            if isinstance(fecha_fin_dt, date) and not isinstance(
-                fecha_fin_dt, datetime
-            ):
-                fecha_fin_dt = datetime.combine(fecha_fin_dt, datetime.min.time())
-
             dias_periodo = (fecha_fin_dt - fecha_inicio_dt).days + 1
 
-            # Consulta para actividad diaria
-            query = f"""
-                SELECT 
-                    DATE(fecha_hora) as fecha,
-                    COUNT(*) as registros,
-                    SUM(CASE WHEN accion IN ('ELIMINACION', 'ANULACION') THEN 1 ELSE 0 END) as criticas
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                GROUP BY DATE(fecha_hora)
-                ORDER BY fecha
-            """
-
-            fecha_inicio_str = self._formatear_fecha_consulta(fecha_inicio)
-            fecha_fin_str = self._formatear_fecha_consulta(fecha_fin, es_fin=True)
-
-            resultados = self.fetch_all(query, (fecha_inicio_str, fecha_fin_str))
+            if agregados is None:
+                agregados = self._obtener_agregados(fecha_inicio, fecha_fin)
 
+            resultados = (agregados or {}).get("dia", [])
             if not resultados:
                 return {}
 
             # Calcular promedios y tendencias
-            total_registros = sum(r["registros"] for r in resultados)
+            total_registros = sum(r["cantidad"] for r in resultados)
             total_criticas = sum(r["criticas"] for r in resultados)
 
             promedio_diario = total_registros / dias_periodo if dias_periodo > 0 else 0
@@ -1074,15 +1563,13 @@ class AuditoriaTransaccionesModel(BaseModel):
                 "total_dias": dias_periodo,
                 "promedio_diario": round(promedio_diario, 2),
                 "porcentaje_acciones_criticas": round(porcentaje_criticas, 2),
-                "pico_actividad": (
-                    max(r["registros"] for r in resultados) if resultados else 0
-                ),
+                "pico_actividad": max(r["cantidad"] for r in resultados),
                 "actividad_consistente": (
                     all(
-                        abs(r["registros"] - promedio_diario) < (promedio_diario * 0.5)
+                        abs(r["cantidad"] - promedio_diario) < (promedio_diario * 0.5)
                         for r in resultados
                     )
-                    if resultados and promedio_diario > 0
+                    if promedio_diario > 0
                     else True
                 ),
             }
@@ -1095,6 +1582,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         self,
         fecha_inicio: Union[str, datetime, date],
         fecha_fin: Union[str, datetime, date],
+        agregados: Optional[Dict[str, List[Dict[str, Any]]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Identifica anomalías en los registros de auditoría
@@ -1102,6 +1590,7 @@ class AuditoriaTransaccionesModel(BaseModel):
         Args:
             fecha_inicio: Fecha de inicio
             fecha_fin: Fecha de fin
+            agregados: Resultado previo de _obtener_agregados (evita recalcular)
 
         Returns:
             List[Dict[str, Any]]: Lista de anomalías identificadas
@@ -1109,85 +1598,55 @@ class AuditoriaTransaccionesModel(BaseModel):
         anomalias = []
 
         try:
-            fecha_inicio_str = self._formatear_fecha_consulta(fecha_inicio)
-            fecha_fin_str = self._formatear_fecha_consulta(fecha_fin, es_fin=True)
-
-            # 1. Múltiples eliminaciones por mismo usuario en poco tiempo
-            query_eliminaciones = f"""
-                SELECT 
-                    usuario_id,
-                    COUNT(*) as cantidad,
-                    MIN(fecha_hora) as primera,
-                    MAX(fecha_hora) as ultima
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                  AND accion = 'ELIMINACION'
-                GROUP BY usuario_id
-                HAVING COUNT(*) > 3
-            """
-
-            elims = self.fetch_all(
-                query_eliminaciones, (fecha_inicio_str, fecha_fin_str)
-            )
-
-            for elim in elims or []:
-                anomalias.append(
-                    {
-                        "tipo": "ELIMINACIONES_MULTIPLES",
-                        "severidad": "ALTA",
-                        "descripcion": f"Usuario {elim['usuario_id']} realizó {elim['cantidad']} eliminaciones",
-                        "detalles": elim,
-                    }
-                )
-
-            # 2. Actividad fuera de horario laboral (simplificado)
-            query_nocturna = f"""
-                SELECT 
-                    usuario_id,
-                    COUNT(*) as cantidad
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                  AND EXTRACT(HOUR FROM fecha_hora) BETWEEN 22 AND 6
-                GROUP BY usuario_id
-                HAVING COUNT(*) > 1
-            """
-
-            nocturna = self.fetch_all(query_nocturna, (fecha_inicio_str, fecha_fin_str))
-
-            for noct in nocturna or []:
-                anomalias.append(
-                    {
-                        "tipo": "ACTIVIDAD_NOCTURNA",
-                        "severidad": "MEDIA",
-                        "descripcion": f"Usuario {noct['usuario_id']} con {noct['cantidad']} acciones nocturnas",
-                        "detalles": noct,
-                    }
-                )
+            if agregados is None:
+                agregados = self._obtener_agregados(fecha_inicio, fecha_fin)
+            if agregados is None:
+                return []
 
-            # 3. Múltiples modificaciones al mismo registro
-            query_modificaciones = f"""
-                SELECT 
-                    origen_tipo,
-                    origen_id,
-                    COUNT(*) as modificaciones
-                FROM {self.table_name}
-                WHERE fecha_hora >= %s AND fecha_hora <= %s
-                  AND accion = 'MODIFICACION'
-                GROUP BY origen_tipo, origen_id
-                HAVING COUNT(*) > 5
-            """
+            # 1. Múltiples eliminaciones por mismo usuario
+            for fila in agregados["usuario"]:
+                if fila["eliminaciones"] > self.UMBRAL_ELIMINACIONES:
+                    anomalias.append(
+                        {
+                            "tipo": "ELIMINACIONES_MULTIPLES",
+                            "severidad": "ALTA",
+                            "descripcion": f"Usuario {fila['usuario_id']} realizó {fila['eliminaciones']} eliminaciones",
+                            "detalles": {
+                                "usuario_id": fila["usuario_id"],
+                                "cantidad": fila["eliminaciones"],
+                                "primera": fila["primera_eliminacion"],
+                                "ultima": fila["ultima_eliminacion"],
+                            },
+                        }
+                    )
 
-            mods = self.fetch_all(
-                query_modificaciones, (fecha_inicio_str, fecha_fin_str)
-            )
+            # 2. Actividad fuera de horario laboral (22:00 a 05:59)
+            for fila in agregados["usuario"]:
+                if fila["nocturnas"] > self.UMBRAL_NOCTURNAS:
+                    anomalias.append(
+                        {
+                            "tipo": "ACTIVIDAD_NOCTURNA",
+                            "severidad": "MEDIA",
+                            "descripcion": f"Usuario {fila['usuario_id']} con {fila['nocturnas']} acciones nocturnas",
+                            "detalles": {
+                                "usuario_id": fila["usuario_id"],
+                                "cantidad": fila["nocturnas"],
+                            },
+                        }
+                    )
 
-            for mod in mods or []:
+            # 3. Múltiples modificaciones al mismo registro (filtradas en SQL)
+            for fila in agregados["registro"]:
                 anomalias.append(
                     {
                         "tipo": "MODIFICACIONES_EXCESIVAS",
                         "severidad": "MEDIA",
-                        "descripcion": f"{mod['origen_tipo']} {mod['origen_id']} modificado {mod['modificaciones']} veces",
-                        "detalles": mod,
+                        "descripcion": f"{fila['origen_tipo']} {fila['origen_id']} modificado {fila['modificaciones']} veces",
+                        "detalles": {
+                            "origen_tipo": fila["origen_tipo"],
+                            "origen_id": fila["origen_id"],
+                            "modificaciones": fila["modificaciones"],
+                        },
                     }
                 )
 
@@ -1314,36 +1773,60 @@ class AuditoriaTransaccionesModel(BaseModel):
     # ============ MÉTODOS DE MANTENIMIENTO ============
 
     def limpiar_registros_antiguos(
-        self, dias_retener: Optional[int] = None
+        self, dias_retener: Optional[int] = None, eliminar: bool = True
     ) -> Dict[str, Any]:
         """
-        Limpia registros de auditoría más antiguos que el período de retención
+        Archiva y retira los registros de auditoría más antiguos que el
+        período de retención
+
+        La tabla está particionada por mes: en lugar de un DELETE masivo se
+        desprenden y eliminan las particiones completas anteriores a la fecha
+        límite; el mes que contiene la fecha límite se conserva completo. Las
+        filas antiguas que queden fuera de esas particiones (partición
+        DEFAULT) se eliminan en lotes acotados por el último ID archivado.
+
+        Antes de retirar nada se avanza el checkpoint de la cadena de hash y
+        se exportan las filas a archivos comprimidos con manifiesto; si la
+        exportación falla no se elimina ninguna fila.
 
         Args:
             dias_retener: Días a retener (si None, usa RETENCION_DIAS)
+            eliminar: Si es False, las particiones solo se desprenden (DETACH)
 
         Returns:
             Dict[str, Any]: Resultado de la limpieza
         """
+        from .particion_model import ParticionModel
+
         try:
             if dias_retener is None:
                 dias_retener = self.RETENCION_DIAS
 
-            fecha_limite = (datetime.now() - timedelta(days=dias_retener)).strftime(
-                "%Y-%m-%d %H:%M:%S"
+            fecha_limite_dt = datetime.now() - timedelta(days=dias_retener)
+            fecha_limite = fecha_limite_dt.strftime("%Y-%m-%d %H:%M:%S")
+
+            particion_model = ParticionModel()
+            particiones = particion_model.particiones_anteriores_a(
+                self.table_name, fecha_limite_dt
             )
 
-            # Contar registros a eliminar
-            query_count = f"""
-                SELECT COUNT(*) as total 
-                FROM {self.table_name} 
-                WHERE fecha_hora < %s
-            """
+            # Corte efectivo: inicio del mes de la fecha límite (la retención
+            # es mensual, tanto para particiones como para filas en DEFAULT)
+            corte = fecha_limite_dt.strftime("%Y-%m-01 00:00:00")
+
+            # Dejar verificada la cadena antes de retirar sus eslabones iniciales
+            self.verificar_integridad()
 
-            count_result = self.fetch_one(query_count, (fecha_limite,))
-            total_a_eliminar = count_result["total"] if count_result else 0
+            manifiesto = self._crear_backup_antes_limpieza(corte)
+            if manifiesto is None:
+                return {
+                    "eliminados": 0,
+                    "fecha_limite": fecha_limite,
+                    "backup_creado": False,
+                    "mensaje": "No se retiraron registros: falló el respaldo",
+                }
 
-            if total_a_eliminar == 0:
+            if manifiesto["total_filas"] == 0:
                 return {
                     "eliminados": 0,
                     "fecha_limite": fecha_limite,
@@ -1351,34 +1834,36 @@ class AuditoriaTransaccionesModel(BaseModel):
                 }
 
             logger.warning(
-                f"Iniciando limpieza de {total_a_eliminar} registros de auditoría "
-                f"anteriores a {fecha_limite}"
+                f"Iniciando retención de {manifiesto['total_filas']} registros de "
+                f"auditoría anteriores a {corte} ({len(particiones)} particiones)"
             )
 
-            # Crear backup de registros antiguos (en una implementación real)
-            backup_exitoso = self._crear_backup_antes_limpieza(fecha_limite)
+            resultado = particion_model.aplicar_retencion(
+                self.table_name,
+                fecha_limite_dt,
+                eliminar=eliminar,
+                id_max=manifiesto["id_max"],
+            )
+            eliminados_lotes = resultado["filas_default"]
 
-            # Eliminar registros
-            query_delete = f"DELETE FROM {self.table_name} WHERE fecha_hora < %s"
-            eliminados = self.execute_query(query_delete, (fecha_limite,), commit=True)
+            eliminados = resultado["filas_retiradas"] + eliminados_lotes
 
-            if eliminados:
-                logger.warning(
-                    f"✓ Limpieza completada: {eliminados} registros eliminados"
-                )
+            logger.warning(
+                f"✓ Limpieza completada: {eliminados} registros "
+                f"({len(resultado['particiones_retiradas'])} particiones "
+                f"{resultado['modo']}, {eliminados_lotes} por lotes)"
+            )
 
-                return {
-                    "eliminados": eliminados,
-                    "fecha_limite": fecha_limite,
-                    "backup_creado": backup_exitoso,
-                    "mensaje": f"Se eliminaron {eliminados} registros anteriores a {fecha_limite}",
-                }
-            else:
-                return {
-                    "eliminados": 0,
-                    "fecha_limite": fecha_limite,
-                    "mensaje": "No se pudieron eliminar los registros",
-                }
+            return {
+                "eliminados": eliminados,
+                "fecha_limite": fecha_limite,
+                "fecha_corte": corte,
+                "backup_creado": True,
+                "manifiesto": manifiesto["ruta_manifiesto"],
+                "particiones_retiradas": resultado["particiones_retiradas"],
+                "particiones_conservadas": resultado["particiones_conservadas"],
+                "mensaje": f"Se retiraron {eliminados} registros anteriores a {corte}",
+            }
 
         except Exception as e:
             logger.error(f"Error en limpieza de registros antiguos: {e}")
@@ -1388,75 +1873,123 @@ class AuditoriaTransaccionesModel(BaseModel):
                 "mensaje": "Error durante la limpieza",
             }
 
-    def _crear_backup_antes_limpieza(self, fecha_limite: str) -> bool:
+    def _crear_backup_antes_limpieza(
+        self, fecha_limite: str, formato: str = "jsonl", compresion: str = "gzip"
+    ) -> Optional[Dict[str, Any]]:
         """
-        Crea backup de registros antes de limpiar (implementación de ejemplo)
+        Exporta los registros anteriores a fecha_limite antes de depurarlos
+
+        La exportación se hace en streaming (cursor del servidor) a archivos
+        comprimidos en RUTA_ARCHIVO, con un manifiesto de checksums que se
+        verifica antes de dar el respaldo por bueno.
 
         Args:
             fecha_limite: Fecha límite para los registros a respaldar
+            formato: "jsonl" o "csv"
+            compresion: "gzip" o "zstd"
 
         Returns:
-            bool: True si el backup fue exitoso
+            Optional[Dict]: Manifiesto del respaldo o None si falló
         """
-        try:
-            # En una implementación real, exportarías a archivo o tabla de backup
-            logger.info(f"Backup simulado para registros anteriores a {fecha_limite}")
-
-            # Ejemplo: Exportar a archivo JSON
-            query_backup = f"""
-                SELECT * FROM {self.table_name} 
-                WHERE fecha_hora < %s 
-                ORDER BY fecha_hora
-            """
-
-            registros = self.fetch_all(query_backup, (fecha_limite,))
+        from .archivador_model import ArchivadorModel
 
-            if registros:
-                # Crear nombre de archivo con timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                nombre_archivo = f"backup_auditoria_{timestamp}.json"
+        try:
+            archivador = ArchivadorModel()
+            manifiesto = archivador.exportar(
+                self.table_name,
+                "fecha_hora < %s",
+                (fecha_limite,),
+                self.RUTA_ARCHIVO,
+                formato=formato,
+                compresion=compresion,
+            )
 
-                # Exportar a JSON (simulado)
-                datos_backup = {
-                    "fecha_backup": datetime.now().isoformat(),
-                    "fecha_limite": fecha_limite,
-                    "total_registros": len(registros),
-                    "registros": registros,
-                }
+            if manifiesto is None:
+                return None
 
-                # En una implementación real, guardarías el archivo
-                logger.info(
-                    f"Backup simulado: {len(registros)} registros en {nombre_archivo}"
+            verificacion = archivador.verificar_manifiesto(
+                manifiesto["ruta_manifiesto"]
+            )
+            if not verificacion["valido"]:
+                logger.error(
+                    f"Respaldo de auditoría con errores: {verificacion['errores']}"
                 )
+                return None
 
-                return True
-            else:
-                logger.info("No hay registros para respaldar")
-                return True
+            logger.info(
+                f"Respaldo de {manifiesto['total_filas']} registros anteriores a "
+                f"{fecha_limite}: {manifiesto['ruta_manifiesto']}"
+            )
+            return manifiesto
 
         except Exception as e:
             logger.error(f"Error creando backup: {e}")
-            return False
+            return None
 
-    def verificar_integridad(self) -> Dict[str, Any]:
+    def verificar_integridad(
+        self, desde_checkpoint: bool = True, tamano_lote: int = 5000
+    ) -> Dict[str, Any]:
         """
         Verifica la integridad de los registros de auditoría
 
+        Recorre la cadena de hash por lotes (paginación por ID) a partir del
+        último checkpoint verificado, de modo que cada ejecución solo revisa
+        los registros nuevos. Si la cadena es válida se guarda un checkpoint
+        nuevo.
+
+        Args:
+            desde_checkpoint: Si es False, verifica la cadena completa
+            tamano_lote: Registros leídos por consulta
+
         Returns:
             Dict[str, Any]: Resultado de la verificación de integridad
         """
         try:
             verificaciones = []
 
-            # 1. Verificar usuarios existentes
+            checkpoint = self.obtener_ultimo_checkpoint() if desde_checkpoint else None
+            desde_id = checkpoint["ultimo_id"] if checkpoint else 0
+
+            # 1. Verificar cadena de hash
+            cadena = self._verificar_cadena(
+                desde_id,
+                checkpoint["ultimo_hash"] if checkpoint else None,
+                tamano_lote,
+            )
+
+            if cadena["rotos"]:
+                estado_cadena = "ERROR"
+                detalles_cadena = (
+                    f"{len(cadena['rotos'])} registros con hash inválido "
+                    f"(primero: ID {cadena['rotos'][0]})"
+                )
+            elif cadena["sin_hash"]:
+                estado_cadena = "ADVERTENCIA"
+                detalles_cadena = (
+                    f"{cadena['verificados']} registros verificados, "
+                    f"{cadena['sin_hash']} registros sin encadenar"
+                )
+            else:
+                estado_cadena = "OK"
+                detalles_cadena = f"{cadena['verificados']} registros verificados"
+
+            verificaciones.append(
+                {
+                    "nombre": "Cadena de hash",
+                    "estado": estado_cadena,
+                    "detalles": detalles_cadena,
+                }
+            )
+
+            # 2. Verificar usuarios existentes (solo registros nuevos)
             query_usuarios_invalidos = f"""
                 SELECT COUNT(*) as cantidad
                 FROM {self.table_name} a
                 LEFT JOIN usuarios u ON a.usuario_id = u.id
-                WHERE u.id IS NULL
+                WHERE a.id > %s AND u.id IS NULL
             """
 
-            usuarios_inv = self.fetch_one(query_usuarios_invalidos)
+            usuarios_inv = self.fetch_one(query_usuarios_invalidos, (desde_id,))
             usuarios_invalidos = usuarios_inv["cantidad"] if usuarios_inv else 0
 
             verificaciones.append(
@@ -1467,32 +2000,16 @@ class AuditoriaTransaccionesModel(BaseModel):
                 }
             )
 
-            # 2. Verificar duplicados por índice único
-            query_duplicados = f"""
-                SELECT COUNT(*) - COUNT(DISTINCT fecha_hora, accion) as duplicados
-                FROM {self.table_name}
-            """
-
-            dup_result = self.fetch_one(query_duplicados)
-            duplicados = dup_result["duplicados"] if dup_result else 0
-
-            verificaciones.append(
-                {
-                    "nombre": "Índices únicos",
-                    "estado": "OK" if duplicados == 0 else "ADVERTENCIA",
-                    "detalles": f"{duplicados} posibles violaciones de unicidad",
-                }
-            )
-
-            # 3. Verificar fechas válidas
+            # 3. Verificar fechas válidas (solo registros nuevos)
             query_fechas_invalidas = f"""
                 SELECT COUNT(*) as cantidad
                 FROM {self.table_name}
-                WHERE fecha_hora > CURRENT_TIMESTAMP + INTERVAL '1 day'
-                   OR fecha_hora < '2000-01-01'
+                WHERE id > %s
+                  AND (fecha_hora > CURRENT_TIMESTAMP + INTERVAL '1 day'
+                       OR fecha_hora < '2000-01-01')
             """
 
-            fechas_inv = self.fetch_one(query_fechas_invalidas)
+            fechas_inv = self.fetch_one(query_fechas_invalidas, (desde_id,))
             fechas_invalidas = fechas_inv["cantidad"] if fechas_inv else 0
 
             verificaciones.append(
@@ -1507,8 +2024,23 @@ class AuditoriaTransaccionesModel(BaseModel):
             total_ok = sum(1 for v in verificaciones if v["estado"] == "OK")
             total_error = sum(1 for v in verificaciones if v["estado"] == "ERROR")
 
+            # Guardar checkpoint si la cadena avanzó sin errores
+            nuevo_checkpoint = None
+            if (
+                not cadena["rotos"]
+                and cadena["ultimo_id"]
+                and cadena["ultimo_id"] > desde_id
+            ):
+                nuevo_checkpoint = self._guardar_checkpoint(
+                    cadena["ultimo_id"], cadena["ultimo_hash"], cadena["verificados"]
+                )
+
             return {
                 "fecha_verificacion": datetime.now().isoformat(),
+                "desde_id": desde_id,
+                "checkpoint_anterior": checkpoint,
+                "checkpoint_nuevo": nuevo_checkpoint,
+                "registros_rotos": cadena["rotos"][:100],
                 "total_verificaciones": len(verificaciones),
                 "verificaciones_ok": total_ok,
                 "verificaciones_error": total_error,
@@ -1520,6 +2052,117 @@ class AuditoriaTransaccionesModel(BaseModel):
             logger.error(f"Error verificando integridad: {e}")
             return {"error": str(e), "estado_general": "ERROR"}
 
+    def _verificar_cadena(
+        self, desde_id: int, hash_anterior: Optional[str], tamano_lote: int
+    ) -> Dict[str, Any]:
+        """
+        Recalcula la cadena de hash desde un ID dado
+
+        Args:
+            desde_id: Último ID ya verificado (0 para empezar desde el inicio)
+            hash_anterior: Hash del registro desde_id (None si no se conoce; en
+                ese caso se toma como ancla el prev_hash del primer registro)
+            tamano_lote: Registros leídos por consulta
+
+        Returns:
+            Dict: verificados, sin_hash, rotos (IDs), ultimo_id, ultimo_hash
+        """
+        columnas = ", ".join(CAMPOS_HASH + ["prev_hash", "hash"])
+        query = f"""
+            SELECT {columnas}
+            FROM {self.table_name}
+            WHERE id > %s
+            ORDER BY id
+            LIMIT %s
+        """
+
+        resultado = {
+            "verificados": 0,
+            "sin_hash": 0,
+            "rotos": [],
+            "ultimo_id": None,
+            "ultimo_hash": hash_anterior,
+        }
+
+        ultimo_id = desde_id
+        prev = hash_anterior
+
+        while True:
+            filas = self.fetch_all(query, (ultimo_id, tamano_lote))
+            if not filas:
+                break
+
+            for fila in filas:
+                ultimo_id = fila["id"]
+
+                if not fila.get("hash"):
+                    # Registros anteriores a la cadena de hash
+                    resultado["sin_hash"] += 1
+                    continue
+
+                if prev is None:
+                    prev = fila["prev_hash"]
+
+                esperado = calcular_hash_registro(fila, prev)
+                if fila["prev_hash"] != prev or fila["hash"] != esperado:
+                    resultado["rotos"].append(fila["id"])
+                else:
+                    resultado["verificados"] += 1
+                    if not resultado["rotos"]:
+                        resultado["ultimo_id"] = fila["id"]
+                        resultado["ultimo_hash"] = fila["hash"]
+
+                # Continuar la cadena con el hash almacenado para localizar
+                # cada registro alterado y no solo el primero
+                prev = fila["hash"]
+
+            if len(filas) < tamano_lote:
+                break
+
+        return resultado
+
+    def obtener_ultimo_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Obtiene el último checkpoint de verificación de la cadena"""
+        try:
+            query = """
+                SELECT id, ultimo_id, ultimo_hash, registros_verificados, created_at
+                FROM auditoria_checkpoints
+                ORDER BY ultimo_id DESC
+                LIMIT 1
+            """
+            return self.fetch_one(query)
+        except Exception as e:
+            logger.warning(f"No se pudo obtener checkpoint de auditoría: {e}")
+            return None
+
+    def _guardar_checkpoint(
+        self, ultimo_id: int, ultimo_hash: str, registros_verificados: int
+    ) -> Optional[Dict[str, Any]]:
+        """Registra un checkpoint tras una verificación exitosa"""
+        try:
+            query = """
+                INSERT INTO auditoria_checkpoints
+                    (ultimo_id, ultimo_hash, registros_verificados)
+                VALUES (%s, %s, %s)
+                RETURNING id
+            """
+            result = self.fetch_one(
+                query, (ultimo_id, ultimo_hash, registros_verificados)
+            )
+            if not result:
+                return None
+            self.commit()
+
+            return {
+                "id": result["id"],
+                "ultimo_id": ultimo_id,
+                "ultimo_hash": ultimo_hash,
+                "registros_verificados": registros_verificados,
+            }
+        except Exception as e:
+            logger.warning(f"No se pudo guardar checkpoint de auditoría: {e}")
+            return None
+
     # ============ MÉTODOS DE UTILIDAD PARA OTROS MÓDULOS ============
 
     @staticmethod
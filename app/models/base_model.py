@@ -2,15 +2,24 @@
 from datetime import datetime
 import sys
 import os
+import re
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional, Tuple, Union, TypeVar, Generic
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from app.database.connection import DatabaseConnection
+from app.database.instrumentacion import instrumentacion
+from app.database.sentencias_preparadas import sentencias_preparadas
+from app.models.cargador_registros import cargador_activo
+from app.utils.exceptions import TransactionRolledBackException
 import threading
+import time
 
 import logging
 
@@ -18,6 +27,62 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Nombre de columna admitido en las proyecciones (columns=)
+_RE_COLUMNA = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class _Transaccion:
+    """
+    Transacción abierta con BaseModel.transaction()
+
+    Todos los modelos del mismo hilo usan su conexión mientras está abierta.
+    Cada nivel anidado es un SAVEPOINT; necesita_rollback marca los niveles
+    que se revirtieron con rollback() o por un error de consulta.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.savepoints: List[str] = []
+        self.necesita_rollback: List[bool] = [False]
+
+    def _ejecutar(self, sql: str) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql)
+
+    def abrir_savepoint(self) -> str:
+        nombre = f"sp_formagest_{len(self.savepoints) + 1}"
+        self._ejecutar(f"SAVEPOINT {nombre}")
+        self.savepoints.append(nombre)
+        self.necesita_rollback.append(False)
+        return nombre
+
+    def cerrar_savepoint(self, revertir: bool) -> None:
+        nombre = self.savepoints.pop()
+        revertir = self.necesita_rollback.pop() or revertir
+        if revertir:
+            self._ejecutar(f"ROLLBACK TO SAVEPOINT {nombre}")
+            sentencias_preparadas.fin_transaccion(self.connection)
+        self._ejecutar(f"RELEASE SAVEPOINT {nombre}")
+
+    def revertir(self) -> None:
+        """
+        Revierte el nivel actual y lo marca para terminar en rollback
+
+        En el nivel exterior el rollback es inmediato (la conexión queda
+        utilizable) y al salir se vuelve a revertir lo ejecutado después.
+        """
+        if self.savepoints:
+            self._ejecutar(f"ROLLBACK TO SAVEPOINT {self.savepoints[-1]}")
+        else:
+            self.connection.rollback()
+        sentencias_preparadas.fin_transaccion(self.connection)
+        self.necesita_rollback[-1] = True
+
+
+_transaccion_actual: ContextVar[Optional[_Transaccion]] = ContextVar(
+    "transaccion_actual", default=None
+)
+
 
 class BaseModel:
     """Clase base para todos los modelos que maneja la conexión a la base de datos"""
@@ -30,6 +95,10 @@ class BaseModel:
     table_name = None
     primary_key = "id"
 
+    # Conjuntos de columnas por vista, p. ej. {"lista": ("id", "nombres")};
+    # se piden con columns="lista" en los métodos de consulta
+    column_sets: Dict[str, Tuple[str, ...]] = {}
+
     @classmethod
     def _get_connection_pool(cls):
         """Obtiene o crea el pool de conexiones"""
@@ -133,25 +202,39 @@ class BaseModel:
             self.cursor = None
             self.connection = None
 
+    def _conexion_activa(self):
+        """Conexión de transaction() si hay una abierta, si no la del modelo"""
+        transaccion = _transaccion_actual.get()
+        if transaccion is not None:
+            return transaccion.connection
+        return self.connection
+
     def _get_cursor(self, dict_cursor=False):
-        """Obtiene un cursor nuevo"""
-        if not self.connection:
+        """Obtiene un cursor nuevo (en la conexión de transaction() si hay una abierta)"""
+        if _transaccion_actual.get() is None and not self.connection:
             self._connect()
             if not self.connection:
                 return None
+        connection = self._conexion_activa()
 
         try:
             if dict_cursor:
-                self.cursor = self.connection.cursor(cursor_factory=RealDictCursor)
+                self.cursor = connection.cursor(cursor_factory=RealDictCursor)
             else:
-                self.cursor = self.connection.cursor()
+                self.cursor = connection.cursor()
             return self.cursor
         except Exception as e:
             print(f"✗ Error obteniendo cursor: {e}")
             return None
 
     def execute_query(
-        self, query, params=None, fetch=True, commit=False, dict_cursor=True
+        self,
+        query,
+        params=None,
+        fetch=True,
+        commit=False,
+        dict_cursor=True,
+        prepared=False,
     ):
         """
         Ejecuta una consulta SQL de forma segura
@@ -162,6 +245,8 @@ class BaseModel:
             fetch (bool): Si es True, retorna resultados (para SELECT)
             commit (bool): Si es True, hace commit de la transacción
             dict_cursor (bool): Si es True, retorna resultados como diccionarios
+            prepared (bool): Si es True, usa una sentencia preparada en la
+                conexión (PREPARE/EXECUTE); para consultas frecuentes
 
         Returns:
             - Para SELECT: Lista de diccionarios o tuplas con resultados
@@ -170,6 +255,9 @@ class BaseModel:
             - None en caso de error
         """
         cursor = None
+        inicio = None
+        filas = None
+        error = None
         try:
             # Obtener cursor
             cursor = self._get_cursor(dict_cursor)
@@ -177,14 +265,19 @@ class BaseModel:
                 return None
 
             # Ejecutar consulta
-            if params:
+            inicio = time.perf_counter()
+            if prepared and sentencias_preparadas.ejecutar(cursor, query, params):
+                pass
+            elif params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
+            filas = cursor.rowcount
 
             # Procesar resultados
             if fetch and cursor.description:  # Es un SELECT que retorna datos
                 results = cursor.fetchall()
+                filas = len(results)
 
                 if dict_cursor:
                     return results  # Ya son diccionarios por RealDictCursor
@@ -221,17 +314,14 @@ class BaseModel:
                 return rowcount
 
         except Exception as e:
+            error = e
             print(f"✗ Error ejecutando consulta: {e}")
             print(f"  Consulta: {query}")
             if params:
                 print(f"  Parámetros: {params}")
 
-            # Rollback en caso de error
-            if self.connection:
-                try:
-                    self.connection.rollback()
-                except:
-                    pass
+            # Rollback en caso de error (dentro de transaction(), del nivel actual)
+            self.rollback()
 
             return None
 
@@ -244,20 +334,30 @@ class BaseModel:
                     pass
                 self.cursor = None
 
+            # Registrar duración, filas y origen de la consulta
+            if inicio is not None:
+                instrumentacion.registrar(
+                    query, inicio, filas, error, self._conexion_activa(), params
+                )
+
     # ============ MÉTODOS CONVENCIONALES ============
 
-    def fetch_one(self, query, params=None, dict_cursor=True):
+    def fetch_one(self, query, params=None, dict_cursor=True, prepared=False):
         """
         Ejecuta una consulta y retorna solo el primer resultado
         """
-        results = self.execute_query(query, params, fetch=True, dict_cursor=dict_cursor)
+        results = self.execute_query(
+            query, params, fetch=True, dict_cursor=dict_cursor, prepared=prepared
+        )
         return results[0] if results else None
 
-    def fetch_all(self, query, params=None, dict_cursor=True):
+    def fetch_all(self, query, params=None, dict_cursor=True, prepared=False):
         """
         Ejecuta una consulta y retorna todos los resultados
         """
-        return self.execute_query(query, params, fetch=True, dict_cursor=dict_cursor)
+        return self.execute_query(
+            query, params, fetch=True, dict_cursor=dict_cursor, prepared=prepared
+        )
 
     def fetch_scalar(self, query, params=None):
         """
@@ -317,6 +417,7 @@ class BaseModel:
         if not data:
             return 0
 
+        self._invalidar_cargador(table)
         try:
             set_clause = ", ".join([f"{key} = %s" for key in data.keys()])
             set_values = tuple(data.values())
@@ -347,6 +448,7 @@ class BaseModel:
         Returns:
             Número de filas afectadas o None en caso de error
         """
+        self._invalidar_cargador(table)
         try:
             query = f"DELETE FROM {table} WHERE {condition}"
             return self.execute_query(query, params, fetch=False, commit=True)
@@ -355,10 +457,477 @@ class BaseModel:
             print(f"✗ Error eliminando de tabla {table}: {e}")
             return None
 
+    def insert_checked(
+        self,
+        data: Dict[str, Any],
+        referencias=(),
+        mensajes_restriccion: Optional[Dict[str, str]] = None,
+        returning: str = "id",
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Inserta un registro en self.table_name en una sola ida y vuelta
+
+        En lugar de consultar antes cada clave foránea, la sentencia confía
+        en las restricciones de la tabla (FK, UNIQUE, CHECK y triggers) y
+        agrega un EXISTS por cada referencia con condiciones que una FK no
+        expresa (ej. activo = TRUE). Los valores se tipan con el tipo de fila
+        de la tabla mediante jsonb_populate_record.
+
+        Solo si el INSERT no inserta nada se hace una segunda consulta para
+        saber qué referencia faltó.
+
+        Args:
+            data: Columnas y valores a insertar
+            referencias: Pares (campo, referencia) con atributos tabla,
+                columna, condicion y mensaje (ver app.utils.validators.Referencia)
+            mensajes_restriccion: Mensaje por nombre de restricción; admite
+                los campos de data (ej. "Programa con ID {programa_id} no existe")
+            returning: Columna a retornar
+
+        Returns:
+            Tuple: (valor_retornado, None) o (None, mensaje_error)
+        """
+        if not data:
+            return None, "No hay datos para insertar"
+
+        columnas = list(data)
+        exists = [
+            (campo, referencia, self._sql_exists_referencia(referencia, f"r.{campo}"))
+            for campo, referencia in referencias
+            if data.get(campo)
+        ]
+
+        query = f"""
+        INSERT INTO {self.table_name} ({', '.join(columnas)})
+        SELECT {', '.join(f"r.{c}" for c in columnas)}
+        FROM jsonb_populate_record(NULL::{self.table_name}, %s) AS r
+        """
+        if exists:
+            query += " WHERE " + " AND ".join(sql for _, _, sql in exists)
+        query += f" RETURNING {returning}"
+        params = (Json(data, dumps=lambda d: json.dumps(d, default=str)),)
+
+        cursor = self._get_cursor(dict_cursor=True)
+        if not cursor:
+            return None, "No hay conexión a la base de datos"
+
+        inicio = time.perf_counter()
+        filas = None
+        error = None
+        try:
+            cursor.execute(query, params)
+            fila = cursor.fetchone()
+            filas = cursor.rowcount
+            self.commit()
+        except psycopg2.Error as e:
+            error = e
+            self.rollback()
+            return None, self._mensaje_restriccion(e, data, mensajes_restriccion)
+        finally:
+            cursor.close()
+            self.cursor = None
+            instrumentacion.registrar(
+                query, inicio, filas, error, self._conexion_activa(), params
+            )
+
+        if fila is not None:
+            return fila[returning], None
+
+        if not exists:
+            return None, "No se pudo insertar el registro"
+
+        # Alguna referencia no existe (o no cumple su condición)
+        resultado = self.fetch_one(
+            "SELECT "
+            + ", ".join(
+                f"{self._sql_exists_referencia(referencia, '%s')} AS r{i}"
+                for i, (_, referencia, _) in enumerate(exists)
+            ),
+            tuple(data[campo] for campo, _, _ in exists),
+        )
+        self.commit()
+        for i, (campo, referencia, _) in enumerate(exists):
+            if resultado and not resultado[f"r{i}"]:
+                return None, referencia.mensaje.format(valor=data[campo])
+        return None, "No se pudo insertar el registro"
+
+    @staticmethod
+    def _sql_exists_referencia(referencia, valor_sql: str) -> str:
+        """EXISTS que comprueba una referencia contra valor_sql (columna o %s)"""
+        sql = f"EXISTS (SELECT 1 FROM {referencia.tabla} WHERE {referencia.columna} = {valor_sql}"
+        if referencia.condicion:
+            sql += f" AND {referencia.condicion}"
+        return sql + ")"
+
+    @staticmethod
+    def _mensaje_restriccion(
+        error: psycopg2.Error,
+        data: Dict[str, Any],
+        mensajes_restriccion: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Traduce una violación de restricción al mensaje del modelo"""
+        diag = getattr(error, "diag", None)
+        restriccion = getattr(diag, "constraint_name", None)
+        plantilla = (mensajes_restriccion or {}).get(restriccion)
+        if plantilla:
+            try:
+                return plantilla.format(**data)
+            except (KeyError, IndexError):
+                return plantilla
+        return getattr(diag, "message_primary", None) or str(error).strip()
+
+    # ============ ESCRITURA POR LOTES ============
+
+    # Tipos SQL de las columnas por tabla (plantillas de update_many)
+    _tipos_columnas: Dict[str, Dict[str, str]] = {}
+
+    def insert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        returning: str = None,  # type: ignore
+        page_size: int = 500,
+        commit: bool = True,
+    ):
+        """
+        Inserta varias filas con execute_values (una sentencia por página)
+
+        Args:
+            table (str): Nombre de la tabla
+            rows (list): Filas a insertar (dicts con las mismas columnas)
+            returning (str): Columna(s) a retornar, ej. "id"
+            page_size (int): Filas por sentencia
+            commit (bool): Si es False, deja la transacción abierta para
+                confirmarla junto con otras escrituras
+
+        Returns:
+            - Con returning: lista con un valor por fila, en el orden de rows
+              (un dict por fila si returning tiene varias columnas)
+            - Sin returning: número de filas insertadas
+            - None en caso de error (la transacción se revierte)
+        """
+        if not rows:
+            return [] if returning else 0
+
+        columnas = self._columnas_lote(rows)
+        query = f"INSERT INTO {table} ({', '.join(columnas)}) VALUES %s"
+        if returning:
+            query += f" RETURNING {returning}"
+
+        valores = [tuple(row[c] for c in columnas) for row in rows]
+        return self._ejecutar_lote(table, query, valores, None, returning, page_size, commit)
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        conflict_target: Union[str, List[str], Tuple[str, ...]],
+        update_columns: Union[List[str], Tuple[str, ...]] = None,  # type: ignore
+        returning: str = None,  # type: ignore
+        page_size: int = 500,
+        commit: bool = True,
+    ):
+        """
+        Inserta o actualiza varias filas con INSERT ... ON CONFLICT
+
+        Args:
+            table (str): Nombre de la tabla
+            rows (list): Filas (dicts con las mismas columnas)
+            conflict_target: Columna(s) de la restricción única, ej. "clave"
+            update_columns: Columnas a actualizar si la fila existe (None para
+                todas las que no son del conflicto; vacío para DO NOTHING)
+            returning (str): Columna(s) a retornar
+            page_size (int): Filas por sentencia
+            commit (bool): Si es False, deja la transacción abierta
+
+        Returns:
+            - Con returning: valores de las filas insertadas o actualizadas
+              (con DO NOTHING las existentes no aparecen)
+            - Sin returning: número de filas insertadas o actualizadas
+            - None en caso de error (la transacción se revierte)
+
+        Las filas repetidas según conflict_target se reducen a la última:
+        PostgreSQL no permite actualizar la misma fila dos veces en una
+        sentencia. Por eso lo retornado no sigue el orden de rows (hay una
+        entrada por clave, en la posición de su primera aparición, y faltan
+        las omitidas por DO NOTHING): para asociar cada valor a su fila,
+        incluya las columnas de conflicto en returning, ej. "clave, id".
+        """
+        if not rows:
+            return [] if returning else 0
+
+        if isinstance(conflict_target, str):
+            conflict_target = [c.strip() for c in conflict_target.split(",")]
+        columnas = self._columnas_lote(rows)
+        for columna in conflict_target:
+            if columna not in columnas:
+                raise ValueError(f"La columna de conflicto '{columna}' no está en las filas")
+
+        if update_columns is None:
+            update_columns = [c for c in columnas if c not in conflict_target]
+        self._select_list(update_columns)  # Validar nombres
+
+        if update_columns:
+            accion = "DO UPDATE SET " + ", ".join(
+                f"{c} = EXCLUDED.{c}" for c in update_columns
+            )
+        else:
+            accion = "DO NOTHING"
+
+        query = (
+            f"INSERT INTO {table} ({', '.join(columnas)}) VALUES %s "
+            f"ON CONFLICT ({', '.join(conflict_target)}) {accion}"
+        )
+        if returning:
+            query += f" RETURNING {returning}"
+
+        unicas = {tuple(row[c] for c in conflict_target): row for row in rows}
+        valores = [tuple(row[c] for c in columnas) for row in unicas.values()]
+        return self._ejecutar_lote(table, query, valores, None, returning, page_size, commit)
+
+    def update_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        key: str = "id",
+        returning: str = None,  # type: ignore
+        page_size: int = 500,
+        commit: bool = True,
+    ):
+        """
+        Actualiza varias filas con UPDATE ... FROM (VALUES ...)
+
+        Cada fila trae la clave y las columnas a modificar; todas las filas
+        deben tener las mismas columnas. Los valores se convierten al tipo de
+        la columna de destino.
+
+        Args:
+            table (str): Nombre de la tabla
+            rows (list): Filas, ej. [{"id": 1, "estado": "PAGADA"}, ...]
+            key (str): Columna que identifica la fila a actualizar
+            returning (str): Columna(s) de la tabla a retornar
+            page_size (int): Filas por sentencia
+            commit (bool): Si es False, deja la transacción abierta
+
+        Returns:
+            - Con returning: valores de las filas actualizadas
+            - Sin returning: número de filas actualizadas
+            - None en caso de error (la transacción se revierte)
+        """
+        if not rows:
+            return [] if returning else 0
+
+        columnas = self._columnas_lote(rows)
+        if key not in columnas:
+            raise ValueError(f"La columna clave '{key}' no está en las filas")
+        asignar = [c for c in columnas if c != key]
+        if not asignar:
+            return [] if returning else 0
+
+        tipos = self._tipos_de_columnas(table)
+        if tipos is None:
+            return None
+        faltantes = [c for c in columnas if c not in tipos]
+        if faltantes:
+            raise ValueError(f"Columnas inexistentes en {table}: {', '.join(faltantes)}")
+
+        template = "(" + ", ".join(f"%s::{tipos[c]}" for c in columnas) + ")"
+        query = (
+            f"UPDATE {table} AS t SET "
+            + ", ".join(f"{c} = v.{c}" for c in asignar)
+            + f" FROM (VALUES %s) AS v ({', '.join(columnas)})"
+            + f" WHERE t.{key} = v.{key}"
+        )
+        if returning:
+            query += " RETURNING " + self._select_list(
+                [c.strip() for c in returning.split(",")], alias="t"
+            )
+
+        # Una fila por clave: UPDATE ... FROM con claves repetidas aplicaría
+        # solo una de ellas, sin garantizar cuál
+        unicas = {row[key]: row for row in rows}
+        valores = [tuple(row[c] for c in columnas) for row in unicas.values()]
+        return self._ejecutar_lote(table, query, valores, template, returning, page_size, commit)
+
+    def _columnas_lote(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Columnas comunes de las filas de un lote (valida nombres y forma)"""
+        columnas = list(rows[0])
+        self._select_list(columnas)
+        for row in rows:
+            if len(row) != len(columnas) or any(c not in row for c in columnas):
+                raise ValueError("Todas las filas del lote deben tener las mismas columnas")
+        return columnas
+
+    def _tipos_de_columnas(self, table: str) -> Optional[Dict[str, str]]:
+        """
+        Tipo SQL de cada columna de la tabla (en caché por proceso)
+
+        Sin modificador de tipo (varchar, no varchar(20)): un cast explícito
+        a varchar(n) truncaría en silencio, en cambio la asignación a la
+        columna sí valida la longitud.
+        """
+        tipos = BaseModel._tipos_columnas.get(table)
+        if tipos is None:
+            filas = self.fetch_all(
+                """
+                SELECT attname, format_type(atttypid, NULL) AS tipo
+                FROM pg_attribute
+                WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+                """,
+                (table,),
+            )
+            if not filas:
+                return None
+            tipos = {fila["attname"]: fila["tipo"] for fila in filas}
+            BaseModel._tipos_columnas[table] = tipos
+        return tipos
+
+    def _ejecutar_lote(
+        self,
+        table: str,
+        query: str,
+        valores: List[tuple],
+        template: Optional[str],
+        returning: Optional[str],
+        page_size: int,
+        commit: bool,
+    ):
+        """Ejecuta una sentencia de lote página por página con execute_values"""
+        self._invalidar_cargador(table)
+
+        cursor = self._get_cursor(dict_cursor=True)
+        if not cursor:
+            return None
+
+        inicio = time.perf_counter()
+        total = 0
+        resultados = []
+        error = None
+        try:
+            for desde in range(0, len(valores), page_size):
+                pagina = valores[desde : desde + page_size]
+                filas = execute_values(
+                    cursor,
+                    query,
+                    pagina,
+                    template=template,
+                    page_size=len(pagina),
+                    fetch=bool(returning),
+                )
+                if returning:
+                    resultados.extend(filas)
+                else:
+                    total += cursor.rowcount
+
+            if commit:
+                self.commit()
+
+        except psycopg2.Error as e:
+            error = e
+            print(f"✗ Error en escritura por lotes en {table}: {e}")
+            print(f"  Consulta: {query}")
+            self.rollback()
+            return None
+
+        finally:
+            cursor.close()
+            self.cursor = None
+            instrumentacion.registrar(
+                query,
+                inicio,
+                len(resultados) if returning else total,
+                error,
+                self._conexion_activa(),
+                None,
+            )
+
+        if not returning:
+            return total
+        if resultados and len(resultados[0]) == 1:
+            return [next(iter(fila.values())) for fila in resultados]
+        return [dict(fila) for fila in resultados]
+
     # ============ MÉTODOS DE TRANSACCIÓN ============
 
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa varias escrituras en una sola transacción
+
+        Dentro del bloque todos los modelos del hilo usan la misma conexión,
+        sus commit() no confirman nada (insert, update, execute_query con
+        commit=True, insert_many...) y se confirma una vez al salir. Una
+        excepción, un rollback() o un error de consulta revierten el bloque.
+
+        Los bloques anidados son SAVEPOINTs: revertir uno interior no
+        deshace lo hecho antes por el exterior. Si el bloque exterior
+        termina revertido sin excepción (rollback() o error de consulta),
+        al salir lanza TransactionRolledBackException.
+
+        Lo que la conexión del modelo tuviera pendiente al entrar se confirma
+        antes de abrir el bloque, para que no quede dentro de él.
+
+        Ejemplo:
+            with gasto_model.transaction():
+                gasto_id = gasto_model.insert("gastos", datos)
+                MovimientoCajaModel().create(movimiento)
+        """
+        transaccion = _transaccion_actual.get()
+
+        if transaccion is not None:
+            transaccion.abrir_savepoint()
+            try:
+                yield
+            except BaseException:
+                try:
+                    transaccion.cerrar_savepoint(revertir=True)
+                except psycopg2.Error as e:
+                    # No se pudo volver al savepoint: se revierte todo al salir
+                    print(f"✗ Error revirtiendo savepoint: {e}")
+                    transaccion.necesita_rollback[0] = True
+                raise
+            transaccion.cerrar_savepoint(revertir=False)
+            return
+
+        if not self.connection:
+            self._connect()
+            if not self.connection:
+                raise RuntimeError("No hay conexión a la base de datos")
+
+        estado = self.connection.get_transaction_status()
+        if estado == psycopg2.extensions.TRANSACTION_STATUS_INERROR:
+            self.connection.rollback()
+        elif estado == psycopg2.extensions.TRANSACTION_STATUS_INTRANS:
+            self.connection.commit()
+        if estado != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            sentencias_preparadas.fin_transaccion(self.connection)
+
+        transaccion = _Transaccion(self.connection)
+        token = _transaccion_actual.set(transaccion)
+        try:
+            try:
+                yield
+            except BaseException:
+                transaccion.connection.rollback()
+                raise
+
+            if transaccion.necesita_rollback[0]:
+                transaccion.connection.rollback()
+                raise TransactionRolledBackException()
+            transaccion.connection.commit()
+        finally:
+            sentencias_preparadas.fin_transaccion(transaccion.connection)
+            _transaccion_actual.reset(token)
+
+    @staticmethod
+    def in_transaction() -> bool:
+        """True si hay un bloque transaction() abierto en este hilo"""
+        return _transaccion_actual.get() is not None
+
     def begin_transaction(self):
         """Inicia una transacción"""
+        if _transaccion_actual.get() is not None:
+            return True
         try:
             if self.connection:
                 self.connection.autocommit = False
@@ -368,20 +937,28 @@ class BaseModel:
         return False
 
     def commit(self):
-        """Confirma la transacción actual"""
+        """Confirma la transacción actual (dentro de transaction() no hace nada)"""
+        if _transaccion_actual.get() is not None:
+            return True
         try:
             if self.connection:
                 self.connection.commit()
+                sentencias_preparadas.fin_transaccion(self.connection)
                 return True
         except Exception as e:
             print(f"✗ Error confirmando transacción: {e}")
         return False
 
     def rollback(self):
-        """Revierte la transacción actual"""
+        """Revierte la transacción actual (dentro de transaction(), el nivel actual)"""
         try:
+            transaccion = _transaccion_actual.get()
+            if transaccion is not None:
+                transaccion.revertir()
+                return True
             if self.connection:
                 self.connection.rollback()
+                sentencias_preparadas.fin_transaccion(self.connection)
                 return True
         except Exception as e:
             print(f"✗ Error revirtiendo transacción: {e}")
@@ -480,6 +1057,7 @@ class BaseModel:
         if not data:
             return 0
 
+        self._invalidar_cargador(table)
         try:
             # Agregar timestamp de actualización si está habilitado
             if auto_timestamp:
@@ -532,11 +1110,7 @@ class BaseModel:
                 logger.error(f"  Parámetros: {all_params}")
 
             # Rollback en caso de error
-            if self.connection:
-                try:
-                    self.connection.rollback()
-                except:
-                    pass
+            self.rollback()
             return None
 
     def delete_rows(
@@ -564,21 +1138,70 @@ class BaseModel:
             return self.delete(table, condition, params)
         except Exception as e:
             logger.error(f"✗ Error en delete_rows para tabla {table}: {e}")
-            if self.connection:
-                try:
-                    self.connection.rollback()
-                except:
-                    pass
+            self.rollback()
             return None
 
     # ============ MÉTODOS DE BÚSQUEDA BÁSICOS ============
 
-    def get_by_id(self, record_id: int) -> Optional[Dict[str, Any]]:
+    def _select_list(
+        self,
+        columns: Union[str, List[str], Tuple[str, ...]] = None,  # type: ignore
+        alias: str = None,  # type: ignore
+    ) -> str:
+        """
+        Lista de columnas para un SELECT
+
+        Args:
+            columns: None (todas), nombre de un conjunto de column_sets o
+                secuencia de nombres de columna
+            alias: Alias de la tabla en la consulta (ej. "m" para "m.*")
+
+        Returns:
+            str: "*" / "alias.*" o las columnas separadas por comas
+
+        Raises:
+            ValueError: Si el conjunto no existe o una columna no es válida
+        """
+        prefijo = f"{alias}." if alias else ""
+        columns = self._resolver_columnas(columns)
+        if not columns:
+            return f"{prefijo}*"
+
+        for column in columns:
+            if not _RE_COLUMNA.match(column):
+                raise ValueError(f"Nombre de columna inválido: {column!r}")
+
+        return ", ".join(f"{prefijo}{column}" for column in columns)
+
+    def _resolver_columnas(
+        self, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Columnas pedidas como tupla: las de un conjunto de column_sets (si
+        columns es un nombre) o la secuencia tal cual; None si son todas
+
+        Raises:
+            ValueError: Si el conjunto no existe
+        """
+        if not columns:
+            return None
+        if isinstance(columns, str):
+            if columns not in self.column_sets:
+                raise ValueError(
+                    f"Conjunto de columnas '{columns}' no definido en {self.__class__.__name__}"
+                )
+            return tuple(self.column_sets[columns])
+        return tuple(columns)
+
+    def get_by_id(
+        self, record_id: int, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> Optional[Dict[str, Any]]:
         """
         Obtiene un registro por su ID
 
         Args:
             record_id (int): ID del registro a buscar
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             Optional[Dict]: Datos del registro o None si no existe
@@ -586,19 +1209,80 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
+
+        # Dentro de alcance_carga() el registro se memoriza y se lee junto
+        # con los IDs anticipados de la misma tabla
+        cargador = cargador_activo()
+        if cargador is not None and not columns:
+            return cargador.cargar(self, record_id)
+
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE {self.primary_key} = %s"
-            return self.fetch_one(query, (record_id,))
+            query = f"SELECT {select_list} FROM {self.table_name} WHERE {self.primary_key} = %s"
+            return self.fetch_one(query, (record_id,), prepared=True)
         except Exception as e:
             logger.error(f"✗ Error obteniendo registro por ID: {e}")
             return None
 
+    def get_by_ids(
+        self, ids, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Obtiene varios registros por ID en una sola consulta
+
+        Args:
+            ids (iterable): IDs a buscar (se ignoran None y repetidos)
+            columns: Columnas a leer (None para todas, ver _select_list); la
+                clave primaria se agrega si no está
+
+        Returns:
+            Dict: {id: registro} solo con los IDs que existen
+        """
+        if not self.table_name:
+            raise ValueError("La propiedad table_name debe ser definida en el modelo")
+
+        cargador = cargador_activo()
+        if cargador is not None and not columns:
+            return cargador.cargar_muchos(self, ids)
+
+        return self._fetch_by_ids(ids, columns) or {}
+
+    def _fetch_by_ids(
+        self, ids, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> Optional[Dict[Any, Dict[str, Any]]]:
+        """Consulta con = ANY(%s); None si la consulta falla"""
+        columns = self._resolver_columnas(columns)
+        if columns and self.primary_key not in columns:
+            columns = (self.primary_key, *columns)
+        select_list = self._select_list(columns)
+
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        if not ids:
+            return {}
+
+        try:
+            query = f"SELECT {select_list} FROM {self.table_name} WHERE {self.primary_key} = ANY(%s)"
+            rows = self.fetch_all(query, (ids,), prepared=True)
+            if rows is None:
+                return None
+            return {row[self.primary_key]: row for row in rows}
+        except Exception as e:
+            logger.error(f"✗ Error obteniendo registros por IDs: {e}")
+            return None
+
+    def _invalidar_cargador(self, table: str) -> None:
+        """Descarta los registros memorizados de la tabla en el alcance actual"""
+        cargador = cargador_activo()
+        if cargador is not None:
+            cargador.invalidar(table)
+
     def get_all_records(
         self,
         limit: int = 100,
         offset: int = 0,
         order_by: str = None,  # type: ignore
         order_desc: bool = True,
+        columns: Union[str, List[str], Tuple[str, ...]] = None,  # type: ignore
     ) -> List[Dict[str, Any]]:
         """
         Obtiene todos los registros de la tabla
@@ -608,6 +1292,7 @@ class BaseModel:
             offset (int): Desplazamiento para paginación
             order_by (str): Campo para ordenar
             order_desc (bool): Si es True, orden descendente
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             List[Dict]: Lista de registros
@@ -615,8 +1300,9 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
         try:
-            query = f"SELECT * FROM {self.table_name}"
+            query = f"SELECT {select_list} FROM {self.table_name}"
 
             # Ordenar
             if order_by:
@@ -631,13 +1317,16 @@ class BaseModel:
             logger.error(f"✗ Error obteniendo todos los registros: {e}")
             return []
 
-    def get_by_field(self, field: str, value: Any) -> List[Dict[str, Any]]:
+    def get_by_field(
+        self, field: str, value: Any, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> List[Dict[str, Any]]:
         """
         Obtiene registros por un campo específico
 
         Args:
             field (str): Nombre del campo
             value (Any): Valor a buscar
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             List[Dict]: Lista de registros que coinciden
@@ -645,20 +1334,24 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE {field} = %s"
+            query = f"SELECT {select_list} FROM {self.table_name} WHERE {field} = %s"
             return self.fetch_all(query, (value,))
         except Exception as e:
             logger.error(f"✗ Error obteniendo registros por campo {field}: {e}")
             return []
 
-    def get_one_by_field(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+    def get_one_by_field(
+        self, field: str, value: Any, columns: Union[str, List[str], Tuple[str, ...]] = None  # type: ignore
+    ) -> Optional[Dict[str, Any]]:
         """
         Obtiene un registro por un campo específico
 
         Args:
             field (str): Nombre del campo
             value (Any): Valor a buscar
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             Optional[Dict]: Primer registro que coincide o None
@@ -666,8 +1359,9 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
         try:
-            query = f"SELECT * FROM {self.table_name} WHERE {field} = %s LIMIT 1"
+            query = f"SELECT {select_list} FROM {self.table_name} WHERE {field} = %s LIMIT 1"
             return self.fetch_one(query, (value,))
         except Exception as e:
             logger.error(f"✗ Error obteniendo registro por campo {field}: {e}")
@@ -678,6 +1372,7 @@ class BaseModel:
         search_term: str,
         fields: List[str] = None,  # type: ignore
         limit: int = 50,
+        columns: Union[str, List[str], Tuple[str, ...]] = None,  # type: ignore
     ) -> List[Dict[str, Any]]:
         """
         Busca registros por término en múltiples campos
@@ -686,6 +1381,7 @@ class BaseModel:
             search_term (str): Término de búsqueda
             fields (List[str]): Campos donde buscar (si es None, busca en todos los campos de texto)
             limit (int): Límite de resultados
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             List[Dict]: Registros que coinciden con la búsqueda
@@ -693,6 +1389,7 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
         try:
             # Si no se especifican campos, obtener todos los campos de texto de la tabla
             if fields is None:
@@ -716,7 +1413,7 @@ class BaseModel:
                 return []
 
             where_clause = " OR ".join(conditions)
-            query = f"SELECT * FROM {self.table_name} WHERE ({where_clause}) LIMIT %s"
+            query = f"SELECT {select_list} FROM {self.table_name} WHERE ({where_clause}) LIMIT %s"
             params.append(limit)
 
             return self.fetch_all(query, params)
@@ -744,7 +1441,7 @@ class BaseModel:
             if condition:
                 query += f" WHERE {condition}"
 
-            result = self.fetch_one(query, params)
+            result = self.fetch_one(query, params, prepared=True)
             return result["total"] if result else 0
         except Exception as e:
             logger.error(f"✗ Error contando registros: {e}")
@@ -761,7 +1458,8 @@ class BaseModel:
             bool: True si existe, False en caso contrario
         """
         try:
-            record = self.get_by_id(record_id)
+            # Solo la clave primaria: basta el índice para responder
+            record = self.get_by_id(record_id, columns=(self.primary_key,))
             return record is not None
         except Exception as e:
             logger.error(f"✗ Error verificando existencia de registro: {e}")
@@ -792,7 +1490,7 @@ class BaseModel:
                 query += f" AND {self.primary_key} != %s"
                 params.append(exclude_id)
 
-            result = self.fetch_one(query, params)
+            result = self.fetch_one(query, params, prepared=True)
             return result["total"] > 0 if result else False
         except Exception as e:
             logger.error(f"✗ Error verificando existencia por campo: {e}")
@@ -808,6 +1506,7 @@ class BaseModel:
         params: Tuple = None,  # type: ignore
         order_by: str = None,  # type: ignore
         order_desc: bool = True,
+        columns: Union[str, List[str], Tuple[str, ...]] = None,  # type: ignore
     ) -> Dict[str, Any]:
         """
         Obtiene registros paginados
@@ -819,6 +1518,7 @@ class BaseModel:
             params (tuple/list): Parámetros para las condiciones
             order_by (str): Campo para ordenar
             order_desc (bool): Si es True, orden descendente
+            columns: Columnas a leer (None para todas, ver _select_list)
 
         Returns:
             Dict: Diccionario con datos de paginación
@@ -826,12 +1526,14 @@ class BaseModel:
         if not self.table_name:
             raise ValueError("La propiedad table_name debe ser definida en el modelo")
 
+        select_list = self._select_list(columns)
+
         try:
             # Calcular offset
             offset = (page - 1) * per_page
 
             # Construir consulta base
-            query = f"SELECT * FROM {self.table_name}"
+            query = f"SELECT {select_list} FROM {self.table_name}"
 
             if conditions:
                 query += f" WHERE {conditions}"
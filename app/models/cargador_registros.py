@@ -0,0 +1,113 @@
+# app/models/cargador_registros.py
+"""
+Carga agrupada de registros por clave primaria durante una acción de la UI.
+
+Dentro de `with alcance_carga():` BaseModel.get_by_id y get_by_ids (sin
+proyección de columnas) pasan por un CargadorRegistros:
+
+- Los registros leídos se memorizan hasta que termina el alcance, por lo que
+  pedir dos veces el mismo estudiante o programa no vuelve a consultar.
+- anticipar(modelo, ids) anota IDs que se van a necesitar; el siguiente
+  get_by_id de esa tabla los trae todos en una sola consulta con ANY.
+- Las escrituras de BaseModel (update, delete, update_table, delete_rows)
+  descartan lo memorizado de la tabla afectada.
+
+El alcance se guarda en una ContextVar: cada hilo tiene el suyo y fuera de
+un alcance get_by_id consulta como siempre.
+
+Ejemplo:
+    with alcance_carga() as carga:
+        carga.anticipar(estudiante_model, [m["estudiante_id"] for m in matriculas])
+        for matricula in matriculas:
+            estudiante = estudiante_model.get_by_id(matricula["estudiante_id"])
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+_cargador_actual: ContextVar[Optional["CargadorRegistros"]] = ContextVar(
+    "cargador_registros", default=None
+)
+
+
+class CargadorRegistros:
+    """Memoria de registros por (tabla, clave primaria) con carga por lotes"""
+
+    def __init__(self):
+        # (tabla, clave primaria) -> {id: registro o None si no existe}
+        self._registros: Dict[Tuple[str, str], Dict[Any, Optional[Dict[str, Any]]]] = {}
+        # (tabla, clave primaria) -> IDs anotados y aún no leídos
+        self._pendientes: Dict[Tuple[str, str], Set[Any]] = {}
+        self.consultas = 0
+
+    @staticmethod
+    def _clave(modelo) -> Tuple[str, str]:
+        return (modelo.table_name, modelo.primary_key)
+
+    def anticipar(self, modelo, ids: Iterable[Any]) -> None:
+        """Anota IDs para leerlos junto con el próximo pedido de la tabla"""
+        clave = self._clave(modelo)
+        cargados = self._registros.get(clave, {})
+        pendientes = self._pendientes.setdefault(clave, set())
+        pendientes.update(i for i in ids if i is not None and i not in cargados)
+
+    def cargar(self, modelo, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Registro por ID (memorizado) o None si no existe"""
+        return self.cargar_muchos(modelo, [record_id]).get(record_id)
+
+    def cargar_muchos(self, modelo, ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Registros por ID; lee en una consulta los que faltan y los anotados
+
+        Returns:
+            Dict: {id: registro} solo con los IDs que existen
+        """
+        ids = [i for i in ids if i is not None]
+        clave = self._clave(modelo)
+        cargados = self._registros.setdefault(clave, {})
+
+        faltantes = {i for i in ids if i not in cargados}
+        if faltantes:
+            faltantes |= self._pendientes.pop(clave, set())
+            faltantes -= cargados.keys()
+
+            filas = modelo._fetch_by_ids(faltantes)
+            self.consultas += 1
+            if filas is not None:
+                # Los IDs sin fila también se memorizan (no existen)
+                for record_id in faltantes:
+                    cargados[record_id] = filas.get(record_id)
+
+        # Copias: quien llama puede modificar el registro sin alterar la memoria
+        return {i: dict(cargados[i]) for i in ids if cargados.get(i) is not None}
+
+    def invalidar(self, tabla: str) -> None:
+        """Descarta lo memorizado de una tabla (tras una escritura)"""
+        for clave in [c for c in self._registros if c[0] == tabla]:
+            del self._registros[clave]
+
+
+def cargador_activo() -> Optional[CargadorRegistros]:
+    """Cargador del alcance actual o None fuera de alcance_carga()"""
+    return _cargador_actual.get()
+
+
+@contextmanager
+def alcance_carga():
+    """
+    Abre un alcance de carga para una acción de la UI
+
+    Los alcances anidados reutilizan el cargador exterior.
+    """
+    existente = _cargador_actual.get()
+    if existente is not None:
+        yield existente
+        return
+
+    cargador = CargadorRegistros()
+    token = _cargador_actual.set(cargador)
+    try:
+        yield cargador
+    finally:
+        _cargador_actual.reset(token)
@@ -5,13 +5,23 @@ Modelo para gestión de configuraciones del sistema (clave-valor).
 Este modelo maneja las configuraciones del sistema usando un patrón clave-valor,
 permitiendo almacenar, recuperar y actualizar configuraciones de manera eficiente.
 
+Los valores se leen de RegistroConfiguraciones: un registro único por
+proceso, cargado una vez con los tipos de CLAVES_PREDEFINIDAS y compartido
+por todas las instancias. Se recarga cuando cambia configuraciones (NOTIFY
+configuraciones_cambio o versión de la tabla), de modo que leer la tasa de
+IVA o una ruta de archivos en cada factura es una búsqueda en un dict.
+
 Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
 """
 
 import sys
 import os
+import copy
 import json
+import time
+import select
 import logging
+import threading
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from typing import Optional, List, Dict, Any, Tuple, Union, Type, TypeVar
@@ -24,6 +34,16 @@ from .base_model import BaseModel
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+CANAL_CONFIGURACIONES = "configuraciones_cambio"
+
+# Tipo Python de cada "tipo" de CLAVES_PREDEFINIDAS
+TIPOS_CONFIGURACION = {
+    "string": str,
+    "integer": int,
+    "decimal": Decimal,
+    "boolean": bool,
+}
+
 
 class ConfiguracionesModel(BaseModel):
     """Modelo que representa una configuración del sistema (clave-valor)"""
@@ -118,6 +138,16 @@ class ConfiguracionesModel(BaseModel):
                 "descripcion": "Tasa de IT aplicable (ej: 0.03 para 3%)",
                 "tipo": "decimal",
             },
+            "IMPUESTO_IVA": {
+                "valor_default": "13",
+                "descripcion": "Porcentaje de IVA aplicable",
+                "tipo": "decimal",
+            },
+            "IMPUESTO_IT": {
+                "valor_default": "3",
+                "descripcion": "Porcentaje de IT aplicable",
+                "tipo": "decimal",
+            },
             "FACTURACION_LEYENDA": {
                 "valor_default": "Ley N° 453: Tienes derecho a recibir información sobre las características de los servicios",
                 "descripcion": "Leyenda legal para facturas",
@@ -144,6 +174,11 @@ class ConfiguracionesModel(BaseModel):
                 "descripcion": "Días para expiración de contraseñas (0 para nunca)",
                 "tipo": "integer",
             },
+            "SEGURIDAD_ITERACIONES_HASH": {
+                "valor_default": "100000",
+                "descripcion": "Iteraciones PBKDF2 de las contraseñas (ver scripts/calibrar_hash_passwords.py)",
+                "tipo": "integer",
+            },
             # Configuración de backup y mantenimiento
             "BACKUP_AUTOMATICO": {
                 "valor_default": "false",
@@ -238,6 +273,22 @@ class ConfiguracionesModel(BaseModel):
                 "tipo": "string",
                 "seguro": True,
             },
+            # Rutas de archivos
+            "RUTA_COMPROBANTES": {
+                "valor_default": "archivos/comprobantes/",
+                "descripcion": "Ruta base para comprobantes",
+                "tipo": "string",
+            },
+            "RUTA_FOTOS_ESTUDIANTES": {
+                "valor_default": "archivos/fotos_estudiantes/",
+                "descripcion": "Ruta para fotos de estudiantes",
+                "tipo": "string",
+            },
+            "RUTA_CURRICULUM_DOCENTES": {
+                "valor_default": "archivos/cv_docentes/",
+                "descripcion": "Ruta para CV de docentes",
+                "tipo": "string",
+            },
             # Configuración de sesión
             "SESION_TIEMPO_EXPIRACION": {
                 "valor_default": "60",
@@ -251,11 +302,6 @@ class ConfiguracionesModel(BaseModel):
             },
         }
 
-        # Cache de configuraciones para mejorar rendimiento
-        self._cache = {}
-        self._cache_timestamp = None
-        self._CACHE_TTL = 300  # 5 minutos en segundos
-
     # ============ MÉTODOS DE VALIDACIÓN ============
 
     def _validate_configuracion_data(
@@ -688,40 +734,9 @@ class ConfiguracionesModel(BaseModel):
             Valor de la configuración convertido al tipo especificado, o valor_default
         """
         try:
-            clave_normalizada = clave.strip().upper()
-
-            # Intentar obtener del cache primero
-            if clave_normalizada in self._cache:
-                cached_value = self._cache[clave_normalizada]
-                if isinstance(cached_value, tipo_retorno):
-                    return cached_value
-
-            # Obtener de la base de datos
-            config = self.read_by_clave(clave_normalizada)
-
-            if config and config.get("valor") is not None:
-                valor_str = str(config["valor"])
-                valor_convertido = self._convertir_valor(valor_str, tipo_retorno)
-
-                # Almacenar en cache
-                self._cache[clave_normalizada] = valor_convertido
-
-                return valor_convertido
-            else:
-                # Usar valor por defecto de configuración predefinida si existe
-                if clave_normalizada in self.CLAVES_PREDEFINIDAS:
-                    valor_default_config = self.CLAVES_PREDEFINIDAS[
-                        clave_normalizada
-                    ].get("valor_default")
-                    if valor_default_config is not None:
-                        valor_convertido = self._convertir_valor(
-                            valor_default_config, tipo_retorno
-                        )
-                        return valor_convertido
-
-                # Usar valor por defecto proporcionado
-                return valor_default
-
+            return RegistroConfiguraciones.get_instance().obtener(
+                clave.strip().upper(), tipo_retorno, valor_default
+            )
         except Exception as e:
             logger.error(f"Error obteniendo valor de configuración: {e}")
             return valor_default
@@ -849,79 +864,27 @@ class ConfiguracionesModel(BaseModel):
     # ============ MÉTODOS DE CACHE ============
 
     def _invalidate_cache(self):
-        """Invalida el cache de configuraciones"""
-        self._cache = {}
-        self._cache_timestamp = None
+        """Marca el registro compartido para recargarse en la próxima lectura"""
+        RegistroConfiguraciones.get_instance().invalidar()
 
     def load_all_to_cache(self) -> bool:
         """
-        Carga todas las configuraciones a cache
+        Recarga ahora el registro compartido de configuraciones
 
         Returns:
             bool: True si se cargó exitosamente
         """
-        try:
-            query = f"SELECT clave, valor FROM {self.table_name}"
-            results = self.fetch_all(query)
-
-            if results:
-                self._cache = {}
-                for row in results:
-                    clave = row["clave"]
-                    valor_str = row["valor"]
-
-                    # Determinar tipo según clave predefinida
-                    tipo = "string"
-                    if clave in self.CLAVES_PREDEFINIDAS:
-                        tipo = self.CLAVES_PREDEFINIDAS[clave].get("tipo", "string")
-
-                    # Convertir según tipo
-                    if tipo == "integer":
-                        self._cache[clave] = int(float(valor_str)) if valor_str else 0
-                    elif tipo == "decimal":
-                        self._cache[clave] = (
-                            Decimal(valor_str) if valor_str else Decimal("0")
-                        )
-                    elif tipo == "boolean":
-                        val_lower = str(valor_str).lower()
-                        self._cache[clave] = val_lower in ["true", "1", "yes"]
-                    else:
-                        self._cache[clave] = str(valor_str) if valor_str else ""
-
-                self._cache_timestamp = datetime.now()
-                logger.info(
-                    f"✓ Cache de configuraciones cargado con {len(self._cache)} elementos"
-                )
-                return True
-            else:
-                logger.warning("No se encontraron configuraciones para cargar en cache")
-                return False
-
-        except Exception as e:
-            logger.error(f"Error cargando configuraciones a cache: {e}")
-            return False
+        return RegistroConfiguraciones.get_instance().recargar()
 
     def get_all_cached(self) -> Dict[str, Any]:
         """
-        Obtiene todas las configuraciones desde cache o las carga si es necesario
+        Obtiene todas las configuraciones del registro compartido
 
         Returns:
-            Dict[str, Any]: Todas las configuraciones en cache
+            Dict[str, Any]: Valores convertidos según el tipo predefinido de cada clave
         """
         try:
-            # Verificar si cache está vacío o expirado
-            if not self._cache or not self._cache_timestamp:
-                self.load_all_to_cache()
-            else:
-                # Verificar si cache expiró
-                tiempo_transcurrido = (
-                    datetime.now() - self._cache_timestamp
-                ).total_seconds()
-                if tiempo_transcurrido > self._CACHE_TTL:
-                    self.load_all_to_cache()
-
-            return self._cache.copy()
-
+            return RegistroConfiguraciones.get_instance().todas()
         except Exception as e:
             logger.error(f"Error obteniendo configuraciones desde cache: {e}")
             return {}
@@ -940,49 +903,35 @@ class ConfiguracionesModel(BaseModel):
         Returns:
             Dict[str, bool]: Resultado por cada configuración
         """
-        resultados = {}
-
         try:
-            for clave, config_info in self.CLAVES_PREDEFINIDAS.items():
-                try:
-                    # Verificar si ya existe
-                    existe = self.read_by_clave(clave)
-
-                    if existe and not forzar:
-                        resultados[clave] = False  # Ya existe, no se actualizó
-                        continue
-
-                    # Preparar datos
-                    datos = {
-                        "clave": clave,
-                        "valor": config_info.get("valor_default", ""),
-                        "descripcion": config_info.get(
-                            "descripcion", f"Configuración para {clave}"
-                        ),
-                    }
-
-                    # Crear o actualizar
-                    if existe:
-                        # Actualizar existente
-                        success = self.update(existe["id"], datos)
-                    else:
-                        # Crear nueva
-                        success = self.create(datos) is not None
-
-                    resultados[clave] = success
-
-                    if success:
-                        logger.debug(
-                            f"Configuración '{clave}' {'actualizada' if existe else 'creada'} exitosamente"
-                        )
-                    else:
-                        logger.warning(
-                            f"Error {'actualizando' if existe else 'creando'} configuración '{clave}'"
-                        )
+            filas = [
+                {
+                    "clave": clave,
+                    "valor": config_info.get("valor_default", ""),
+                    "descripcion": config_info.get(
+                        "descripcion", f"Configuración para {clave}"
+                    ),
+                }
+                for clave, config_info in self.CLAVES_PREDEFINIDAS.items()
+            ]
+
+            # Una sola sentencia: las existentes se omiten o, con forzar, se
+            # sobrescriben valor y descripción
+            escritas = self.upsert_many(
+                self.table_name,
+                filas,
+                conflict_target="clave",
+                update_columns=None if forzar else (),
+                returning="clave",
+            )
+            if escritas is None:
+                logger.warning("Error escribiendo configuraciones predefinidas")
+                escritas = []
 
-                except Exception as e:
-                    logger.error(f"Error procesando configuración '{clave}': {e}")
-                    resultados[clave] = False
+            escritas = set(escritas)
+            resultados = {
+                clave: clave in escritas for clave in self.CLAVES_PREDEFINIDAS
+            }
 
             # Invalidar cache después de inicialización
             self._invalidate_cache()
@@ -1277,6 +1226,253 @@ class ConfiguracionesModel(BaseModel):
             return {}
 
 
+class RegistroConfiguraciones:
+    """
+    Registro de configuraciones compartido por todo el proceso
+
+    Carga la tabla completa en una sola consulta y guarda cada valor ya
+    convertido por (clave, tipo), así que obtener() no consulta la base de
+    datos. Se recarga:
+
+    - Al escribir desde este proceso (ConfiguracionesModel._invalidate_cache)
+    - Al recibir NOTIFY configuraciones_cambio, con iniciar_escucha()
+    - Si cambia la versión de la tabla (número de filas y MAX(updated_at)),
+      comprobada como mucho cada INTERVALO_VERIFICACION segundos
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Segundos entre comprobaciones de versión
+    INTERVALO_VERIFICACION = 5.0
+    # Con la escucha activa la comprobación es solo un respaldo
+    INTERVALO_VERIFICACION_ESCUCHANDO = 300.0
+
+    def __init__(self):
+        self._modelo = ConfiguracionesModel()
+        self._lock = threading.RLock()
+
+        self._valores: Dict[str, str] = {}
+        self._tipados: Dict[Tuple[str, type], Any] = {}
+        self._version: Optional[Tuple[int, Any]] = None
+        self._obsoleto = True
+        self._verificado_en = 0.0
+
+        self._hilo_escucha: Optional[threading.Thread] = None
+        self._detener_escucha = threading.Event()
+        self._escuchando = False
+
+    @classmethod
+    def get_instance(cls) -> "RegistroConfiguraciones":
+        """Obtiene el registro compartido del proceso"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    # ============ LECTURA ============
+
+    def obtener(
+        self, clave: str, tipo_retorno: Type[T] = str, valor_default: Optional[T] = None
+    ) -> Optional[T]:
+        """
+        Valor de una clave convertido a tipo_retorno
+
+        Sin valor en la tabla usa el valor_default de CLAVES_PREDEFINIDAS y,
+        si la clave no es predefinida, valor_default. Los dict y list se
+        devuelven como copia para que el llamador no altere el registro.
+        """
+        self._asegurar_vigente()
+
+        llave = (clave, tipo_retorno)
+        try:
+            valor = self._tipados[llave]
+        except KeyError:
+            valor_str = self._valores.get(clave)
+            if valor_str is None:
+                predefinida = self._modelo.CLAVES_PREDEFINIDAS.get(clave, {})
+                valor_str = predefinida.get("valor_default")
+                if valor_str is None:
+                    return valor_default
+            valor = self._modelo._convertir_valor(valor_str, tipo_retorno)
+            self._tipados[llave] = valor
+
+        if isinstance(valor, (dict, list)):
+            return copy.deepcopy(valor)
+        return valor
+
+    def todas(self) -> Dict[str, Any]:
+        """Todas las claves de la tabla, convertidas según su tipo predefinido"""
+        self._asegurar_vigente()
+        return {
+            clave: self.obtener(clave, self._tipo_de(clave))
+            for clave in list(self._valores)
+        }
+
+    def _tipo_de(self, clave: str) -> type:
+        tipo = self._modelo.CLAVES_PREDEFINIDAS.get(clave, {}).get("tipo", "string")
+        return TIPOS_CONFIGURACION.get(tipo, str)
+
+    # ============ CARGA Y VERSIÓN ============
+
+    def invalidar(self) -> None:
+        """La próxima lectura recarga la tabla"""
+        self._obsoleto = True
+
+    def recargar(self) -> bool:
+        """
+        Carga todas las configuraciones en una consulta
+
+        Si la consulta falla se conservan los valores anteriores y se
+        reintenta tras INTERVALO_VERIFICACION segundos.
+
+        Returns:
+            bool: True si se cargó exitosamente
+        """
+        with self._lock:
+            # Antes de consultar: una notificación durante la carga vuelve a marcarlo
+            self._obsoleto = False
+            filas = self._modelo.fetch_all(
+                f"SELECT clave, valor, updated_at FROM {self._modelo.table_name}"
+            )
+            self._modelo.commit()
+            self._verificado_en = time.monotonic()
+
+            if filas is None:
+                self._version = None
+                logger.error("Error cargando el registro de configuraciones")
+                return False
+
+            valores = {
+                fila["clave"]: str(fila["valor"])
+                for fila in filas
+                if fila["valor"] is not None
+            }
+            tipados = {}
+            for clave, valor_str in valores.items():
+                tipo = self._tipo_de(clave)
+                tipados[(clave, tipo)] = self._modelo._convertir_valor(valor_str, tipo)
+
+            # Se reemplazan los dict completos: los lectores nunca ven una mezcla
+            self._valores = valores
+            self._tipados = tipados
+            self._version = (
+                len(filas),
+                max((fila["updated_at"] for fila in filas if fila["updated_at"]), default=None),
+            )
+
+        logger.info(f"✓ Registro de configuraciones cargado con {len(valores)} elementos")
+        return True
+
+    def _leer_version(self) -> Optional[Tuple[int, Any]]:
+        """(número de filas, MAX(updated_at)); cambia con cualquier alta, baja o edición"""
+        fila = self._modelo.fetch_one(
+            f"SELECT COUNT(*) AS total, MAX(updated_at) AS ultima FROM {self._modelo.table_name}"
+        )
+        self._modelo.commit()
+        return (fila["total"], fila["ultima"]) if fila else None
+
+    def _asegurar_vigente(self) -> None:
+        if self._obsoleto:
+            with self._lock:
+                if self._obsoleto:
+                    self.recargar()
+            return
+
+        intervalo = (
+            self.INTERVALO_VERIFICACION_ESCUCHANDO
+            if self._escuchando
+            else self.INTERVALO_VERIFICACION
+        )
+        if time.monotonic() - self._verificado_en < intervalo:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._verificado_en < intervalo:
+                return
+            version = self._leer_version()
+            self._verificado_en = time.monotonic()
+            if version is not None and version != self._version:
+                self.recargar()
+
+    # ============ NOTIFICACIONES ============
+
+    def iniciar_escucha(self) -> None:
+        """Inicia (una sola vez) el hilo que escucha NOTIFY configuraciones_cambio"""
+        if self._hilo_escucha is not None and self._hilo_escucha.is_alive():
+            return
+
+        self._detener_escucha.clear()
+        self._hilo_escucha = threading.Thread(
+            target=self._bucle_escucha, name="escucha-configuraciones", daemon=True
+        )
+        self._hilo_escucha.start()
+
+    def detener_escucha(self) -> None:
+        """Detiene el hilo de escucha"""
+        self._detener_escucha.set()
+        if self._hilo_escucha is not None:
+            self._hilo_escucha.join(timeout=10)
+        self._hilo_escucha = None
+
+    def _bucle_escucha(self) -> None:
+        """Escucha con una conexión dedicada y la reabre si se pierde"""
+        while not self._detener_escucha.is_set():
+            self._escuchar()
+            self._detener_escucha.wait(30.0)
+
+    def _escuchar(self) -> None:
+        conexion = self._modelo.get_connection()
+        if conexion is None:
+            logger.error("No hay conexión disponible para escuchar configuraciones")
+            return
+
+        try:
+            conexion.rollback()
+            conexion.autocommit = True
+            with conexion.cursor() as cursor:
+                cursor.execute(f"LISTEN {CANAL_CONFIGURACIONES}")
+
+            # Lo cambiado mientras no se escuchaba
+            self._escuchando = True
+            self.invalidar()
+
+            while not self._detener_escucha.is_set():
+                listos, _, _ = select.select([conexion], [], [], 5.0)
+                if listos:
+                    conexion.poll()
+                    if conexion.notifies:
+                        conexion.notifies.clear()
+                        self.invalidar()
+
+        except Exception as e:
+            logger.error(f"Error escuchando {CANAL_CONFIGURACIONES}: {e}", exc_info=True)
+
+        finally:
+            self._escuchando = False
+            try:
+                with conexion.cursor() as cursor:
+                    cursor.execute("UNLISTEN *")
+                conexion.autocommit = False
+            except Exception:
+                pass
+            self._modelo.return_connection(conexion)
+
+
+def obtener_configuracion(
+    clave: str, tipo_retorno: Type[T] = str, valor_default: Optional[T] = None
+) -> Optional[T]:
+    """
+    Atajo al registro compartido para rutas frecuentes (facturas, recibos)
+
+    Ejemplo: obtener_configuracion("IMPUESTO_IVA", Decimal)
+    """
+    return RegistroConfiguraciones.get_instance().obtener(
+        clave.strip().upper(), tipo_retorno, valor_default
+    )
+
+
 # Ejemplo de uso
 if __name__ == "__main__":
     # Configurar logging
@@ -269,13 +269,15 @@ class EstudianteModel(BaseModel):
 
     # ============ MÉTODOS DE CONSULTA AVANZADOS ============
 
-    def get_all(self, active_only=True, limit=100, offset=0):
+    def get_all(self, active_only=True, limit=100, offset=0, columns=None):
         """
         Obtiene todos los estudiantes con paginación
         FIX: Ahora es método de instancia (tiene self)
+        columns: columnas a leer (None para todas, ver BaseModel._select_list)
         """
+        select_list = self._select_list(columns)
         try:
-            query = "SELECT * FROM estudiantes"
+            query = f"SELECT {select_list} FROM estudiantes"
             params = []
 
             # Filtrar por estado activo
@@ -0,0 +1,288 @@
+# app/models/exportador_model.py
+"""
+Modelo para exportar consultas a CSV o XLSX en streaming.
+
+Las filas se leen desde un cursor del lado del servidor y se escriben
+directamente en el archivo destino, sin límite de filas y con memoria
+constante. XLSX se escribe con openpyxl en modo write-only. La exportación
+informa el progreso mediante un callback, puede cancelarse y puede
+ejecutarse en un hilo de trabajo para no bloquear la interfaz.
+
+El archivo se escribe primero como temporal y se renombra al terminar: una
+exportación fallida o cancelada nunca deja un archivo truncado en la ruta
+solicitada.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import csv
+import uuid
+import logging
+import threading
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Optional, List, Dict, Any, Tuple, Callable
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+try:
+    from openpyxl import Workbook
+
+    XLSX_SUPPORT = True
+except ImportError:
+    XLSX_SUPPORT = False
+
+
+class ExportadorModel(BaseModel):
+    """Modelo para exportar consultas en streaming a CSV o XLSX"""
+
+    FORMATOS = ["csv", "xlsx"]
+
+    def __init__(self):
+        """Inicializa el exportador"""
+        super().__init__()
+
+        # Filas leídas del servidor por viaje de red
+        self.TAMANO_CHUNK = 2000
+
+        # Cada cuántas filas se informa el progreso
+        self.INTERVALO_PROGRESO = 5000
+
+    # ============ EXPORTACIÓN ============
+
+    def exportar(
+        self,
+        query: str,
+        params: Tuple,
+        ruta_archivo: str,
+        formato: Optional[str] = None,
+        progreso: Optional[Callable[[int, Optional[int]], None]] = None,
+        cancelar: Optional[threading.Event] = None,
+        contar: bool = False,
+        nombre_hoja: str = "Datos",
+    ) -> Dict[str, Any]:
+        """
+        Exporta el resultado de una consulta en streaming
+
+        Los encabezados son los nombres de columna de la consulta (usar
+        alias para personalizarlos).
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+            ruta_archivo: Archivo destino
+            formato: "csv" o "xlsx" (por defecto según la extensión)
+            progreso: Callback (filas_escritas, total) llamado periódicamente;
+                total es None si no se contó
+            cancelar: Evento que, al activarse, detiene la exportación
+            contar: Si es True, cuenta las filas antes de exportar para
+                informar el total en el progreso
+            nombre_hoja: Nombre de la hoja (solo XLSX)
+
+        Returns:
+            Dict: exito, filas, ruta, cancelado y mensaje
+        """
+        if formato is None:
+            formato = os.path.splitext(ruta_archivo)[1].lstrip(".").lower() or "csv"
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato inválido. Válidos: {', '.join(self.FORMATOS)}")
+        if formato == "xlsx" and not XLSX_SUPPORT:
+            raise ValueError("Exportación XLSX no disponible: instale 'openpyxl'")
+
+        directorio = os.path.dirname(os.path.abspath(ruta_archivo))
+        os.makedirs(directorio, exist_ok=True)
+        temporal = f"{ruta_archivo}.{uuid.uuid4().hex[:8]}.tmp"
+
+        connection = self.get_connection()
+        if connection is None:
+            return self._resultado(False, 0, ruta_archivo, "No hay conexión disponible")
+
+        filas = 0
+        total = None
+        cancelado = False
+        escritor = None
+
+        try:
+            # Snapshot consistente: el conteo y los datos ven las mismas filas
+            connection.rollback()
+            connection.set_session(isolation_level="REPEATABLE READ", readonly=True)
+
+            if contar:
+                with connection.cursor() as cursor_conteo:
+                    cursor_conteo.execute(
+                        f"SELECT COUNT(*) FROM ({query}) AS exportacion", params
+                    )
+                    total = cursor_conteo.fetchone()[0]
+
+            # Cursor del lado del servidor: el resultado se consume por chunks
+            cursor = connection.cursor(name=f"exportacion_{uuid.uuid4().hex[:12]}")
+            cursor.itersize = self.TAMANO_CHUNK
+            cursor.execute(query, params)
+
+            while True:
+                lote = cursor.fetchmany(self.TAMANO_CHUNK)
+
+                if escritor is None:
+                    encabezados = [col[0] for col in cursor.description]
+                    escritor = self._abrir_escritor(
+                        temporal, formato, encabezados, nombre_hoja
+                    )
+
+                if not lote:
+                    break
+
+                for fila in lote:
+                    escritor["escribir"](fila)
+                filas += len(lote)
+
+                if progreso and filas % self.INTERVALO_PROGRESO < len(lote):
+                    progreso(filas, total)
+
+                if cancelar is not None and cancelar.is_set():
+                    cancelado = True
+                    break
+
+            cursor.close()
+            connection.rollback()
+
+            escritor["cerrar"]()
+            escritor = None
+
+            if cancelado:
+                os.remove(temporal)
+                logger.info(f"Exportación a {ruta_archivo} cancelada en {filas} filas")
+                return self._resultado(
+                    False, filas, ruta_archivo, "Exportación cancelada", cancelado=True
+                )
+
+            os.replace(temporal, ruta_archivo)
+
+            if progreso:
+                progreso(filas, total if total is not None else filas)
+
+            logger.info(f"✓ Exportadas {filas} filas a {ruta_archivo}")
+            return self._resultado(
+                True, filas, ruta_archivo, f"{filas} registros exportados a {ruta_archivo}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error exportando a {ruta_archivo}: {e}", exc_info=True)
+            if escritor is not None:
+                try:
+                    escritor["cerrar"]()
+                except Exception:
+                    pass
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            return self._resultado(False, filas, ruta_archivo, f"Error al exportar: {e}")
+
+        finally:
+            try:
+                connection.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+            except Exception:
+                pass
+            self.return_connection(connection)
+
+    def exportar_en_segundo_plano(
+        self,
+        query: str,
+        params: Tuple,
+        ruta_archivo: str,
+        al_terminar: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **kwargs,
+    ) -> Tuple[threading.Thread, threading.Event]:
+        """
+        Ejecuta exportar() en un hilo de trabajo
+
+        Los callbacks (progreso, al_terminar) se llaman desde el hilo de
+        trabajo; en la interfaz deben reenviarse al hilo principal (p. ej.
+        emitiendo una señal de Qt).
+
+        Args:
+            query: Consulta SELECT
+            params: Parámetros de la consulta
+            ruta_archivo: Archivo destino
+            al_terminar: Callback con el resultado de la exportación
+            **kwargs: Argumentos adicionales de exportar()
+
+        Returns:
+            Tuple: (hilo iniciado, evento para cancelar)
+        """
+        cancelar = kwargs.pop("cancelar", None) or threading.Event()
+
+        def trabajo():
+            try:
+                resultado = self.exportar(
+                    query, params, ruta_archivo, cancelar=cancelar, **kwargs
+                )
+            except Exception as e:
+                resultado = self._resultado(False, 0, ruta_archivo, str(e))
+            if al_terminar:
+                al_terminar(resultado)
+
+        hilo = threading.Thread(target=trabajo, name="Exportacion", daemon=True)
+        hilo.start()
+        return hilo, cancelar
+
+    # ============ ESCRITORES ============
+
+    def _abrir_escritor(
+        self, ruta: str, formato: str, encabezados: List[str], nombre_hoja: str
+    ) -> Dict[str, Callable]:
+        """Abre el escritor del formato indicado y escribe los encabezados"""
+        if formato == "csv":
+            archivo = open(ruta, "w", newline="", encoding="utf-8")
+            writer = csv.writer(archivo)
+            writer.writerow(encabezados)
+
+            def escribir(fila):
+                writer.writerow(["" if v is None else v for v in fila])
+
+            def cerrar():
+                archivo.close()
+
+        else:
+            libro = Workbook(write_only=True)
+            hoja = libro.create_sheet(title=nombre_hoja[:31])
+            hoja.append(encabezados)
+
+            def escribir(fila):
+                hoja.append([self._valor_celda(v) for v in fila])
+
+            def cerrar():
+                libro.save(ruta)
+                libro.close()
+
+        return {"escribir": escribir, "cerrar": cerrar}
+
+    @staticmethod
+    def _valor_celda(valor: Any) -> Any:
+        """Convierte un valor a un tipo que openpyxl sabe escribir"""
+        if valor is None or isinstance(
+            valor, (str, int, float, Decimal, bool, datetime, date)
+        ):
+            return valor
+        return str(valor)
+
+    @staticmethod
+    def _resultado(
+        exito: bool, filas: int, ruta: str, mensaje: str, cancelado: bool = False
+    ) -> Dict[str, Any]:
+        """Construye el diccionario de resultado de una exportación"""
+        return {
+            "exito": exito,
+            "filas": filas,
+            "ruta": ruta,
+            "cancelado": cancelado,
+            "mensaje": mensaje,
+        }
@@ -10,6 +10,8 @@ from datetime import datetime, date
 from decimal import Decimal
 
 from .base_model import BaseModel
+from .numeracion_model import NumeracionModel
+from .resumen_financiero_model import ResumenFinancieroModel
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ class FacturasModel(BaseModel):
     Modelo para gestión de facturas según estructura:
     CREATE TABLE facturas (
         id INTEGER PRIMARY KEY DEFAULT nextval('seq_facturas_id'),
-        numero TEXT NOT NULL,
+        nro_factura TEXT NOT NULL,
         cliente_id INTEGER NOT NULL,
         cliente_nombre TEXT,
         cliente_cedula TEXT,
@@ -43,7 +45,7 @@ class FacturasModel(BaseModel):
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
-        CONSTRAINT uk_factura_numero UNIQUE (numero),
+        CONSTRAINT uk_factura_numero UNIQUE (nro_factura),
         CONSTRAINT chk_factura_total CHECK (total >= 0),
         CONSTRAINT chk_factura_subtotal CHECK (subtotal >= 0),
         CONSTRAINT chk_factura_iva CHECK (iva >= 0)
@@ -97,7 +99,7 @@ class FacturasModel(BaseModel):
         # Columnas según estructura de la tabla
         self.columns = [
             "id",
-            "numero",
+            "nro_factura",
             "cliente_id",
             "cliente_nombre",
             "cliente_cedula",
@@ -137,16 +139,26 @@ class FacturasModel(BaseModel):
             ID de la factura creada o None si hay error
         """
         try:
+            # Establecer valores por defecto
+            datos_completos = datos_factura.copy()
+
+            # El número va en nro_factura, la columna desde la que se
+            # sincroniza la serie FACTURA ("numero" se acepta como alias).
+            # Si no viene dado se asigna en esta misma transacción
+            numero = datos_completos.pop("numero", None)
+            if not datos_completos.get("nro_factura"):
+                datos_completos["nro_factura"] = (
+                    numero or self.generar_nuevo_numero_factura()
+                )
+
             # Validar datos requeridos
-            campos_requeridos = ["numero", "cliente_id", "fecha_emision", "total"]
+            campos_requeridos = ["nro_factura", "fecha_emision", "razon_social", "total"]
             for campo in campos_requeridos:
-                if campo not in datos_factura or not datos_factura[campo]:
+                if campo not in datos_completos or not datos_completos[campo]:
                     logger.error(f"❌ Campo requerido faltante: {campo}")
+                    self.rollback()
                     return None
 
-            # Establecer valores por defecto
-            datos_completos = datos_factura.copy()
-
             if "estado" not in datos_completos:
                 datos_completos["estado"] = "PENDIENTE"
 
@@ -156,20 +168,24 @@ class FacturasModel(BaseModel):
             if "iva" not in datos_completos:
                 datos_completos["iva"] = 0
 
-            if "anulada" not in datos_completos:
-                datos_completos["anulada"] = False
+            if "it" not in datos_completos:
+                datos_completos["it"] = 0
 
             # Insertar en base de datos
             result = self.insert(self.TABLE_NAME, datos_completos, returning="id")
 
             if result:
+                # Confirma la factura y libera el contador de la serie
+                self.commit()
                 factura_id = result[0] if isinstance(result, list) else result
                 logger.info(f"✅ Factura creada exitosamente con ID: {factura_id}")
                 return factura_id
 
+            self.rollback()
             return None
 
         except Exception as e:
+            self.rollback()
             logger.error(f"❌ Error creando factura: {e}", exc_info=True)
             return None
 
@@ -202,7 +218,7 @@ class FacturasModel(BaseModel):
             Diccionario con datos de la factura o None si no existe
         """
         try:
-            query = f"SELECT * FROM {self.TABLE_NAME} WHERE numero = %s"
+            query = f"SELECT * FROM {self.TABLE_NAME} WHERE nro_factura = %s"
             result = self.fetch_one(query, (numero,))
             return result
         except Exception as e:
@@ -464,20 +480,21 @@ class FacturasModel(BaseModel):
             if año is None:
                 año = date.today().year
 
-            query = f"""
-                SELECT 
-                    EXTRACT(MONTH FROM fecha_emision) as mes,
-                    COUNT(*) as cantidad_facturas,
-                    COALESCE(SUM(total), 0) as total_ingresos
-                FROM {self.TABLE_NAME}
-                WHERE EXTRACT(YEAR FROM fecha_emision) = %s 
-                    AND anulada = FALSE 
-                    AND estado = 'PAGADA'
-                GROUP BY EXTRACT(MONTH FROM fecha_emision)
-                ORDER BY mes
-            """
+            # Acumulados diarios mantenidos por triggers: no recorre facturas.
+            # Las facturas anuladas dejan de estar en estado PAGADA.
+            filas = ResumenFinancieroModel().comparativo_anual(
+                "FACTURA", [año], filtros={"estado": "PAGADA"}
+            )
 
-            return self.fetch_all(query, (año,))
+            return [
+                {
+                    "mes": fila["mes"],
+                    "cantidad_facturas": fila["cantidad"],
+                    "total_ingresos": fila["total"],
+                }
+                for fila in filas
+                if fila["cantidad"]
+            ]
         except Exception as e:
             logger.error(f"❌ Error obteniendo ingresos por mes: {e}")
             return []
@@ -536,33 +553,335 @@ class FacturasModel(BaseModel):
             logger.error(f"❌ Error anulando factura: {e}")
             return False
 
-    def generar_nuevo_numero_factura(self) -> str:
+    # ============ OPERACIONES EN LOTE ============
+
+    def _condicion_lote(
+        self,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, List[Any]]:
         """
-        Genera un nuevo número de factura único
+        Construye la condición WHERE de una operación en lote
+
+        Args:
+            factura_ids: IDs de facturas
+            filtro: Filtros opcionales (fecha_inicio, fecha_fin, estado,
+                exportada_siat)
+
+        Returns:
+            Tuple[str, List]: Condición SQL y parámetros
+        """
+        condiciones = []
+        params: List[Any] = []
+
+        if factura_ids is not None:
+            condiciones.append("id = ANY(%s)")
+            params.append([int(i) for i in factura_ids])
+
+        filtro = filtro or {}
+        if filtro.get("fecha_inicio"):
+            condiciones.append("fecha_emision >= %s::date")
+            params.append(str(filtro["fecha_inicio"]))
+        if filtro.get("fecha_fin"):
+            condiciones.append("fecha_emision <= %s::date")
+            params.append(str(filtro["fecha_fin"]))
+        if filtro.get("estado"):
+            condiciones.append("estado = %s")
+            params.append(filtro["estado"])
+        if filtro.get("exportada_siat") is not None:
+            condiciones.append("COALESCE(exportada_siat, FALSE) = %s")
+            params.append(bool(filtro["exportada_siat"]))
+
+        if not condiciones:
+            # Nunca aplicar una transición a toda la tabla por omisión
+            raise ValueError("Debe indicar IDs de facturas o al menos un filtro")
+
+        return " AND ".join(condiciones), params
+
+    def _transicion_lote(
+        self,
+        asignaciones: str,
+        params_asignaciones: List[Any],
+        condicion_estado: str,
+        factura_ids: Optional[List[int]],
+        filtro: Optional[Dict[str, Any]],
+        movimiento_sql: Optional[str] = None,
+        params_movimiento: Optional[List[Any]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Aplica una transición de estado a un conjunto de facturas
+
+        Una sola sentencia bloquea las filas candidatas, las actualiza y,
+        opcionalmente, inserta sus movimientos de caja. Las facturas que no
+        cumplen condicion_estado se omiten sin error.
+
+        Returns:
+            Optional[List[Dict]]: Facturas actualizadas (id, nro_factura, total,
+            estado_anterior, movimiento_id) o None si hubo error; la
+            transacción queda abierta para que el llamador haga commit
+        """
+        condicion, params_condicion = self._condicion_lote(factura_ids, filtro)
+
+        movimientos_cte = ""
+        movimientos_join = "NULL::INTEGER AS movimiento_id"
+        if movimiento_sql:
+            movimientos_cte = f""",
+            movimientos AS (
+                {movimiento_sql}
+                RETURNING id, origen_id
+            )"""
+            movimientos_join = (
+                "(SELECT m.id FROM movimientos m WHERE m.origen_id = a.id "
+                "LIMIT 1) AS movimiento_id"
+            )
+
+        query = f"""
+            WITH candidatas AS (
+                SELECT id, estado
+                FROM {self.TABLE_NAME}
+                WHERE {condicion} AND {condicion_estado}
+                ORDER BY id
+                FOR UPDATE
+            ),
+            actualizadas AS (
+                UPDATE {self.TABLE_NAME} f
+                SET {asignaciones}
+                FROM candidatas c
+                WHERE f.id = c.id
+                RETURNING f.id, f.nro_factura, f.total, c.estado AS estado_anterior
+            ){movimientos_cte}
+            SELECT a.*, {movimientos_join}
+            FROM actualizadas a
+            ORDER BY a.id
+        """
+
+        params = (
+            params_condicion
+            + params_asignaciones
+            + (params_movimiento or [])
+        )
+        return self.fetch_all(query, tuple(params))
+
+    def _finalizar_lote(
+        self,
+        actualizadas: Optional[List[Dict[str, Any]]],
+        factura_ids: Optional[List[int]],
+        accion: str,
+        motivo: str,
+        usuario_id: Optional[int],
+        datos_nuevos: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Confirma una operación en lote y registra su auditoría en un lote"""
+        if actualizadas is None:
+            self.rollback()
+            return {"exito": False, "actualizadas": [], "omitidas": factura_ids or []}
+
+        self.commit()
+
+        ids = [f["id"] for f in actualizadas]
+        omitidas = sorted(set(factura_ids) - set(ids)) if factura_ids else []
+
+        if usuario_id and actualizadas:
+            from .auditoria_transacciones_model import AuditoriaTransaccionesModel
+
+            AuditoriaTransaccionesModel().registrar_lote(
+                [
+                    {
+                        "usuario_id": usuario_id,
+                        "origen_tipo": "FACTURA",
+                        "origen_id": f["id"],
+                        "accion": accion,
+                        "motivo": motivo,
+                        "datos_anteriores": {"estado": f["estado_anterior"]},
+                        "datos_nuevos": datos_nuevos,
+                    }
+                    for f in actualizadas
+                ]
+            )
+
+        return {
+            "exito": True,
+            "actualizadas": ids,
+            "omitidas": omitidas,
+            "facturas": actualizadas,
+        }
+
+    def marcar_exportadas_siat_lote(
+        self,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+        usuario_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Marca como exportadas al SIAT todas las facturas indicadas
+
+        Se omiten las anuladas y las ya exportadas.
+
+        Args:
+            factura_ids: IDs de facturas
+            filtro: Filtros (fecha_inicio, fecha_fin, estado)
+            usuario_id: Usuario para la auditoría
 
         Returns:
-            Nuevo número de factura
+            Dict: exito, actualizadas (IDs), omitidas (IDs) y facturas
         """
         try:
-            # Obtener el máximo número actual
-            query = f"SELECT MAX(numero) as ultimo_numero FROM {self.TABLE_NAME}"
-            result = self.fetch_one(query)
-
-            if result and result["ultimo_numero"]:
-                try:
-                    ultimo = int(result["ultimo_numero"])
-                    nuevo = str(ultimo + 1).zfill(8)
-                except ValueError:
-                    # Si no es numérico, empezar desde 1
-                    nuevo = "00000001"
-            else:
-                nuevo = "00000001"
+            actualizadas = self._transicion_lote(
+                "exportada_siat = TRUE",
+                [],
+                "COALESCE(exportada_siat, FALSE) = FALSE AND estado <> 'ANULADA'",
+                factura_ids,
+                filtro,
+            )
+            return self._finalizar_lote(
+                actualizadas,
+                factura_ids,
+                "MODIFICACION",
+                "Exportación de facturas al SIAT",
+                usuario_id,
+                {"exportada_siat": True},
+            )
+        except Exception as e:
+            self.rollback()
+            logger.error(f"❌ Error marcando facturas como exportadas al SIAT: {e}")
+            return {"exito": False, "actualizadas": [], "omitidas": factura_ids or []}
+
+    def marcar_pagadas_lote(
+        self,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+        forma_pago: Optional[str] = None,
+        referencia: Optional[str] = None,
+        usuario_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Marca como pagadas las facturas pendientes o emitidas indicadas
+
+        En la misma sentencia se registra un movimiento de caja de ingreso
+        por cada factura que aún no lo tenga. La tabla facturas no guarda
+        datos del pago: la forma de pago y la referencia quedan en la
+        descripción del movimiento y en la auditoría.
+
+        Args:
+            factura_ids: IDs de facturas
+            filtro: Filtros (fecha_inicio, fecha_fin, estado)
+            forma_pago: Forma de pago (opcional)
+            referencia: Referencia del pago (opcional)
+            usuario_id: Usuario que registra (caja y auditoría)
+
+        Returns:
+            Dict: exito, actualizadas (IDs), omitidas (IDs) y facturas
+        """
+        try:
+            movimiento_sql = """
+                INSERT INTO movimientos_caja
+                    (fecha, tipo, monto, descripcion, origen_tipo, origen_id, registrado_por)
+                SELECT CURRENT_TIMESTAMP, 'INGRESO', a.total,
+                       'Pago de factura ' || a.nro_factura
+                           || COALESCE(' - ' || %s::text, '')
+                           || COALESCE(' (Ref: ' || %s::text || ')', ''),
+                       'FACTURA', a.id, %s
+                FROM actualizadas a
+                WHERE a.total > 0
+                  AND NOT EXISTS (
+                      SELECT 1 FROM movimientos_caja m
+                      WHERE m.origen_tipo = 'FACTURA' AND m.origen_id = a.id
+                  )
+            """
+            actualizadas = self._transicion_lote(
+                "estado = 'PAGADA'",
+                [],
+                "estado IN ('PENDIENTE', 'EMITIDA')",
+                factura_ids,
+                filtro,
+                movimiento_sql=movimiento_sql,
+                params_movimiento=[forma_pago, referencia, usuario_id],
+            )
+            return self._finalizar_lote(
+                actualizadas,
+                factura_ids,
+                "MODIFICACION",
+                "Registro de pago de facturas",
+                usuario_id,
+                {"estado": "PAGADA", "forma_pago": forma_pago, "referencia_pago": referencia},
+            )
+        except Exception as e:
+            self.rollback()
+            logger.error(f"❌ Error marcando facturas como pagadas: {e}")
+            return {"exito": False, "actualizadas": [], "omitidas": factura_ids or []}
+
+    def anular_facturas_lote(
+        self,
+        motivo: str,
+        factura_ids: Optional[List[int]] = None,
+        filtro: Optional[Dict[str, Any]] = None,
+        usuario_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Anula las facturas indicadas que no estén ya anuladas
+
+        Las facturas con movimiento de caja de ingreso reciben, en la misma
+        sentencia, un movimiento de egreso que lo revierte.
+
+        Args:
+            motivo: Motivo de la anulación
+            factura_ids: IDs de facturas
+            filtro: Filtros (fecha_inicio, fecha_fin, estado)
+            usuario_id: Usuario que anula (caja y auditoría)
+
+        Returns:
+            Dict: exito, actualizadas (IDs), omitidas (IDs) y facturas
+        """
+        try:
+            movimiento_sql = """
+                INSERT INTO movimientos_caja
+                    (fecha, tipo, monto, descripcion, registrado_por)
+                SELECT CURRENT_TIMESTAMP, 'EGRESO', m.monto,
+                       'ANULACIÓN de factura ' || a.nro_factura || ': ' || %s, %s
+                FROM actualizadas a
+                JOIN movimientos_caja m
+                  ON m.origen_tipo = 'FACTURA' AND m.origen_id = a.id
+                 AND m.tipo = 'INGRESO'
+            """
+            # El motivo queda en el movimiento de reversión y en la auditoría
+            actualizadas = self._transicion_lote(
+                "estado = 'ANULADA'",
+                [],
+                "estado <> 'ANULADA'",
+                factura_ids,
+                filtro,
+                movimiento_sql=movimiento_sql,
+                params_movimiento=[motivo, usuario_id],
+            )
+            return self._finalizar_lote(
+                actualizadas,
+                factura_ids,
+                "ANULACION",
+                motivo,
+                usuario_id,
+                {"estado": "ANULADA", "motivo_anulacion": motivo},
+            )
+        except Exception as e:
+            self.rollback()
+            logger.error(f"❌ Error anulando facturas: {e}")
+            return {"exito": False, "actualizadas": [], "omitidas": factura_ids or []}
+
+    def generar_nuevo_numero_factura(self) -> Optional[str]:
+        """
+        Genera un nuevo número de factura único
 
-            return nuevo
+        El número se toma del contador de la serie FACTURA en la transacción
+        abierta de este modelo; se confirma junto con la factura en
+        crear_factura o se libera con su rollback.
+
+        Returns:
+            Nuevo número de factura o None si no se pudo asignar
+        """
+        try:
+            return NumeracionModel().siguiente_numero("FACTURA", modelo=self)
         except Exception as e:
             logger.error(f"❌ Error generando número de factura: {e}")
-            # Número basado en fecha como respaldo
-            return datetime.now().strftime("%Y%m%d") + "001"
+            return None
 
     def existe_numero_factura(
         self, numero: str, excluir_id: int = None  # type:ignore
@@ -579,11 +898,11 @@ class FacturasModel(BaseModel):
         """
         try:
             if excluir_id:
-                query = f"SELECT COUNT(*) as count FROM {self.TABLE_NAME} WHERE numero = %s AND id != %s"
+                query = f"SELECT COUNT(*) as count FROM {self.TABLE_NAME} WHERE nro_factura = %s AND id != %s"
                 params = (numero, excluir_id)
             else:
                 query = (
-                    f"SELECT COUNT(*) as count FROM {self.TABLE_NAME} WHERE numero = %s"
+                    f"SELECT COUNT(*) as count FROM {self.TABLE_NAME} WHERE nro_factura = %s"
                 )
                 params = (numero,)
 
@@ -610,7 +929,7 @@ class FacturasModel(BaseModel):
             search_term = f"%{termino}%"
             query = f"""
                 SELECT * FROM {self.TABLE_NAME}
-                WHERE (numero ILIKE %s OR 
+                WHERE (nro_factura ILIKE %s OR 
                        cliente_nombre ILIKE %s OR 
                        cliente_cedula ILIKE %s OR 
                        observaciones ILIKE %s)
@@ -662,18 +981,18 @@ class FacturasModel(BaseModel):
         """
         try:
             # Validar campos requeridos
-            campos_requeridos = ["numero", "cliente_id", "fecha_emision", "total"]
+            campos_requeridos = ["nro_factura", "fecha_emision", "razon_social", "total"]
             for campo in campos_requeridos:
                 if campo not in datos or not datos[campo]:
                     return False, f"Campo requerido faltante: {campo}"
 
             # Validar número único
-            if "numero" in datos:
+            if "nro_factura" in datos:
                 excluir_id = datos.get("id")
                 if self.existe_numero_factura(
-                    datos["numero"], excluir_id  # type:ignore
+                    datos["nro_factura"], excluir_id  # type:ignore
                 ):
-                    return False, f"El número de factura '{datos['numero']}' ya existe"
+                    return False, f"El número de factura '{datos['nro_factura']}' ya existe"
 
             # Validar estado
             if "estado" in datos and datos["estado"]:
@@ -19,6 +19,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .base_model import BaseModel
 from .movimiento_caja_model import MovimientoCajaModel
+from .numeracion_model import NumeracionModel
+from .resumen_financiero_model import ResumenFinancieroModel
+from app.utils.exceptions import TransactionRolledBackException
 
 logger = logging.getLogger(__name__)
 
@@ -397,49 +400,59 @@ class GastoModel(BaseModel):
             return None
 
         try:
-            # Iniciar transacción
-            self.begin_transaction()
-
-            # Preparar datos para inserción
-            insert_data = data.copy()
-
-            # Establecer valores por defecto
-            defaults = {"created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-            for key, value in defaults.items():
-                if key not in insert_data or insert_data[key] is None:
-                    insert_data[key] = value
-
-            # Insertar en base de datos
-            gasto_id = self.insert(self.table_name, insert_data, returning="id")
-
-            if not gasto_id:
-                self.rollback()
-                logger.error("No se pudo insertar el gasto en la base de datos")
-                return None
-
-            logger.info(f"✓ Gasto creado exitosamente con ID: {gasto_id}")
-
-            # Registrar movimiento de caja si corresponde
-            if registrar_movimiento:
-                movimiento_creado = self._registrar_movimiento_caja(
-                    gasto_id, insert_data, usuario_id
-                )
-
-                if not movimiento_creado:
+            # Número, gasto, movimiento de caja y comprobantes se confirman
+            # juntos al salir del bloque; un rollback() lo revierte todo
+            with self.transaction():
+                # Preparar datos para inserción
+                insert_data = data.copy()
+
+                # Establecer valores por defecto
+                defaults = {"created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+                for key, value in defaults.items():
+                    if key not in insert_data or insert_data[key] is None:
+                        insert_data[key] = value
+
+                # Número de comprobante asignado dentro de esta transacción
+                if not insert_data.get("comprobante_nro"):
+                    comprobante_nro = self._generar_numero_comprobante()
+                    if not comprobante_nro:
+                        self.rollback()
+                        logger.error("No se pudo asignar número de comprobante al gasto")
+                        return None
+                    insert_data["comprobante_nro"] = comprobante_nro
+
+                # Insertar en base de datos
+                gasto_id = self.insert(self.table_name, insert_data, returning="id")
+
+                if not gasto_id:
                     self.rollback()
-                    logger.error("Rollback: No se pudo registrar movimiento en caja")
+                    logger.error("No se pudo insertar el gasto en la base de datos")
                     return None
 
-            # Commit de la transacción
-            self.commit()
-            logger.info(f"✓ Transacción completada para gasto ID: {gasto_id}")
+                # Registrar movimiento de caja si corresponde
+                if registrar_movimiento:
+                    movimiento_creado = self._registrar_movimiento_caja(
+                        gasto_id, insert_data, usuario_id
+                    )
+
+                    if not movimiento_creado:
+                        self.rollback()
+                        logger.error("Rollback: No se pudo registrar movimiento en caja")
+                        return None
 
-            # Generar comprobantes si corresponde
-            self._generar_comprobantes(gasto_id, insert_data)
+                # Generar comprobantes si corresponde (en su propio savepoint:
+                # si fallan no se pierde el gasto)
+                with self.transaction():
+                    self._generar_comprobantes(gasto_id, insert_data)
 
+            logger.info(f"✓ Gasto creado exitosamente con ID: {gasto_id}")
             return gasto_id
 
+        except TransactionRolledBackException:
+            logger.error("Gasto no creado: la transacción se revirtió")
+            return None
+
         except Exception as e:
             # Rollback en caso de error
             self.rollback()
@@ -565,26 +578,18 @@ class GastoModel(BaseModel):
         except Exception as e:
             logger.error(f"Error generando comprobantes: {e}")
 
-    def _generar_numero_comprobante(self) -> str:
-        """Genera un número de comprobante secuencial"""
-        try:
-            # Obtener el último número de comprobante
-            query = """
-            SELECT MAX(CAST(SUBSTRING(comprobante_nro FROM 7) AS INTEGER)) as ultimo_num
-            FROM gastos 
-            WHERE comprobante_nro LIKE 'GASTO-%'
-            """
-            result = self.fetch_one(query)
-
-            if result and result["ultimo_num"]:
-                next_num = result["ultimo_num"] + 1
-            else:
-                next_num = 1
+    def _generar_numero_comprobante(self) -> Optional[str]:
+        """
+        Genera un número de comprobante secuencial
 
-            return f"GASTO-{next_num:06d}"
-        except Exception:
-            # Fallback: usar timestamp
-            return f"GASTO-{int(datetime.now().timestamp())}"
+        Usa el contador de la serie GASTO en la transacción abierta de este
+        modelo, de modo que el número se confirma o revierte con el gasto.
+        """
+        try:
+            return NumeracionModel().siguiente_numero("GASTO", modelo=self)
+        except Exception as e:
+            logger.error(f"Error generando número de comprobante: {e}")
+            return None
 
     # En el método _guardar_comprobante (línea ~490)
     def _guardar_comprobante(self, comprobante_data: Dict[str, Any]) -> bool:
@@ -600,8 +605,11 @@ class GastoModel(BaseModel):
         try:
             if comprobante_data["tipo"] == "GASTO":
                 update_data = {"comprobante_nro": comprobante_data["numero"]}
-                # Cambiar update_table por update
-                return self.update(comprobante_data["gasto_id"], update_data) > 0
+                filas = BaseModel.update(
+                    self, self.table_name, update_data, "id = %s",
+                    (comprobante_data["gasto_id"],),
+                )
+                return bool(filas)
             return True
         except Exception:
             return False
@@ -676,37 +684,40 @@ class GastoModel(BaseModel):
             return False
 
         try:
-            # Iniciar transacción
-            self.begin_transaction()
-
-            # Actualizar en base de datos
-            result = self.update(gasto_id, data)
-
-            if not result:
-                self.rollback()
-                return False
-
-            logger.info(f"✓ Gasto {gasto_id} actualizado exitosamente")
-
-            # Actualizar movimiento de caja si corresponde
-            if actualizar_movimiento and (data.get("monto") or data.get("descripcion")):
-                movimiento_actualizado = self._actualizar_movimiento_caja(
-                    gasto_id, data, usuario_id
+            with self.transaction():
+                # Actualizar en base de datos (UPDATE de BaseModel, no este método)
+                result = BaseModel.update(
+                    self, self.table_name, data, "id = %s", (gasto_id,)
                 )
 
-                if not movimiento_actualizado:
-                    logger.warning(
-                        f"No se pudo actualizar movimiento de caja para gasto {gasto_id}"
-                    )
+                if not result:
+                    self.rollback()
+                    return False
+
+                # Actualizar movimiento de caja si corresponde; en un savepoint
+                # para que un fallo no deshaga la actualización del gasto
+                if actualizar_movimiento and (data.get("monto") or data.get("descripcion")):
+                    with self.transaction():
+                        movimiento_actualizado = self._actualizar_movimiento_caja(
+                            gasto_id, data, usuario_id
+                        )
+                        if not movimiento_actualizado:
+                            self.rollback()
+                            logger.warning(
+                                f"No se pudo actualizar movimiento de caja para gasto {gasto_id}"
+                            )
 
-            # Commit de la transacción
-            self.commit()
+            logger.info(f"✓ Gasto {gasto_id} actualizado exitosamente")
 
             # Registrar auditoría
             self._registrar_auditoria("ACTUALIZACION", gasto_id, usuario_id)
 
             return True
 
+        except TransactionRolledBackException:
+            logger.error(f"Gasto {gasto_id} no actualizado: la transacción se revirtió")
+            return False
+
         except Exception as e:
             self.rollback()
             logger.error(f"Error actualizando gasto: {e}", exc_info=True)
@@ -815,31 +826,35 @@ class GastoModel(BaseModel):
                 logger.error("No se pueden eliminar gastos de más de 30 días")
                 return False
 
-            # Iniciar transacción
-            self.begin_transaction()
-
-            # Eliminar movimiento de caja asociado si corresponde
-            if eliminar_movimiento:
-                movimiento_eliminado = self._eliminar_movimiento_caja(gasto_id)
-                if not movimiento_eliminado:
-                    logger.warning(
-                        f"No se pudo eliminar movimiento de caja para gasto {gasto_id}"
-                    )
-
-            # Registrar auditoría antes de eliminar
-            self._registrar_auditoria("ELIMINACION", gasto_id, usuario_id)
+            with self.transaction():
+                # Eliminar movimiento de caja asociado si corresponde (en un
+                # savepoint: si falla se conserva el movimiento y se sigue)
+                if eliminar_movimiento:
+                    with self.transaction():
+                        movimiento_eliminado = self._eliminar_movimiento_caja(gasto_id)
+                        if not movimiento_eliminado:
+                            self.rollback()
+                            logger.warning(
+                                f"No se pudo eliminar movimiento de caja para gasto {gasto_id}"
+                            )
+
+                # Registrar auditoría antes de eliminar
+                self._registrar_auditoria("ELIMINACION", gasto_id, usuario_id)
+
+                # Eliminar el gasto
+                query = f"DELETE FROM {self.table_name} WHERE id = %s"
+                result = self.execute_query(query, (gasto_id,), commit=False)
+
+                if not result:
+                    self.rollback()
+                    return False
 
-            # Eliminar el gasto
-            query = f"DELETE FROM {self.table_name} WHERE id = %s"
-            result = self.execute_query(query, (gasto_id,), commit=False)
+            logger.info(f"✓ Gasto {gasto_id} eliminado exitosamente")
+            return True
 
-            if result:
-                self.commit()
-                logger.info(f"✓ Gasto {gasto_id} eliminado exitosamente")
-                return True
-            else:
-                self.rollback()
-                return False
+        except TransactionRolledBackException:
+            logger.error(f"Gasto {gasto_id} no eliminado: la transacción se revirtió")
+            return False
 
         except Exception as e:
             self.rollback()
@@ -1062,24 +1077,14 @@ class GastoModel(BaseModel):
                     datetime.strptime(fecha_fin, "%Y-%m-%d") - timedelta(days=1)
                 ).strftime("%Y-%m-%d")
 
-            # Consulta para totales por categoría
-            query_categorias = f"""
-            SELECT categoria, COUNT(*) as cantidad, SUM(monto) as total
-            FROM {self.table_name}
-            WHERE fecha >= %s AND fecha <= %s
-            GROUP BY categoria
-            ORDER BY total DESC
-            """
-
-            # Consulta para total general
-            query_total = f"""
-            SELECT COUNT(*) as total_gastos, SUM(monto) as monto_total
-            FROM {self.table_name}
-            WHERE fecha >= %s AND fecha <= %s
-            """
-
-            categorias = self.fetch_all(query_categorias, (fecha_inicio, fecha_fin))
-            total = self.fetch_one(query_total, (fecha_inicio, fecha_fin))
+            # Totales desde los acumulados diarios: no recorre la tabla de gastos
+            categorias = ResumenFinancieroModel().resumen_mes(
+                "GASTO", año, mes, agrupar=["categoria"]
+            )
+            total = {
+                "total_gastos": sum(c["cantidad"] for c in categorias),
+                "monto_total": sum(c["total"] for c in categorias),
+            }
 
             # Consulta para gasto más alto
             query_max = f"""
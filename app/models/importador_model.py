@@ -0,0 +1,776 @@
+# app/models/importador_model.py
+"""
+Modelo para importar estudiantes y matrículas en lote desde CSV o XLSX.
+
+El flujo es el mismo para ambos tipos de registro:
+
+1. Leer el archivo (CSV con separador detectado o XLSX con openpyxl en
+   modo solo lectura) y normalizar los encabezados.
+2. Validar cada fila con las reglas de Validator y detectar duplicados
+   dentro del propio archivo.
+3. Resolver referencias y duplicados contra la base con una consulta por
+   conjunto (= ANY(%s)), no una consulta por fila.
+4. Cargar las filas válidas con COPY en una tabla temporal y fusionarlas
+   con INSERT ... SELECT ... ON CONFLICT en una sola transacción.
+5. Escribir un reporte CSV con cada fila rechazada y sus errores.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import io
+import csv
+import logging
+import unicodedata
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+from typing import Optional, List, Dict, Any, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+from app.utils.validators import Validator
+
+logger = logging.getLogger(__name__)
+
+try:
+    from openpyxl import load_workbook
+
+    XLSX_SUPPORT = True
+except ImportError:
+    XLSX_SUPPORT = False
+
+
+# Encabezados alternativos aceptados en los archivos
+ALIAS_COLUMNAS = {
+    "ci": "ci_numero",
+    "carnet": "ci_numero",
+    "nro_ci": "ci_numero",
+    "expedido": "ci_expedicion",
+    "expedicion": "ci_expedicion",
+    "nombre": "nombres",
+    "apellido": "apellidos",
+    "correo": "email",
+    "correo_electronico": "email",
+    "celular": "telefono",
+    "fecha_nac": "fecha_nacimiento",
+    "universidad": "universidad_egreso",
+    "programa": "programa_codigo",
+    "codigo_programa": "programa_codigo",
+    "modalidad": "modalidad_pago",
+    "descuento": "descuento_aplicado",
+    "plan": "plan_pago",
+    "estado": "estado_academico",
+}
+
+COLUMNAS_ESTUDIANTE = [
+    "ci_numero",
+    "ci_expedicion",
+    "nombres",
+    "apellidos",
+    "fecha_nacimiento",
+    "telefono",
+    "email",
+    "universidad_egreso",
+    "profesion",
+]
+
+COLUMNAS_MATRICULA = [
+    "estudiante_id",
+    "programa_id",
+    "modalidad_pago",
+    "plan_pago_id",
+    "monto_total",
+    "descuento_aplicado",
+    "monto_final",
+    "estado_academico",
+    "fecha_inicio",
+    "observaciones",
+]
+
+
+class ImportadorModel(BaseModel):
+    """Modelo para importar estudiantes y matrículas en lote"""
+
+    FORMATOS = ["csv", "xlsx"]
+
+    def __init__(self):
+        """Inicializa el importador"""
+        super().__init__()
+        self.validator = Validator()
+
+        # Estados académicos admitidos por el dominio d_estado_academico
+        self.ESTADOS_ACADEMICOS = [
+            "PREINSCRITO",
+            "INSCRITO",
+            "EN_CURSO",
+            "CONCLUIDO",
+            "RETIRADO",
+        ]
+
+    # ============ LECTURA DE ARCHIVOS ============
+
+    @staticmethod
+    def _normalizar_encabezado(encabezado: Any) -> str:
+        """Minúsculas, sin acentos y con guiones bajos; aplica alias"""
+        texto = unicodedata.normalize("NFKD", str(encabezado or "").strip().lower())
+        texto = "".join(c for c in texto if not unicodedata.combining(c))
+        texto = "_".join(texto.replace("-", " ").split())
+        return ALIAS_COLUMNAS.get(texto, texto)
+
+    def leer_archivo(
+        self, ruta_archivo: str, nombre_hoja: Optional[str] = None
+    ) -> Tuple[List[str], List[Tuple[int, Dict[str, Any]]]]:
+        """
+        Lee un archivo CSV o XLSX
+
+        Args:
+            ruta_archivo: Archivo a leer
+            nombre_hoja: Hoja a leer (solo XLSX, por defecto la activa)
+
+        Returns:
+            Tuple: (encabezados originales, [(nro_fila, datos normalizados)])
+            nro_fila es la fila en el archivo (el encabezado es la fila 1)
+        """
+        formato = os.path.splitext(ruta_archivo)[1].lstrip(".").lower()
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato inválido. Válidos: {', '.join(self.FORMATOS)}")
+
+        if formato == "xlsx":
+            if not XLSX_SUPPORT:
+                raise ValueError("Importación XLSX no disponible: instale 'openpyxl'")
+            libro = load_workbook(ruta_archivo, read_only=True, data_only=True)
+            try:
+                hoja = libro[nombre_hoja] if nombre_hoja else libro.active
+                iterador = hoja.iter_rows(values_only=True)
+                encabezados = [str(c or "").strip() for c in next(iterador, ())]
+                crudas = [list(fila) for fila in iterador]
+            finally:
+                libro.close()
+        else:
+            with open(ruta_archivo, "r", newline="", encoding="utf-8-sig") as archivo:
+                muestra = archivo.read(8192)
+                archivo.seek(0)
+                try:
+                    dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+                except csv.Error:
+                    dialecto = csv.excel
+                lector = csv.reader(archivo, dialecto)
+                encabezados = [c.strip() for c in next(lector, [])]
+                crudas = list(lector)
+
+        claves = [self._normalizar_encabezado(e) for e in encabezados]
+        filas = []
+        for indice, valores in enumerate(crudas, start=2):
+            if not any(v not in (None, "") for v in valores):
+                continue  # Fila vacía
+            filas.append((indice, dict(zip(claves, valores))))
+
+        return encabezados, filas
+
+    # ============ NORMALIZACIÓN ============
+
+    @staticmethod
+    def _texto(valor: Any) -> Optional[str]:
+        """Texto sin espacios extremos; números enteros de Excel sin '.0'"""
+        if valor is None:
+            return None
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        texto = str(valor).strip()
+        return texto or None
+
+    @staticmethod
+    def _fecha(valor: Any) -> Optional[str]:
+        """Fecha como YYYY-MM-DD; acepta date, YYYY-MM-DD y DD/MM/YYYY"""
+        if valor in (None, ""):
+            return None
+        if isinstance(valor, datetime):
+            return valor.date().isoformat()
+        if isinstance(valor, date):
+            return valor.isoformat()
+        texto = str(valor).strip()
+        for formato in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+            try:
+                return datetime.strptime(texto[:10], formato).date().isoformat()
+            except ValueError:
+                continue
+        raise ValueError(f"Fecha inválida: {texto}. Use YYYY-MM-DD o DD/MM/YYYY")
+
+    @staticmethod
+    def _monto(valor: Any) -> Optional[Decimal]:
+        """Monto como Decimal con 2 decimales"""
+        if valor in (None, ""):
+            return None
+        try:
+            return Decimal(str(valor).replace(",", ".").strip()).quantize(Decimal("0.01"))
+        except InvalidOperation:
+            raise ValueError(f"Monto inválido: {valor}")
+
+    def _errores_validator(self) -> List[str]:
+        """Errores acumulados por el validador desde el último reset"""
+        errores = self.validator.get_errors()
+        self.validator.reset()
+        return errores
+
+    # ============ ESTUDIANTES ============
+
+    def _preparar_estudiante(self, datos: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Normaliza y valida una fila de estudiante"""
+        v = self.validator
+        v.reset()
+        errores = []
+
+        fila = {c: self._texto(datos.get(c)) for c in COLUMNAS_ESTUDIANTE}
+        fila["ci_numero"] = v.normalize_ci(fila["ci_numero"]) or None
+        for campo in ("nombres", "apellidos", "universidad_egreso", "profesion"):
+            if fila[campo]:
+                fila[campo] = v.sanitize_string(fila[campo], v.NOMBRE_MAX_LENGTH)
+        if fila["ci_expedicion"]:
+            fila["ci_expedicion"] = fila["ci_expedicion"].upper()
+        if fila["email"]:
+            fila["email"] = fila["email"].lower()
+
+        v.validate_ci(fila["ci_numero"], fila["ci_expedicion"])
+        v.validate_nombre_completo(fila["nombres"] or "", fila["apellidos"] or "")
+        v.validate_email(fila["email"])
+        v.validate_telefono(fila["telefono"])
+
+        try:
+            fila["fecha_nacimiento"] = self._fecha(datos.get("fecha_nacimiento"))
+            if fila["fecha_nacimiento"]:
+                v.validate_fecha_nacimiento(fila["fecha_nacimiento"])
+        except ValueError as e:
+            errores.append(str(e))
+
+        return fila, self._errores_validator() + errores
+
+    def importar_estudiantes(
+        self,
+        ruta_archivo: str,
+        ruta_reporte: Optional[str] = None,
+        actualizar_existentes: bool = False,
+        simular: bool = False,
+        nombre_hoja: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Importa estudiantes desde un archivo CSV o XLSX
+
+        Columnas: ci_numero, nombres y apellidos (requeridas); ci_expedicion,
+        fecha_nacimiento, telefono, email, universidad_egreso y profesion.
+
+        Args:
+            ruta_archivo: Archivo a importar
+            ruta_reporte: CSV de errores (por defecto <archivo>.errores.csv)
+            actualizar_existentes: Si es True, un CI ya registrado actualiza
+                al estudiante existente; si es False, la fila se rechaza
+            simular: Validar y fusionar sin confirmar (ROLLBACK al final)
+            nombre_hoja: Hoja a leer (solo XLSX)
+
+        Returns:
+            Dict: exito, total, insertados, actualizados, rechazados,
+            ruta_reporte y mensaje
+        """
+        encabezados, filas = self.leer_archivo(ruta_archivo, nombre_hoja)
+
+        # 1. Validación por fila y duplicados dentro del archivo
+        preparadas = []
+        errores = {}
+        vistos = {"ci_numero": {}, "email": {}, "nombre": {}}
+
+        for nro_fila, datos in filas:
+            fila, errores_fila = self._preparar_estudiante(datos)
+            claves = {
+                "ci_numero": fila["ci_numero"],
+                "email": fila["email"],
+                "nombre": (fila["nombres"], fila["apellidos"]),
+            }
+            for tipo, clave in claves.items():
+                if not clave or clave == (None, None):
+                    continue
+                if clave in vistos[tipo]:
+                    errores_fila.append(
+                        f"{self._etiqueta(tipo)} repetido en el archivo (fila {vistos[tipo][clave]})"
+                    )
+                else:
+                    vistos[tipo][clave] = nro_fila
+
+            if errores_fila:
+                errores[nro_fila] = errores_fila
+            else:
+                preparadas.append((nro_fila, fila))
+
+        # 2. Duplicados contra la base en una sola consulta
+        existentes = self._estudiantes_existentes(preparadas)
+        validas = []
+        for nro_fila, fila in preparadas:
+            errores_fila = []
+            propietario_ci = existentes["ci_numero"].get(fila["ci_numero"])
+            if propietario_ci is not None and not actualizar_existentes:
+                errores_fila.append(f"El CI {fila['ci_numero']} ya está registrado")
+
+            propietario = existentes["email"].get(fila["email"])
+            if propietario is not None and propietario != fila["ci_numero"]:
+                errores_fila.append(f"El email {fila['email']} ya está registrado")
+
+            propietario = existentes["nombre"].get((fila["nombres"], fila["apellidos"]))
+            if propietario is not None and propietario != fila["ci_numero"]:
+                errores_fila.append(
+                    f"Ya existe un estudiante {fila['nombres']} {fila['apellidos']}"
+                )
+
+            if errores_fila:
+                errores[nro_fila] = errores_fila
+            else:
+                validas.append((nro_fila, fila))
+
+        # 3. COPY a tabla temporal y fusión
+        insertados = actualizados = 0
+        if validas:
+            if actualizar_existentes:
+                conflicto = "DO UPDATE SET " + ", ".join(
+                    f"{c} = COALESCE(EXCLUDED.{c}, estudiantes.{c})"
+                    for c in COLUMNAS_ESTUDIANTE
+                    if c != "ci_numero"
+                ) + ", activo = TRUE"
+            else:
+                conflicto = "DO NOTHING"
+
+            columnas = ", ".join(COLUMNAS_ESTUDIANTE)
+            fusion = f"""
+                INSERT INTO estudiantes ({columnas})
+                SELECT {columnas} FROM tmp_importacion
+                ORDER BY fila
+                ON CONFLICT (ci_numero) {conflicto}
+                RETURNING ci_numero, (xmax = 0) AS insertado
+            """
+            resultado = self._fusionar(
+                validas,
+                "fila INTEGER, ci_numero TEXT, ci_expedicion TEXT, nombres TEXT, "
+                "apellidos TEXT, fecha_nacimiento DATE, telefono TEXT, email TEXT, "
+                "universidad_egreso TEXT, profesion TEXT",
+                COLUMNAS_ESTUDIANTE,
+                fusion,
+                simular,
+            )
+            if resultado is None:
+                return self._resultado_error(len(filas), "Error al fusionar estudiantes")
+
+            fusionadas = {r[0]: r[1] for r in resultado}
+            for nro_fila, fila in validas:
+                if fila["ci_numero"] not in fusionadas:
+                    # Registrado por otro proceso entre la verificación y la fusión
+                    errores[nro_fila] = [f"El CI {fila['ci_numero']} ya está registrado"]
+                elif fusionadas[fila["ci_numero"]]:
+                    insertados += 1
+                else:
+                    actualizados += 1
+
+        return self._resultado(
+            "estudiantes", ruta_archivo, ruta_reporte, encabezados, filas, errores,
+            insertados, actualizados, simular,
+        )
+
+    def _estudiantes_existentes(
+        self, preparadas: List[Tuple[int, Dict[str, Any]]]
+    ) -> Dict[str, Dict]:
+        """
+        CI, emails y nombres ya registrados, en una sola consulta
+
+        Returns:
+            Dict: {"ci_numero": {ci: ci}, "email": {email: ci},
+            "nombre": {(nombres, apellidos): ci}}
+        """
+        existentes = {"ci_numero": {}, "email": {}, "nombre": {}}
+        if not preparadas:
+            return existentes
+
+        cis = [f["ci_numero"] for _, f in preparadas]
+        emails = [f["email"] for _, f in preparadas if f["email"]]
+        nombres = [f["nombres"] for _, f in preparadas]
+        apellidos = [f["apellidos"] for _, f in preparadas]
+
+        query = """
+            SELECT ci_numero, LOWER(email) AS email, nombres, apellidos
+            FROM estudiantes
+            WHERE ci_numero = ANY(%s)
+               OR LOWER(email) = ANY(%s)
+               OR (nombres, apellidos) IN (
+                    SELECT * FROM unnest(%s::text[], %s::text[])
+               )
+        """
+        for fila in self.fetch_all(query, (cis, emails, nombres, apellidos)) or []:
+            existentes["ci_numero"][fila["ci_numero"]] = fila["ci_numero"]
+            if fila["email"]:
+                existentes["email"][fila["email"]] = fila["ci_numero"]
+            existentes["nombre"][(fila["nombres"], fila["apellidos"])] = fila["ci_numero"]
+        self.rollback()
+        return existentes
+
+    # ============ MATRÍCULAS ============
+
+    def importar_matriculas(
+        self,
+        ruta_archivo: str,
+        ruta_reporte: Optional[str] = None,
+        simular: bool = False,
+        nombre_hoja: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Importa matrículas desde un archivo CSV o XLSX
+
+        Columnas: ci_numero del estudiante, programa_codigo y modalidad_pago
+        (requeridas); descuento_aplicado, plan_pago (nombre del plan; por
+        defecto el primer plan activo del programa si la modalidad es
+        CUOTAS), estado_academico, fecha_inicio y observaciones.
+
+        El monto total es el costo base del programa. Las matrículas ya
+        existentes (estudiante, programa) se rechazan y los cupos
+        disponibles del programa se descuentan en la misma transacción.
+
+        Args:
+            ruta_archivo: Archivo a importar
+            ruta_reporte: CSV de errores (por defecto <archivo>.errores.csv)
+            simular: Validar y fusionar sin confirmar (ROLLBACK al final)
+            nombre_hoja: Hoja a leer (solo XLSX)
+
+        Returns:
+            Dict: exito, total, insertados, actualizados, rechazados,
+            ruta_reporte y mensaje
+        """
+        encabezados, filas = self.leer_archivo(ruta_archivo, nombre_hoja)
+        v = self.validator
+
+        # 1. Referencias en una consulta por conjunto
+        cis = {v.normalize_ci(self._texto(d.get("ci_numero"))) for _, d in filas}
+        codigos = {(self._texto(d.get("programa_codigo")) or "").upper() for _, d in filas}
+        estudiantes = self._mapa(
+            "SELECT ci_numero, id FROM estudiantes WHERE ci_numero = ANY(%s) AND activo = TRUE",
+            [c for c in cis if c],
+        )
+        programas = {
+            p["codigo"]: p
+            for p in self.fetch_all(
+                """
+                SELECT id, codigo, costo_base, cupos_disponibles, estado
+                FROM programas_academicos WHERE codigo = ANY(%s)
+                """,
+                ([c for c in codigos if c],),
+            ) or []
+        }
+        planes = {}
+        for plan in self.fetch_all(
+            """
+            SELECT id, programa_id, nombre FROM planes_pago
+            WHERE programa_id = ANY(%s) AND activo = TRUE
+            ORDER BY programa_id, id
+            """,
+            ([p["id"] for p in programas.values()],),
+        ) or []:
+            planes.setdefault(plan["programa_id"], []).append(plan)
+
+        # 2. Validación por fila
+        candidatas = []
+        errores = {}
+        for nro_fila, datos in filas:
+            errores_fila = []
+            ci = v.normalize_ci(self._texto(datos.get("ci_numero")))
+            codigo = (self._texto(datos.get("programa_codigo")) or "").upper()
+            estudiante_id = estudiantes.get(ci)
+            programa = programas.get(codigo)
+
+            if not ci:
+                errores_fila.append("El CI no puede estar vacío")
+            elif estudiante_id is None:
+                errores_fila.append(f"Estudiante con CI {ci} no existe")
+            if not codigo:
+                errores_fila.append("El código de programa es requerido")
+            elif programa is None:
+                errores_fila.append(f"Programa {codigo} no existe")
+            elif programa["estado"] in ("CONCLUIDO", "CANCELADO"):
+                errores_fila.append(f"El programa {codigo} está {programa['estado']}")
+
+            try:
+                descuento = self._monto(datos.get("descuento_aplicado")) or Decimal("0.00")
+                fecha_inicio = self._fecha(datos.get("fecha_inicio"))
+            except ValueError as e:
+                errores_fila.append(str(e))
+                descuento, fecha_inicio = Decimal("0.00"), None
+
+            modalidad = (self._texto(datos.get("modalidad_pago")) or "").upper()
+            estado_academico = (
+                self._texto(datos.get("estado_academico")) or "PREINSCRITO"
+            ).upper()
+            if estado_academico not in self.ESTADOS_ACADEMICOS:
+                errores_fila.append(
+                    f"Estado académico inválido. Use: {', '.join(self.ESTADOS_ACADEMICOS)}"
+                )
+
+            if errores_fila:
+                errores[nro_fila] = errores_fila
+                continue
+
+            plan_pago_id = None
+            if modalidad == "CUOTAS":
+                nombre_plan = self._texto(datos.get("plan_pago"))
+                disponibles = planes.get(programa["id"], [])
+                if nombre_plan:
+                    disponibles = [p for p in disponibles if p["nombre"] == nombre_plan]
+                if disponibles:
+                    plan_pago_id = disponibles[0]["id"]
+
+            monto_total = Decimal(str(programa["costo_base"]))
+            fila = {
+                "estudiante_id": estudiante_id,
+                "programa_id": programa["id"],
+                "modalidad_pago": modalidad,
+                "plan_pago_id": plan_pago_id,
+                "monto_total": monto_total,
+                "descuento_aplicado": descuento,
+                "monto_final": monto_total - descuento,
+                "estado_academico": estado_academico,
+                "fecha_inicio": fecha_inicio,
+                "observaciones": v.sanitize_string(
+                    self._texto(datos.get("observaciones")) or "",
+                    v.OBSERVACIONES_MAX_LENGTH,
+                ) or None,
+            }
+
+            v.validate_matricula_data(fila)
+            errores_fila = self._errores_validator()
+            if modalidad == "CUOTAS" and plan_pago_id is None:
+                errores_fila.append("Modalidad CUOTAS requiere un plan de pago")
+
+            if errores_fila:
+                errores[nro_fila] = errores_fila
+            else:
+                candidatas.append((nro_fila, fila, codigo))
+
+        # 3. Duplicados (archivo y base) y cupos
+        pares = [(f["estudiante_id"], f["programa_id"]) for _, f, _ in candidatas]
+        matriculados = set()
+        if pares:
+            for fila in self.fetch_all(
+                """
+                SELECT estudiante_id, programa_id FROM matriculas
+                WHERE (estudiante_id, programa_id) IN (
+                    SELECT * FROM unnest(%s::int[], %s::int[])
+                )
+                """,
+                ([p[0] for p in pares], [p[1] for p in pares]),
+            ) or []:
+                matriculados.add((fila["estudiante_id"], fila["programa_id"]))
+
+        validas = []
+        vistos = {}
+        cupos = {p["id"]: p["cupos_disponibles"] for p in programas.values()}
+        for nro_fila, fila, codigo in candidatas:
+            par = (fila["estudiante_id"], fila["programa_id"])
+            if par in matriculados:
+                errores[nro_fila] = ["El estudiante ya está matriculado en este programa"]
+            elif par in vistos:
+                errores[nro_fila] = [f"Matrícula repetida en el archivo (fila {vistos[par]})"]
+            elif cupos.get(fila["programa_id"]) is not None and cupos[fila["programa_id"]] <= 0:
+                errores[nro_fila] = [f"El programa {codigo} no tiene cupos disponibles"]
+            else:
+                vistos[par] = nro_fila
+                if cupos.get(fila["programa_id"]) is not None:
+                    cupos[fila["programa_id"]] -= 1
+                validas.append((nro_fila, fila))
+        self.rollback()
+
+        # 4. COPY a tabla temporal, fusión y descuento de cupos
+        insertados = 0
+        if validas:
+            columnas = ", ".join(COLUMNAS_MATRICULA)
+            fusion = f"""
+                WITH nuevas AS (
+                    INSERT INTO matriculas ({columnas})
+                    SELECT {columnas} FROM tmp_importacion
+                    ORDER BY fila
+                    ON CONFLICT (estudiante_id, programa_id) DO NOTHING
+                    RETURNING estudiante_id, programa_id
+                ),
+                cupos AS (
+                    UPDATE programas_academicos p
+                    SET cupos_disponibles = p.cupos_disponibles - n.cantidad,
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (
+                        SELECT programa_id, COUNT(*) AS cantidad
+                        FROM nuevas GROUP BY programa_id
+                    ) n
+                    WHERE p.id = n.programa_id AND p.cupos_disponibles IS NOT NULL
+                )
+                SELECT estudiante_id, programa_id FROM nuevas
+            """
+            resultado = self._fusionar(
+                validas,
+                "fila INTEGER, estudiante_id INTEGER, programa_id INTEGER, "
+                "modalidad_pago TEXT, plan_pago_id INTEGER, monto_total DECIMAL(10,2), "
+                "descuento_aplicado DECIMAL(10,2), monto_final DECIMAL(10,2), "
+                "estado_academico TEXT, fecha_inicio DATE, observaciones TEXT",
+                COLUMNAS_MATRICULA,
+                fusion,
+                simular,
+            )
+            if resultado is None:
+                return self._resultado_error(len(filas), "Error al fusionar matrículas")
+
+            fusionadas = {(r[0], r[1]) for r in resultado}
+            for nro_fila, fila in validas:
+                if (fila["estudiante_id"], fila["programa_id"]) in fusionadas:
+                    insertados += 1
+                else:
+                    errores[nro_fila] = ["El estudiante ya está matriculado en este programa"]
+
+        return self._resultado(
+            "matrículas", ruta_archivo, ruta_reporte, encabezados, filas, errores,
+            insertados, 0, simular,
+        )
+
+    def _mapa(self, query: str, valores: List[Any]) -> Dict[Any, Any]:
+        """Ejecuta una consulta de dos columnas y la devuelve como diccionario"""
+        if not valores:
+            return {}
+        filas = self.execute_query(query, (valores,), dict_cursor=False) or []
+        return {fila[0]: fila[1] for fila in filas}
+
+    # ============ CARGA ============
+
+    def _fusionar(
+        self,
+        validas: List[Tuple[int, Dict[str, Any]]],
+        definicion: str,
+        columnas: List[str],
+        fusion: str,
+        simular: bool,
+    ) -> Optional[List[tuple]]:
+        """
+        Carga las filas con COPY en tmp_importacion y ejecuta la fusión
+
+        Todo ocurre en una transacción: ante un error no queda nada
+        importado.
+
+        Returns:
+            Optional[List[tuple]]: Filas devueltas por la fusión o None si hubo error
+        """
+        connection = self.get_connection()
+        if connection is None:
+            logger.error("No hay conexión disponible para importar")
+            return None
+
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for nro_fila, fila in validas:
+            escritor.writerow(
+                [nro_fila] + ["" if fila[c] is None else fila[c] for c in columnas]
+            )
+        buffer.seek(0)
+
+        try:
+            connection.rollback()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TEMP TABLE tmp_importacion ({definicion}) ON COMMIT DROP"
+                )
+                cursor.copy_expert(
+                    f"COPY tmp_importacion (fila, {', '.join(columnas)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+                cursor.execute(fusion)
+                resultado = cursor.fetchall()
+
+            if simular:
+                connection.rollback()
+            else:
+                connection.commit()
+            return resultado
+
+        except Exception as e:
+            logger.error(f"Error en la importación: {e}", exc_info=True)
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            return None
+
+        finally:
+            self.return_connection(connection)
+
+    # ============ REPORTE ============
+
+    @staticmethod
+    def _etiqueta(tipo: str) -> str:
+        return {"ci_numero": "CI", "email": "Email", "nombre": "Nombre completo"}[tipo]
+
+    def _escribir_reporte(
+        self,
+        ruta_reporte: str,
+        encabezados: List[str],
+        filas: List[Tuple[int, Dict[str, Any]]],
+        errores: Dict[int, List[str]],
+    ) -> None:
+        """Escribe las filas rechazadas con sus errores"""
+        claves = [self._normalizar_encabezado(e) for e in encabezados]
+        with open(ruta_reporte, "w", newline="", encoding="utf-8-sig") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["fila"] + encabezados + ["errores"])
+            for nro_fila, datos in filas:
+                if nro_fila in errores:
+                    escritor.writerow(
+                        [nro_fila]
+                        + ["" if datos.get(c) is None else datos.get(c) for c in claves]
+                        + ["; ".join(errores[nro_fila])]
+                    )
+
+    def _resultado(
+        self,
+        tipo: str,
+        ruta_archivo: str,
+        ruta_reporte: Optional[str],
+        encabezados: List[str],
+        filas: List[Tuple[int, Dict[str, Any]]],
+        errores: Dict[int, List[str]],
+        insertados: int,
+        actualizados: int,
+        simular: bool,
+    ) -> Dict[str, Any]:
+        """Escribe el reporte de errores (si hay) y construye el resultado"""
+        if errores:
+            ruta_reporte = ruta_reporte or f"{os.path.splitext(ruta_archivo)[0]}.errores.csv"
+            self._escribir_reporte(ruta_reporte, encabezados, filas, errores)
+        else:
+            ruta_reporte = None
+
+        mensaje = (
+            f"{insertados} {tipo} importados, {actualizados} actualizados, "
+            f"{len(errores)} filas rechazadas"
+        )
+        if simular:
+            mensaje += " (simulación: no se guardaron cambios)"
+        logger.info(f"Importación de {ruta_archivo}: {mensaje}")
+
+        return {
+            "exito": True,
+            "total": len(filas),
+            "insertados": insertados,
+            "actualizados": actualizados,
+            "rechazados": len(errores),
+            "ruta_reporte": ruta_reporte,
+            "mensaje": mensaje,
+        }
+
+    @staticmethod
+    def _resultado_error(total: int, mensaje: str) -> Dict[str, Any]:
+        """Resultado de una importación que no pudo completarse"""
+        return {
+            "exito": False,
+            "total": total,
+            "insertados": 0,
+            "actualizados": 0,
+            "rechazados": total,
+            "ruta_reporte": None,
+            "mensaje": mensaje,
+        }
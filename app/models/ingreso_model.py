@@ -6,6 +6,7 @@ Hereda de BaseModel para conexión a PostgreSQL
 
 import sys
 import os
+import calendar
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple, Union
@@ -13,6 +14,8 @@ from typing import Optional, List, Dict, Any, Tuple, Union
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .base_model import BaseModel
+from .numeracion_model import NumeracionModel
+from .resumen_financiero_model import ResumenFinancieroModel
 
 
 class IngresoModel(BaseModel):
@@ -122,23 +125,35 @@ class IngresoModel(BaseModel):
                 data["nro_cuota"] = self.nro_cuota
             if self.descripcion:
                 data["descripcion"] = self.descripcion
-            if self.nro_comprobante:
-                data["nro_comprobante"] = self.nro_comprobante
             if self.nro_transaccion:
                 data["nro_transaccion"] = self.nro_transaccion
             if self.registrado_por:
                 data["registrado_por"] = self.registrado_por
 
+            # Recibo correlativo asignado en la misma transacción del ingreso
+            if not self.nro_comprobante:
+                self.nro_comprobante = NumeracionModel().siguiente_numero(
+                    "RECIBO_INGRESO", modelo=self
+                )
+                if not self.nro_comprobante:
+                    self.rollback()
+                    return None
+            data["nro_comprobante"] = self.nro_comprobante
+
             # Insertar en base de datos
             result = self.insert(self.table_name, data, returning="id")
 
             if result:
+                # Confirma el ingreso junto con su número de recibo
+                self.commit()
                 self.id = result
                 return result
 
+            self.rollback()
             return None
 
         except Exception as e:
+            self.rollback()
             print(f"✗ Error guardando ingreso: {e}")
             return None
 
@@ -431,36 +446,37 @@ class IngresoModel(BaseModel):
             Dict[str, Any]: Estadísticas del mes
         """
         try:
-            instance = cls()
-
             fecha_inicio = f"{año:04d}-{mes:02d}-01"
-            if mes == 12:
-                fecha_fin = f"{año:04d}-12-31"
-            else:
-                fecha_fin = f"{año:04d}-{(mes+1):02d}-01"
-
-            query = """
-                SELECT 
-                    tipo_ingreso,
-                    COUNT(*) as cantidad,
-                    SUM(monto) as total_monto,
-                    forma_pago,
-                    COUNT(CASE WHEN estado = %s THEN 1 END) as confirmados,
-                    COUNT(CASE WHEN estado = %s THEN 1 END) as anulados
-                FROM ingresos 
-                WHERE fecha BETWEEN %s AND %s
-                GROUP BY tipo_ingreso, forma_pago
-                ORDER BY total_monto DESC
-            """
-
-            params = [
-                cls.ESTADO_CONFIRMADO,
-                cls.ESTADO_ANULADO,
-                fecha_inicio,
-                fecha_fin,
-            ]
-
-            results = instance.fetch_all(query, params)
+            fecha_fin = f"{año:04d}-{mes:02d}-{calendar.monthrange(año, mes)[1]:02d}"
+
+            # Acumulados diarios mantenidos por triggers: no recorre ingresos
+            filas = ResumenFinancieroModel().resumen_mes(
+                "INGRESO", año, mes, agrupar=["tipo", "forma_pago", "estado"]
+            )
+
+            detalle = {}
+            for fila in filas:
+                clave = (fila["tipo"], fila["forma_pago"])
+                if clave not in detalle:
+                    detalle[clave] = {
+                        "tipo_ingreso": fila["tipo"],
+                        "cantidad": 0,
+                        "total_monto": Decimal("0.00"),
+                        "forma_pago": fila["forma_pago"],
+                        "confirmados": 0,
+                        "anulados": 0,
+                    }
+                item = detalle[clave]
+                item["cantidad"] += fila["cantidad"]
+                item["total_monto"] += fila["total"]
+                if fila["estado"] == cls.ESTADO_CONFIRMADO:
+                    item["confirmados"] += fila["cantidad"]
+                elif fila["estado"] == cls.ESTADO_ANULADO:
+                    item["anulados"] += fila["cantidad"]
+
+            results = sorted(
+                detalle.values(), key=lambda d: d["total_monto"], reverse=True
+            )
 
             # Calcular totales
             total_general = 0
@@ -9,8 +9,26 @@ from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple, Union
 
+from utils.dinero import Dinero
+from app.utils.validators import EsquemaValidacion, Referencia
+
 
 class MatriculaModel(BaseModel):
+    # Esquema de validación compartido (se compila con la primera instancia)
+    _esquema: Optional[EsquemaValidacion] = None
+
+    # Mensajes para las restricciones de la tabla violadas al insertar
+    MENSAJES_RESTRICCION = {
+        "fk_matricula_estudiante": "Estudiante con ID {estudiante_id} no existe",
+        "fk_matricula_programa": "Programa con ID {programa_id} no existe",
+        "fk_matricula_plan_pago": "Plan de pago con ID {plan_pago_id} no existe",
+        "uk_matricula_unica": "El estudiante ya está matriculado en este programa",
+        "ck_montos_validos": "Los montos no pueden ser negativos",
+        "ck_monto_final_correcto": "Monto final debe ser igual a monto_total - descuento_aplicado",
+        "ck_plan_pago_consistente": "Modalidad CUOTAS requiere un plan de pago y CONTADO no debe tenerlo",
+        "ck_monto_pagado_no_excede": "Monto pagado no puede exceder monto final",
+    }
+
     def __init__(self):
         """Inicializa el modelo de matrículas"""
         super().__init__()
@@ -81,151 +99,124 @@ class MatriculaModel(BaseModel):
 
     # ============ MÉTODOS DE VALIDACIÓN ============
 
-    def _validate_matricula_data(
-        self, data: Dict[str, Any], for_update: bool = False
-    ) -> Tuple[bool, str]:
-        """
-        Valida los datos de la matrícula
-
-        Args:
-            data: Diccionario con datos de la matrícula
-            for_update: Si es True, valida para actualización
-
-        Returns:
-            Tuple[bool, str]: (es_válido, mensaje_error)
-        """
-        # Campos requeridos para creación
-        if not for_update:
-            for field in self.required_columns:
-                if field not in data or data[field] is None:
-                    return False, f"Campo requerido faltante: {field}"
-
-        # Validar modalidad de pago
-        if "modalidad_pago" in data and data["modalidad_pago"]:
-            if data["modalidad_pago"] not in self.MODALIDADES_PAGO:
-                return (
-                    False,
-                    f"Modalidad de pago inválida. Use: {', '.join(self.MODALIDADES_PAGO)}",
-                )
-
-        # Validar estado de pago si se proporciona
-        if "estado_pago" in data and data["estado_pago"]:
-            if data["estado_pago"] not in self.ESTADOS_PAGO:
-                return (
-                    False,
-                    f"Estado de pago inválido. Use: {', '.join(self.ESTADOS_PAGO)}",
-                )
-
-        # Validar estado académico si se proporciona
-        if "estado_academico" in data and data["estado_academico"]:
-            if data["estado_academico"] not in self.ESTADOS_ACADEMICOS:
-                return (
-                    False,
-                    f"Estado académico inválido. Use: {', '.join(self.ESTADOS_ACADEMICOS)}",
-                )
+    def _get_esquema(self) -> EsquemaValidacion:
+        """Esquema de validación compilado una sola vez para la clase"""
+        if MatriculaModel._esquema is None:
+            mensajes_monto = {
+                "invalido": "{campo} inválido",
+                "minimo": "{campo} no puede ser negativo",
+            }
+            monto = {"convertir": Dinero.de, "minimo": 0, "mensajes": mensajes_monto}
+
+            MatriculaModel._esquema = EsquemaValidacion(
+                {
+                    "estudiante_id": {
+                        "requerido": True,
+                        "referencia": Referencia(
+                            "estudiantes",
+                            "Estudiante con ID {valor} no existe",
+                            condicion="activo = TRUE",
+                        ),
+                    },
+                    "programa_id": {
+                        "requerido": True,
+                        "referencia": Referencia(
+                            "programas_academicos", "Programa con ID {valor} no existe"
+                        ),
+                    },
+                    "modalidad_pago": {
+                        "requerido": True,
+                        "opciones": self.MODALIDADES_PAGO,
+                        "mensajes": {"opciones": "Modalidad de pago inválida. Use: {opciones}"},
+                    },
+                    "plan_pago_id": {
+                        "referencia": Referencia(
+                            "planes_pago",
+                            "Plan de pago con ID {valor} no existe",
+                            condicion="activo = TRUE",
+                        ),
+                    },
+                    "monto_total": dict(monto, requerido=True),
+                    "descuento_aplicado": monto,
+                    "monto_final": dict(monto, requerido=True),
+                    "monto_pagado": monto,
+                    "estado_pago": {
+                        "opciones": self.ESTADOS_PAGO,
+                        "mensajes": {"opciones": "Estado de pago inválido. Use: {opciones}"},
+                    },
+                    "estado_academico": {
+                        "opciones": self.ESTADOS_ACADEMICOS,
+                        "mensajes": {
+                            "opciones": "Estado académico inválido. Use: {opciones}"
+                        },
+                    },
+                    "coordinador_id": {
+                        "referencia": Referencia(
+                            "docentes",
+                            "Coordinador con ID {valor} no existe",
+                            condicion="activo = TRUE",
+                        ),
+                    },
+                    "fecha_inicio": {"fecha": True},
+                    "fecha_conclusion": {"fecha": True},
+                },
+                reglas_fila=[
+                    self._regla_modalidad_plan,
+                    self._regla_monto_final,
+                    self._regla_monto_pagado,
+                    self._regla_fechas,
+                ],
+            )
+        return MatriculaModel._esquema
 
-        # Validar consistencia entre modalidad y plan de pago
+    @staticmethod
+    def _regla_modalidad_plan(data: Dict[str, Any]) -> Optional[str]:
+        """Consistencia entre modalidad y plan de pago"""
         if "modalidad_pago" in data and "plan_pago_id" in data:
             if data["modalidad_pago"] == "CUOTAS" and not data["plan_pago_id"]:
-                return False, "Modalidad CUOTAS requiere un plan de pago"
+                return "Modalidad CUOTAS requiere un plan de pago"
             elif data["modalidad_pago"] == "CONTADO" and data["plan_pago_id"]:
-                return False, "Modalidad CONTADO no debe tener plan de pago"
-
-        # Validar montos
-        montos_a_validar = [
-            "monto_total",
-            "descuento_aplicado",
-            "monto_final",
-            "monto_pagado",
-        ]
-        for monto_field in montos_a_validar:
-            if monto_field in data and data[monto_field] is not None:
-                try:
-                    monto = Decimal(str(data[monto_field]))
-                    if monto < 0:
-                        return False, f"{monto_field} no puede ser negativo"
-                except (ValueError, TypeError):
-                    return False, f"{monto_field} inválido"
+                return "Modalidad CONTADO no debe tener plan de pago"
+        return None
 
-        # Validar cálculo de monto final
+    @staticmethod
+    def _regla_monto_final(data: Dict[str, Any]) -> Optional[str]:
+        """monto_final = monto_total - descuento_aplicado"""
         if (
             "monto_total" in data
             and "descuento_aplicado" in data
             and "monto_final" in data
         ):
             try:
-                monto_total = Decimal(str(data.get("monto_total", 0)))
-                descuento = Decimal(str(data.get("descuento_aplicado", 0)))
-                monto_final = Decimal(str(data.get("monto_final", 0)))
+                monto_total = Dinero.de(data.get("monto_total", 0))
+                descuento = Dinero.de(data.get("descuento_aplicado", 0))
+                monto_final = Dinero.de(data.get("monto_final", 0))
 
                 if monto_final != (monto_total - descuento):
-                    return (
-                        False,
-                        "Monto final debe ser igual a monto_total - descuento_aplicado",
-                    )
-            except:
-                pass  # Si hay error en conversión, ya fue validado arriba
-
-        # Validar que monto pagado no exceda monto final
+                    return "Monto final debe ser igual a monto_total - descuento_aplicado"
+            except (ValueError, TypeError):
+                pass  # Si hay error en conversión, ya fue validado en el campo
+        return None
+
+    @staticmethod
+    def _regla_monto_pagado(data: Dict[str, Any]) -> Optional[str]:
+        """El monto pagado no excede el monto final"""
         if (
             "monto_pagado" in data
             and "monto_final" in data
             and data["monto_pagado"] is not None
         ):
             try:
-                monto_pagado = Decimal(str(data["monto_pagado"]))
-                monto_final = Decimal(str(data["monto_final"]))
-
-                if monto_pagado > monto_final:
-                    return False, "Monto pagado no puede exceder monto final"
-            except:
+                if Dinero.de(data["monto_pagado"]) > Dinero.de(data["monto_final"]):
+                    return "Monto pagado no puede exceder monto final"
+            except (ValueError, TypeError):
                 pass
+        return None
 
-        # Validar unicidad estudiante-programa
-        if "estudiante_id" in data and "programa_id" in data:
-            existing_id = None
-            if for_update and "id" in data:
-                existing_id = data["id"]
-
-            if self.matricula_exists(
-                data["estudiante_id"], data["programa_id"], exclude_id=existing_id
-            ):
-                return False, "El estudiante ya está matriculado en este programa"
-
-        # Validar existencia de referencias
-        if "estudiante_id" in data and data["estudiante_id"]:
-            if not self._estudiante_exists(data["estudiante_id"]):
-                return False, f"Estudiante con ID {data['estudiante_id']} no existe"
-
-        if "programa_id" in data and data["programa_id"]:
-            if not self._programa_exists(data["programa_id"]):
-                return False, f"Programa con ID {data['programa_id']} no existe"
-
-        if "plan_pago_id" in data and data["plan_pago_id"]:
-            if not self._plan_pago_exists(data["plan_pago_id"]):
-                return False, f"Plan de pago con ID {data['plan_pago_id']} no existe"
-
-        if "coordinador_id" in data and data["coordinador_id"]:
-            if not self._coordinador_exists(data["coordinador_id"]):
-                return False, f"Coordinador con ID {data['coordinador_id']} no existe"
-
-        # Validar fechas
-        date_fields = ["fecha_inicio", "fecha_conclusion"]
-        for field in date_fields:
-            if field in data and data[field]:
-                if not self._is_valid_date(data[field]):
-                    return (
-                        False,
-                        f"Formato de fecha inválido en {field}. Use YYYY-MM-DD",
-                    )
-
-        # Validar relación entre fechas
-        if (
-            "fecha_inicio" in data
-            and data["fecha_inicio"]
-            and "fecha_conclusion" in data
-            and data["fecha_conclusion"]
-        ):
+    @staticmethod
+    def _regla_fechas(data: Dict[str, Any]) -> Optional[str]:
+        """La conclusión no es anterior al inicio"""
+        if data.get("fecha_inicio") and data.get("fecha_conclusion"):
             try:
                 fecha_inicio = datetime.strptime(
                     data["fecha_inicio"], "%Y-%m-%d"
@@ -235,14 +226,86 @@ class MatriculaModel(BaseModel):
                 ).date()
 
                 if fecha_conclusion < fecha_inicio:
-                    return (
-                        False,
-                        "Fecha de conclusión no puede ser anterior a fecha de inicio",
-                    )
-            except:
+                    return "Fecha de conclusión no puede ser anterior a fecha de inicio"
+            except (ValueError, TypeError):
                 pass
+        return None
 
-        return True, "Datos válidos"
+    def _validate_matricula_data(
+        self, data: Dict[str, Any], for_update: bool = False
+    ) -> Tuple[bool, str]:
+        """
+        Valida los datos de la matrícula
+
+        Args:
+            data: Diccionario con datos de la matrícula
+            for_update: Si es True, valida para actualización
+
+        Returns:
+            Tuple[bool, str]: (es_válido, mensaje_error)
+        """
+        return self.validate_many([data], for_update=for_update)[0]
+
+    def validate_many(
+        self, rows: List[Dict[str, Any]], for_update: bool = False
+    ) -> List[Tuple[bool, str]]:
+        """
+        Valida un lote de matrículas
+
+        Las reglas se evalúan en memoria; las referencias (estudiante,
+        programa, plan de pago, coordinador) y la unicidad
+        estudiante-programa se comprueban con una consulta por tabla para
+        todo el lote. Dos filas del lote con el mismo estudiante y programa
+        también se rechazan.
+
+        Args:
+            rows: Filas a validar
+            for_update: Si es True, valida para actualización
+
+        Returns:
+            List[Tuple[bool, str]]: (es_válido, mensaje_error) por fila, en orden
+        """
+        resultados = self._get_esquema().validate_many(
+            rows, self.fetch_all, parcial=for_update
+        )
+
+        # Unicidad estudiante-programa
+        pares: Dict[int, Tuple[Any, Any]] = {}
+        for i, (valido, _) in enumerate(resultados):
+            fila = rows[i]
+            if valido and "estudiante_id" in fila and "programa_id" in fila:
+                try:
+                    pares[i] = (int(fila["estudiante_id"]), int(fila["programa_id"]))
+                except (ValueError, TypeError):
+                    continue
+
+        if not pares:
+            return resultados
+
+        existentes: Dict[Tuple[int, int], set] = {}
+        for fila in self.fetch_all(
+            f"""
+            SELECT id, estudiante_id, programa_id FROM {self.table_name}
+            WHERE estudiante_id = ANY(%s) AND programa_id = ANY(%s)
+            """,
+            (
+                list({e for e, _ in pares.values()}),
+                list({p for _, p in pares.values()}),
+            ),
+        ) or []:
+            existentes.setdefault(
+                (fila["estudiante_id"], fila["programa_id"]), set()
+            ).add(fila["id"])
+
+        vistos = set()
+        for i, par in pares.items():
+            propio = rows[i].get("id") if for_update else None
+            otros = existentes.get(par, set()) - {propio}
+            if otros or par in vistos:
+                resultados[i] = (False, "El estudiante ya está matriculado en este programa")
+            vistos.add(par)
+
+        return resultados
 
     def _is_valid_date(self, date_value: Any) -> bool:
         """Valida formato de fecha"""
@@ -256,44 +319,6 @@ class MatriculaModel(BaseModel):
             return True
         return False
 
-    def _estudiante_exists(self, estudiante_id: int) -> bool:
-        """Verifica si el estudiante existe"""
-        try:
-            query = "SELECT COUNT(*) as count FROM estudiantes WHERE id = %s AND activo = TRUE"
-            result = self.fetch_one(query, (estudiante_id,))
-            return result["count"] > 0 if result else False
-        except:
-            return False
-
-    def _programa_exists(self, programa_id: int) -> bool:
-        """Verifica si el programa existe"""
-        try:
-            query = "SELECT COUNT(*) as count FROM programas_academicos WHERE id = %s"
-            result = self.fetch_one(query, (programa_id,))
-            return result["count"] > 0 if result else False
-        except:
-            return False
-
-    def _plan_pago_exists(self, plan_pago_id: int) -> bool:
-        """Verifica si el plan de pago existe"""
-        try:
-            query = "SELECT COUNT(*) as count FROM planes_pago WHERE id = %s AND activo = TRUE"
-            result = self.fetch_one(query, (plan_pago_id,))
-            return result["count"] > 0 if result else False
-        except:
-            return False
-
-    def _coordinador_exists(self, coordinador_id: int) -> bool:
-        """Verifica si el coordinador existe (asumiendo que es un docente)"""
-        try:
-            query = (
-                "SELECT COUNT(*) as count FROM docentes WHERE id = %s AND activo = TRUE"
-            )
-            result = self.fetch_one(query, (coordinador_id,))
-            return result["count"] > 0 if result else False
-        except:
-            return False
-
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Sanitiza los datos de la matrícula
@@ -314,7 +339,7 @@ class MatriculaModel(BaseModel):
                 # Convertir decimales
                 elif key in self.decimal_columns and value is not None:
                     try:
-                        sanitized[key] = Decimal(str(value))
+                        sanitized[key] = Dinero.de(value)
                     except:
                         sanitized[key] = value
                 # Convertir enteros
@@ -341,9 +366,11 @@ class MatriculaModel(BaseModel):
         Returns:
             Optional[int]: ID de la matrícula creada o None si hay error
         """
-        # Sanitizar y validar datos
+        # Sanitizar y validar en memoria; referencias y unicidad las
+        # comprueba el propio INSERT
         data = self._sanitize_data(data)
-        is_valid, error_msg = self._validate_matricula_data(data, for_update=False)
+        esquema = self._get_esquema()
+        is_valid, error_msg = esquema.validate(data)
 
         if not is_valid:
             print(f"✗ Error validando datos: {error_msg}")
@@ -367,7 +394,13 @@ class MatriculaModel(BaseModel):
                     insert_data[key] = value
 
             # Insertar en base de datos
-            result = self.insert(self.table_name, insert_data, returning="id")
+            result, error_msg = self.insert_checked(
+                insert_data, esquema.referencias, self.MENSAJES_RESTRICCION
+            )
+
+            if error_msg:
+                print(f"✗ Error creando matrícula: {error_msg}")
+                return None
 
             if result:
                 print(f"✓ Matrícula creada exitosamente con ID: {result}")
@@ -518,6 +551,7 @@ class MatriculaModel(BaseModel):
         offset: int = 0,
         order_by: str = "fecha_matricula",
         order_desc: bool = True,
+        columns: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Obtiene todas las matrículas
@@ -531,13 +565,16 @@ class MatriculaModel(BaseModel):
             offset: Desplazamiento para paginación
             order_by: Campo para ordenar
             order_desc: Si es True, orden descendente
+            columns: Columnas de la matrícula (None para todas); los nombres
+                de estudiante y programa se incluyen siempre
 
         Returns:
             List[Dict]: Lista de matrículas
         """
+        select_list = self._select_list(columns, alias="m")
         try:
             query = f"""
-            SELECT m.*,
+            SELECT {select_list},
                    e.nombres as estudiante_nombres,
                    e.apellidos as estudiante_apellidos,
                    p.nombre as programa_nombre,
@@ -721,13 +758,15 @@ class MatriculaModel(BaseModel):
             print(f"✗ Error cambiando estado académico: {e}")
             return False
 
-    def registrar_pago(self, matricula_id: int, monto_pagado: Decimal) -> bool:
+    def registrar_pago(
+        self, matricula_id: int, monto_pagado: Union[Dinero, Decimal, float]
+    ) -> bool:
         """
         Registra un pago en la matrícula
 
         Args:
             matricula_id: ID de la matrícula
-            monto_pagado: Monto pagado a registrar
+            monto_pagado: Monto pagado a registrar (Dinero, Decimal o float)
 
         Returns:
             bool: True si se registró correctamente
@@ -739,9 +778,9 @@ class MatriculaModel(BaseModel):
                 return False
 
             # Calcular nuevo monto pagado
-            monto_actual = Decimal(str(matricula["monto_pagado"]))
-            monto_final = Decimal(str(matricula["monto_final"]))
-            nuevo_monto = monto_actual + monto_pagado
+            monto_actual = Dinero.de(matricula["monto_pagado"])
+            monto_final = Dinero.de(matricula["monto_final"])
+            nuevo_monto = monto_actual + Dinero.de(monto_pagado)
 
             # Validar que no exceda el monto final
             if nuevo_monto > monto_final:
@@ -750,7 +789,7 @@ class MatriculaModel(BaseModel):
                 )
                 return False
 
-            data = {"monto_pagado": float(nuevo_monto)}  # Convertir a float para la BD
+            data = {"monto_pagado": nuevo_monto}  # psycopg2 lo adapta como NUMERIC
 
             return self.update(matricula_id, data)
 
@@ -773,8 +812,8 @@ class MatriculaModel(BaseModel):
             if not matricula:
                 return False
 
-            monto_pagado = Decimal(str(matricula["monto_pagado"]))
-            monto_final = Decimal(str(matricula["monto_final"]))
+            monto_pagado = Dinero.de(matricula["monto_pagado"])
+            monto_final = Dinero.de(matricula["monto_final"])
 
             nuevo_estado = "PENDIENTE"
 
@@ -5,12 +5,33 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .base_model import BaseModel
+from .resumen_financiero_model import ResumenFinancieroModel
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple, Union
 
+from utils.dinero import Dinero, CERO
+from app.utils.validators import Referencia
+
 
 class MovimientoCajaModel(BaseModel):
+    # Referencias comprobadas dentro del INSERT
+    REFERENCIAS = (
+        (
+            "registrado_por",
+            Referencia(
+                "usuarios", "Usuario con ID {valor} no existe", condicion="activo = TRUE"
+            ),
+        ),
+    )
+
+    # Mensajes para las restricciones de la tabla violadas al insertar
+    MENSAJES_RESTRICCION = {
+        "uk_movimiento_origen": "Ya existe un movimiento para el origen {origen_tipo} con ID {origen_id}",
+        "fk_movimiento_registrado_por": "Usuario con ID {registrado_por} no existe",
+        "ck_movimiento_monto_positivo": "El monto debe ser mayor a 0",
+    }
+
     def __init__(self):
         """Inicializa el modelo de movimientos de caja"""
         super().__init__()
@@ -19,7 +40,7 @@ class MovimientoCajaModel(BaseModel):
 
         # Tipos enumerados según la base de datos
         self.TIPOS_MOVIMIENTO = ["INGRESO", "GASTO", "SALDO_INICIAL", "AJUSTE"]
-        self.TIPOS_ORIGEN = ["INGRESO", "GASTO"]
+        self.TIPOS_ORIGEN = ["INGRESO", "GASTO", "FACTURA"]
 
         # Columnas de la tabla para validación
         self.columns = [
@@ -48,7 +69,7 @@ class MovimientoCajaModel(BaseModel):
     # ============ MÉTODOS DE VALIDACIÓN ============
 
     def _validate_movimiento_data(
-        self, data: Dict[str, Any], for_update: bool = False
+        self, data: Dict[str, Any], for_update: bool = False, verificar_bd: bool = True
     ) -> Tuple[bool, str]:
         """
         Valida los datos del movimiento de caja
@@ -56,6 +77,8 @@ class MovimientoCajaModel(BaseModel):
         Args:
             data: Diccionario con datos del movimiento
             for_update: Si es True, valida para actualización
+            verificar_bd: Si es False, omite las consultas de unicidad de
+                origen y de usuario (create las delega al INSERT)
 
         Returns:
             Tuple[bool, str]: (es_válido, mensaje_error)
@@ -92,7 +115,7 @@ class MovimientoCajaModel(BaseModel):
         # Validar monto positivo
         if "monto" in data and data["monto"] is not None:
             try:
-                monto = Decimal(str(data["monto"]))
+                monto = Dinero.de(data["monto"])
                 if monto <= 0:
                     return False, "El monto debe ser mayor a 0"
             except (ValueError, TypeError):
@@ -100,7 +123,8 @@ class MovimientoCajaModel(BaseModel):
 
         # Validar unicidad origen_tipo/origen_id si se proporcionan
         if (
-            "origen_tipo" in data
+            verificar_bd
+            and "origen_tipo" in data
             and data["origen_tipo"]
             and "origen_id" in data
             and data["origen_id"]
@@ -118,7 +142,7 @@ class MovimientoCajaModel(BaseModel):
                 )
 
         # Validar usuario registrador si se proporciona
-        if "registrado_por" in data and data["registrado_por"]:
+        if verificar_bd and "registrado_por" in data and data["registrado_por"]:
             if not self._usuario_exists(data["registrado_por"]):
                 return False, f"Usuario con ID {data['registrado_por']} no existe"
 
@@ -191,7 +215,7 @@ class MovimientoCajaModel(BaseModel):
                 # Convertir decimales
                 elif key in self.decimal_columns and value is not None:
                     try:
-                        sanitized[key] = Decimal(str(value))
+                        sanitized[key] = Dinero.de(value)
                     except:
                         sanitized[key] = value
                 # Convertir enteros
@@ -236,7 +260,9 @@ class MovimientoCajaModel(BaseModel):
         if usuario_id:
             data["registrado_por"] = usuario_id
 
-        is_valid, error_msg = self._validate_movimiento_data(data, for_update=False)
+        is_valid, error_msg = self._validate_movimiento_data(
+            data, for_update=False, verificar_bd=False
+        )
 
         if not is_valid:
             print(f"✗ Error validando datos: {error_msg}")
@@ -253,8 +279,15 @@ class MovimientoCajaModel(BaseModel):
                 if key not in insert_data or insert_data[key] is None:
                     insert_data[key] = value
 
-            # Insertar en base de datos
-            result = self.insert(self.table_name, insert_data, returning="id")
+            # Insertar en base de datos: el usuario y la unicidad de origen se
+            # comprueban en la misma sentencia
+            result, error_msg = self.insert_checked(
+                insert_data, self.REFERENCIAS, self.MENSAJES_RESTRICCION
+            )
+
+            if error_msg:
+                print(f"✗ Error creando movimiento de caja: {error_msg}")
+                return None
 
             if result:
                 print(f"✓ Movimiento de caja creado exitosamente con ID: {result}")
@@ -412,6 +445,7 @@ class MovimientoCajaModel(BaseModel):
         offset: int = 0,
         order_by: str = "fecha",
         order_desc: bool = True,
+        columns: Optional[Union[str, List[str]]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Obtiene todos los movimientos de caja
@@ -426,13 +460,16 @@ class MovimientoCajaModel(BaseModel):
             offset: Desplazamiento para paginación
             order_by: Campo para ordenar
             order_desc: Si es True, orden descendente
+            columns: Columnas del movimiento (None para todas); los datos del
+                usuario que registró se incluyen siempre
 
         Returns:
             List[Dict]: Lista de movimientos
         """
+        select_list = self._select_list(columns, alias="mc")
         try:
             query = f"""
-            SELECT mc.*,
+            SELECT {select_list},
                    u.username as registrado_por_usuario,
                    u.nombre_completo as registrado_por_nombre
             FROM {self.table_name} mc
@@ -447,11 +484,11 @@ class MovimientoCajaModel(BaseModel):
                 params.append(tipo)
 
             if fecha_desde is not None:
-                conditions.append("DATE(mc.fecha) >= %s")
+                conditions.append("mc.fecha >= %s::date")
                 params.append(fecha_desde)
 
             if fecha_hasta is not None:
-                conditions.append("DATE(mc.fecha) <= %s")
+                conditions.append("mc.fecha < %s::date + 1")
                 params.append(fecha_hasta)
 
             if origen_tipo is not None:
@@ -585,11 +622,11 @@ class MovimientoCajaModel(BaseModel):
             params = [f"%{search_term}%"]
 
             if fecha_desde is not None:
-                query += " AND DATE(mc.fecha) >= %s"
+                query += " AND mc.fecha >= %s::date"
                 params.append(fecha_desde)
 
             if fecha_hasta is not None:
-                query += " AND DATE(mc.fecha) <= %s"
+                query += " AND mc.fecha < %s::date + 1"
                 params.append(fecha_hasta)
 
             query += " ORDER BY mc.fecha DESC"
@@ -613,46 +650,33 @@ class MovimientoCajaModel(BaseModel):
             Dict: Estadísticas de saldo
         """
         try:
-            # Construir consulta base
-            query_base = f"""
-            SELECT 
-                COALESCE(SUM(CASE WHEN tipo = 'INGRESO' THEN monto ELSE 0 END), 0) as total_ingresos,
-                COALESCE(SUM(CASE WHEN tipo = 'GASTO' THEN monto ELSE 0 END), 0) as total_gastos,
-                COALESCE(SUM(CASE WHEN tipo = 'SALDO_INICIAL' THEN monto ELSE 0 END), 0) as saldo_inicial,
-                COUNT(*) as total_movimientos
-            FROM {self.table_name}
-            """
-
-            params = []
-
-            if fecha_corte:
-                query_base += " WHERE DATE(fecha) <= %s"
-                params.append(fecha_corte)
-
-            result = self.fetch_one(query_base, params)
-
-            if result:
-                total_ingresos = Decimal(str(result["total_ingresos"]))
-                total_gastos = Decimal(str(result["total_gastos"]))
-                saldo_inicial = Decimal(str(result["saldo_inicial"]))
-
-                saldo_actual = saldo_inicial + total_ingresos - total_gastos
+            # Acumulados diarios mantenidos por triggers: no recorre movimientos
+            filas = ResumenFinancieroModel().totales_hasta(
+                "MOVIMIENTO", fecha_corte, agrupar=["tipo"]
+            )
 
-                return {
-                    "saldo_inicial": float(saldo_inicial),
-                    "total_ingresos": float(total_ingresos),
-                    "total_gastos": float(total_gastos),
-                    "saldo_actual": float(saldo_actual),
-                    "total_movimientos": result["total_movimientos"],
-                    "fecha_corte": fecha_corte or datetime.now().strftime("%Y-%m-%d"),
-                }
+            result = {
+                "total_ingresos": CERO,
+                "total_gastos": CERO,
+                "saldo_inicial": CERO,
+                "total_movimientos": 0,
+            }
+            for fila in filas:
+                clave = self._clave_total_tipo(fila["tipo"])
+                if clave:
+                    result[clave] += Dinero.de(fila["total"])
+                result["total_movimientos"] += fila["cantidad"] or 0
+
+            saldo_actual = (
+                result["saldo_inicial"] + result["total_ingresos"] - result["total_gastos"]
+            )
 
             return {
-                "saldo_inicial": 0.0,
-                "total_ingresos": 0.0,
-                "total_gastos": 0.0,
-                "saldo_actual": 0.0,
-                "total_movimientos": 0,
+                "saldo_inicial": float(result["saldo_inicial"]),
+                "total_ingresos": float(result["total_ingresos"]),
+                "total_gastos": float(result["total_gastos"]),
+                "saldo_actual": float(saldo_actual),
+                "total_movimientos": result["total_movimientos"],
                 "fecha_corte": fecha_corte or datetime.now().strftime("%Y-%m-%d"),
             }
 
@@ -684,12 +708,12 @@ class MovimientoCajaModel(BaseModel):
                 COUNT(*) as cantidad,
                 SUM(monto) as total
             FROM {self.table_name}
-            WHERE DATE(fecha) = %s
+            WHERE fecha >= %s::date AND fecha < %s::date + 1
             GROUP BY tipo
             ORDER BY tipo
             """
 
-            resultados = self.fetch_all(query, (fecha,))
+            resultados = self.fetch_all(query, (fecha, fecha))
 
             # Procesar resultados
             resumen = {
@@ -708,10 +732,11 @@ class MovimientoCajaModel(BaseModel):
 
                 resumen["detalle"][tipo] = {"total": total, "cantidad": cantidad}
 
-                if tipo == "INGRESO":
-                    resumen["ingresos"] = total
-                elif tipo == "GASTO":
-                    resumen["gastos"] = total
+                clave = self._clave_total_tipo(tipo)
+                if clave == "total_ingresos":
+                    resumen["ingresos"] += total
+                elif clave == "total_gastos":
+                    resumen["gastos"] += total
                 else:
                     resumen["otros"] += total
 
@@ -733,6 +758,23 @@ class MovimientoCajaModel(BaseModel):
                 "detalle": {},
             }
 
+    @staticmethod
+    def _clave_total_tipo(tipo: Optional[str]) -> Optional[str]:
+        """
+        Clave de total para un tipo de movimiento
+
+        El dominio d_tipo_movimiento solo admite INGRESO y EGRESO; GASTO se
+        mantiene por compatibilidad con TIPOS_MOVIMIENTO. EGRESO cuenta como
+        gasto: saldo = ingresos - egresos.
+        """
+        if tipo == "INGRESO":
+            return "total_ingresos"
+        if tipo in ("GASTO", "EGRESO"):
+            return "total_gastos"
+        if tipo == "SALDO_INICIAL":
+            return "saldo_inicial"
+        return None
+
     def get_estadisticas_periodo(
         self, fecha_desde: str, fecha_hasta: str
     ) -> Dict[str, Any]:
@@ -754,20 +796,10 @@ class MovimientoCajaModel(BaseModel):
                 ).strftime("%Y-%m-%d")
             )
 
-            # Obtener movimientos del período
-            query = f"""
-            SELECT 
-                tipo,
-                COUNT(*) as cantidad,
-                SUM(monto) as total,
-                DATE(fecha) as fecha_dia
-            FROM {self.table_name}
-            WHERE DATE(fecha) BETWEEN %s AND %s
-            GROUP BY tipo, DATE(fecha)
-            ORDER BY DATE(fecha), tipo
-            """
-
-            resultados = self.fetch_all(query, (fecha_desde, fecha_hasta))
+            # Obtener movimientos del período desde los acumulados diarios
+            resultados = ResumenFinancieroModel().resumen_diario(
+                "MOVIMIENTO", fecha_desde, fecha_hasta, agrupar=["tipo"]
+            )
 
             # Procesar resultados
             estadisticas = {
@@ -786,9 +818,9 @@ class MovimientoCajaModel(BaseModel):
 
             for row in resultados:
                 fecha_dia = (
-                    row["fecha_dia"].strftime("%Y-%m-%d")
-                    if hasattr(row["fecha_dia"], "strftime")
-                    else row["fecha_dia"]
+                    row["fecha"].strftime("%Y-%m-%d")
+                    if hasattr(row["fecha"], "strftime")
+                    else row["fecha"]
                 )
                 tipo = row["tipo"]
                 total = float(row["total"])
@@ -799,10 +831,11 @@ class MovimientoCajaModel(BaseModel):
                     dias[fecha_dia] = {"ingresos": 0.0, "gastos": 0.0, "movimientos": 0}
 
                 # Acumular por tipo
-                if tipo == "INGRESO":
+                clave = self._clave_total_tipo(tipo)
+                if clave == "total_ingresos":
                     estadisticas["total_ingresos"] += total
                     dias[fecha_dia]["ingresos"] += total
-                elif tipo == "GASTO":
+                elif clave == "total_gastos":
                     estadisticas["total_gastos"] += total
                     dias[fecha_dia]["gastos"] += total
 
@@ -872,11 +905,11 @@ class MovimientoCajaModel(BaseModel):
                 params.append(tipo)
 
             if fecha_desde is not None:
-                conditions.append("DATE(fecha) >= %s")
+                conditions.append("fecha >= %s::date")
                 params.append(fecha_desde)
 
             if fecha_hasta is not None:
-                conditions.append("DATE(fecha) <= %s")
+                conditions.append("fecha < %s::date + 1")
                 params.append(fecha_hasta)
 
             if conditions:
@@ -915,11 +948,11 @@ class MovimientoCajaModel(BaseModel):
             params = []
 
             if fecha_desde is not None:
-                conditions.append("DATE(fecha) >= %s")
+                conditions.append("fecha >= %s::date")
                 params.append(fecha_desde)
 
             if fecha_hasta is not None:
-                conditions.append("DATE(fecha) <= %s")
+                conditions.append("fecha < %s::date + 1")
                 params.append(fecha_hasta)
 
             if conditions:
@@ -0,0 +1,197 @@
+# app/models/numeracion_model.py
+"""
+Modelo para la numeración correlativa de documentos.
+
+Cada serie (facturas, comprobantes de gasto, recibos de ingreso) tiene una
+fila contador en series_numeracion. El siguiente número se obtiene con un
+único UPDATE ... RETURNING ejecutado en la misma conexión y transacción que
+inserta el documento:
+
+- La asignación es O(1): no se recorre la tabla del documento.
+- El bloqueo de la fila contador serializa a los emisores concurrentes, por
+  lo que no hay colisiones.
+- Si el documento falla y se hace ROLLBACK, el contador también vuelve atrás
+  y la serie queda sin huecos.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import logging
+from typing import Optional, Dict, Any, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Series conocidas: formato por defecto y origen para sincronizar el contador
+SERIES_NUMERACION = {
+    "FACTURA": {
+        "prefijo": "",
+        "digitos": 8,
+        "tabla": "facturas",
+        "columna": "nro_factura",
+    },
+    "GASTO": {
+        "prefijo": "GASTO-",
+        "digitos": 6,
+        "tabla": "gastos",
+        "columna": "comprobante_nro",
+    },
+    "RECIBO_INGRESO": {
+        "prefijo": "REC-",
+        "digitos": 8,
+        "tabla": "ingresos",
+        "columna": "nro_comprobante",
+    },
+}
+
+
+class NumeracionModel(BaseModel):
+    """Modelo para asignar números correlativos sin huecos por serie"""
+
+    TABLE_NAME = "series_numeracion"
+
+    def __init__(self):
+        """Inicializa el modelo de numeración"""
+        super().__init__()
+        self.table_name = self.TABLE_NAME
+
+    # ============ MÉTODOS DE VALIDACIÓN ============
+
+    def _validar_serie(self, serie: str) -> Dict[str, Any]:
+        """Verifica que la serie sea conocida y retorna su definición"""
+        if serie not in SERIES_NUMERACION:
+            raise ValueError(
+                f"Serie de numeración desconocida: {serie}. "
+                f"Válidas: {', '.join(SERIES_NUMERACION)}"
+            )
+        return SERIES_NUMERACION[serie]
+
+    @staticmethod
+    def formatear_numero(prefijo: str, digitos: int, valor: int) -> str:
+        """Formatea un valor del contador como número de documento"""
+        return f"{prefijo}{valor:0{digitos}d}"
+
+    # ============ ASIGNACIÓN ============
+
+    def siguiente_numero(
+        self, serie: str, modelo: Optional[BaseModel] = None
+    ) -> Optional[str]:
+        """
+        Asigna el siguiente número de la serie
+
+        Cuando se indica el modelo del documento, el UPDATE se ejecuta en su
+        conexión y NO se hace commit: el número queda reservado hasta que la
+        transacción del documento termine (commit) o se revierta (rollback).
+        Sin modelo, la asignación se confirma de inmediato y un documento que
+        luego falle deja un hueco en la serie.
+
+        Args:
+            serie: Serie de numeración (FACTURA, GASTO, RECIBO_INGRESO)
+            modelo: Modelo cuya transacción insertará el documento
+
+        Returns:
+            Optional[str]: Número formateado o None si hubo error
+        """
+        definicion = self._validar_serie(serie)
+        ejecutor = modelo if modelo is not None else self
+
+        query = f"""
+            UPDATE {self.table_name}
+            SET ultimo_numero = ultimo_numero + 1,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE serie = %s
+            RETURNING ultimo_numero, prefijo, digitos
+        """
+
+        fila = ejecutor.fetch_one(query, (serie,))
+
+        if fila is None:
+            # Serie aún no inicializada: crearla a partir de los números ya
+            # emitidos (no desde 0, que repetiría números) y reintentar una vez
+            creada = ejecutor.fetch_one(*self._consulta_sincronizar(serie))
+            if creada is not None:
+                fila = ejecutor.fetch_one(query, (serie,))
+
+        if fila is None:
+            logger.error(f"No se pudo asignar número para la serie {serie}")
+            return None
+
+        if modelo is None:
+            self.commit()
+
+        return self.formatear_numero(
+            fila["prefijo"], fila["digitos"], fila["ultimo_numero"]
+        )
+
+    # ============ CONSULTA Y MANTENIMIENTO ============
+
+    def obtener_serie(self, serie: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el estado actual de una serie
+
+        Args:
+            serie: Serie de numeración
+
+        Returns:
+            Optional[Dict]: Fila de la serie o None si no existe
+        """
+        self._validar_serie(serie)
+        return self.fetch_one(
+            f"SELECT * FROM {self.table_name} WHERE serie = %s", (serie,)
+        )
+
+    def sincronizar_serie(self, serie: str) -> Optional[int]:
+        """
+        Ajusta el contador al mayor número ya emitido en la tabla de origen
+
+        Pensado para la migración inicial o tras una carga manual de datos:
+        recorre la tabla del documento una vez. Nunca retrocede el contador.
+
+        Args:
+            serie: Serie de numeración
+
+        Returns:
+            Optional[int]: Valor del contador tras sincronizar o None si hubo error
+        """
+        fila = self.fetch_one(*self._consulta_sincronizar(serie))
+        if fila is None:
+            logger.error(f"No se pudo sincronizar la serie {serie}")
+            return None
+
+        self.commit()
+        logger.info(f"✓ Serie {serie} sincronizada en {fila['ultimo_numero']}")
+        return fila["ultimo_numero"]
+
+    def _consulta_sincronizar(self, serie: str) -> Tuple[str, tuple]:
+        """
+        Upsert que lleva el contador al mayor número emitido en la tabla de
+        origen (sin retroceder nunca); la misma lógica que la sección 7.4 de
+        database/PgSQL_Scheme.sql
+
+        Returns:
+            Tuple[str, tuple]: Consulta (RETURNING ultimo_numero) y parámetros
+        """
+        definicion = self._validar_serie(serie)
+        prefijo = definicion["prefijo"]
+        columna = definicion["columna"]
+
+        query = f"""
+            INSERT INTO {self.table_name} (serie, prefijo, digitos, ultimo_numero)
+            SELECT %s, %s, %s, COALESCE(MAX(SUBSTRING({columna} FROM %s)::BIGINT), 0)
+            FROM {definicion["tabla"]}
+            WHERE {columna} ~ %s
+            ON CONFLICT (serie) DO UPDATE
+            SET ultimo_numero = GREATEST(
+                    {self.table_name}.ultimo_numero, EXCLUDED.ultimo_numero
+                ),
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING ultimo_numero
+        """
+        patron = "^" + prefijo.replace("-", "\\-") + "[0-9]+$"
+
+        return query, (serie, prefijo, definicion["digitos"], len(prefijo) + 1, patron)
@@ -0,0 +1,360 @@
+# app/models/particion_model.py
+"""
+Modelo para la gestión de particiones mensuales.
+
+Las tablas de solo inserción que crecen indefinidamente (auditoria_transacciones
+y movimientos_caja) están particionadas por rango mensual sobre su columna de
+fecha. Este modelo crea las particiones futuras, las lista y aplica la
+retención desprendiendo (DETACH) y eliminando particiones completas en lugar de
+ejecutar DELETE masivos. Solo las filas antiguas que quedaron en la partición
+DEFAULT (meses sin partición propia) se eliminan en lotes.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import re
+import logging
+from datetime import datetime, date
+from typing import Optional, List, Dict, Any, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Tablas particionadas por mes y su columna de partición
+TABLAS_PARTICIONADAS = {
+    "auditoria_transacciones": "fecha_hora",
+    "movimientos_caja": "fecha",
+}
+
+# Límites de una partición de rango tal como los devuelve pg_get_expr
+_PATRON_LIMITES = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class ParticionModel(BaseModel):
+    """Modelo para crear, listar y retirar particiones mensuales"""
+
+    def __init__(self):
+        """Inicializa el modelo de particiones"""
+        super().__init__()
+
+        # Meses hacia adelante que deben existir siempre
+        self.MESES_ADELANTE = 3
+
+    # ============ MÉTODOS DE VALIDACIÓN ============
+
+    def _validar_tabla(self, tabla: str) -> None:
+        """Verifica que la tabla sea una tabla particionada conocida"""
+        if tabla not in TABLAS_PARTICIONADAS:
+            raise ValueError(
+                f"La tabla {tabla} no está particionada por mes. "
+                f"Válidas: {', '.join(TABLAS_PARTICIONADAS)}"
+            )
+
+    @staticmethod
+    def _inicio_mes(fecha: Union[str, date, datetime]) -> date:
+        """Normaliza una fecha al primer día de su mes"""
+        if isinstance(fecha, str):
+            fecha = datetime.strptime(fecha[:10], "%Y-%m-%d")
+        if isinstance(fecha, datetime):
+            fecha = fecha.date()
+        return fecha.replace(day=1)
+
+    # ============ CREACIÓN ============
+
+    def crear_particiones(
+        self,
+        tabla: str,
+        desde: Optional[Union[str, date, datetime]] = None,
+        meses: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Crea las particiones mensuales que falten
+
+        Si la partición DEFAULT tiene filas de un mes que se crea, la función
+        SQL las mueve a la partición nueva en la misma transacción.
+
+        Args:
+            tabla: Tabla particionada
+            desde: Primer mes a crear (por defecto el mes actual)
+            meses: Cantidad de meses (por defecto MESES_ADELANTE + 1)
+
+        Returns:
+            List[str]: Nombres de las particiones (existentes o creadas)
+        """
+        self._validar_tabla(tabla)
+
+        inicio = self._inicio_mes(desde or date.today())
+        if meses is None:
+            meses = self.MESES_ADELANTE + 1
+
+        query = "SELECT fn_crear_particiones_mensuales(%s, %s, %s) AS particion"
+        resultados = self.fetch_all(query, (tabla, inicio, meses))
+
+        if resultados is None:
+            logger.error(f"No se pudieron crear particiones para {tabla}")
+            return []
+
+        self.commit()
+
+        nombres = [r["particion"] for r in resultados]
+        logger.info(f"✓ Particiones aseguradas para {tabla}: {', '.join(nombres)}")
+        return nombres
+
+    def asegurar_particiones_futuras(self) -> Dict[str, List[str]]:
+        """
+        Crea las particiones del mes actual y los MESES_ADELANTE siguientes
+        para todas las tablas particionadas
+
+        Returns:
+            Dict[str, List[str]]: Particiones por tabla
+        """
+        return {tabla: self.crear_particiones(tabla) for tabla in TABLAS_PARTICIONADAS}
+
+    # ============ CONSULTA ============
+
+    def listar_particiones(self, tabla: str) -> List[Dict[str, Any]]:
+        """
+        Lista las particiones de una tabla con sus límites
+
+        Args:
+            tabla: Tabla particionada
+
+        Returns:
+            List[Dict]: nombre, desde, hasta (None para DEFAULT), es_default,
+            filas_estimadas y tamano_bytes, ordenadas por fecha
+        """
+        self._validar_tabla(tabla)
+
+        query = """
+            SELECT c.relname AS nombre,
+                   pg_get_expr(c.relpartbound, c.oid) AS limites,
+                   GREATEST(c.reltuples, 0)::BIGINT AS filas_estimadas,
+                   pg_total_relation_size(c.oid) AS tamano_bytes
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = %s
+        """
+        resultados = self.fetch_all(query, (tabla,)) or []
+
+        particiones = []
+        for fila in resultados:
+            limites = _PATRON_LIMITES.search(fila["limites"] or "")
+            particiones.append(
+                {
+                    "nombre": fila["nombre"],
+                    "desde": self._inicio_mes(limites.group(1)) if limites else None,
+                    "hasta": self._inicio_mes(limites.group(2)) if limites else None,
+                    "es_default": limites is None,
+                    "filas_estimadas": fila["filas_estimadas"],
+                    "tamano_bytes": fila["tamano_bytes"],
+                }
+            )
+
+        particiones.sort(key=lambda p: (p["es_default"], p["desde"] or date.max))
+        return particiones
+
+    def particiones_anteriores_a(
+        self, tabla: str, fecha_limite: Union[str, date, datetime]
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene las particiones cuyo rango completo es anterior a fecha_limite
+
+        Args:
+            tabla: Tabla particionada
+            fecha_limite: Fecha de corte
+
+        Returns:
+            List[Dict]: Particiones que pueden retirarse completas
+        """
+        if isinstance(fecha_limite, str):
+            fecha_limite = datetime.strptime(fecha_limite[:10], "%Y-%m-%d").date()
+        if isinstance(fecha_limite, datetime):
+            fecha_limite = fecha_limite.date()
+
+        return [
+            p
+            for p in self.listar_particiones(tabla)
+            if not p["es_default"] and p["hasta"] <= fecha_limite
+        ]
+
+    # ============ RETENCIÓN ============
+
+    def desprender_particion(self, tabla: str, particion: str) -> bool:
+        """
+        Desprende una partición de su tabla (queda como tabla independiente)
+
+        Args:
+            tabla: Tabla particionada
+            particion: Nombre de la partición
+
+        Returns:
+            bool: True si se desprendió correctamente
+        """
+        self._validar_tabla(tabla)
+        self._validar_particion(tabla, particion)
+
+        result = self.execute_query(
+            f"ALTER TABLE {tabla} DETACH PARTITION {particion}",
+            fetch=False,
+            commit=True,
+        )
+        if result is None:
+            logger.error(f"No se pudo desprender la partición {particion}")
+            return False
+
+        logger.warning(f"Partición {particion} desprendida de {tabla}")
+        return True
+
+    def eliminar_particion(self, tabla: str, particion: str) -> bool:
+        """
+        Desprende y elimina una partición completa
+
+        Args:
+            tabla: Tabla particionada
+            particion: Nombre de la partición
+
+        Returns:
+            bool: True si se eliminó correctamente
+        """
+        if not self.desprender_particion(tabla, particion):
+            return False
+
+        result = self.execute_query(
+            f"DROP TABLE {particion}", fetch=False, commit=True
+        )
+        if result is None:
+            logger.error(f"No se pudo eliminar la partición desprendida {particion}")
+            return False
+
+        logger.warning(f"Partición {particion} eliminada")
+        return True
+
+    def aplicar_retencion(
+        self,
+        tabla: str,
+        fecha_limite: Union[str, date, datetime],
+        eliminar: bool = True,
+        antes_de_retirar=None,
+        id_max: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Retira las particiones completamente anteriores a fecha_limite
+
+        Los meses que contienen la fecha límite se conservan completos; la
+        retención tiene granularidad mensual. Con eliminar=True también se
+        borran en lotes las filas de la partición DEFAULT anteriores a ese
+        mes (ver eliminar_antiguas_default).
+
+        Args:
+            tabla: Tabla particionada
+            fecha_limite: Fecha de corte
+            eliminar: Si es False, solo desprende las particiones
+            antes_de_retirar: Callable opcional (particion) -> bool que se
+                ejecuta antes de retirar cada partición (p. ej. un respaldo);
+                si retorna False la partición se conserva
+            id_max: Mayor ID que puede borrarse de la partición DEFAULT (el
+                último archivado); None para no acotar
+
+        Returns:
+            Dict[str, Any]: Particiones retiradas y conservadas, filas
+            retiradas con las particiones y filas borradas de DEFAULT
+        """
+        retiradas = []
+        conservadas = []
+        filas = 0
+
+        for particion in self.particiones_anteriores_a(tabla, fecha_limite):
+            nombre = particion["nombre"]
+
+            if antes_de_retirar is not None and not antes_de_retirar(particion):
+                logger.error(f"Se conserva {nombre}: falló el paso previo")
+                conservadas.append(nombre)
+                continue
+
+            total = self.fetch_scalar(f"SELECT COUNT(*) FROM {nombre}") or 0
+
+            if eliminar:
+                ok = self.eliminar_particion(tabla, nombre)
+            else:
+                ok = self.desprender_particion(tabla, nombre)
+
+            if ok:
+                retiradas.append(nombre)
+                filas += total
+            else:
+                conservadas.append(nombre)
+
+        filas_default = 0
+        if eliminar:
+            filas_default = self.eliminar_antiguas_default(tabla, fecha_limite, id_max)
+
+        return {
+            "tabla": tabla,
+            "fecha_limite": str(fecha_limite),
+            "particiones_retiradas": retiradas,
+            "particiones_conservadas": conservadas,
+            "filas_retiradas": filas,
+            "filas_default": filas_default,
+            "modo": "DROP" if eliminar else "DETACH",
+        }
+
+    def eliminar_antiguas_default(
+        self,
+        tabla: str,
+        fecha_limite: Union[str, date, datetime],
+        id_max: Optional[int] = None,
+    ) -> int:
+        """
+        Elimina en lotes las filas de la partición DEFAULT anteriores al mes
+        de fecha_limite
+
+        Son filas de meses que no tenían partición propia al insertarse. Se
+        borran de la partición DEFAULT directamente, de modo que las
+        particiones mensuales no se recorren.
+
+        Args:
+            tabla: Tabla particionada
+            fecha_limite: Fecha de corte (se conserva su mes completo)
+            id_max: Mayor ID que puede borrarse; None toma el mayor ID
+                presente al empezar, para no borrar filas nuevas
+
+        Returns:
+            int: Filas eliminadas
+        """
+        from .archivador_model import ArchivadorModel
+
+        self._validar_tabla(tabla)
+
+        default = next(
+            (p["nombre"] for p in self.listar_particiones(tabla) if p["es_default"]),
+            None,
+        )
+        if default is None:
+            return 0
+
+        if id_max is None:
+            id_max = self.fetch_scalar(f"SELECT MAX(id) FROM {default}")
+            if id_max is None:
+                return 0
+
+        eliminadas = ArchivadorModel().eliminar_por_lotes(
+            default,
+            f"{TABLAS_PARTICIONADAS[tabla]} < %s",
+            (self._inicio_mes(fecha_limite),),
+            id_max=id_max,
+        )
+        if eliminadas:
+            logger.warning(f"{eliminadas} filas antiguas eliminadas de {default}")
+        return eliminadas
+
+    def _validar_particion(self, tabla: str, particion: str) -> None:
+        """Verifica que la partición pertenezca a la tabla"""
+        nombres = {p["nombre"] for p in self.listar_particiones(tabla)}
+        if particion not in nombres:
+            raise ValueError(f"{particion} no es una partición de {tabla}")
@@ -9,6 +9,14 @@ from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple, Union
 
+from utils.calculos_financieros import (
+    a_centavos,
+    porcentaje_escalado,
+    descuento_centavos,
+    cuotas_centavos,
+    tabla_precios,
+)
+
 
 class ProgramasAcademicosModel(BaseModel):
     def __init__(self):
@@ -408,14 +416,16 @@ class ProgramasAcademicosModel(BaseModel):
         return instance.get_all(**kwargs)
 
     # Y asegurar que el método get_all existente tenga self:
-    def get_all(self, estado=None, active_only=True, limit=100, offset=0):
+    def get_all(self, estado=None, active_only=True, limit=100, offset=0, columns=None):
         """
         Obtiene todos los programas académicos
         FIX: Ahora es método de instancia
+        columns: columnas a leer (None para todas, ver BaseModel._select_list)
         """
+        select_list = self._select_list(columns)
         try:
-            query = """
-            SELECT * FROM programas_academicos
+            query = f"""
+            SELECT {select_list} FROM programas_academicos
             """
             conditions = []
             params = []
@@ -822,6 +832,9 @@ class ProgramasAcademicosModel(BaseModel):
         """
         Calcula el costo total del programa
 
+        Usa las mismas reglas y el mismo redondeo en centavos que
+        calcular_costos_lote, por lo que ambos dan resultados idénticos.
+
         Args:
             programa_id: ID del programa
             pago_contado: Si es True, aplica descuento por pago contado
@@ -844,9 +857,9 @@ class ProgramasAcademicosModel(BaseModel):
             if programa["promocion_activa"]:
                 # Verificar si la promoción está vigente
                 if programa["promocion_fecha_limite"]:
-                    fecha_limite = datetime.strptime(
-                        programa["promocion_fecha_limite"], "%Y-%m-%d"
-                    ).date()
+                    fecha_limite = programa["promocion_fecha_limite"]
+                    if isinstance(fecha_limite, str):
+                        fecha_limite = datetime.strptime(fecha_limite[:10], "%Y-%m-%d").date()
                     if date.today() <= fecha_limite:
                         descuento_aplicar = Decimal(
                             str(programa["descuento_promocion"] or 0)
@@ -854,30 +867,97 @@ class ProgramasAcademicosModel(BaseModel):
             elif pago_contado:
                 descuento_aplicar = Decimal(str(programa["descuento_contado"] or 0))
 
-            # Calcular montos
-            subtotal = costo_base + costo_inscripcion + costo_matricula
-            descuento_monto = (subtotal * descuento_aplicar) / 100
+            # Calcular montos en centavos
+            subtotal = (
+                a_centavos(costo_base)
+                + a_centavos(costo_inscripcion)
+                + a_centavos(costo_matricula)
+            )
+            descuento_monto = descuento_centavos(
+                subtotal, porcentaje_escalado(descuento_aplicar)
+            )
             total = subtotal - descuento_monto
+            nro_cuotas = programa["cuotas_mensuales"] or 0
+            cuota, ultima_cuota = (
+                cuotas_centavos(total, nro_cuotas) if nro_cuotas > 0 else (total, total)
+            )
 
             return {
                 "costo_base": costo_base,
                 "costo_inscripcion": costo_inscripcion,
                 "costo_matricula": costo_matricula,
-                "subtotal": subtotal,
+                "subtotal": self._desde_centavos(subtotal),
                 "descuento_porcentaje": descuento_aplicar,
-                "descuento_monto": descuento_monto,
-                "total": total,
-                "cuota_mensual": (
-                    total / Decimal(str(programa["cuotas_mensuales"]))
-                    if programa["cuotas_mensuales"] > 0
-                    else total
-                ),
+                "descuento_monto": self._desde_centavos(descuento_monto),
+                "total": self._desde_centavos(total),
+                "cuota_mensual": self._desde_centavos(cuota),
+                "ultima_cuota": self._desde_centavos(ultima_cuota),
             }
 
         except Exception as e:
             print(f"✗ Error calculando costo total: {e}")
             return {}
 
+    def calcular_costos_lote(
+        self,
+        programa_ids: Optional[List[int]] = None,
+        nros_cuotas: Optional[List[int]] = None,
+        escenarios: Optional[List[Optional[float]]] = None,
+        pago_contado: bool = False,
+        fecha: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        Calcula precios de muchos programas, planes y escenarios a la vez
+
+        Lee los programas con una sola consulta y calcula con
+        utils.calculos_financieros.tabla_precios (NumPy, centavos enteros).
+
+        Args:
+            programa_ids: Programas a evaluar (None para todos)
+            nros_cuotas: Números de cuotas a simular (por defecto los
+                cuotas_mensuales de los programas leídos)
+            escenarios: Porcentajes de descuento a evaluar; None en la lista
+                aplica la regla del programa (promoción o contado)
+            pago_contado: Aplicar descuento por pago contado en la regla
+            fecha: Fecha para evaluar la vigencia de promociones (hoy por defecto)
+
+        Returns:
+            Dict: programas (filas leídas), nros_cuotas, escenarios y los
+            arreglos en centavos de tabla_precios
+        """
+        query = f"""
+            SELECT id, codigo, nombre, costo_base, costo_inscripcion, costo_matricula,
+                   descuento_contado, promocion_activa, descuento_promocion,
+                   promocion_fecha_limite, cuotas_mensuales
+            FROM {self.table_name}
+        """
+        params = []
+        if programa_ids is not None:
+            query += " WHERE id = ANY(%s)"
+            params.append(list(programa_ids))
+        query += " ORDER BY id"
+
+        programas = self.fetch_all(query, params) or []
+        if nros_cuotas is None:
+            nros_cuotas = sorted({p["cuotas_mensuales"] or 1 for p in programas}) or [1]
+        escenarios = [None] if escenarios is None else list(escenarios)
+
+        resultado = {
+            "programas": programas,
+            "nros_cuotas": list(nros_cuotas),
+            "escenarios": escenarios,
+        }
+        if programas:
+            resultado.update(
+                tabla_precios(programas, nros_cuotas, escenarios, pago_contado, fecha)
+            )
+        return resultado
+
+    @staticmethod
+    def _desde_centavos(centavos: int) -> Decimal:
+        """Convierte centavos enteros a Decimal con 2 decimales"""
+        return Decimal(int(centavos)).scaleb(-2)
+
     # ============ MÉTODOS DE VALIDACIÓN DE UNICIDAD ============
 
     def codigo_exists(self, codigo: str, exclude_id: Optional[int] = None) -> bool:
@@ -0,0 +1,269 @@
+# app/models/resumen_financiero_model.py
+"""
+Modelo para los acumulados financieros diarios (tabla resumen_financiero).
+
+La tabla se mantiene de forma incremental con triggers por sentencia sobre
+ingresos, gastos, facturas y movimientos_caja: cada fila guarda cantidad y
+total por fuente, día y dimensiones (tipo, categoría, forma de pago,
+estado). Los reportes mensuales y comparativos leen unas pocas filas del
+resumen en lugar de recorrer las tablas de origen, por lo que su costo no
+crece con el historial.
+
+Las dimensiones ausentes se guardan como cadena vacía ('') para que formen
+parte de la clave primaria; los lectores las devuelven como None.
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import logging
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+FechaLike = Union[str, date, datetime]
+
+
+class ResumenFinancieroModel(BaseModel):
+    """Modelo de lectura y mantenimiento de resumen_financiero"""
+
+    TABLE_NAME = "resumen_financiero"
+
+    FUENTES = ["INGRESO", "GASTO", "FACTURA", "MOVIMIENTO"]
+    DIMENSIONES = ["tipo", "categoria", "forma_pago", "estado"]
+
+    def __init__(self):
+        """Inicializa el modelo de resumen financiero"""
+        super().__init__()
+        self.table_name = self.TABLE_NAME
+
+    # ============ MÉTODOS DE VALIDACIÓN ============
+
+    def _validar_fuente(self, fuente: str) -> None:
+        """Verifica que la fuente sea válida"""
+        if fuente not in self.FUENTES:
+            raise ValueError(f"Fuente inválida. Válidas: {', '.join(self.FUENTES)}")
+
+    def _validar_dimensiones(self, agrupar: Optional[List[str]]) -> List[str]:
+        """Verifica las dimensiones de agrupación y las retorna"""
+        agrupar = list(agrupar or [])
+        for dimension in agrupar:
+            if dimension not in self.DIMENSIONES:
+                raise ValueError(
+                    f"Dimensión inválida: {dimension}. "
+                    f"Válidas: {', '.join(self.DIMENSIONES)}"
+                )
+        return agrupar
+
+    @staticmethod
+    def _a_fecha(valor: FechaLike) -> date:
+        """Convierte str (YYYY-MM-DD), date o datetime a date"""
+        if isinstance(valor, datetime):
+            return valor.date()
+        if isinstance(valor, date):
+            return valor
+        return datetime.strptime(str(valor)[:10], "%Y-%m-%d").date()
+
+    @staticmethod
+    def _columnas(agrupar: List[str]) -> str:
+        """Columnas de agrupación con '' convertido a NULL"""
+        return "".join(f"NULLIF({d}, '') AS {d}, " for d in agrupar)
+
+    # ============ LECTURA ============
+
+    def resumen_mes(
+        self,
+        fuente: str,
+        año: int,
+        mes: int,
+        agrupar: Optional[List[str]] = None,
+        filtros: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales de un mes agrupados por las dimensiones indicadas
+
+        Args:
+            fuente: INGRESO, GASTO, FACTURA o MOVIMIENTO
+            año: Año
+            mes: Mes (1-12)
+            agrupar: Dimensiones de agrupación (tipo, categoria, forma_pago, estado)
+            filtros: Igualdades adicionales sobre dimensiones
+
+        Returns:
+            List[Dict]: Filas con las dimensiones, cantidad y total
+        """
+        self._validar_fuente(fuente)
+        agrupar = self._validar_dimensiones(agrupar)
+        condicion, params = self._condicion_filtros(filtros)
+
+        query = f"""
+            SELECT {self._columnas(agrupar)}
+                   SUM(cantidad)::BIGINT AS cantidad, SUM(total) AS total
+            FROM {self.table_name}
+            WHERE fuente = %s AND anio = %s AND mes = %s{condicion}
+            {self._agrupacion(agrupar)}
+            HAVING SUM(cantidad) <> 0
+            ORDER BY total DESC
+        """
+        return self.fetch_all(query, (fuente, año, mes) + params) or []
+
+    def resumen_diario(
+        self,
+        fuente: str,
+        fecha_desde: FechaLike,
+        fecha_hasta: FechaLike,
+        agrupar: Optional[List[str]] = None,
+        filtros: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales por día en un rango de fechas (ambos extremos incluidos)
+
+        Args:
+            fuente: INGRESO, GASTO, FACTURA o MOVIMIENTO
+            fecha_desde: Fecha inicial
+            fecha_hasta: Fecha final
+            agrupar: Dimensiones de agrupación además del día
+            filtros: Igualdades adicionales sobre dimensiones
+
+        Returns:
+            List[Dict]: Filas con fecha, dimensiones, cantidad y total
+        """
+        self._validar_fuente(fuente)
+        agrupar = self._validar_dimensiones(agrupar)
+        condicion, params = self._condicion_filtros(filtros)
+        desde = self._a_fecha(fecha_desde)
+        hasta = self._a_fecha(fecha_hasta)
+
+        query = f"""
+            SELECT make_date(anio, mes, dia) AS fecha, {self._columnas(agrupar)}
+                   SUM(cantidad)::BIGINT AS cantidad, SUM(total) AS total
+            FROM {self.table_name}
+            WHERE fuente = %s
+              AND (anio, mes, dia) >= (%s, %s, %s)
+              AND (anio, mes, dia) <= (%s, %s, %s){condicion}
+            GROUP BY anio, mes, dia{''.join(', ' + d for d in agrupar)}
+            HAVING SUM(cantidad) <> 0
+            ORDER BY anio, mes, dia
+        """
+        params = (
+            fuente,
+            desde.year, desde.month, desde.day,
+            hasta.year, hasta.month, hasta.day,
+        ) + params
+        return self.fetch_all(query, params) or []
+
+    def totales_hasta(
+        self,
+        fuente: str,
+        fecha_corte: Optional[FechaLike] = None,
+        agrupar: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales acumulados desde el inicio hasta una fecha (incluida)
+
+        Args:
+            fuente: INGRESO, GASTO, FACTURA o MOVIMIENTO
+            fecha_corte: Última fecha incluida, None para no limitar
+            agrupar: Dimensiones de agrupación
+
+        Returns:
+            List[Dict]: Filas con las dimensiones, cantidad y total
+        """
+        self._validar_fuente(fuente)
+        agrupar = self._validar_dimensiones(agrupar)
+
+        condicion = ""
+        params = (fuente,)
+        if fecha_corte is not None:
+            corte = self._a_fecha(fecha_corte)
+            condicion = " AND (anio, mes, dia) <= (%s, %s, %s)"
+            params += (corte.year, corte.month, corte.day)
+
+        query = f"""
+            SELECT {self._columnas(agrupar)}
+                   SUM(cantidad)::BIGINT AS cantidad, SUM(total) AS total
+            FROM {self.table_name}
+            WHERE fuente = %s{condicion}
+            {self._agrupacion(agrupar)}
+        """
+        return self.fetch_all(query, params) or []
+
+    def comparativo_anual(
+        self,
+        fuente: str,
+        años: List[int],
+        filtros: Optional[Dict[str, str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Totales mensuales de varios años para comparativos
+
+        Args:
+            fuente: INGRESO, GASTO, FACTURA o MOVIMIENTO
+            años: Años a comparar
+            filtros: Igualdades adicionales sobre dimensiones
+
+        Returns:
+            List[Dict]: Filas con anio, mes, cantidad y total
+        """
+        self._validar_fuente(fuente)
+        condicion, params = self._condicion_filtros(filtros)
+
+        query = f"""
+            SELECT anio, mes, SUM(cantidad)::BIGINT AS cantidad, SUM(total) AS total
+            FROM {self.table_name}
+            WHERE fuente = %s AND anio = ANY(%s){condicion}
+            GROUP BY anio, mes
+            ORDER BY anio, mes
+        """
+        return self.fetch_all(query, (fuente, list(años)) + params) or []
+
+    def _condicion_filtros(self, filtros: Optional[Dict[str, str]]) -> tuple:
+        """Construye condiciones AND de igualdad sobre dimensiones"""
+        if not filtros:
+            return "", ()
+        self._validar_dimensiones(list(filtros))
+        condicion = "".join(f" AND {d} = %s" for d in filtros)
+        return condicion, tuple(v or "" for v in filtros.values())
+
+    @staticmethod
+    def _agrupacion(agrupar: List[str]) -> str:
+        """Cláusula GROUP BY para las dimensiones (vacía si no hay)"""
+        return f"GROUP BY {', '.join(agrupar)}" if agrupar else ""
+
+    # ============ MANTENIMIENTO ============
+
+    def reconstruir(self, conservar_archivado: bool = True) -> Optional[int]:
+        """
+        Recalcula todo el resumen desde las tablas de origen
+
+        Para la carga inicial tras crear la tabla o para reparar el resumen
+        después de cargas que desactivaron los triggers.
+
+        Los movimientos de caja retirados por retención ya no están en
+        movimientos_caja, pero siguen contando en el resumen (y en el saldo).
+        Con conservar_archivado=True se mantienen las filas MOVIMIENTO
+        anteriores al movimiento más antiguo que queda; con False el
+        resumen refleja solo las filas presentes y el saldo histórico cambia.
+
+        Args:
+            conservar_archivado: Conservar el resumen de movimientos archivados
+
+        Returns:
+            Optional[int]: Filas del resumen generadas o None si hubo error
+        """
+        filas = self.fetch_scalar(
+            "SELECT fn_reconstruir_resumen_financiero(%s)", (conservar_archivado,)
+        )
+        if filas is None:
+            logger.error("No se pudo reconstruir el resumen financiero")
+            return None
+
+        self.commit()
+        logger.info(f"✓ Resumen financiero reconstruido: {filas} filas")
+        return filas
@@ -0,0 +1,243 @@
+# app/models/seguridad_passwords.py
+"""
+Verificación de contraseñas fuera del hilo que llama y limitación de intentos.
+
+- VerificadorPasswords: ejecuta PBKDF2 (o bcrypt para hashes heredados) en
+  un pool de hilos propio, con un semáforo que acota los cálculos en curso
+  o en espera. Así el hilo de la GUI no se congela durante el login y un
+  ataque por fuerza bruta no puede acaparar la CPU.
+- LimitadorIntentos: espera exponencial por usuario y por IP tras varios
+  fallos consecutivos.
+- calibrar_iteraciones: mide PBKDF2 en el equipo y elige el número de
+  iteraciones para una latencia objetivo.
+
+hashlib.pbkdf2_hmac libera el GIL, por lo que el pool aprovecha varios
+núcleos.
+"""
+
+import time
+import hashlib
+import secrets
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Iterable, Tuple
+
+try:
+    import bcrypt
+
+    BCRYPT_SUPPORT = True
+except ImportError:
+    BCRYPT_SUPPORT = False
+
+logger = logging.getLogger(__name__)
+
+# Prefijos de hashes bcrypt (p. ej. el administrador inicial del esquema)
+PREFIJOS_BCRYPT = ("$2a$", "$2b$", "$2y$")
+
+
+# ============================================================
+# HASH Y VERIFICACIÓN
+# ============================================================
+
+
+def _partes_pbkdf2(stored_hash: str) -> Tuple[str, str, str, str]:
+    """
+    (algoritmo, iteraciones, salt, hash) de un hash PBKDF2
+
+    La sal puede contener ':' (se genera con signos de puntuación); el hash
+    hexadecimal nunca, así que se separa desde ambos extremos.
+    """
+    algorithm, iterations_str, resto = stored_hash.split(":", 2)
+    salt, original_hash = resto.rsplit(":", 1)
+    return algorithm, iterations_str, salt, original_hash
+
+
+def generar_hash(password: str, salt: str, algoritmo: str, iteraciones: int) -> str:
+    """Hash PBKDF2 en formato algoritmo:iteraciones:salt:hash"""
+    hash_obj = hashlib.pbkdf2_hmac(
+        algoritmo, password.encode("utf-8"), salt.encode("utf-8"), iteraciones
+    )
+    return f"{algoritmo}:{iteraciones}:{salt}:{hash_obj.hex()}"
+
+
+def verificar_hash(password: str, stored_hash: str) -> bool:
+    """
+    Verifica una contraseña contra un hash PBKDF2 o bcrypt
+
+    Los hashes bcrypt solo se pueden verificar si el paquete bcrypt está
+    instalado.
+    """
+    if not stored_hash:
+        return False
+
+    if stored_hash.startswith(PREFIJOS_BCRYPT):
+        if not BCRYPT_SUPPORT:
+            logger.warning("Hash bcrypt heredado pero el paquete bcrypt no está instalado")
+            return False
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), stored_hash.encode("utf-8"))
+        except ValueError:
+            return False
+
+    try:
+        algorithm, iterations_str, salt, original_hash = _partes_pbkdf2(stored_hash)
+        hash_obj = hashlib.pbkdf2_hmac(
+            algorithm, password.encode("utf-8"), salt.encode("utf-8"), int(iterations_str)
+        )
+        # Comparar hashes de manera segura (timing-safe)
+        return secrets.compare_digest(hash_obj.hex(), original_hash)
+    except (ValueError, TypeError):
+        return False
+
+
+def requiere_rehash(stored_hash: str, algoritmo: str, iteraciones: int) -> bool:
+    """True si el hash es heredado (bcrypt), de otro algoritmo o de menor costo"""
+    if not stored_hash or stored_hash.startswith(PREFIJOS_BCRYPT):
+        return True
+    try:
+        algorithm, iterations_str, _, _ = _partes_pbkdf2(stored_hash)
+        return algorithm != algoritmo or int(iterations_str) < iteraciones
+    except ValueError:
+        return True
+
+
+def calibrar_iteraciones(
+    objetivo_ms: float = 250.0,
+    algoritmo: str = "sha256",
+    minimo: int = 100_000,
+    muestra: int = 50_000,
+    repeticiones: int = 3,
+) -> Tuple[int, float]:
+    """
+    Elige las iteraciones PBKDF2 que tardan aproximadamente objetivo_ms
+
+    Mide `muestra` iteraciones (mejor de `repeticiones`), escala linealmente
+    y redondea a múltiplos de 10.000 sin bajar de `minimo`.
+
+    Returns:
+        Tuple[int, float]: (iteraciones, ms medidos por cada 1000 iteraciones)
+    """
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        hashlib.pbkdf2_hmac(algoritmo, b"calibracion", b"sal-calibracion", muestra)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    ms_por_mil = mejor * 1000 / muestra * 1000
+    iteraciones = int(objetivo_ms / ms_por_mil * 1000) // 10_000 * 10_000
+    return max(minimo, iteraciones), ms_por_mil
+
+
+# ============================================================
+# EJECUCIÓN FUERA DEL HILO QUE LLAMA
+# ============================================================
+
+
+class VerificadorPasswords:
+    """
+    Pool compartido para calcular hashes de contraseñas
+
+    max_hilos cálculos se ejecutan a la vez y, como mucho, max_pendientes
+    esperan turno; si el pool está saturado enviar() devuelve None en lugar
+    de encolar sin límite.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_hilos: int = 2, max_pendientes: int = 8):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_hilos, thread_name_prefix="hash-password"
+        )
+        self._semaforo = threading.BoundedSemaphore(max_hilos + max_pendientes)
+
+    @classmethod
+    def get_instance(cls) -> "VerificadorPasswords":
+        """Obtiene el verificador compartido del proceso"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def enviar(self, funcion, *args) -> Optional[Future]:
+        """
+        Ejecuta funcion(*args) en el pool
+
+        Returns:
+            Optional[Future]: Futuro con el resultado, o None si el pool está
+            saturado
+        """
+        if not self._semaforo.acquire(blocking=False):
+            return None
+        try:
+            futuro = self._executor.submit(funcion, *args)
+        except RuntimeError:
+            self._semaforo.release()
+            raise
+        futuro.add_done_callback(lambda _: self._semaforo.release())
+        return futuro
+
+
+# ============================================================
+# LIMITACIÓN DE INTENTOS
+# ============================================================
+
+
+class LimitadorIntentos:
+    """
+    Espera exponencial tras fallos consecutivos, por clave
+
+    Las claves son, por ejemplo, "usuario:admin" e "ip:10.0.0.5". Tras
+    `umbral` fallos, cada fallo adicional duplica la espera (desde
+    espera_base hasta espera_max segundos). Un login correcto reinicia las
+    claves.
+    """
+
+    def __init__(
+        self,
+        umbral: int = 3,
+        espera_base: float = 1.0,
+        espera_max: float = 300.0,
+        max_claves: int = 10000,
+    ):
+        self.umbral = umbral
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self.max_claves = max_claves
+        # clave -> (fallos, bloqueada_hasta)
+        self._claves: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def espera(self, claves: Iterable[str]) -> float:
+        """Segundos que faltan para admitir otro intento (0 si se admite)"""
+        ahora = time.monotonic()
+        with self._lock:
+            hasta = max(
+                (self._claves.get(c, (0, 0.0))[1] for c in claves), default=0.0
+            )
+        return max(0.0, hasta - ahora)
+
+    def registrar_fallo(self, claves: Iterable[str]) -> None:
+        ahora = time.monotonic()
+        with self._lock:
+            for clave in claves:
+                fallos = self._claves.get(clave, (0, 0.0))[0] + 1
+                bloqueada_hasta = 0.0
+                if fallos >= self.umbral:
+                    espera = min(
+                        self.espera_max,
+                        self.espera_base * 2 ** (fallos - self.umbral),
+                    )
+                    bloqueada_hasta = ahora + espera
+                self._claves[clave] = (fallos, bloqueada_hasta)
+                self._claves.move_to_end(clave)
+            while len(self._claves) > self.max_claves:
+                self._claves.popitem(last=False)
+
+    def registrar_exito(self, claves: Iterable[str]) -> None:
+        with self._lock:
+            for clave in claves:
+                self._claves.pop(clave, None)
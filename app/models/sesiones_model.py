@@ -0,0 +1,308 @@
+# app/models/sesiones_model.py
+"""
+Almacenes de sesiones de usuario y caché de registros con expiración.
+
+UsuariosModel delega las sesiones en un AlmacenSesiones intercambiable:
+
+- AlmacenSesionesMemoria: diccionario LRU en el proceso, con expiración
+  deslizante. Rápido, pero se pierde al reiniciar y no se comparte.
+- AlmacenSesionesPostgres: tabla UNLOGGED `sesiones` (sin WAL, se vacía
+  tras una caída del servidor). Sobrevive a reinicios de la aplicación y la
+  comparten todas las instancias conectadas a la misma base de datos. Solo
+  guarda el SHA-256 del token.
+
+Ambos purgan las sesiones vencidas en segundo plano con iniciar_purga().
+CacheTTL guarda por poco tiempo registros leídos con frecuencia (usuarios)
+para no consultar la base de datos en cada validación de sesión.
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from psycopg2.extras import Json
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class CacheTTL:
+    """
+    Caché LRU con expiración por entrada, segura entre hilos
+
+    Las entradas vencen ttl segundos después de guardarse; al superar
+    max_items se descarta la usada hace más tiempo.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_items: int = 1000):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._items: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave, default=None):
+        """Valor vigente de la clave o default"""
+        with self._lock:
+            entrada = self._items.get(clave)
+            if entrada is None:
+                return default
+            valor, expira = entrada
+            if expira <= time.monotonic():
+                del self._items[clave]
+                return default
+            self._items.move_to_end(clave)
+            return valor
+
+    def set(self, clave, valor) -> None:
+        """Guarda un valor con la expiración configurada"""
+        with self._lock:
+            self._items[clave] = (valor, time.monotonic() + self.ttl)
+            self._items.move_to_end(clave)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidar(self, clave) -> None:
+        """Descarta una clave"""
+        with self._lock:
+            self._items.pop(clave, None)
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas"""
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class AlmacenSesiones:
+    """
+    Interfaz de los almacenes de sesiones
+
+    Una sesión es un dict con usuario_id, created_at, last_activity y data.
+    Cada acceso con obtener() renueva la expiración (ttl_segundos de
+    inactividad).
+    """
+
+    def __init__(self, ttl_segundos: int = 8 * 3600):
+        self.ttl_segundos = ttl_segundos
+        self._hilo_purga: Optional[threading.Thread] = None
+        self._detener_purga = threading.Event()
+
+    def crear(self, token: str, usuario_id: int, datos: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+    def obtener(self, token: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def eliminar(self, token: str) -> bool:
+        raise NotImplementedError
+
+    def eliminar_usuario(self, usuario_id: int) -> int:
+        raise NotImplementedError
+
+    def purgar(self) -> int:
+        """Elimina las sesiones vencidas y devuelve cuántas eran"""
+        raise NotImplementedError
+
+    # ============ PURGA EN SEGUNDO PLANO ============
+
+    def iniciar_purga(self, intervalo_segundos: float = 300.0) -> None:
+        """Inicia (una sola vez) el hilo que purga sesiones vencidas"""
+        if self._hilo_purga is not None and self._hilo_purga.is_alive():
+            return
+
+        self._detener_purga.clear()
+        self._hilo_purga = threading.Thread(
+            target=self._bucle_purga,
+            args=(intervalo_segundos,),
+            name=f"purga-{self.__class__.__name__}",
+            daemon=True,
+        )
+        self._hilo_purga.start()
+
+    def detener_purga(self) -> None:
+        """Detiene el hilo de purga"""
+        self._detener_purga.set()
+        if self._hilo_purga is not None:
+            self._hilo_purga.join(timeout=5)
+        self._hilo_purga = None
+
+    def _bucle_purga(self, intervalo_segundos: float) -> None:
+        while not self._detener_purga.wait(intervalo_segundos):
+            try:
+                eliminadas = self.purgar()
+                if eliminadas:
+                    logger.info(f"🧹 {eliminadas} sesiones vencidas eliminadas")
+            except Exception as e:
+                logger.warning(f"Error purgando sesiones: {e}")
+
+
+class AlmacenSesionesMemoria(AlmacenSesiones):
+    """Sesiones en memoria del proceso (LRU con expiración deslizante)"""
+
+    def __init__(self, ttl_segundos: int = 8 * 3600, max_sesiones: int = 10000):
+        super().__init__(ttl_segundos)
+        self.max_sesiones = max_sesiones
+        self._sesiones: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def crear(self, token: str, usuario_id: int, datos: Dict[str, Any]) -> bool:
+        ahora = datetime.now().isoformat()
+        with self._lock:
+            self._sesiones[token] = {
+                "usuario_id": usuario_id,
+                "created_at": ahora,
+                "last_activity": ahora,
+                "data": datos,
+                "_expira": time.monotonic() + self.ttl_segundos,
+            }
+            while len(self._sesiones) > self.max_sesiones:
+                self._sesiones.popitem(last=False)
+        return True
+
+    def obtener(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            sesion = self._sesiones.get(token)
+            if sesion is None:
+                return None
+
+            ahora = time.monotonic()
+            if sesion["_expira"] <= ahora:
+                del self._sesiones[token]
+                return None
+
+            sesion["_expira"] = ahora + self.ttl_segundos
+            sesion["last_activity"] = datetime.now().isoformat()
+            self._sesiones.move_to_end(token)
+            return {k: v for k, v in sesion.items() if k != "_expira"}
+
+    def eliminar(self, token: str) -> bool:
+        with self._lock:
+            return self._sesiones.pop(token, None) is not None
+
+    def eliminar_usuario(self, usuario_id: int) -> int:
+        with self._lock:
+            tokens = [
+                token
+                for token, sesion in self._sesiones.items()
+                if sesion["usuario_id"] == usuario_id
+            ]
+            for token in tokens:
+                del self._sesiones[token]
+        return len(tokens)
+
+    def purgar(self) -> int:
+        ahora = time.monotonic()
+        with self._lock:
+            vencidas = [t for t, s in self._sesiones.items() if s["_expira"] <= ahora]
+            for token in vencidas:
+                del self._sesiones[token]
+        return len(vencidas)
+
+
+class AlmacenSesionesPostgres(AlmacenSesiones, BaseModel):
+    """
+    Sesiones en la tabla UNLOGGED `sesiones`
+
+    Validar una sesión es un único UPDATE ... RETURNING que comprueba la
+    expiración y la renueva. Una caída del servidor de base de datos vacía
+    la tabla (los usuarios vuelven a iniciar sesión), a cambio de no escribir
+    WAL en cada validación.
+    """
+
+    TABLE_NAME = "sesiones"
+
+    def __init__(self, ttl_segundos: int = 8 * 3600):
+        AlmacenSesiones.__init__(self, ttl_segundos)
+        BaseModel.__init__(self)
+        # La conexión del modelo se usa también desde el hilo de purga
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash_token(token: str) -> str:
+        """La tabla guarda el hash del token, no el token"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def crear(self, token: str, usuario_id: int, datos: Dict[str, Any]) -> bool:
+        query = f"""
+        INSERT INTO {self.TABLE_NAME}
+            (token_hash, usuario_id, datos, expira_en)
+        VALUES (%s, %s, %s, NOW() + make_interval(secs => %s))
+        """
+        with self._lock:
+            resultado = self.execute_query(
+                query,
+                (
+                    self._hash_token(token),
+                    usuario_id,
+                    Json(datos, dumps=lambda d: json.dumps(d, default=str)),
+                    self.ttl_segundos,
+                ),
+                fetch=False,
+                commit=True,
+            )
+        return bool(resultado)
+
+    def obtener(self, token: str) -> Optional[Dict[str, Any]]:
+        query = f"""
+        UPDATE {self.TABLE_NAME}
+        SET last_activity = NOW(),
+            expira_en = NOW() + make_interval(secs => %s)
+        WHERE token_hash = %s AND expira_en > NOW()
+        RETURNING usuario_id, created_at, last_activity, datos
+        """
+        with self._lock:
+            filas = self.execute_query(query, (self.ttl_segundos, self._hash_token(token)))
+            self.commit()
+
+        if not filas:
+            return None
+
+        fila = filas[0]
+        return {
+            "usuario_id": fila["usuario_id"],
+            "created_at": fila["created_at"].isoformat(),
+            "last_activity": fila["last_activity"].isoformat(),
+            "data": fila["datos"] or {},
+        }
+
+    def eliminar(self, token: str) -> bool:
+        with self._lock:
+            resultado = self.execute_query(
+                f"DELETE FROM {self.TABLE_NAME} WHERE token_hash = %s",
+                (self._hash_token(token),),
+                fetch=False,
+                commit=True,
+            )
+        return bool(resultado)
+
+    def eliminar_usuario(self, usuario_id: int) -> int:
+        with self._lock:
+            resultado = self.execute_query(
+                f"DELETE FROM {self.TABLE_NAME} WHERE usuario_id = %s",
+                (usuario_id,),
+                fetch=False,
+                commit=True,
+            )
+        return resultado or 0
+
+    def purgar(self) -> int:
+        with self._lock:
+            resultado = self.execute_query(
+                f"DELETE FROM {self.TABLE_NAME} WHERE expira_en <= NOW()",
+                fetch=False,
+                commit=True,
+            )
+        return resultado or 0
@@ -1,18 +1,55 @@
 # app/models/usuarios_model.py - Versión optimizada para escalabilidad multiusuario
 import sys
 import os
-import hashlib
 import secrets
 import string
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple, Union
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .base_model import BaseModel
+from .configuracion_model import ConfiguracionesModel
+from .sesiones_model import (
+    AlmacenSesiones,
+    AlmacenSesionesMemoria,
+    AlmacenSesionesPostgres,
+    CacheTTL,
+)
+from .seguridad_passwords import (
+    VerificadorPasswords,
+    LimitadorIntentos,
+    generar_hash,
+    verificar_hash,
+    requiere_rehash,
+    calibrar_iteraciones,
+)
 
 
 class UsuariosModel(BaseModel):
+    # Almacén de sesiones compartido por todas las instancias del modelo
+    # (ver configurar_sesiones_desde_ini); por defecto, en memoria
+    _session_store: Optional[AlmacenSesiones] = None
+
+    # Usuarios leídos al validar sesiones; se invalidan al modificarlos
+    _usuarios_cache = CacheTTL(ttl=30.0, max_items=500)
+
+    # Costo PBKDF2 de los hashes nuevos (SEGURIDAD_ITERACIONES_HASH); los
+    # hashes con menos iteraciones o heredados (bcrypt) se regeneran al
+    # iniciar sesión
+    _iteraciones_hash = 100000
+    _parametros_cargados = False
+
+    # Espera exponencial tras fallos de login por usuario y por IP
+    _limitador_intentos = LimitadorIntentos()
+
+    # Hash de referencia para usuarios inexistentes (mismo tiempo de respuesta)
+    _hash_ficticio: Optional[str] = None
+
+    # Hilo para authenticate_async
+    _executor_login: Optional[ThreadPoolExecutor] = None
+
     def __init__(self):
         """Inicializa el modelo de usuarios con soporte para futura escalabilidad"""
         super().__init__()
@@ -31,7 +68,6 @@ class UsuariosModel(BaseModel):
         # Parámetros de seguridad
         self.PASSWORD_MIN_LENGTH = 8
         self.SALT_LENGTH = 32
-        self.HASH_ITERATIONS = 100000
         self.HASH_ALGORITHM = "sha256"
 
         # Columnas de la tabla para validación
@@ -50,11 +86,89 @@ class UsuariosModel(BaseModel):
         # Columnas requeridas
         self.required_columns = ["username", "password_hash", "nombre_completo"]
 
-        # Cache para sesiones (simulado para futura implementación distribuida)
-        self._session_cache = {}
+    # ============ ALMACÉN DE SESIONES Y CACHÉ ============
+
+    @classmethod
+    def configurar_almacen_sesiones(
+        cls, almacen: AlmacenSesiones, intervalo_purga: Optional[float] = 300.0
+    ) -> None:
+        """
+        Define el almacén de sesiones de la aplicación
+
+        Args:
+            almacen: AlmacenSesionesMemoria o AlmacenSesionesPostgres
+            intervalo_purga: Segundos entre purgas de sesiones vencidas
+                (None para no purgar en segundo plano)
+        """
+        if cls._session_store is not None and cls._session_store is not almacen:
+            cls._session_store.detener_purga()
+        cls._session_store = almacen
+        if intervalo_purga:
+            almacen.iniciar_purga(intervalo_purga)
+
+    @classmethod
+    def configurar_sesiones_desde_ini(cls, config) -> None:
+        """
+        Lee la sección [sesiones] de un ConfigParser y elige el almacén
+
+        almacen = memoria | postgres (tabla UNLOGGED sesiones), ttl_segundos
+        de inactividad e intervalo_purga en segundos (0 para no purgar).
+        """
+        if not config.has_section("sesiones"):
+            return
+        seccion = "sesiones"
+        tipo = config.get(seccion, "almacen", fallback="memoria").strip().lower()
+        ttl = config.getint(seccion, "ttl_segundos", fallback=8 * 3600)
+        intervalo = config.getfloat(seccion, "intervalo_purga", fallback=300.0)
+
+        almacenes = {"memoria": AlmacenSesionesMemoria, "postgres": AlmacenSesionesPostgres}
+        if tipo not in almacenes:
+            print(f"✗ Almacén de sesiones desconocido: {tipo}; se usa memoria")
+            tipo = "memoria"
+        cls.configurar_almacen_sesiones(almacenes[tipo](ttl), intervalo or None)
+        print(f"✓ Sesiones en almacén '{tipo}'")
+
+    @property
+    def _sesiones(self) -> AlmacenSesiones:
+        """Almacén configurado (crea el de memoria la primera vez)"""
+        if UsuariosModel._session_store is None:
+            UsuariosModel.configurar_almacen_sesiones(AlmacenSesionesMemoria())
+        return UsuariosModel._session_store
+
+    def _invalidar_cache_usuario(self, usuario_id: int) -> None:
+        """Descarta el usuario de la caché tras modificarlo"""
+        UsuariosModel._usuarios_cache.invalidar(usuario_id)
 
     # ============ MÉTODOS DE SEGURIDAD Y HASHING ============
 
+    @property
+    def HASH_ITERATIONS(self) -> int:
+        """Iteraciones PBKDF2 vigentes para hashes nuevos"""
+        self._cargar_parametros_seguridad()
+        return UsuariosModel._iteraciones_hash
+
+    def _cargar_parametros_seguridad(self) -> None:
+        """
+        Lee una vez por proceso el costo del hash y los límites de intentos
+        (SEGURIDAD_ITERACIONES_HASH, SEGURIDAD_INTENTOS_LOGIN y
+        SEGURIDAD_TIEMPO_BLOQUEO en configuraciones)
+        """
+        if UsuariosModel._parametros_cargados:
+            return
+        UsuariosModel._parametros_cargados = True
+
+        try:
+            config = ConfiguracionesModel()
+            UsuariosModel._iteraciones_hash = config.get_valor_int(
+                "SEGURIDAD_ITERACIONES_HASH", UsuariosModel._iteraciones_hash
+            )
+            UsuariosModel._limitador_intentos = LimitadorIntentos(
+                umbral=config.get_valor_int("SEGURIDAD_INTENTOS_LOGIN", 3),
+                espera_max=config.get_valor_int("SEGURIDAD_TIEMPO_BLOQUEO", 30) * 60,
+            )
+        except Exception as e:
+            print(f"✗ Error cargando parámetros de seguridad: {e}")
+
     def _generate_salt(self) -> str:
         """
         Genera una sal criptográfica segura
@@ -81,17 +195,9 @@ class UsuariosModel(BaseModel):
         if salt is None:
             salt = self._generate_salt()
 
-        # Usar PBKDF2 para mayor seguridad
-        encoded_password = password.encode("utf-8")
-        encoded_salt = salt.encode("utf-8")
-
-        hash_obj = hashlib.pbkdf2_hmac(
-            self.HASH_ALGORITHM, encoded_password, encoded_salt, self.HASH_ITERATIONS
-        )
-
-        # Formato: algoritmo:iteraciones:salt:hash
-        password_hash = (
-            f"{self.HASH_ALGORITHM}:{self.HASH_ITERATIONS}:{salt}:{hash_obj.hex()}"
+        # Usar PBKDF2 (formato: algoritmo:iteraciones:salt:hash)
+        password_hash = generar_hash(
+            password, salt, self.HASH_ALGORITHM, self.HASH_ITERATIONS
         )
 
         return password_hash, salt
@@ -100,6 +206,9 @@ class UsuariosModel(BaseModel):
         """
         Verifica una contraseña contra su hash almacenado
 
+        Acepta hashes PBKDF2 (algoritmo:iteraciones:salt:hash) y bcrypt
+        heredados ($2b$...), estos últimos si el paquete bcrypt está instalado.
+
         Args:
             password: Contraseña en texto plano a verificar
             stored_hash: Hash almacenado en la base de datos
@@ -107,35 +216,60 @@ class UsuariosModel(BaseModel):
         Returns:
             bool: True si la contraseña es correcta, False en caso contrario
         """
-        try:
-            # Parsear el hash almacenado
-            parts = stored_hash.split(":")
-            if len(parts) != 4:
-                return False
-
-            algorithm, iterations_str, salt, original_hash = parts
-
-            # Verificar algoritmo
-            if algorithm != self.HASH_ALGORITHM:
-                return False
+        return verificar_hash(password, stored_hash)
 
-            iterations = int(iterations_str)
+    def _verificar_y_regenerar(
+        self, password: str, stored_hash: Optional[str]
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verifica la contraseña y, si el hash es heredado o de menor costo,
+        calcula el nuevo (se ejecuta en el pool de VerificadorPasswords)
 
-            # Calcular hash de la contraseña proporcionada
-            encoded_password = password.encode("utf-8")
-            encoded_salt = salt.encode("utf-8")
+        Sin stored_hash (usuario inexistente) verifica contra el hash
+        ficticio, de modo que el tiempo de respuesta no revela qué usuarios
+        existen.
 
-            hash_obj = hashlib.pbkdf2_hmac(
-                algorithm, encoded_password, encoded_salt, iterations
-            )
+        Returns:
+            Tuple[bool, Optional[str]]: (válida, nuevo_hash o None)
+        """
+        if stored_hash is None:
+            self._verify_password(password, self._get_hash_ficticio())
+            return False, None
+        if not self._verify_password(password, stored_hash):
+            return False, None
+        if requiere_rehash(stored_hash, self.HASH_ALGORITHM, self.HASH_ITERATIONS):
+            return True, self._hash_password(password)[0]
+        return True, None
+
+    @classmethod
+    def calibrar_hash(cls, objetivo_ms: float = 250.0, guardar: bool = False) -> int:
+        """
+        Ajusta las iteraciones PBKDF2 para que un hash tarde ~objetivo_ms
+        en este equipo (nunca por debajo de 100.000)
 
-            computed_hash = hash_obj.hex()
+        Args:
+            objetivo_ms: Latencia objetivo de un hash
+            guardar: Guardar el valor en SEGURIDAD_ITERACIONES_HASH
 
-            # Comparar hashes de manera segura (timing-safe)
-            return secrets.compare_digest(computed_hash, original_hash)
+        Returns:
+            int: Iteraciones elegidas
+        """
+        cls()._cargar_parametros_seguridad()
+
+        iteraciones, ms_por_mil = calibrar_iteraciones(objetivo_ms)
+        cls._iteraciones_hash = iteraciones
+        cls._hash_ficticio = None
+        cls().precalcular_hash_ficticio()
+        print(
+            f"✓ PBKDF2: {ms_por_mil:.2f} ms por 1000 iteraciones; "
+            f"se usarán {iteraciones} iteraciones"
+        )
 
-        except (ValueError, IndexError):
-            return False
+        if guardar:
+            ConfiguracionesModel().update_by_clave(
+                "SEGURIDAD_ITERACIONES_HASH", iteraciones
+            )
+        return iteraciones
 
     def _validate_password_strength(self, password: str) -> Tuple[bool, str]:
         """
@@ -410,6 +544,7 @@ class UsuariosModel(BaseModel):
             result = self.update_table(self.table_name, data, "id = %s", (usuario_id,))
 
             if result:
+                self._invalidar_cache_usuario(usuario_id)
                 print(f"✓ Usuario {usuario_id} actualizado exitosamente")
                 return True
 
@@ -464,18 +599,37 @@ class UsuariosModel(BaseModel):
 
     # ============ MÉTODOS DE AUTENTICACIÓN Y SESIÓN ============
 
-    def authenticate(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+    def authenticate(
+        self, username: str, password: str, ip: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Autentica un usuario
 
+        El hash se calcula en el pool de VerificadorPasswords y los fallos
+        consecutivos imponen una espera creciente por usuario y por IP. Los
+        hashes heredados o de menor costo se regeneran tras un login correcto.
+
         Args:
             username: Nombre de usuario
             password: Contraseña en texto plano
+            ip: Dirección de origen del intento (opcional)
 
         Returns:
             Optional[Dict]: Datos del usuario autenticado (sin password_hash) o None
         """
         try:
+            self._cargar_parametros_seguridad()
+
+            claves = [f"usuario:{username.strip().lower()}"]
+            if ip:
+                claves.append(f"ip:{ip}")
+
+            limitador = UsuariosModel._limitador_intentos
+            espera = limitador.espera(claves)
+            if espera > 0:
+                print(f"✗ Demasiados intentos fallidos. Reintente en {espera:.0f} s")
+                return None
+
             # Buscar usuario por username
             query = f"""
             SELECT * FROM {self.table_name} 
@@ -483,17 +637,33 @@ class UsuariosModel(BaseModel):
             """
 
             usuario = self.fetch_one(query, (username,))
+            stored_hash = usuario.get("password_hash") if usuario else None
 
-            if not usuario:
-                print("✗ Usuario no encontrado o inactivo")
+            futuro = VerificadorPasswords.get_instance().enviar(
+                self._verificar_y_regenerar, password, stored_hash
+            )
+            if futuro is None:
+                print("✗ Demasiados inicios de sesión simultáneos. Reintente")
                 return None
 
-            # Verificar contraseña
-            stored_hash = usuario.get("password_hash")
-            if not stored_hash or not self._verify_password(password, stored_hash):
-                print("✗ Contraseña incorrecta")
+            valida, nuevo_hash = futuro.result()
+
+            if not usuario or not valida:
+                limitador.registrar_fallo(claves)
+                print("✗ Usuario o contraseña incorrectos")
                 return None
 
+            limitador.registrar_exito(claves)
+
+            # Regenerar hash heredado (bcrypt) o de menor costo
+            if nuevo_hash:
+                self.execute_query(
+                    f"UPDATE {self.table_name} SET password_hash = %s WHERE id = %s",
+                    (nuevo_hash, usuario["id"]),
+                    fetch=False,
+                    commit=True,
+                )
+
             # Actualizar último login
             self._update_last_login(usuario["id"])
 
@@ -507,6 +677,46 @@ class UsuariosModel(BaseModel):
             print(f"✗ Error en autenticación: {e}")
             return None
 
+    def authenticate_async(
+        self, username: str, password: str, ip: Optional[str] = None
+    ) -> Future:
+        """
+        Ejecuta authenticate en un hilo aparte (para no bloquear la GUI)
+
+        No usar este modelo desde otro hilo hasta que el futuro termine.
+
+        Returns:
+            Future: Se resuelve con el resultado de authenticate
+        """
+        if UsuariosModel._executor_login is None:
+            UsuariosModel._executor_login = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="login"
+            )
+        return UsuariosModel._executor_login.submit(
+            self.authenticate, username, password, ip
+        )
+
+    def precalcular_hash_ficticio(self) -> Optional[Future]:
+        """
+        Calcula el hash ficticio en el pool de VerificadorPasswords
+
+        Llamarlo al iniciar la aplicación evita que el primer login de un
+        usuario inexistente pague además ese cálculo.
+
+        Returns:
+            Optional[Future]: Futuro del cálculo, o None si el pool está saturado
+        """
+        self._cargar_parametros_seguridad()
+        return VerificadorPasswords.get_instance().enviar(self._get_hash_ficticio)
+
+    def _get_hash_ficticio(self) -> str:
+        """Hash PBKDF2 con el costo actual, calculado una vez por proceso"""
+        if UsuariosModel._hash_ficticio is None:
+            UsuariosModel._hash_ficticio = self._hash_password(
+                secrets.token_urlsafe(16)
+            )[0]
+        return UsuariosModel._hash_ficticio
+
     def _update_last_login(self, usuario_id: int) -> bool:
         """
         Actualiza la fecha del último login
@@ -526,6 +736,7 @@ class UsuariosModel(BaseModel):
 
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             result = self.execute_query(query, (current_time, usuario_id), commit=True)
+            self._invalidar_cache_usuario(usuario_id)
 
             return result is not None
 
@@ -785,13 +996,8 @@ class UsuariosModel(BaseModel):
             # Generar token seguro
             session_token = secrets.token_urlsafe(64)
 
-            # Almacenar en cache (en futura versión, usar Redis o DB)
-            self._session_cache[session_token] = {
-                "usuario_id": usuario_id,
-                "created_at": datetime.now().isoformat(),
-                "last_activity": datetime.now().isoformat(),
-                "data": session_data,
-            }
+            if not self._sesiones.crear(session_token, usuario_id, session_data):
+                return None
 
             print(f"✓ Sesión creada para usuario {usuario_id}")
             return session_token
@@ -804,6 +1010,9 @@ class UsuariosModel(BaseModel):
         """
         Valida una sesión y devuelve los datos del usuario
 
+        La sesión vence tras el período de inactividad del almacén; el
+        usuario se toma de la caché (unos segundos) antes de consultar la BD.
+
         Args:
             session_token: Token de sesión
 
@@ -811,23 +1020,24 @@ class UsuariosModel(BaseModel):
             Optional[Dict]: Datos del usuario o None si la sesión no es válida
         """
         try:
-            if session_token not in self._session_cache:
+            # Obtener la sesión (renueva su expiración)
+            session = self._sesiones.obtener(session_token)
+            if not session:
                 return None
 
-            session = self._session_cache[session_token]
-
-            # Actualizar última actividad
-            session["last_activity"] = datetime.now().isoformat()
-
-            # Obtener usuario
-            usuario = self.read(session["usuario_id"])
+            usuario_id = session["usuario_id"]
+            usuario = UsuariosModel._usuarios_cache.get(usuario_id)
+            if usuario is None:
+                usuario = self.read(usuario_id)
+                if usuario:
+                    UsuariosModel._usuarios_cache.set(usuario_id, usuario)
 
             if not usuario:
-                # Si el usuario no existe, limpiar sesión
+                # Si el usuario no existe o está inactivo, limpiar sesión
                 self._clear_session(session_token)
                 return None
 
-            return usuario
+            return dict(usuario)
 
         except Exception as e:
             print(f"✗ Error validando sesión: {e}")
@@ -844,10 +1054,7 @@ class UsuariosModel(BaseModel):
             bool: True si se limpió correctamente
         """
         try:
-            if session_token in self._session_cache:
-                del self._session_cache[session_token]
-                return True
-            return False
+            return self._sesiones.eliminar(session_token)
 
         except Exception as e:
             print(f"✗ Error limpiando sesión: {e}")
@@ -864,14 +1071,8 @@ class UsuariosModel(BaseModel):
             bool: True si se limpiaron correctamente
         """
         try:
-            tokens_to_remove = []
-
-            for token, session in self._session_cache.items():
-                if session["usuario_id"] == usuario_id:
-                    tokens_to_remove.append(token)
-
-            for token in tokens_to_remove:
-                del self._session_cache[token]
+            self._sesiones.eliminar_usuario(usuario_id)
+            self._invalidar_cache_usuario(usuario_id)
 
             print(f"✓ Sesiones limpiadas para usuario {usuario_id}")
             return True
@@ -1080,7 +1281,7 @@ class UsuariosModel(BaseModel):
 
     def update_table(self, table, data, condition, params=None):
         """Método helper para actualizar (compatibilidad con BaseModel)"""
-        return self.update(table, data, condition, params)  # type: ignore
+        return BaseModel.update(self, table, data, condition, params)
 
     # ============ MÉTODOS DE UTILIDAD ============
 
@@ -0,0 +1,358 @@
+# app/models/vista_materializada_model.py
+"""
+Modelo para las vistas materializadas de reportes.
+
+vw_resumen_financiero_programa, vw_estado_pagos_estudiante y
+vw_ingresos_detallados se guardan materializadas con un índice único, de
+modo que leer el estado de pagos de un estudiante es una búsqueda por
+índice y no un join sobre todo el historial de matrículas.
+
+Los triggers de las tablas de origen marcan la vista como pendiente en
+vistas_materializadas y emiten NOTIFY vistas_pendientes al confirmar. El
+refresco usa REFRESH MATERIALIZED VIEW CONCURRENTLY, que no bloquea a los
+lectores, y puede ejecutarse:
+
+- Desde un proceso programado: refrescar_pendientes()
+- Desde un proceso en escucha: escuchar()
+
+Hereda de BaseModel para utilizar el sistema de conexiones y transacciones.
+"""
+
+import sys
+import os
+import time
+import select
+import logging
+import threading
+from datetime import date
+from typing import Optional, List, Dict, Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .base_model import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Vistas materializadas gestionadas y su clave única
+VISTAS_MATERIALIZADAS = {
+    "vw_resumen_financiero_programa": "programa_id",
+    "vw_estado_pagos_estudiante": "estudiante_id",
+    "vw_ingresos_detallados": "id",
+}
+
+CANAL_VISTAS_PENDIENTES = "vistas_pendientes"
+
+
+class VistaMaterializadaModel(BaseModel):
+    """Modelo para refrescar y leer las vistas materializadas de reportes"""
+
+    TABLE_NAME = "vistas_materializadas"
+
+    def __init__(self):
+        """Inicializa el modelo de vistas materializadas"""
+        super().__init__()
+        self.table_name = self.TABLE_NAME
+
+        # Segundos sin notificaciones antes de refrescar (agrupa ráfagas)
+        self.ESPERA_AGRUPACION = 2.0
+
+    # ============ MÉTODOS DE VALIDACIÓN ============
+
+    def _validar_vista(self, nombre: str) -> None:
+        """Verifica que la vista sea una de las gestionadas"""
+        if nombre not in VISTAS_MATERIALIZADAS:
+            raise ValueError(
+                f"Vista desconocida: {nombre}. "
+                f"Válidas: {', '.join(VISTAS_MATERIALIZADAS)}"
+            )
+
+    # ============ REFRESCO ============
+
+    def refrescar(self, nombre: str, concurrente: bool = True) -> bool:
+        """
+        Refresca una vista materializada
+
+        La marca de pendiente se limpia y confirma ANTES del refresco: una
+        escritura confirmada durante el refresco vuelve a marcar la vista y
+        no se pierde. Un candado advisory evita dos refrescos simultáneos de
+        la misma vista; si otro proceso ya la está refrescando, se omite.
+
+        Args:
+            nombre: Nombre de la vista
+            concurrente: Usar CONCURRENTLY (no bloquea a los lectores)
+
+        Returns:
+            bool: True si se refrescó
+        """
+        self._validar_vista(nombre)
+        clave_candado = f"vista_materializada:{nombre}"
+
+        obtenido = self.fetch_scalar(
+            "SELECT pg_try_advisory_lock(hashtext(%s))", (clave_candado,)
+        )
+        if not obtenido:
+            logger.info(f"Refresco de {nombre} omitido: ya está en curso")
+            self.rollback()
+            return False
+
+        try:
+            self.execute_query(
+                f"UPDATE {self.table_name} SET pendiente = FALSE WHERE nombre = %s",
+                (nombre,),
+                fetch=False,
+                commit=True,
+            )
+
+            inicio = time.perf_counter()
+            modo = "CONCURRENTLY " if concurrente else ""
+            resultado = self.execute_query(
+                f"REFRESH MATERIALIZED VIEW {modo}{nombre}",
+                fetch=False,
+                commit=True,
+            )
+            duracion_ms = int((time.perf_counter() - inicio) * 1000)
+
+            if resultado is None:
+                # Restaurar la marca para que el próximo ciclo lo reintente
+                self.execute_query(
+                    f"""
+                    UPDATE {self.table_name}
+                    SET pendiente = TRUE, marcada_en = CURRENT_TIMESTAMP
+                    WHERE nombre = %s
+                    """,
+                    (nombre,),
+                    fetch=False,
+                    commit=True,
+                )
+                logger.error(f"No se pudo refrescar {nombre}")
+                return False
+
+            self.execute_query(
+                f"""
+                UPDATE {self.table_name}
+                SET ultima_actualizacion = CURRENT_TIMESTAMP, duracion_ms = %s
+                WHERE nombre = %s
+                """,
+                (duracion_ms, nombre),
+                fetch=False,
+                commit=True,
+            )
+            logger.info(f"✓ Vista {nombre} refrescada en {duracion_ms} ms")
+            return True
+
+        finally:
+            self.fetch_scalar(
+                "SELECT pg_advisory_unlock(hashtext(%s))", (clave_candado,)
+            )
+            self.commit()
+
+    def refrescar_pendientes(
+        self, antiguedad_maxima_minutos: Optional[int] = None
+    ) -> List[str]:
+        """
+        Refresca las vistas marcadas como pendientes
+
+        Pensado para un proceso programado (cron / Programador de tareas).
+
+        Args:
+            antiguedad_maxima_minutos: Refrescar también las vistas cuya
+                última actualización sea más antigua (red de seguridad)
+
+        Returns:
+            List[str]: Vistas refrescadas
+        """
+        query = f"SELECT nombre FROM {self.table_name} WHERE pendiente"
+        params = []
+        if antiguedad_maxima_minutos is not None:
+            query += """
+                OR ultima_actualizacion IS NULL
+                OR ultima_actualizacion < CURRENT_TIMESTAMP - make_interval(mins => %s)
+            """
+            params.append(antiguedad_maxima_minutos)
+        query += " ORDER BY nombre"
+
+        filas = self.fetch_all(query, params) or []
+        self.commit()
+
+        return [
+            fila["nombre"]
+            for fila in filas
+            if fila["nombre"] in VISTAS_MATERIALIZADAS and self.refrescar(fila["nombre"])
+        ]
+
+    def escuchar(
+        self,
+        detener: Optional[threading.Event] = None,
+        intervalo_minutos: int = 60,
+    ) -> None:
+        """
+        Escucha NOTIFY vistas_pendientes y refresca al terminar cada ráfaga
+
+        Bloquea hasta que se active el evento detener. Las notificaciones se
+        agrupan: se refresca cuando pasan ESPERA_AGRUPACION segundos sin
+        nuevas. Sin notificaciones, cada intervalo_minutos se revisan las
+        marcas de pendiente.
+
+        Args:
+            detener: Evento que finaliza la escucha
+            intervalo_minutos: Intervalo de revisión periódica
+        """
+        detener = detener or threading.Event()
+        conexion = self.get_connection()
+        if conexion is None:
+            logger.error("No hay conexión disponible para escuchar notificaciones")
+            return
+
+        try:
+            conexion.rollback()
+            conexion.autocommit = True
+            with conexion.cursor() as cursor:
+                cursor.execute(f"LISTEN {CANAL_VISTAS_PENDIENTES}")
+
+            # Refrescar lo que haya quedado pendiente antes de escuchar
+            self.refrescar_pendientes()
+            ultima_revision = time.monotonic()
+            pendientes = False
+
+            while not detener.is_set():
+                espera = self.ESPERA_AGRUPACION if pendientes else 5.0
+                listos, _, _ = select.select([conexion], [], [], espera)
+
+                if listos:
+                    conexion.poll()
+                    if conexion.notifies:
+                        conexion.notifies.clear()
+                        pendientes = True
+                    continue
+
+                if pendientes or (
+                    time.monotonic() - ultima_revision >= intervalo_minutos * 60
+                ):
+                    self.refrescar_pendientes()
+                    ultima_revision = time.monotonic()
+                    pendientes = False
+
+        except Exception as e:
+            logger.error(f"Error escuchando {CANAL_VISTAS_PENDIENTES}: {e}", exc_info=True)
+
+        finally:
+            try:
+                with conexion.cursor() as cursor:
+                    cursor.execute("UNLISTEN *")
+                conexion.autocommit = False
+            except Exception:
+                pass
+            self.return_connection(conexion)
+
+    def obtener_estado(self) -> List[Dict[str, Any]]:
+        """
+        Obtiene el estado de refresco de las vistas
+
+        Returns:
+            List[Dict]: nombre, pendiente, marcada_en, ultima_actualizacion y duracion_ms
+        """
+        return self.fetch_all(f"SELECT * FROM {self.table_name} ORDER BY nombre") or []
+
+    # ============ LECTURA ============
+
+    def obtener_resumen_programas(
+        self, programa_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene el resumen financiero por programa
+
+        Args:
+            programa_id: Filtrar un programa (opcional)
+
+        Returns:
+            List[Dict]: Filas de vw_resumen_financiero_programa
+        """
+        query = "SELECT * FROM vw_resumen_financiero_programa"
+        params = []
+        if programa_id is not None:
+            query += " WHERE programa_id = %s"
+            params.append(programa_id)
+        query += " ORDER BY programa_nombre"
+
+        return self.fetch_all(query, params) or []
+
+    def obtener_estado_pagos_estudiante(
+        self, estudiante_id: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene el estado de pagos de un estudiante
+
+        Args:
+            estudiante_id: ID del estudiante
+
+        Returns:
+            Optional[Dict]: Fila de vw_estado_pagos_estudiante o None si no
+            tiene matrículas
+        """
+        return self.fetch_one(
+            "SELECT * FROM vw_estado_pagos_estudiante WHERE estudiante_id = %s",
+            (estudiante_id,),
+        )
+
+    def listar_estado_pagos(
+        self, solo_con_saldo: bool = True, limit: int = 100, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista el estado de pagos de los estudiantes, mayor saldo primero
+
+        Args:
+            solo_con_saldo: Solo estudiantes con saldo pendiente
+            limit: Límite de resultados
+            offset: Desplazamiento para paginación
+
+        Returns:
+            List[Dict]: Filas de vw_estado_pagos_estudiante
+        """
+        query = "SELECT * FROM vw_estado_pagos_estudiante"
+        if solo_con_saldo:
+            query += " WHERE total_saldo > 0"
+        query += " ORDER BY total_saldo DESC, estudiante_id LIMIT %s OFFSET %s"
+
+        return self.fetch_all(query, (limit, offset)) or []
+
+    def obtener_ingresos_detallados(
+        self,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        tipo_ingreso: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Obtiene ingresos con estudiante, programa y usuario, más recientes primero
+
+        Args:
+            fecha_desde: Fecha inicial (opcional)
+            fecha_hasta: Fecha final (opcional)
+            tipo_ingreso: Filtrar por tipo de ingreso (opcional)
+            limit: Límite de resultados
+            offset: Desplazamiento para paginación
+
+        Returns:
+            List[Dict]: Filas de vw_ingresos_detallados
+        """
+        condiciones = []
+        params = []
+
+        if fecha_desde:
+            condiciones.append("fecha >= %s")
+            params.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append("fecha <= %s")
+            params.append(fecha_hasta)
+        if tipo_ingreso:
+            condiciones.append("tipo_ingreso = %s")
+            params.append(tipo_ingreso)
+
+        query = "SELECT * FROM vw_ingresos_detallados"
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY fecha DESC, id DESC LIMIT %s OFFSET %s"
+        params.extend([limit, offset])
+
+        return self.fetch_all(query, params) or []
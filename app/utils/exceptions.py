@@ -50,6 +50,13 @@ class DatabaseException(FormaGestProException):
         super().__init__(message, "DATABASE_ERROR")
 
 
+class TransactionRolledBackException(DatabaseException):
+    """Excepción para bloques transaction() que terminaron revertidos"""
+
+    def __init__(self, message: str = "La transacción se revirtió"):
+        super().__init__(message)
+
+
 class InvalidEmailException(ValidationException):
     """Excepción para emails inválidos"""
 
@@ -1121,3 +1121,267 @@ class Validator:
 
         pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
         return re.match(pattern, email) is not None
+
+
+# ==================== ESQUEMAS COMPILADOS ====================
+
+
+class Referencia:
+    """
+    Clave foránea que se verifica contra la base de datos
+
+    El mensaje admite {valor} (ej. "Programa con ID {valor} no existe").
+    condicion es SQL fijo del esquema (ej. "activo = TRUE"), nunca datos
+    del usuario.
+    """
+
+    __slots__ = ("tabla", "mensaje", "condicion", "columna", "convertir")
+
+    def __init__(
+        self,
+        tabla: str,
+        mensaje: str,
+        condicion: Optional[str] = None,
+        columna: str = "id",
+        convertir: Callable[[Any], Any] = int,
+    ):
+        self.tabla = tabla
+        self.mensaje = mensaje
+        self.condicion = condicion
+        self.columna = columna
+        self.convertir = convertir
+
+    @property
+    def clave(self) -> Tuple[str, str, Optional[str]]:
+        """Referencias con la misma clave comparten consulta"""
+        return self.tabla, self.columna, self.condicion
+
+
+class EsquemaValidacion:
+    """
+    Reglas de campo compiladas una vez por modelo
+
+    Cada campo se describe con un dict:
+
+    - requerido: falta si el valor es None (no se exige con parcial=True)
+    - opciones: valores permitidos
+    - convertir / minimo: función de conversión (ej. Dinero.de) y mínimo
+    - fecha: acepta date, datetime o texto YYYY-MM-DD
+    - referencia: Referencia a otra tabla
+    - mensajes: textos por regla (requerido, opciones, invalido, minimo,
+      fecha); admiten {campo}
+
+    Los campos vacíos (None o "") solo se comprueban como requeridos.
+    reglas_fila son funciones fila -> mensaje o None para las relaciones
+    entre campos, evaluadas tras los campos.
+
+    validate() no consulta la base de datos. validate_many() comprueba las
+    referencias de todo el lote con una consulta = ANY(%s) por tabla.
+    """
+
+    MENSAJES = {
+        "requerido": "Campo requerido faltante: {campo}",
+        "opciones": "{campo} inválido. Use: {opciones}",
+        "invalido": "{campo} inválido",
+        "minimo": "{campo} fuera de rango",
+        "fecha": "Formato de fecha inválido en {campo}. Use YYYY-MM-DD",
+    }
+
+    def __init__(
+        self,
+        campos: Dict[str, Dict[str, Any]],
+        reglas_fila: Optional[List[Callable[[Dict[str, Any]], Optional[str]]]] = None,
+    ):
+        self._campos = tuple(
+            (campo, self._compilar_campo(campo, spec)) for campo, spec in campos.items()
+        )
+        self._referencias = tuple(
+            (campo, spec["referencia"])
+            for campo, spec in campos.items()
+            if spec.get("referencia") is not None
+        )
+        self._reglas_fila = tuple(reglas_fila or ())
+
+    @property
+    def referencias(self) -> Tuple[Tuple[str, Referencia], ...]:
+        """Pares (campo, Referencia) en el orden de los campos"""
+        return self._referencias
+
+    def _compilar_campo(
+        self, campo: str, spec: Dict[str, Any]
+    ) -> Callable[[Dict[str, Any], bool], Optional[str]]:
+        """Convierte la descripción del campo en una sola función"""
+        textos = {
+            regla: spec.get("mensajes", {}).get(regla, texto).format(
+                campo=campo, opciones=", ".join(map(str, spec.get("opciones", ())))
+            )
+            for regla, texto in self.MENSAJES.items()
+        }
+        comprobaciones = []
+
+        if "opciones" in spec:
+            opciones = frozenset(spec["opciones"])
+            error_opciones = textos["opciones"]
+            comprobaciones.append(lambda v: None if v in opciones else error_opciones)
+
+        if "convertir" in spec:
+            convertir = spec["convertir"]
+            minimo = spec.get("minimo")
+            error_invalido, error_minimo = textos["invalido"], textos["minimo"]
+
+            def comprobar_valor(v):
+                try:
+                    convertido = convertir(v)
+                except (ValueError, TypeError, InvalidOperation):
+                    return error_invalido
+                if minimo is not None and convertido < minimo:
+                    return error_minimo
+                return None
+
+            comprobaciones.append(comprobar_valor)
+
+        if spec.get("fecha"):
+            error_fecha = textos["fecha"]
+
+            def comprobar_fecha(v):
+                if isinstance(v, (date, datetime)):
+                    return None
+                if isinstance(v, str):
+                    try:
+                        datetime.strptime(v, "%Y-%m-%d")
+                        return None
+                    except ValueError:
+                        pass
+                return error_fecha
+
+            comprobaciones.append(comprobar_fecha)
+
+        requerido = spec.get("requerido", False)
+        error_requerido = textos["requerido"]
+        comprobaciones = tuple(comprobaciones)
+
+        def validar_campo(data, parcial):
+            valor = data.get(campo)
+            if valor is None or (isinstance(valor, str) and valor == ""):
+                if valor is None and requerido and not parcial:
+                    return error_requerido
+                return None
+            for comprobar in comprobaciones:
+                error = comprobar(valor)
+                if error:
+                    return error
+            return None
+
+        return validar_campo
+
+    # ==================== VALIDACIÓN ====================
+
+    def validate(self, data: Dict[str, Any], parcial: bool = False) -> Tuple[bool, str]:
+        """
+        Valida una fila sin consultar la base de datos
+
+        Args:
+            data: Datos a validar
+            parcial: True para actualizaciones (no exige campos requeridos)
+
+        Returns:
+            Tuple[bool, str]: (es_válido, mensaje_error)
+        """
+        for _, validar_campo in self._campos:
+            error = validar_campo(data, parcial)
+            if error:
+                return False, error
+
+        for regla in self._reglas_fila:
+            error = regla(data)
+            if error:
+                return False, error
+
+        return True, "Datos válidos"
+
+    def verificar_referencias(
+        self,
+        filas: List[Dict[str, Any]],
+        consultar: Callable[[str, Tuple], Optional[List[Dict[str, Any]]]],
+    ) -> List[Optional[str]]:
+        """
+        Comprueba las claves foráneas de un lote
+
+        Args:
+            filas: Filas a comprobar
+            consultar: Función (query, params) -> filas, ej. modelo.fetch_all
+
+        Returns:
+            List[Optional[str]]: Primer error de referencia de cada fila o None
+        """
+        if not self._referencias:
+            return [None] * len(filas)
+
+        # Valores por tabla referenciada
+        por_tabla: Dict[Tuple[str, str, Optional[str]], set] = {}
+        for fila in filas:
+            for campo, referencia in self._referencias:
+                valor = fila.get(campo)
+                if not valor:
+                    continue
+                try:
+                    por_tabla.setdefault(referencia.clave, set()).add(
+                        referencia.convertir(valor)
+                    )
+                except (ValueError, TypeError):
+                    pass
+
+        existentes: Dict[Tuple[str, str, Optional[str]], set] = {}
+        for (tabla, columna, condicion), valores in por_tabla.items():
+            query = f"SELECT {columna} AS valor FROM {tabla} WHERE {columna} = ANY(%s)"
+            if condicion:
+                query += f" AND {condicion}"
+            resultado = consultar(query, (list(valores),)) or []
+            existentes[(tabla, columna, condicion)] = {r["valor"] for r in resultado}
+
+        errores: List[Optional[str]] = []
+        for fila in filas:
+            error = None
+            for campo, referencia in self._referencias:
+                valor = fila.get(campo)
+                if not valor:
+                    continue
+                try:
+                    encontrado = referencia.convertir(valor) in existentes.get(
+                        referencia.clave, ()
+                    )
+                except (ValueError, TypeError):
+                    encontrado = False
+                if not encontrado:
+                    error = referencia.mensaje.format(valor=valor)
+                    break
+            errores.append(error)
+
+        return errores
+
+    def validate_many(
+        self,
+        rows: List[Dict[str, Any]],
+        consultar: Optional[Callable[[str, Tuple], Optional[List[Dict[str, Any]]]]] = None,
+        parcial: bool = False,
+    ) -> List[Tuple[bool, str]]:
+        """
+        Valida un lote de filas
+
+        Las reglas de campo y de fila se evalúan en memoria; si se indica
+        consultar, las referencias de las filas válidas se comprueban con una
+        consulta por tabla referenciada.
+
+        Returns:
+            List[Tuple[bool, str]]: (es_válido, mensaje_error) por fila, en orden
+        """
+        resultados = [self.validate(fila, parcial) for fila in rows]
+
+        if consultar is not None:
+            indices = [i for i, (valido, _) in enumerate(resultados) if valido]
+            errores = self.verificar_referencias([rows[i] for i in indices], consultar)
+            for i, error in zip(indices, errores):
+                if error:
+                    resultados[i] = (False, error)
+
+        return resultados
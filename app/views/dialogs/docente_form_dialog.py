@@ -5,8 +5,6 @@ Diálogo para formulario de docentes - Basado en estudiantes pero con manejo de
 
 import logging
 import shutil
-import fitz
-from PIL import Image
 import io
 from datetime import datetime, date
 from pathlib import Path
@@ -1448,6 +1446,8 @@ class DocenteFormDialog(QDialog):
     def generar_vista_previa_pdf(self, ruta_pdf):
         """Generar y mostrar vista previa de la primera página del PDF"""
         try:
+            import fitz  # PyMuPDF: solo se carga al previsualizar un CV
+
             # Abrir el PDF
             pdf_document = fitz.open(str(ruta_pdf))
 
@@ -1486,6 +1486,8 @@ class DocenteFormDialog(QDialog):
     def obtener_numero_paginas_pdf(self, ruta_pdf):
         """Obtener número de páginas del PDF"""
         try:
+            import fitz
+
             pdf_document = fitz.open(str(ruta_pdf))
             num_paginas = len(pdf_document)
             pdf_document.close()
@@ -19,6 +19,7 @@ from PySide6.QtGui import QFont
 from app.models.programa_academico_model import ProgramaAcademicoModel
 from app.models.estudiante_model import EstudianteModel
 from app.models.matricula_model import MatriculaModel
+from utils.dinero import Dinero, CERO
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +34,9 @@ class MatriculaEstudianteFormDialog(QDialog):
         self.estudiante_id = estudiante_id
         self.estudiante_data = None
         self.programa_seleccionado = None
-        self.monto_base = Decimal('0')
-        self.descuento_total = Decimal('0')
-        self.monto_final = Decimal('0')
+        self.monto_base = CERO
+        self.descuento_total = CERO
+        self.monto_final = CERO
         self.programas_cache = {}
 
         # Inicializar controladores
@@ -482,43 +483,43 @@ class MatriculaEstudianteFormDialog(QDialog):
                 return
             
             # Obtener valores
-            costo_base = Decimal(str(getattr(self.programa_seleccionado, 'costo_base', 0)))
-            costo_matricula = Decimal(str(getattr(self.programa_seleccionado, 'costo_matricula', 0)))
+            costo_base = Dinero.de(getattr(self.programa_seleccionado, 'costo_base', 0))
+            costo_matricula = Dinero.de(getattr(self.programa_seleccionado, 'costo_matricula', 0))
             
             # Determinar si incluir matrícula
             if self.check_incluir_matricula.isChecked():
                 self.monto_base = costo_base + costo_matricula
-                self.lbl_costo_matricula.setText(f"Bs. {float(costo_matricula):.2f}")
+                self.lbl_costo_matricula.setText(f"Bs. {costo_matricula}")
             else:
                 self.monto_base = costo_base
                 self.lbl_costo_matricula.setText("No incluido")
             
             # Aplicar descuentos
-            self.descuento_total = Decimal('0')
+            self.descuento_total = CERO
             
             # Descuento por contado
             if self.check_descuento.isChecked() and self.check_descuento.isEnabled():
                 descuento_contado = Decimal(str(getattr(self.programa_seleccionado, 'descuento_contado', 0)))
                 if descuento_contado > 0:
-                    self.descuento_total = self.monto_base * (descuento_contado / 100)
+                    self.descuento_total = self.monto_base.porcentaje(descuento_contado)
             
             # Descuento por promoción
             if getattr(self.programa_seleccionado, 'promocion_activa', False):
                 descuento_promocion = Decimal(str(getattr(self.programa_seleccionado, 'descuento_promocion', 0)))
                 if descuento_promocion > 0:
-                    descuento_promocion_monto = costo_base * (descuento_promocion / 100)
+                    descuento_promocion_monto = costo_base.porcentaje(descuento_promocion)
                     if not self.check_incluir_matricula.isChecked():
-                        descuento_promocion_monto = self.monto_base * (descuento_promocion / 100)
+                        descuento_promocion_monto = self.monto_base.porcentaje(descuento_promocion)
                     
                     if descuento_promocion_monto > self.descuento_total:
                         self.descuento_total = descuento_promocion_monto
             
             # Calcular monto final
-            self.monto_final = max(Decimal('0'), self.monto_base - self.descuento_total)
+            self.monto_final = max(CERO, self.monto_base - self.descuento_total)
             
             # Actualizar UI
-            self.lbl_descuento.setText(f"Bs. {float(self.descuento_total):.2f}")
-            self.lbl_total.setText(f"Bs. {float(self.monto_final):.2f}")
+            self.lbl_descuento.setText(f"Bs. {self.descuento_total}")
+            self.lbl_total.setText(f"Bs. {self.monto_final}")
                 
         except Exception as e:
             logger.error(f"Error calculando costos: {e}")
@@ -665,7 +666,10 @@ class MatriculaEstudianteFormDialog(QDialog):
             if self.descuento_total > 0:
                 descuento_aplicado = float(self.descuento_total)
                 # Asegurar que no exceda el 50%
-                porcentaje_descuento = (self.descuento_total / self.monto_base * 100) if self.monto_base > 0 else Decimal('0')
+                porcentaje_descuento = (
+                    Decimal(self.descuento_total.centavos * 100) / self.monto_base.centavos
+                    if self.monto_base > 0 else Decimal('0')
+                )
 
                 if porcentaje_descuento > Decimal('50'):
                     # Ajustar al máximo permitido
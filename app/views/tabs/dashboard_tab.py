@@ -61,49 +61,15 @@ from PySide6.QtGui import (
     QPixmap,
     QImage,
     QPageSize,
-)
-from PySide6.QtCharts import (
-    QChart,
-    QChartView,
-    QPieSeries,
-    QPieSlice,
-    QBarSeries,
-    QBarSet,
-    QBarCategoryAxis,
-    QValueAxis,
-    QLineSeries,
+    QPageLayout,
 )
 
 # Importar clases base
 from app.views.tabs.base_tab import BaseTab
 from app.controllers.dashboard_controller import DashboardController
 
-# Para exportación a PDF
-try:
-    from PySide6.QtPrintSupport import QPrinter
-    from PySide6.QtGui import QTextDocument
-    from reportlab.lib import pagesizes
-    from reportlab.lib.pagesizes import letter, A4, landscape
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch, cm
-    from reportlab.platypus import (
-        SimpleDocTemplate,
-        Paragraph,
-        Spacer,
-        Table,
-        TableStyle,
-        Image,
-        PageBreak,
-    )
-    from reportlab.pdfgen import canvas
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
-    logger = logging.getLogger(__name__)
-    logger.warning("QPrinter no disponible - funcionalidad PDF desactivada")
+# QtCharts y QtPrintSupport se importan al usarse (gráficos y exportación
+# a PDF): cargarlos al importar el módulo retrasa el arranque de la ventana
 
 logger = logging.getLogger(__name__)
 
@@ -646,8 +612,8 @@ class DashboardTab(BaseTab):
         # 1. Actualizar tarjetas de métricas
         self._update_metrics_cards()
 
-        # 2. Actualizar gráficos
-        self._update_charts()
+        # 2. Actualizar gráficos (después de pintar la ventana: QtCharts es pesado)
+        QTimer.singleShot(0, self._update_charts)
 
         # 3. Actualizar tabla de detalles
         self._update_detail_table()
@@ -788,8 +754,10 @@ class DashboardTab(BaseTab):
 
     def _create_pie_chart(
         self, data: List[Dict], title: str, colors: List[str]
-    ) -> QChartView:
+    ) -> QWidget:
         """Crea un gráfico de pastel"""
+        from PySide6.QtCharts import QChart, QChartView, QPieSeries, QPieSlice
+
         series = QPieSeries()
         series.setHoleSize(0.3)  # Para gráfico de dona
 
@@ -831,8 +799,17 @@ class DashboardTab(BaseTab):
 
         return chart_view
 
-    def _create_bar_chart(self, data: List[Dict], title: str, color: str) -> QChartView:
+    def _create_bar_chart(self, data: List[Dict], title: str, color: str) -> QWidget:
         """Crea un gráfico de barras"""
+        from PySide6.QtCharts import (
+            QChart,
+            QChartView,
+            QBarSeries,
+            QBarSet,
+            QBarCategoryAxis,
+            QValueAxis,
+        )
+
         series = QBarSeries()
         bar_set = QBarSet("")
 
@@ -967,7 +944,10 @@ class DashboardTab(BaseTab):
     @Slot()
     def export_to_pdf(self):
         """Exporta el dashboard a PDF"""
-        if not PDF_SUPPORT:
+        try:
+            from PySide6.QtPrintSupport import QPrinter
+        except ImportError:
+            logger.warning("QPrinter no disponible - funcionalidad PDF desactivada")
             self.show_error("La funcionalidad de exportación a PDF no está disponible")
             return
 
@@ -998,10 +978,8 @@ class DashboardTab(BaseTab):
             printer.setOutputFileName(file_path)
 
             # Configurar tamaño de página (PyQt6)
-            printer.setPageSize(letter)  # type: ignore
-            printer.setPageOrientation(
-                QPrinter.PaQPrinter.setPageSizegeOrientation.Portrait  # type: ignore
-            )
+            printer.setPageSize(QPageSize(QPageSize.PageSizeId.Letter))
+            printer.setPageOrientation(QPageLayout.Orientation.Portrait)
 
             # Imprimir - en PyQt6 se usa print() en lugar de print_()
             # Alternativamente, puedes usar QPainter
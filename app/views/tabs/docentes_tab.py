@@ -39,6 +39,21 @@ class DocentesTab(QWidget):
     docente_seleccionado = Signal(dict)
     necesita_actualizar = Signal()
 
+    # Columnas que usan la tabla, los filtros y el diálogo de detalles
+    COLUMNAS_LISTA = (
+        "id",
+        "ci_numero",
+        "ci_expedicion",
+        "nombres",
+        "apellidos",
+        "max_grado_academico",
+        "especialidad",
+        "telefono",
+        "email",
+        "curriculum_path",
+        "activo",
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -459,7 +474,7 @@ class DocentesTab(QWidget):
             self.lbl_estado.setText("Cargando docentes...")
 
             # Obtener todos los docentes
-            docentes = DocenteModel().get_all()
+            docentes = DocenteModel().get_all(columns=self.COLUMNAS_LISTA)
 
             # CORRECCIÓN: Asegurar que no sea None
             self.docentes_data = docentes if docentes is not None else []
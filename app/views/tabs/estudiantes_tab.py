@@ -24,6 +24,18 @@ class EstudiantesTab(QWidget):
     # Señales para comunicación con MainWindow
     estudiante_seleccionado = Signal(dict)
     necesita_actualizar = Signal()
+
+    # Columnas que usan la tabla, los filtros y el diálogo de detalles
+    COLUMNAS_LISTA = (
+        'id',
+        'ci_numero',
+        'ci_expedicion',
+        'nombres',
+        'apellidos',
+        'telefono',
+        'email',
+        'activo',
+    )
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -403,7 +415,7 @@ class EstudiantesTab(QWidget):
             self.lbl_estado.setText("Cargando estudiantes...")
             
             # Obtener todos los estudiantes
-            self.estudiantes_data = EstudianteModel.get_all()
+            self.estudiantes_data = EstudianteModel().get_all(columns=self.COLUMNAS_LISTA)
             
             # Resetear paginación
             self.current_page = 1
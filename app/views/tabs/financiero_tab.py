@@ -49,6 +49,20 @@ class FinancieroTab(BaseTab):
     pago_seleccionado = Signal(dict)
     necesita_actualizar = Signal()
 
+    # Columnas de ingresos que usan la tabla, los filtros y el resumen
+    COLUMNAS_LISTA = (
+        "id",
+        "matricula_id",
+        "nro_cuota",
+        "fecha",
+        "monto",
+        "concepto",
+        "forma_pago",
+        "estado",
+        "nro_comprobante",
+        "created_at",
+    )
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -563,7 +577,7 @@ class FinancieroTab(BaseTab):
             self.lbl_estado.setText("Cargando pagos...")
 
             # Obtener todos los pagos
-            self.pagos_data = IngresoModel.get_all_records(IngresoModel())
+            self.pagos_data = IngresoModel().get_all_records(columns=self.COLUMNAS_LISTA)
 
             # Resetear paginación
             self.current_page = 1
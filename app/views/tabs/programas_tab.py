@@ -24,6 +24,19 @@ class ProgramasTab(QWidget):
     # Señales para comunicación con MainWindow
     programa_seleccionado = Signal(dict)
     necesita_actualizar = Signal()
+
+    # Columnas que usan la tabla, los filtros (incluye descripcion) y el
+    # diálogo de detalles
+    COLUMNAS_LISTA = (
+        'id',
+        'codigo',
+        'nombre',
+        'descripcion',
+        'costo_base',
+        'cupos_totales',
+        'cupos_disponibles',
+        'estado',
+    )
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -403,7 +416,7 @@ class ProgramasTab(QWidget):
             self.lbl_estado.setText("Cargando programas...")
             
             # Obtener todos los programas
-            self.programas_data = ProgramaAcademicoModel.get_all()
+            self.programas_data = ProgramaAcademicoModel().get_all(columns=self.COLUMNAS_LISTA)
             
             # Resetear paginación
             self.current_page = 1
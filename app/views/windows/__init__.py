@@ -2,5 +2,6 @@
 Ventanas principales del sistema
 """
 from .main_window_tabs import MainWindowTabs
+from .splash_screen import SplashScreen
 
-__all__ = ["MainWindowTabs"]
+__all__ = ["MainWindowTabs", "SplashScreen"]
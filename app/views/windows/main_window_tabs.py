@@ -11,7 +11,10 @@ ESTRUCTURA PRINCIPAL:
 """
 
 import sys
+import time
 import logging
+import importlib
+from contextlib import nullcontext
 from typing import Optional
 from pathlib import Path
 
@@ -33,25 +36,7 @@ from PySide6.QtGui import QIcon, QFont, QColor, QPalette
 
 # Importar clase base
 from app.views.base_view import BaseView
-
-# Importar pestañas del sistema
-try:
-    from app.views.tabs.dashboard_tab import DashboardTab
-    from app.views.tabs.estudiantes_tab import EstudiantesTab
-    from app.views.tabs.docentes_tab import DocentesTab
-    from app.views.tabs.programas_tab import ProgramasTab
-    from app.views.tabs.financiero_tab import FinancieroTab
-    from app.views.tabs.ayuda_tab import AyudaTab
-
-    TABS_AVAILABLE = True
-except ImportError as e:
-    logger = logging.getLogger(__name__)
-    logger.warning(f"Algunas pestañas no están disponibles: {e}")
-    TABS_AVAILABLE = False
-    # Definir placeholders para evitar errores
-    DashboardTab = EstudiantesTab = DocentesTab = ProgramasTab = FinancieroTab = (
-        AyudaTab
-    ) = QWidget
+from app.database.instrumentacion import pantalla
 
 logger = logging.getLogger(__name__)
 
@@ -73,16 +58,39 @@ class MainWindowTabs(BaseView):
     window_ready = Signal()
     refresh_all_requested = Signal()
 
-    def __init__(self, parent: Optional[QWidget] = None, title: str = "FormaGestPro"):
+    # Consultas esperadas al crear o actualizar una pestaña; si se exceden
+    # se registra una advertencia (ver app.database.instrumentacion)
+    PRESUPUESTO_CONSULTAS_PESTANA = 25
+
+    # Pestañas del sistema (ícono, módulo, clase, título). El módulo se importa
+    # y la pestaña se construye la primera vez que se activa
+    TABS_CONFIG = [
+        ("🏠", "app.views.tabs.dashboard_tab", "DashboardTab", "Dashboard"),
+        ("👤", "app.views.tabs.estudiantes_tab", "EstudiantesTab", "Estudiantes"),
+        ("👨‍🏫", "app.views.tabs.docentes_tab", "DocentesTab", "Docentes"),
+        ("📚", "app.views.tabs.programas_tab", "ProgramasTab", "Programas"),
+        ("💰", "app.views.tabs.financiero_tab", "FinancieroTab", "Financiero"),
+        ("⚙️", "app.views.tabs.ayuda_tab", "AyudaTab", "Configuración"),
+    ]
+
+    def __init__(
+        self,
+        parent: Optional[QWidget] = None,
+        title: str = "FormaGestPro",
+        splash=None,
+    ):
         """
         Inicializa la ventana principal del sistema.
 
         Args:
             parent: Widget padre (opcional)
             title: Título de la ventana
+            splash: SplashScreen donde registrar las fases del arranque (opcional)
         """
         super().__init__(parent, title)
 
+        self._splash = splash
+
         logger.info("🚀 Inicializando MainWindowTabs (versión BaseView)...")
 
         # Configuración específica de ventana principal
@@ -92,17 +100,19 @@ class MainWindowTabs(BaseView):
         # Diccionario para almacenar instancias de pestañas
         self.tab_instances = {}
 
-        # Configurar ventana
-        self._setup_window()
+        with self._fase("Construyendo ventana principal"):
+            # Configurar ventana
+            self._setup_window()
 
-        # Configurar interfaz de usuario
-        self._setup_ui()
+            # Configurar interfaz de usuario
+            self._setup_ui()
 
-        # Configurar conexiones
-        self._setup_connections()
+            # Configurar conexiones
+            self._setup_connections()
 
-        # Cargar pestañas iniciales
-        self._load_initial_tabs()
+        # Registrar pestañas (solo se construye la pestaña inicial)
+        with self._fase("Cargando pestaña inicial"):
+            self._load_initial_tabs()
 
         self._window_initialized = True
         self.window_ready.emit()
@@ -113,6 +123,10 @@ class MainWindowTabs(BaseView):
     # MÉTODOS DE CONFIGURACIÓN
     # ============================================================================
 
+    def _fase(self, nombre: str):
+        """Fase del arranque medida en la pantalla de inicio, si la hay"""
+        return self._splash.fase(nombre) if self._splash else nullcontext()
+
     def _setup_window(self):
         """Configura las propiedades básicas de la ventana"""
         # Establecer título de ventana
@@ -315,74 +329,116 @@ class MainWindowTabs(BaseView):
     # ============================================================================
 
     def _load_initial_tabs(self):
-        """Carga las pestañas iniciales del sistema"""
-        if not TABS_AVAILABLE:
-            self._show_error_tabs()
-            return
-
-        logger.info("📂 Cargando pestañas del sistema...")
+        """Registra las pestañas del sistema y construye solo la actual"""
+        logger.info("📂 Registrando pestañas del sistema...")
 
         try:
-            # Lista de pestañas a cargar (ícono, clase, título)
-            tabs_to_load = [
-                ("🏠", DashboardTab, "Dashboard"),
-                ("👤", EstudiantesTab, "Estudiantes"),
-                ("👨‍🏫", DocentesTab, "Docentes"),
-                ("📚", ProgramasTab, "Programas"),
-                ("💰", FinancieroTab, "Financiero"),
-                ("⚙️", AyudaTab, "Configuración"),  # Renombrado de Ayuda a Configuración
-            ]
-
-            for icon, tab_class, title in tabs_to_load:
-                self._add_tab(tab_class, f"{icon} {title}")
+            for icon, module_name, class_name, title in self.TABS_CONFIG:
+                self._add_lazy_tab(module_name, class_name, f"{icon} {title}")
 
             self._tabs_loaded = True
-            logger.info(f"✅ {len(tabs_to_load)} pestañas cargadas correctamente")
+            self._ensure_tab_loaded(self.tab_widget.currentIndex())
+            logger.info(f"✅ {len(self.TABS_CONFIG)} pestañas registradas")
 
         except Exception as e:
             logger.error(f"❌ Error cargando pestañas: {e}")
             self._show_error_tabs()
 
-    def _add_tab(self, tab_class, tab_title):
+    def _add_lazy_tab(self, module_name, class_name, tab_title):
         """
-        Añade una pestaña al sistema.
+        Añade una pestaña cuyo contenido se construye al activarla.
 
         Args:
-            tab_class: Clase de la pestaña a instanciar
+            module_name: Módulo donde está la clase de la pestaña
+            class_name: Nombre de la clase de la pestaña
             tab_title: Título de la pestaña (con ícono)
         """
-        try:
-            # Crear instancia de la pestaña
-            tab_instance = tab_class(parent=self)
+        # Contenedor con un aviso de carga; recibirá la pestaña real
+        container = QWidget()
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+
+        loading_label = QLabel(f"⏳ Cargando {tab_title}...")
+        loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        loading_label.setStyleSheet(f"color: {self.COLORS['gray']};")
+        container_layout.addWidget(loading_label)
+
+        # Registrar antes de addTab: la primera pestaña dispara currentChanged
+        tab_index = self.tab_widget.count()
+        self.tab_instances[tab_index] = {
+            "instance": None,
+            "container": container,
+            "title": tab_title,
+            "class": class_name,
+            "module": module_name,
+        }
+
+        self.tab_widget.addTab(container, tab_title)
+
+    def _tab_info(self, index):
+        """
+        Información de la pestaña mostrada en un índice.
 
-            # Almacenar referencia
-            tab_index = self.tab_widget.count()
-            self.tab_instances[tab_index] = {
-                "instance": tab_instance,
-                "title": tab_title,
-                "class": tab_class.__name__,
-            }
+        Las pestañas son movibles, así que se busca por el widget y no por
+        el índice con el que se registró.
+        """
+        widget = self.tab_widget.widget(index)
+        for tab_info in self.tab_instances.values():
+            if widget is not None and widget in (
+                tab_info.get("container"),
+                tab_info.get("instance"),
+            ):
+                return tab_info
+        return self.tab_instances.get(index, {})
+
+    def _ensure_tab_loaded(self, index):
+        """
+        Construye la pestaña del índice si aún no se creó.
 
-            # Añadir al widget de pestañas
-            self.tab_widget.addTab(tab_instance, tab_title)
+        Args:
+            index: Índice de la pestaña
+
+        Returns:
+            dict: Información de la pestaña
+        """
+        tab_info = self._tab_info(index)
+        if tab_info.get("instance") is not None or "module" not in tab_info:
+            return tab_info
 
-            logger.debug(f"  ✅ Pestaña '{tab_title}' cargada correctamente")
+        tab_title = tab_info["title"]
+        start = time.perf_counter()
+
+        try:
+            tab_class = getattr(
+                importlib.import_module(tab_info["module"]), tab_info["class"]
+            )
+
+            # Crear instancia de la pestaña (sus consultas cuentan para su presupuesto)
+            with pantalla(
+                tab_info["class"], max_consultas=self.PRESUPUESTO_CONSULTAS_PESTANA
+            ):
+                tab_instance = tab_class(parent=self)
+
+            logger.info(
+                f"  ✅ Pestaña '{tab_title}' creada en "
+                f"{(time.perf_counter() - start) * 1000:.0f} ms"
+            )
 
         except Exception as e:
             logger.error(f"  ⚠️ Error cargando pestaña '{tab_title}': {e}")
 
             # Crear pestaña de fallback
-            fallback_widget = self._create_fallback_tab(tab_title)
-            tab_index = self.tab_widget.count()
+            tab_instance = self._create_fallback_tab(tab_title)
+            tab_info["class"] = "FallbackTab"
+            tab_info["is_fallback"] = True
 
-            self.tab_instances[tab_index] = {
-                "instance": fallback_widget,
-                "title": tab_title,
-                "class": "FallbackTab",
-                "is_fallback": True,
-            }
+        # Reemplazar el aviso de carga por la pestaña
+        container_layout = tab_info["container"].layout()
+        self._clear_layout(container_layout)
+        container_layout.addWidget(tab_instance)
+        tab_info["instance"] = tab_instance
 
-            self.tab_widget.addTab(fallback_widget, tab_title)
+        return tab_info
 
     def _create_fallback_tab(self, title):
         """
@@ -486,8 +542,8 @@ class MainWindowTabs(BaseView):
         if index < 0 or index >= self.tab_widget.count():
             return
 
-        # Obtener información de la pestaña
-        tab_info = self.tab_instances.get(index, {})
+        # Construir la pestaña la primera vez que se activa
+        tab_info = self._ensure_tab_loaded(index)
         tab_title = tab_info.get("title", "Desconocido")
 
         # Actualizar barra de estado
@@ -500,7 +556,7 @@ class MainWindowTabs(BaseView):
 
     @Slot()
     def _refresh_all_tabs(self):
-        """Actualiza todas las pestañas cargadas"""
+        """Actualiza las pestañas ya construidas (las demás cargarán datos al abrirse)"""
         logger.info("🔄 Actualizando todas las pestañas...")
 
         self.lbl_system_status.setText("⏳ Actualizando...")
@@ -513,7 +569,11 @@ class MainWindowTabs(BaseView):
                 # Si la pestaña tiene método refresh, llamarlo
                 if hasattr(tab_instance, "refresh"):
                     try:
-                        tab_instance.refresh()
+                        with pantalla(
+                            f"{tab_info.get('class')}.refresh",
+                            max_consultas=self.PRESUPUESTO_CONSULTAS_PESTANA,
+                        ):
+                            tab_instance.refresh()
                         logger.debug(f"  ✅ Pestaña {index} actualizada")
                     except Exception as e:
                         logger.warning(f"  ⚠️ Error actualizando pestaña {index}: {e}")
@@ -546,7 +606,7 @@ class MainWindowTabs(BaseView):
         if current_index < 0:
             return None, None, None
 
-        tab_info = self.tab_instances.get(current_index, {})
+        tab_info = self._ensure_tab_loaded(current_index)
         return current_index, tab_info.get("instance"), tab_info.get("title")
 
     def switch_to_tab(self, tab_index):
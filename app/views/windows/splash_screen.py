@@ -0,0 +1,90 @@
+# app/views/windows/splash_screen.py
+"""
+Pantalla de inicio de FormaGestPro.
+
+Muestra el progreso del arranque y mide cada fase (importación de módulos,
+construcción de la ventana, pestaña inicial) para diagnosticar inicios
+lentos en los equipos de recepción.
+"""
+
+import time
+import logging
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPixmap
+
+logger = logging.getLogger(__name__)
+
+
+class SplashScreen(QSplashScreen):
+    """Pantalla de inicio con registro de tiempos por fase"""
+
+    ANCHO = 480
+    ALTO = 240
+
+    def __init__(self, titulo: str = "FormaGestPro"):
+        super().__init__(self._crear_fondo(titulo))
+        self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint, True)
+
+        self._inicio = time.perf_counter()
+        self.tiempos: List[Tuple[str, float]] = []
+
+    def _crear_fondo(self, titulo: str) -> QPixmap:
+        """Fondo simple dibujado en memoria (no depende de archivos)"""
+        pixmap = QPixmap(self.ANCHO, self.ALTO)
+        pixmap.fill(QColor("#2c3e50"))
+
+        painter = QPainter(pixmap)
+        painter.setPen(QColor("#ffffff"))
+        painter.setFont(QFont("Segoe UI", 22, QFont.Weight.Bold))
+        painter.drawText(
+            pixmap.rect().adjusted(0, 0, 0, -60),
+            Qt.AlignmentFlag.AlignCenter,
+            f"🏛️ {titulo}",
+        )
+        painter.setFont(QFont("Segoe UI", 10))
+        painter.setPen(QColor("#bdc3c7"))
+        painter.drawText(
+            pixmap.rect().adjusted(0, 60, 0, 0),
+            Qt.AlignmentFlag.AlignCenter,
+            "Sistema de Gestión Académica",
+        )
+        painter.end()
+        return pixmap
+
+    @contextmanager
+    def fase(self, nombre: str):
+        """
+        Mide una fase del arranque y la muestra en la pantalla de inicio.
+
+        Args:
+            nombre: Descripción de la fase (ej. "Cargando pestaña inicial")
+        """
+        self._mostrar(f"⏳ {nombre}...")
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            self.tiempos.append((nombre, ms))
+            logger.info(f"⏱️ Inicio - {nombre}: {ms:.0f} ms")
+
+    def _mostrar(self, mensaje: str):
+        """Actualiza el mensaje y procesa eventos para que se pinte"""
+        self.showMessage(
+            mensaje,
+            Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter,
+            QColor("#ecf0f1"),
+        )
+        QApplication.processEvents()
+
+    def finish(self, window):
+        """Cierra la pantalla de inicio y registra el resumen de tiempos"""
+        super().finish(window)
+
+        total = (time.perf_counter() - self._inicio) * 1000
+        detalle = ", ".join(f"{nombre} {ms:.0f} ms" for nombre, ms in self.tiempos)
+        logger.info(f"🚀 Arranque completo en {total:.0f} ms ({detalle})")
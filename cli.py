@@ -2891,11 +2891,19 @@ def simular_plan_pagos(programa, planes):
     # Mostrar planes activos
     planes_activos = [p for p in planes if p.activo]
     
+    # Cuotas exactas al centavo de todos los planes (la última absorbe el redondeo)
+    from utils.calculos_financieros import calcular_monto_cuota
+    cuotas_por_plan = {
+        plan.id: calcular_monto_cuota(programa.costo_base, plan.nro_cuotas)
+        for plan in planes_activos
+    }
+    
     if planes_activos:
         print(f"\n📅 PLANES DE PAGO DISPONIBLES ({len(planes_activos)}):")
         
         for i, plan in enumerate(planes_activos, 1):
-            monto_cuota = programa.costo_base / plan.nro_cuotas
+            cuotas_plan = cuotas_por_plan[plan.id]
+            monto_cuota = cuotas_plan[0]
             
             print(f"\n{i}. {plan.nombre}:")
             print(f"   • Cuotas: {plan.nro_cuotas} de ${monto_cuota:.2f}")
@@ -2911,10 +2919,12 @@ def simular_plan_pagos(programa, planes):
             print(f"   📅 SIMULACIÓN DE FECHAS:")
             for j in range(1, min(plan.nro_cuotas + 1, 7)):  # Mostrar máximo 6 cuotas
                 fecha_cuota = hoy + timedelta(days=(j * plan.intervalo_dias))
-                print(f"      Cuota {j}: {fecha_cuota.strftime('%d/%m/%Y')} - ${monto_cuota:.2f}")
+                print(f"      Cuota {j}: {fecha_cuota.strftime('%d/%m/%Y')} - ${cuotas_plan[j - 1]:.2f}")
             
             if plan.nro_cuotas > 6:
                 print(f"      ... y {plan.nro_cuotas - 6} cuotas más")
+            if cuotas_plan[-1] != monto_cuota:
+                print(f"      (la última cuota es de ${cuotas_plan[-1]:.2f} por redondeo)")
     else:
         print("\nℹ️  No hay planes de pago activos para este programa.")
     
@@ -2925,7 +2935,7 @@ def simular_plan_pagos(programa, planes):
         print("-" * 55)
         
         for plan in planes_activos:
-            monto_cuota = programa.costo_base / plan.nro_cuotas
+            monto_cuota = cuotas_por_plan[plan.id][0]
             print(f"{plan.nombre:<20} {plan.nro_cuotas:<10} ${monto_cuota:<14.2f} ${programa.costo_base:<9.2f}")
     
     pausar()
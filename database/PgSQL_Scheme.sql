@@ -273,12 +273,15 @@ CREATE TABLE matriculas (
         CHECK ((modalidad_pago = 'CUOTAS' AND plan_pago_id IS NOT NULL) OR 
                (modalidad_pago = 'CONTADO' AND plan_pago_id IS NULL)),
     CONSTRAINT ck_monto_pagado_no_excede 
-        CHECK (monto_pagado <= monto_final),
-    
-    -- Índices para consultas frecuentes
-    CONSTRAINT idx_matricula_estado UNIQUE (estado_pago, estado_academico)
+        CHECK (monto_pagado <= monto_final)
 );
 
+-- Índices para consultas frecuentes
+-- Comentario: Índice simple; como UNIQUE solo admitía una matrícula por
+-- combinación de estados.
+-- Nota: En bases existentes aplicar database/migracion_indices_no_unicos.sql
+CREATE INDEX idx_matricula_estado ON matriculas(estado_pago, estado_academico);
+
 -- 4.12 TABLA: usuarios
 -- Comentario: Usuarios del sistema con roles y autenticación
 CREATE TABLE usuarios (
@@ -337,10 +340,14 @@ CREATE TABLE ingresos (
         CHECK (nro_cuota IS NULL OR nro_cuota > 0),
     
     -- Índices
-    CONSTRAINT idx_ingreso_fecha UNIQUE (fecha, id),
-    CONSTRAINT idx_ingreso_matricula UNIQUE (matricula_id, tipo_ingreso)
+    CONSTRAINT idx_ingreso_fecha UNIQUE (fecha, id)
 );
 
+-- Comentario: Índice simple; como UNIQUE solo admitía un pago por
+-- matrícula y tipo de ingreso (una sola cuota).
+-- Nota: En bases existentes aplicar database/migracion_indices_no_unicos.sql
+CREATE INDEX idx_ingreso_matricula ON ingresos(matricula_id, tipo_ingreso);
+
 -- 4.8 TABLA: gastos
 -- Comentario: Registro de gastos operativos del sistema
 CREATE TABLE gastos (
@@ -364,12 +371,15 @@ CREATE TABLE gastos (
         ON DELETE SET NULL,
     
     -- Restricciones
-    CONSTRAINT ck_gasto_monto_positivo CHECK (monto > 0),
-    
-    -- Índices
-    CONSTRAINT idx_gasto_categoria UNIQUE (categoria, fecha)
+    CONSTRAINT ck_gasto_monto_positivo CHECK (monto > 0)
 );
 
+-- Índices
+-- Comentario: Índice simple; como UNIQUE solo admitía un gasto por
+-- categoría y día.
+-- Nota: En bases existentes aplicar database/migracion_indices_no_unicos.sql
+CREATE INDEX idx_gasto_categoria ON gastos(categoria, fecha);
+
 -- 4.9 TABLA: comprobantes_adjuntos (VERSIÓN CORREGIDA)
 -- Comentario: Archivos adjuntos de comprobantes (unificada para ingresos y gastos)
 CREATE TABLE comprobantes_adjuntos (
@@ -422,17 +432,21 @@ CREATE TRIGGER tr_validar_origen_comprobante
     EXECUTE FUNCTION fn_validar_origen_comprobante();
 
 -- 4.10 TABLA: movimientos_caja
--- Comentario: Movimientos simplificados de caja para reportes rápidos
+-- Comentario: Movimientos simplificados de caja para reportes rápidos.
+-- Particionada por mes sobre fecha (ver sección 5.14); la clave primaria
+-- debe incluir la columna de partición.
 CREATE TABLE movimientos_caja (
-    id INTEGER PRIMARY KEY DEFAULT nextval('seq_movimientos_caja_id'),
+    id INTEGER NOT NULL DEFAULT nextval('seq_movimientos_caja_id'),
     fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
     tipo d_tipo_movimiento NOT NULL,
     monto DECIMAL(12,2) NOT NULL,
-    origen_tipo TEXT CHECK (origen_tipo IN ('INGRESO', 'GASTO')),
+    origen_tipo TEXT CHECK (origen_tipo IN ('INGRESO', 'GASTO', 'FACTURA')),
     origen_id INTEGER,
     descripcion TEXT NOT NULL,
     registrado_por INTEGER,
     
+    CONSTRAINT pk_movimientos_caja PRIMARY KEY (id, fecha),
+    
     -- Claves foráneas
     CONSTRAINT fk_movimiento_registrado_por 
         FOREIGN KEY (registrado_por) 
@@ -440,12 +454,15 @@ CREATE TABLE movimientos_caja (
         ON DELETE SET NULL,
     
     -- Restricciones
-    CONSTRAINT ck_movimiento_monto_positivo CHECK (monto > 0),
-    CONSTRAINT uk_movimiento_origen UNIQUE (origen_tipo, origen_id),
-    
-    -- Índices para consultas de caja
-    CONSTRAINT idx_movimiento_fecha_tipo UNIQUE (fecha, tipo)
-);
+    CONSTRAINT ck_movimiento_monto_positivo CHECK (monto > 0)
+) PARTITION BY RANGE (fecha);
+
+-- Índices para consultas de caja
+-- Comentario: Una restricción UNIQUE en una tabla particionada debe incluir
+-- fecha, por lo que la unicidad de (origen_tipo, origen_id) se valida con
+-- el trigger tr_validar_origen_movimiento_unico.
+CREATE INDEX idx_movimiento_origen ON movimientos_caja(origen_tipo, origen_id);
+CREATE INDEX idx_movimiento_fecha_tipo ON movimientos_caja(fecha, tipo);
 
 -- 4.11 TABLA: facturas
 -- Comentario: Registro de facturas emitidas (solo registro, no generación)
@@ -488,11 +505,12 @@ CREATE TABLE configuraciones (
 
 -- 4.14 TABLA: auditoria_transacciones
 -- Comentario: Auditoría de todas las transacciones (ingresos y gastos)
+-- Particionada por mes sobre fecha_hora (ver sección 5.14).
 CREATE TABLE auditoria_transacciones (
-    id INTEGER PRIMARY KEY DEFAULT nextval('seq_auditoria_transacciones_id'),
-    fecha_hora TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    id INTEGER NOT NULL DEFAULT nextval('seq_auditoria_transacciones_id'),
+    fecha_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     usuario_id INTEGER NOT NULL,
-    origen_tipo TEXT NOT NULL CHECK (origen_tipo IN ('INGRESO', 'GASTO')),
+    origen_tipo TEXT NOT NULL CHECK (origen_tipo IN ('INGRESO', 'GASTO', 'FACTURA')),
     origen_id INTEGER NOT NULL,
     accion TEXT NOT NULL CHECK (accion IN ('CREACION', 'MODIFICACION', 'ELIMINACION', 'ANULACION')),
     motivo TEXT NOT NULL,
@@ -500,16 +518,121 @@ CREATE TABLE auditoria_transacciones (
     ruta_resolucion TEXT,
     datos_anteriores TEXT,
     datos_nuevos TEXT,
+    prev_hash TEXT,
+    hash TEXT,
+    
+    CONSTRAINT pk_auditoria_transacciones PRIMARY KEY (id, fecha_hora),
     
     -- Claves foráneas
     CONSTRAINT fk_auditoria_usuario 
         FOREIGN KEY (usuario_id) 
         REFERENCES usuarios(id) 
+        ON DELETE CASCADE
+) PARTITION BY RANGE (fecha_hora);
+
+-- Índices para consultas de auditoría
+-- Comentario: No son UNIQUE; varios eventos pueden compartir segundo y acción
+-- cuando se escriben en lote.
+CREATE INDEX idx_auditoria_hash ON auditoria_transacciones(hash);
+CREATE INDEX idx_auditoria_fecha_accion ON auditoria_transacciones(fecha_hora, accion);
+CREATE INDEX idx_auditoria_origen ON auditoria_transacciones(origen_tipo, origen_id, accion);
+
+-- 4.15 TABLA: auditoria_checkpoints
+-- Comentario: Último eslabón verificado de la cadena de hash de auditoría.
+-- Permite verificar la cadena de forma incremental.
+CREATE SEQUENCE seq_auditoria_checkpoints_id START 1;
+
+CREATE TABLE auditoria_checkpoints (
+    id INTEGER PRIMARY KEY DEFAULT nextval('seq_auditoria_checkpoints_id'),
+    ultimo_id INTEGER NOT NULL,
+    ultimo_hash TEXT NOT NULL,
+    registros_verificados INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_auditoria_checkpoints_ultimo_id ON auditoria_checkpoints(ultimo_id DESC);
+
+-- 4.16 TABLA: series_numeracion
+-- Comentario: Contador por serie de documentos (facturas, comprobantes de
+-- gasto, recibos de ingreso). El número se asigna con UPDATE ... RETURNING
+-- dentro de la transacción del documento: el bloqueo de fila serializa a los
+-- emisores concurrentes y un ROLLBACK devuelve el número, sin huecos.
+CREATE TABLE series_numeracion (
+    serie TEXT PRIMARY KEY,
+    prefijo TEXT NOT NULL DEFAULT '',
+    digitos INTEGER NOT NULL DEFAULT 8,
+    ultimo_numero BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT ck_serie_digitos CHECK (digitos BETWEEN 1 AND 20),
+    CONSTRAINT ck_serie_ultimo_numero CHECK (ultimo_numero >= 0)
+);
+
+-- 4.17 TABLA: resumen_financiero
+-- Comentario: Acumulados diarios de ingresos, gastos, facturas y movimientos
+-- de caja por (año, mes, día, tipo, categoría, forma de pago, estado). Se
+-- mantiene de forma incremental con triggers por sentencia (sección 5.19) y
+-- permite resúmenes mensuales y comparativos multianuales sin recorrer las
+-- tablas de origen. fn_reconstruir_resumen_financiero() lo recalcula.
+-- Retirar movimientos de caja por retención (DROP de particiones o DELETE
+-- con formagest.archivando = 'on') no resta del resumen: el saldo y los
+-- reportes históricos se mantienen.
+CREATE TABLE resumen_financiero (
+    fuente TEXT NOT NULL CHECK (fuente IN ('INGRESO', 'GASTO', 'FACTURA', 'MOVIMIENTO')),
+    anio SMALLINT NOT NULL,
+    mes SMALLINT NOT NULL CHECK (mes BETWEEN 1 AND 12),
+    dia SMALLINT NOT NULL CHECK (dia BETWEEN 1 AND 31),
+    tipo TEXT NOT NULL DEFAULT '',
+    categoria TEXT NOT NULL DEFAULT '',
+    forma_pago TEXT NOT NULL DEFAULT '',
+    estado TEXT NOT NULL DEFAULT '',
+    cantidad BIGINT NOT NULL DEFAULT 0,
+    total DECIMAL(14,2) NOT NULL DEFAULT 0,
+
+    CONSTRAINT pk_resumen_financiero PRIMARY KEY
+        (fuente, anio, mes, dia, tipo, categoria, forma_pago, estado)
+);
+
+-- 4.18 TABLA: vistas_materializadas
+-- Comentario: Estado de refresco de las vistas materializadas de la sección
+-- 6. Los triggers de las tablas de origen marcan la vista como pendiente y el
+-- refresco (CONCURRENTLY) lo hace la aplicación o un proceso programado.
+CREATE TABLE vistas_materializadas (
+    nombre TEXT PRIMARY KEY,
+    pendiente BOOLEAN NOT NULL DEFAULT FALSE,
+    marcada_en TIMESTAMP,
+    ultima_actualizacion TIMESTAMP,
+    duracion_ms INTEGER
+);
+
+-- 4.19 TABLA: sesiones
+-- Comentario: Sesiones de usuario compartidas entre instancias de la
+-- aplicación (ver app/models/sesiones_model.py). UNLOGGED: no escribe WAL
+-- en cada validación y se vacía tras una caída del servidor, lo que solo
+-- obliga a iniciar sesión de nuevo. Se guarda el SHA-256 del token.
+CREATE UNLOGGED TABLE sesiones (
+    token_hash TEXT PRIMARY KEY,
+    usuario_id INTEGER NOT NULL
+        REFERENCES usuarios(id)
         ON DELETE CASCADE,
-    
-    -- Índices para consultas de auditoría
-    CONSTRAINT idx_auditoria_fecha_accion UNIQUE (fecha_hora, accion),
-    CONSTRAINT idx_auditoria_origen UNIQUE (origen_tipo, origen_id, accion)
+    datos JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_activity TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expira_en TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_sesiones_usuario ON sesiones(usuario_id);
+CREATE INDEX idx_sesiones_expira ON sesiones(expira_en);
+
+-- Delta de filas que se acumula en resumen_financiero
+CREATE TYPE t_resumen_delta AS (
+    fecha DATE,
+    tipo TEXT,
+    categoria TEXT,
+    forma_pago TEXT,
+    estado TEXT,
+    cantidad BIGINT,
+    total DECIMAL(14,2)
 );
 
 -- ============================================================
@@ -633,12 +756,432 @@ CREATE TRIGGER tr_actualizar_cupos_matricula
     FOR EACH ROW
     EXECUTE FUNCTION fn_actualizar_cupos_matricula();
 
+-- 5.12 FUNCIÓN: Auditoría de solo inserción
+-- Comentario: Los registros de auditoría forman una cadena de hash; modificarlos
+-- rompería la verificación. Las correcciones se registran como eventos nuevos.
+CREATE OR REPLACE FUNCTION fn_auditoria_solo_insercion()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'auditoria_transacciones es de solo inserción (registro %)', OLD.id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.13 TRIGGER para impedir UPDATE en auditoría
+CREATE TRIGGER tr_auditoria_solo_insercion
+    BEFORE UPDATE ON auditoria_transacciones
+    FOR EACH ROW
+    EXECUTE FUNCTION fn_auditoria_solo_insercion();
+
+-- 5.14 FUNCIÓN: Crear partición mensual
+-- Comentario: Crea (si no existe) la partición del mes que contiene p_mes
+-- para auditoria_transacciones o movimientos_caja. Nombre: <tabla>_pAAAA_MM.
+-- Si la partición DEFAULT ya tiene filas de ese mes, PostgreSQL no permite
+-- crearla directamente: se desprende la DEFAULT, se crea la partición, se
+-- mueven las filas del mes y se vuelve a adjuntar, todo en la misma
+-- transacción.
+CREATE OR REPLACE FUNCTION fn_crear_particion_mensual(p_tabla TEXT, p_mes DATE)
+RETURNS TEXT AS $$
+DECLARE
+    v_inicio DATE := date_trunc('month', p_mes)::DATE;
+    v_fin DATE := (date_trunc('month', p_mes) + INTERVAL '1 month')::DATE;
+    v_nombre TEXT := p_tabla || '_p' || to_char(date_trunc('month', p_mes), 'YYYY_MM');
+    v_columna TEXT;
+    v_default REGCLASS;
+    v_con_filas BOOLEAN := FALSE;
+BEGIN
+    IF p_tabla NOT IN ('auditoria_transacciones', 'movimientos_caja') THEN
+        RAISE EXCEPTION 'La tabla % no está particionada por mes', p_tabla;
+    END IF;
+
+    IF to_regclass(v_nombre) IS NOT NULL THEN
+        RETURN v_nombre;
+    END IF;
+
+    -- Evita que se inserten filas del mes en DEFAULT mientras se crea
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', p_tabla);
+    IF to_regclass(v_nombre) IS NOT NULL THEN
+        RETURN v_nombre;
+    END IF;
+
+    v_columna := CASE p_tabla
+        WHEN 'auditoria_transacciones' THEN 'fecha_hora'
+        ELSE 'fecha'
+    END;
+
+    SELECT NULLIF(partdefid, 0)::REGCLASS INTO v_default
+    FROM pg_partitioned_table
+    WHERE partrelid = p_tabla::REGCLASS;
+
+    IF v_default IS NOT NULL THEN
+        EXECUTE format(
+            'SELECT EXISTS (SELECT 1 FROM %s WHERE %I >= %L AND %I < %L)',
+            v_default, v_columna, v_inicio, v_columna, v_fin
+        ) INTO v_con_filas;
+    END IF;
+
+    IF v_con_filas THEN
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %s', p_tabla, v_default);
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        v_nombre, p_tabla, v_inicio, v_fin
+    );
+
+    IF v_con_filas THEN
+        EXECUTE format(
+            'WITH movidas AS (
+                 DELETE FROM %s WHERE %I >= %L AND %I < %L RETURNING *
+             )
+             INSERT INTO %I SELECT * FROM movidas',
+            v_default, v_columna, v_inicio, v_columna, v_fin, v_nombre
+        );
+        EXECUTE format('ALTER TABLE %I ATTACH PARTITION %s DEFAULT', p_tabla, v_default);
+    END IF;
+
+    RETURN v_nombre;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.15 FUNCIÓN: Crear varias particiones mensuales consecutivas
+CREATE OR REPLACE FUNCTION fn_crear_particiones_mensuales(
+    p_tabla TEXT, p_desde DATE, p_meses INTEGER
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    i INTEGER;
+BEGIN
+    FOR i IN 0..p_meses - 1 LOOP
+        RETURN NEXT fn_crear_particion_mensual(
+            p_tabla, (p_desde + make_interval(months => i))::DATE
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.16 Particiones iniciales: 12 meses atrás y 3 hacia adelante, más una
+-- partición DEFAULT para filas fuera de rango. Las siguientes se crean con
+-- scripts/gestionar_particiones.py (programar mensualmente).
+CREATE TABLE auditoria_transacciones_default
+    PARTITION OF auditoria_transacciones DEFAULT;
+CREATE TABLE movimientos_caja_default
+    PARTITION OF movimientos_caja DEFAULT;
+
+SELECT fn_crear_particiones_mensuales(
+    'auditoria_transacciones', (CURRENT_DATE - INTERVAL '12 months')::DATE, 16
+);
+SELECT fn_crear_particiones_mensuales(
+    'movimientos_caja', (CURRENT_DATE - INTERVAL '12 months')::DATE, 16
+);
+
+-- 5.17 FUNCIÓN: Unicidad de origen en movimientos_caja
+-- Comentario: Reemplaza la restricción UNIQUE (origen_tipo, origen_id), que
+-- no es posible en una tabla particionada sin incluir fecha. Informa el
+-- nombre uk_movimiento_origen para que la aplicación traduzca el error.
+-- Un advisory lock por origen serializa las inserciones concurrentes: sin él,
+-- en READ COMMITTED dos transacciones no ven la fila de la otra y ambas pasan
+-- la verificación. El lock se libera al terminar la transacción, y la
+-- consulta que sigue toma una instantánea nueva que ya ve la fila confirmada.
+CREATE OR REPLACE FUNCTION fn_validar_origen_movimiento_unico()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.origen_tipo IS NOT NULL AND NEW.origen_id IS NOT NULL THEN
+        PERFORM pg_advisory_xact_lock(hashtext(NEW.origen_tipo), NEW.origen_id);
+    END IF;
+
+    IF NEW.origen_tipo IS NOT NULL AND NEW.origen_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM movimientos_caja
+        WHERE origen_tipo = NEW.origen_tipo
+          AND origen_id = NEW.origen_id
+          AND (TG_OP = 'INSERT' OR id <> NEW.id)
+    ) THEN
+        RAISE EXCEPTION 'Ya existe un movimiento para el origen % %',
+            NEW.origen_tipo, NEW.origen_id
+            USING ERRCODE = 'unique_violation', CONSTRAINT = 'uk_movimiento_origen';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.18 TRIGGER para unicidad de origen en movimientos_caja
+CREATE TRIGGER tr_validar_origen_movimiento_unico
+    BEFORE INSERT OR UPDATE OF origen_tipo, origen_id ON movimientos_caja
+    FOR EACH ROW
+    EXECUTE FUNCTION fn_validar_origen_movimiento_unico();
+
+-- 5.19 FUNCIÓN: Acumular un delta en resumen_financiero
+-- Comentario: Agrupa el delta por clave y lo aplica con un único upsert. Las
+-- claves se procesan ordenadas para que sesiones concurrentes bloqueen las
+-- filas del resumen en el mismo orden.
+CREATE OR REPLACE FUNCTION fn_aplicar_resumen_financiero(
+    p_fuente TEXT, p_delta t_resumen_delta[]
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO resumen_financiero AS r
+        (fuente, anio, mes, dia, tipo, categoria, forma_pago, estado, cantidad, total)
+    SELECT p_fuente,
+           EXTRACT(YEAR FROM d.fecha)::SMALLINT,
+           EXTRACT(MONTH FROM d.fecha)::SMALLINT,
+           EXTRACT(DAY FROM d.fecha)::SMALLINT,
+           d.tipo, d.categoria, d.forma_pago, d.estado,
+           SUM(d.cantidad), SUM(d.total)
+    FROM unnest(p_delta) AS d
+    GROUP BY 2, 3, 4, 5, 6, 7, 8
+    ORDER BY 2, 3, 4, 5, 6, 7, 8
+    ON CONFLICT (fuente, anio, mes, dia, tipo, categoria, forma_pago, estado)
+    DO UPDATE SET cantidad = r.cantidad + EXCLUDED.cantidad,
+                  total = r.total + EXCLUDED.total;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.20 FUNCIONES: Delta de cada tabla de origen
+-- Comentario: Triggers por sentencia con tablas de transición: una carga
+-- masiva produce un solo upsert agrupado, no uno por fila.
+CREATE OR REPLACE FUNCTION fn_resumen_ingresos()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta t_resumen_delta[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha, tipo_ingreso, '', COALESCE(forma_pago, ''),
+                       COALESCE(estado, ''), 1, monto)::t_resumen_delta
+            FROM nuevas
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha, tipo_ingreso, '', COALESCE(forma_pago, ''),
+                       COALESCE(estado, ''), -1, -monto)::t_resumen_delta
+            FROM viejas
+        );
+    END IF;
+    PERFORM fn_aplicar_resumen_financiero('INGRESO', v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_resumen_gastos()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta t_resumen_delta[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha, '', categoria, COALESCE(forma_pago, ''),
+                       '', 1, monto)::t_resumen_delta
+            FROM nuevas
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha, '', categoria, COALESCE(forma_pago, ''),
+                       '', -1, -monto)::t_resumen_delta
+            FROM viejas
+        );
+    END IF;
+    PERFORM fn_aplicar_resumen_financiero('GASTO', v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION fn_resumen_facturas()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta t_resumen_delta[] := '{}';
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha_emision, '', '', '', COALESCE(estado, ''),
+                       1, total)::t_resumen_delta
+            FROM nuevas
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha_emision, '', '', '', COALESCE(estado, ''),
+                       -1, -total)::t_resumen_delta
+            FROM viejas
+        );
+    END IF;
+    PERFORM fn_aplicar_resumen_financiero('FACTURA', v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Comentario: Los DELETE de archivo (SET LOCAL formagest.archivando = 'on',
+-- ver ArchivadorModel.eliminar_por_lotes) no restan: igual que el DROP de una
+-- partición retirada, que no dispara triggers, el resumen conserva los
+-- movimientos archivados.
+CREATE OR REPLACE FUNCTION fn_resumen_movimientos_caja()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_delta t_resumen_delta[] := '{}';
+BEGIN
+    IF TG_OP = 'DELETE'
+       AND current_setting('formagest.archivando', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha::DATE, tipo, COALESCE(origen_tipo, ''), '', '',
+                       1, monto)::t_resumen_delta
+            FROM nuevas
+        );
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        v_delta := v_delta || ARRAY(
+            SELECT ROW(fecha::DATE, tipo, COALESCE(origen_tipo, ''), '', '',
+                       -1, -monto)::t_resumen_delta
+            FROM viejas
+        );
+    END IF;
+    PERFORM fn_aplicar_resumen_financiero('MOVIMIENTO', v_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.21 TRIGGERS para mantener resumen_financiero
+-- Comentario: Un trigger con tablas de transición solo admite un evento,
+-- por eso hay tres por tabla.
+CREATE TRIGGER tr_resumen_ingresos_ins AFTER INSERT ON ingresos
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_ingresos();
+CREATE TRIGGER tr_resumen_ingresos_upd AFTER UPDATE ON ingresos
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_ingresos();
+CREATE TRIGGER tr_resumen_ingresos_del AFTER DELETE ON ingresos
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_ingresos();
+
+CREATE TRIGGER tr_resumen_gastos_ins AFTER INSERT ON gastos
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_gastos();
+CREATE TRIGGER tr_resumen_gastos_upd AFTER UPDATE ON gastos
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_gastos();
+CREATE TRIGGER tr_resumen_gastos_del AFTER DELETE ON gastos
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_gastos();
+
+CREATE TRIGGER tr_resumen_facturas_ins AFTER INSERT ON facturas
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_facturas();
+CREATE TRIGGER tr_resumen_facturas_upd AFTER UPDATE ON facturas
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_facturas();
+CREATE TRIGGER tr_resumen_facturas_del AFTER DELETE ON facturas
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_facturas();
+
+CREATE TRIGGER tr_resumen_movimientos_caja_ins AFTER INSERT ON movimientos_caja
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_movimientos_caja();
+CREATE TRIGGER tr_resumen_movimientos_caja_upd AFTER UPDATE ON movimientos_caja
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_movimientos_caja();
+CREATE TRIGGER tr_resumen_movimientos_caja_del AFTER DELETE ON movimientos_caja
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_resumen_movimientos_caja();
+
+-- 5.22 FUNCIÓN: Reconstruir resumen_financiero desde las tablas de origen
+-- Comentario: Para la carga inicial o para reparar el resumen. Bloquea las
+-- tablas de origen contra escrituras mientras recalcula. Los movimientos de
+-- caja archivados ya no están en la tabla: con p_conservar_archivado (por
+-- defecto) se conservan las filas MOVIMIENTO anteriores al movimiento más
+-- antiguo que queda, para que el saldo no cambie. Con FALSE el resumen
+-- refleja solo lo que hay en las tablas.
+CREATE OR REPLACE FUNCTION fn_reconstruir_resumen_financiero(
+    p_conservar_archivado BOOLEAN DEFAULT TRUE
+)
+RETURNS BIGINT AS $$
+DECLARE
+    v_filas BIGINT;
+    v_desde DATE;
+BEGIN
+    LOCK TABLE ingresos, gastos, facturas, movimientos_caja IN SHARE MODE;
+
+    IF p_conservar_archivado THEN
+        SELECT MIN(fecha)::DATE INTO v_desde FROM movimientos_caja;
+        DELETE FROM resumen_financiero
+        WHERE NOT (fuente = 'MOVIMIENTO'
+                   AND (v_desde IS NULL OR make_date(anio, mes, dia) < v_desde));
+    ELSE
+        DELETE FROM resumen_financiero;
+    END IF;
+
+    INSERT INTO resumen_financiero
+        (fuente, anio, mes, dia, tipo, categoria, forma_pago, estado, cantidad, total)
+    SELECT fuente,
+           EXTRACT(YEAR FROM fecha)::SMALLINT,
+           EXTRACT(MONTH FROM fecha)::SMALLINT,
+           EXTRACT(DAY FROM fecha)::SMALLINT,
+           tipo, categoria, forma_pago, estado, COUNT(*), SUM(monto)
+    FROM (
+        SELECT 'INGRESO' AS fuente, fecha, tipo_ingreso AS tipo, '' AS categoria,
+               COALESCE(forma_pago, '') AS forma_pago, COALESCE(estado, '') AS estado,
+               monto
+        FROM ingresos
+        UNION ALL
+        SELECT 'GASTO', fecha, '', categoria, COALESCE(forma_pago, ''), '', monto
+        FROM gastos
+        UNION ALL
+        SELECT 'FACTURA', fecha_emision, '', '', '', COALESCE(estado, ''), total
+        FROM facturas
+        UNION ALL
+        SELECT 'MOVIMIENTO', fecha::DATE, tipo, COALESCE(origen_tipo, ''), '', '', monto
+        FROM movimientos_caja
+    ) AS origen
+    GROUP BY 1, 2, 3, 4, 5, 6, 7, 8;
+
+    GET DIAGNOSTICS v_filas = ROW_COUNT;
+    RETURN v_filas;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.23 FUNCIÓN: Marcar vistas materializadas como pendientes de refresco
+-- Comentario: Trigger por sentencia; TG_ARGV lista las vistas afectadas. Solo
+-- escribe si la vista aún no estaba marcada, para no convertir la fila de
+-- control en un punto de contención. La notificación se entrega al hacer
+-- commit, por lo que un proceso en LISTEN refresca con los datos visibles.
+CREATE OR REPLACE FUNCTION fn_marcar_vistas_pendientes()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE vistas_materializadas
+    SET pendiente = TRUE,
+        marcada_en = CURRENT_TIMESTAMP
+    WHERE nombre = ANY(TG_ARGV) AND NOT pendiente;
+
+    PERFORM pg_notify('vistas_pendientes', array_to_string(TG_ARGV, ','));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.24 FUNCIÓN: Notificar cambios en configuraciones
+-- Comentario: Los procesos de la aplicación escuchan configuraciones_cambio y
+-- recargan su registro de configuraciones. Por sentencia: una importación
+-- masiva produce una sola notificación (y NOTIFY agrupa las repetidas).
+CREATE OR REPLACE FUNCTION fn_notificar_configuraciones()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('configuraciones_cambio', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 5.25 TRIGGER para notificar cambios en configuraciones
+CREATE TRIGGER tr_notificar_configuraciones
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON configuraciones
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_notificar_configuraciones();
+
 -- ============================================================
 -- 6. CREACIÓN DE VISTAS PARA REPORTES
 -- ============================================================
 
--- 6.1 VISTA: Resumen financiero por programa
-CREATE OR REPLACE VIEW vw_resumen_financiero_programa AS
+-- 6.1 VISTA MATERIALIZADA: Resumen financiero por programa
+CREATE MATERIALIZED VIEW vw_resumen_financiero_programa AS
 SELECT 
     p.id AS programa_id,
     p.codigo,
@@ -647,13 +1190,16 @@ SELECT
     SUM(m.monto_total) AS ingresos_potenciales,
     SUM(m.monto_pagado) AS ingresos_reales,
     SUM(m.monto_final - m.monto_pagado) AS saldo_pendiente,
-    AVG(m.monto_pagado / m.monto_final * 100) AS porcentaje_pago_promedio
+    AVG(m.monto_pagado / NULLIF(m.monto_final, 0) * 100) AS porcentaje_pago_promedio
 FROM programas_academicos p
 LEFT JOIN matriculas m ON p.id = m.programa_id
 GROUP BY p.id, p.codigo, p.nombre;
 
--- 6.2 VISTA: Estado de pagos por estudiante
-CREATE OR REPLACE VIEW vw_estado_pagos_estudiante AS
+CREATE UNIQUE INDEX idx_vw_resumen_financiero_programa
+    ON vw_resumen_financiero_programa(programa_id);
+
+-- 6.2 VISTA MATERIALIZADA: Estado de pagos por estudiante
+CREATE MATERIALIZED VIEW vw_estado_pagos_estudiante AS
 SELECT 
     e.id AS estudiante_id,
     e.nombres || ' ' || e.apellidos AS estudiante_nombre,
@@ -662,12 +1208,17 @@ SELECT
     SUM(m.monto_final) AS total_debe,
     SUM(m.monto_pagado) AS total_pagado,
     SUM(m.monto_final - m.monto_pagado) AS total_saldo,
-    STRING_AGG(p.nombre, ', ') AS programas_inscritos
+    STRING_AGG(p.nombre, ', ' ORDER BY p.nombre) AS programas_inscritos
 FROM estudiantes e
 JOIN matriculas m ON e.id = m.estudiante_id
 JOIN programas_academicos p ON m.programa_id = p.id
 GROUP BY e.id, e.nombres, e.apellidos, e.ci_numero;
 
+CREATE UNIQUE INDEX idx_vw_estado_pagos_estudiante
+    ON vw_estado_pagos_estudiante(estudiante_id);
+CREATE INDEX idx_vw_estado_pagos_estudiante_saldo
+    ON vw_estado_pagos_estudiante(total_saldo DESC);
+
 -- 6.3 VISTA: Movimientos de caja diarios
 CREATE OR REPLACE VIEW vw_movimientos_caja_diarios AS
 SELECT 
@@ -680,8 +1231,10 @@ FROM movimientos_caja
 GROUP BY DATE(fecha), tipo
 ORDER BY fecha_dia DESC;
 
--- 6.4 VISTA: Ingresos detallados por tipo
-CREATE OR REPLACE VIEW vw_ingresos_detallados AS
+-- 6.4 VISTA MATERIALIZADA: Ingresos detallados por tipo
+-- Comentario: Sin ORDER BY en la definición; el orden lo fija cada consulta
+-- y lo resuelve el índice por fecha.
+CREATE MATERIALIZED VIEW vw_ingresos_detallados AS
 SELECT 
     i.id,
     i.tipo_ingreso,
@@ -690,6 +1243,7 @@ SELECT
     i.concepto,
     i.forma_pago,
     i.estado,
+    i.matricula_id,
     e.nombres || ' ' || e.apellidos AS estudiante_nombre,
     p.nombre AS programa_nombre,
     u.nombre_completo AS registrado_por
@@ -697,8 +1251,54 @@ FROM ingresos i
 LEFT JOIN matriculas m ON i.matricula_id = m.id
 LEFT JOIN estudiantes e ON m.estudiante_id = e.id
 LEFT JOIN programas_academicos p ON m.programa_id = p.id
-LEFT JOIN usuarios u ON i.registrado_por = u.id
-ORDER BY i.fecha DESC;
+LEFT JOIN usuarios u ON i.registrado_por = u.id;
+
+CREATE UNIQUE INDEX idx_vw_ingresos_detallados
+    ON vw_ingresos_detallados(id);
+CREATE INDEX idx_vw_ingresos_detallados_fecha
+    ON vw_ingresos_detallados(fecha DESC, id DESC);
+
+-- 6.5 Control de refresco de las vistas materializadas
+INSERT INTO vistas_materializadas (nombre, ultima_actualizacion) VALUES
+    ('vw_resumen_financiero_programa', CURRENT_TIMESTAMP),
+    ('vw_estado_pagos_estudiante', CURRENT_TIMESTAMP),
+    ('vw_ingresos_detallados', CURRENT_TIMESTAMP)
+ON CONFLICT (nombre) DO NOTHING;
+
+-- 6.6 TRIGGERS para marcar vistas pendientes
+-- Comentario: Por sentencia, de modo que una carga masiva marca una sola vez.
+-- En tablas maestras solo cuentan las columnas que aparecen en las vistas.
+CREATE TRIGGER tr_vistas_pendientes_matriculas
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON matriculas
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_marcar_vistas_pendientes(
+        'vw_resumen_financiero_programa', 'vw_estado_pagos_estudiante',
+        'vw_ingresos_detallados'
+    );
+
+CREATE TRIGGER tr_vistas_pendientes_ingresos
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON ingresos
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_marcar_vistas_pendientes(
+        'vw_ingresos_detallados'
+    );
+
+CREATE TRIGGER tr_vistas_pendientes_estudiantes
+    AFTER INSERT OR DELETE OR UPDATE OF nombres, apellidos, ci_numero ON estudiantes
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_marcar_vistas_pendientes(
+        'vw_estado_pagos_estudiante', 'vw_ingresos_detallados'
+    );
+
+CREATE TRIGGER tr_vistas_pendientes_programas
+    AFTER INSERT OR DELETE OR UPDATE OF codigo, nombre ON programas_academicos
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_marcar_vistas_pendientes(
+        'vw_resumen_financiero_programa', 'vw_estado_pagos_estudiante',
+        'vw_ingresos_detallados'
+    );
+
+CREATE TRIGGER tr_vistas_pendientes_usuarios
+    AFTER DELETE OR UPDATE OF nombre_completo ON usuarios
+    FOR EACH STATEMENT EXECUTE FUNCTION fn_marcar_vistas_pendientes(
+        'vw_ingresos_detallados'
+    );
 
 -- ============================================================
 -- 7. INSERCIÓN DE DATOS INICIALES
@@ -730,6 +1330,24 @@ INSERT INTO configuraciones (clave, valor, descripcion) VALUES
 ('RUTA_CURRICULUM_DOCENTES', 'archivos/cv_docentes/', 'Ruta para CV de docentes')
 ON CONFLICT (clave) DO UPDATE SET valor = EXCLUDED.valor;
 
+-- 7.4 Insertar series de numeración de documentos
+-- Comentario: Cada contador arranca en el mayor número ya emitido en su
+-- tabla (0 en una base nueva) y nunca retrocede, igual que
+-- NumeracionModel.sincronizar_serie. Así una migración sobre datos
+-- existentes no vuelve a emitir números ya usados.
+INSERT INTO series_numeracion AS s (serie, prefijo, digitos, ultimo_numero)
+SELECT 'FACTURA', '', 8, COALESCE(MAX(nro_factura::BIGINT), 0)
+FROM facturas WHERE nro_factura ~ '^[0-9]+$'
+UNION ALL
+SELECT 'GASTO', 'GASTO-', 6, COALESCE(MAX(SUBSTRING(comprobante_nro FROM 7)::BIGINT), 0)
+FROM gastos WHERE comprobante_nro ~ '^GASTO-[0-9]+$'
+UNION ALL
+SELECT 'RECIBO_INGRESO', 'REC-', 8, COALESCE(MAX(SUBSTRING(nro_comprobante FROM 5)::BIGINT), 0)
+FROM ingresos WHERE nro_comprobante ~ '^REC-[0-9]+$'
+ON CONFLICT (serie) DO UPDATE
+SET ultimo_numero = GREATEST(s.ultimo_numero, EXCLUDED.ultimo_numero),
+    updated_at = CURRENT_TIMESTAMP;
+
 -- ============================================================
 -- 8. CREACIÓN DE ÍNDICES ADICIONALES PARA OPTIMIZACIÓN
 -- ============================================================
@@ -775,6 +1393,11 @@ COMMENT ON TABLE facturas IS 'Registro de facturas emitidas';
 COMMENT ON TABLE usuarios IS 'Usuarios del sistema con autenticación';
 COMMENT ON TABLE configuraciones IS 'Configuraciones del sistema en formato clave-valor';
 COMMENT ON TABLE auditoria_transacciones IS 'Auditoría de transacciones del sistema';
+COMMENT ON TABLE auditoria_checkpoints IS 'Puntos de control de la verificación de la cadena de auditoría';
+COMMENT ON TABLE series_numeracion IS 'Contadores sin huecos para la numeración de documentos';
+COMMENT ON TABLE vistas_materializadas IS 'Estado de refresco de las vistas materializadas de reportes';
+COMMENT ON TABLE resumen_financiero IS 'Acumulados diarios de ingresos, gastos, facturas y caja para reportes';
+COMMENT ON TABLE sesiones IS 'Sesiones de usuario activas (UNLOGGED, con expiración)';
 
 -- ============================================================
 -- 10. SENTENCIAS DE VERIFICACIÓN
@@ -788,6 +1411,7 @@ BEGIN
     RAISE NOTICE '=========================================';
     RAISE NOTICE 'Tablas creadas: %', (SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public');
     RAISE NOTICE 'Vistas creadas: %', (SELECT COUNT(*) FROM information_schema.views WHERE table_schema = 'public');
+    RAISE NOTICE 'Vistas materializadas: %', (SELECT COUNT(*) FROM pg_matviews WHERE schemaname = 'public');
     RAISE NOTICE 'Funciones creadas: %', (SELECT COUNT(*) FROM information_schema.routines WHERE routine_schema = 'public');
     RAISE NOTICE 'Triggers creados: %', (SELECT COUNT(*) FROM information_schema.triggers WHERE trigger_schema = 'public');
     RAISE NOTICE '=========================================';
@@ -0,0 +1,37 @@
+-- ============================================================
+-- MIGRACIÓN: RESTRICCIONES UNIQUE CONVERTIDAS EN ÍNDICES SIMPLES
+-- Para bases creadas con una versión anterior de PgSQL_Scheme.sql
+-- ============================================================
+-- Comentario: Estas restricciones se declararon UNIQUE aunque solo servían
+-- como índices de consulta, y rechazaban datos válidos:
+--   - matriculas(estado_pago, estado_academico): una matrícula por
+--     combinación de estados
+--   - ingresos(matricula_id, tipo_ingreso): un pago por matrícula y tipo
+--     (fallaba la segunda cuota)
+--   - gastos(categoria, fecha): un gasto por categoría y día
+-- PgSQL_Scheme.sql ya crea índices simples con los mismos nombres. Este
+-- script hace el mismo cambio en una base existente; se puede ejecutar más
+-- de una vez.
+--
+-- Uso:
+--   psql -d formagestpro_db -f database/migracion_indices_no_unicos.sql
+--
+-- Nota: Solo se relaja una regla, no se modifican datos. Volver atrás
+-- (ADD CONSTRAINT ... UNIQUE) fallará en cuanto existan filas que la
+-- restricción original no admitía.
+
+BEGIN;
+
+ALTER TABLE matriculas DROP CONSTRAINT IF EXISTS idx_matricula_estado;
+CREATE INDEX IF NOT EXISTS idx_matricula_estado
+    ON matriculas(estado_pago, estado_academico);
+
+ALTER TABLE ingresos DROP CONSTRAINT IF EXISTS idx_ingreso_matricula;
+CREATE INDEX IF NOT EXISTS idx_ingreso_matricula
+    ON ingresos(matricula_id, tipo_ingreso);
+
+ALTER TABLE gastos DROP CONSTRAINT IF EXISTS idx_gasto_categoria;
+CREATE INDEX IF NOT EXISTS idx_gasto_categoria
+    ON gastos(categoria, fecha);
+
+COMMIT;
@@ -10,17 +10,45 @@ import traceback
 
 # Y modificar el bloque try-except principal:
 try:
+    from contextlib import nullcontext
     from PySide6.QtWidgets import QApplication
-    from app.views.windows.main_window_tabs import MainWindowTabs
 
     # Configurar aplicación
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setApplicationName("FormaGestPro")
 
-    # Crear ventana principal
-    window = MainWindowTabs()
+    # Pantalla de inicio con tiempos por fase (desactivar con --sin-splash)
+    splash = None
+    if "--sin-splash" not in sys.argv:
+        from app.views.windows.splash_screen import SplashScreen
+
+        splash = SplashScreen()
+        splash.show()
+
+    with splash.fase("Importando módulos") if splash else nullcontext():
+        from app.views.windows.main_window_tabs import MainWindowTabs
+
+    # Configuraciones compartidas, recargadas con NOTIFY configuraciones_cambio
+    with splash.fase("Cargando configuraciones") if splash else nullcontext():
+        from app.models.configuracion_model import RegistroConfiguraciones
+
+        registro_configuraciones = RegistroConfiguraciones.get_instance()
+        registro_configuraciones.recargar()
+        registro_configuraciones.iniciar_escucha()
+
+    # Almacén de sesiones según la sección [sesiones] de database.ini
+    with splash.fase("Configurando sesiones") if splash else nullcontext():
+        from app.database.connection import DatabaseConnection
+        from app.models.usuarios_model import UsuariosModel
+
+        UsuariosModel.configurar_sesiones_desde_ini(DatabaseConnection().get_config_ini())
+
+    # Crear ventana principal (las pestañas se construyen al abrirse)
+    window = MainWindowTabs(splash=splash)
     window.showMaximized()
+    if splash:
+        splash.finish(window)
 
     print("✅ Aplicación iniciada correctamente")
     print("✅ Todas las importaciones funcionando")
@@ -0,0 +1,74 @@
+"""
+calibrar_hash_passwords.py - Elige las iteraciones PBKDF2 para este equipo
+
+Uso:
+    python scripts/calibrar_hash_passwords.py [--objetivo-ms MS] [--guardar]
+
+Mide el costo de PBKDF2-HMAC-SHA256 en el equipo y propone el número de
+iteraciones para que verificar una contraseña tarde aproximadamente
+--objetivo-ms (por defecto 250 ms). Con --guardar lo escribe en la
+configuración SEGURIDAD_ITERACIONES_HASH; las contraseñas con menos
+iteraciones se regeneran en el siguiente inicio de sesión de cada usuario.
+Ejecutar en el equipo más lento que autentique usuarios.
+"""
+import sys
+import time
+import hashlib
+import argparse
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.models.seguridad_passwords import calibrar_iteraciones
+
+
+def medir(iteraciones, repeticiones=3):
+    """Milisegundos (mejor de varias) de un hash con las iteraciones dadas"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        hashlib.pbkdf2_hmac("sha256", b"calibracion", b"sal-calibracion", iteraciones)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrar las iteraciones PBKDF2 de las contraseñas"
+    )
+    parser.add_argument(
+        "--objetivo-ms", type=float, default=250.0, help="Latencia objetivo por hash"
+    )
+    parser.add_argument(
+        "--guardar",
+        action="store_true",
+        help="Guardar el resultado en SEGURIDAD_ITERACIONES_HASH",
+    )
+    args = parser.parse_args()
+
+    iteraciones, ms_por_mil = calibrar_iteraciones(args.objetivo_ms)
+
+    print("⏱️  PBKDF2-HMAC-SHA256 en este equipo:")
+    for n in sorted({100_000, 200_000, 300_000, 600_000, iteraciones}):
+        marca = "  ← recomendado" if n == iteraciones else ""
+        print(f"  {n:>9,} iteraciones  {medir(n):8.1f} ms{marca}")
+
+    print(f"\n✅ Recomendado: {iteraciones} iteraciones (~{args.objetivo_ms:.0f} ms)")
+
+    if args.guardar:
+        from app.models.configuracion_model import ConfiguracionesModel
+
+        if not ConfiguracionesModel().update_by_clave(
+            "SEGURIDAD_ITERACIONES_HASH", iteraciones
+        ):
+            print("❌ No se pudo guardar la configuración")
+            return 1
+        print("💾 Guardado en SEGURIDAD_ITERACIONES_HASH")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+estadisticas_consultas.py - Estadísticas de consultas SQL de la aplicación
+
+Uso:
+    python scripts/estadisticas_consultas.py [--archivo RUTA] [--limite N]
+                                             [--orden total_ms|llamadas|max_ms|filas]
+                                             [--planes]
+
+Lee el volcado que la aplicación escribe al salir cuando [instrumentacion]
+archivo_volcado está configurado en database.ini, y muestra las consultas
+más costosas, los modelos/controladores que más consultan y el consumo por
+pantalla.
+"""
+import sys
+import json
+import argparse
+import configparser
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.database.instrumentacion import formatear_resumen
+
+
+def archivo_configurado():
+    """Ruta de archivo_volcado en database.ini, si existe"""
+    config = configparser.ConfigParser()
+    config.read(root_dir / "app" / "config" / "database.ini", encoding="utf-8")
+    return config.get("instrumentacion", "archivo_volcado", fallback="") or None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estadísticas de consultas SQL de FormaGestPro"
+    )
+    parser.add_argument("--archivo", help="Volcado JSON (por defecto, el de database.ini)")
+    parser.add_argument("--limite", type=int, default=20, help="Filas por sección")
+    parser.add_argument(
+        "--orden",
+        choices=["total_ms", "llamadas", "max_ms", "filas"],
+        default="total_ms",
+    )
+    parser.add_argument(
+        "--planes", action="store_true", help="Mostrar planes EXPLAIN capturados"
+    )
+    args = parser.parse_args()
+
+    ruta = args.archivo or archivo_configurado()
+    if not ruta or not Path(ruta).exists():
+        print("❌ No hay volcado de estadísticas. Configure archivo_volcado en")
+        print("   la sección [instrumentacion] de database.ini o use --archivo.")
+        return 1
+
+    with open(ruta, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+
+    datos["consultas"] = sorted(
+        datos.get("consultas", []), key=lambda c: c.get(args.orden, 0), reverse=True
+    )[: args.limite]
+    datos["origenes"] = datos.get("origenes", [])[: args.limite]
+    datos["pantallas"] = datos.get("pantallas", [])[: args.limite]
+
+    print(formatear_resumen(datos))
+
+    if args.planes:
+        for consulta in datos["consultas"]:
+            if consulta.get("plan"):
+                print(f"\n📋 [{consulta['huella']}] {consulta['consulta'][:100]}")
+                print(consulta["plan"])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+gestionar_particiones.py - Gestión de particiones mensuales en PostgreSQL
+
+Uso:
+    python scripts/gestionar_particiones.py crear [--tabla T] [--meses N]
+    python scripts/gestionar_particiones.py listar [--tabla T]
+    python scripts/gestionar_particiones.py retener --tabla T --dias N [--solo-desprender]
+
+Se recomienda programar "crear" una vez al mes (cron / Programador de tareas)
+para que las particiones futuras existan antes de recibir datos.
+"""
+import sys
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.models.particion_model import ParticionModel, TABLAS_PARTICIONADAS
+
+
+def crear(model, tablas, meses):
+    """Crear particiones del mes actual y los siguientes"""
+    for tabla in tablas:
+        nombres = model.crear_particiones(tabla, meses=meses)
+        print(f"✅ {tabla}: {len(nombres)} particiones aseguradas")
+
+
+def listar(model, tablas):
+    """Listar particiones con límites y tamaño"""
+    for tabla in tablas:
+        print(f"\n📋 {tabla}")
+        for p in model.listar_particiones(tabla):
+            rango = "DEFAULT" if p["es_default"] else f"{p['desde']} → {p['hasta']}"
+            tamano_mb = p["tamano_bytes"] / (1024 * 1024)
+            print(
+                f"  {p['nombre']:<45} {rango:<27} "
+                f"~{p['filas_estimadas']:>10} filas  {tamano_mb:8.2f} MB"
+            )
+
+
+def retener(model, tabla, dias, eliminar):
+    """Retirar particiones completamente anteriores al período de retención"""
+    if tabla == "auditoria_transacciones":
+        # El respaldo y la verificación de la cadena los gestiona el modelo
+        from app.models.auditoria_transacciones_model import (
+            AuditoriaTransaccionesModel,
+        )
+
+        resultado = AuditoriaTransaccionesModel().limpiar_registros_antiguos(
+            dias_retener=dias, eliminar=eliminar
+        )
+        print(f"✅ {resultado.get('mensaje')}")
+        return
+
+    fecha_limite = date.today() - timedelta(days=dias)
+    resultado = model.aplicar_retencion(tabla, fecha_limite, eliminar=eliminar)
+    print(
+        f"✅ {tabla}: {len(resultado['particiones_retiradas'])} particiones "
+        f"retiradas ({resultado['modo']}), {resultado['filas_retiradas']} filas, "
+        f"{resultado['filas_default']} filas antiguas de DEFAULT"
+    )
+    for nombre in resultado["particiones_conservadas"]:
+        print(f"⚠️  Conservada: {nombre}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gestión de particiones mensuales de FormaGestPro"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_crear = subparsers.add_parser("crear", help="Crear particiones futuras")
+    p_crear.add_argument("--tabla", choices=list(TABLAS_PARTICIONADAS))
+    p_crear.add_argument(
+        "--meses", type=int, default=4, help="Meses a asegurar desde el actual"
+    )
+
+    p_listar = subparsers.add_parser("listar", help="Listar particiones")
+    p_listar.add_argument("--tabla", choices=list(TABLAS_PARTICIONADAS))
+
+    p_retener = subparsers.add_parser(
+        "retener", help="Retirar particiones antiguas"
+    )
+    p_retener.add_argument("--tabla", choices=list(TABLAS_PARTICIONADAS), required=True)
+    p_retener.add_argument("--dias", type=int, required=True, help="Días a retener")
+    p_retener.add_argument(
+        "--solo-desprender",
+        action="store_true",
+        help="Desprender (DETACH) sin eliminar las particiones",
+    )
+
+    args = parser.parse_args()
+    model = ParticionModel()
+
+    tablas = [args.tabla] if getattr(args, "tabla", None) else list(TABLAS_PARTICIONADAS)
+
+    if args.comando == "crear":
+        crear(model, tablas, args.meses)
+    elif args.comando == "listar":
+        listar(model, tablas)
+    elif args.comando == "retener":
+        retener(model, args.tabla, args.dias, not args.solo_desprender)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
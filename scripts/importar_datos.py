@@ -0,0 +1,86 @@
+"""
+importar_datos.py - Importación en lote de estudiantes y matrículas
+
+Uso:
+    python scripts/importar_datos.py estudiantes ARCHIVO [--actualizar]
+                                     [--reporte RUTA] [--hoja HOJA] [--simular]
+    python scripts/importar_datos.py matriculas ARCHIVO
+                                     [--reporte RUTA] [--hoja HOJA] [--simular]
+
+ARCHIVO puede ser CSV (separador "," ";" o tabulador) o XLSX. Las filas
+rechazadas se escriben con sus errores en un CSV de reporte (por defecto
+<archivo>.errores.csv). Con --simular se valida y fusiona todo sin confirmar
+los cambios.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.models.importador_model import ImportadorModel
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importación en lote de estudiantes y matrículas de FormaGestPro"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    for comando, ayuda in (
+        ("estudiantes", "Importar estudiantes"),
+        ("matriculas", "Importar matrículas (estudiante por CI, programa por código)"),
+    ):
+        p = subparsers.add_parser(comando, help=ayuda)
+        p.add_argument("archivo", help="Archivo CSV o XLSX")
+        p.add_argument("--reporte", help="CSV de filas rechazadas")
+        p.add_argument("--hoja", help="Hoja a leer (solo XLSX)")
+        p.add_argument(
+            "--simular", action="store_true", help="Validar sin guardar cambios"
+        )
+        if comando == "estudiantes":
+            p.add_argument(
+                "--actualizar",
+                action="store_true",
+                help="Actualizar estudiantes cuyo CI ya está registrado",
+            )
+
+    args = parser.parse_args()
+
+    if not Path(args.archivo).exists():
+        print(f"❌ No existe el archivo {args.archivo}")
+        return 1
+
+    model = ImportadorModel()
+    try:
+        if args.comando == "estudiantes":
+            resultado = model.importar_estudiantes(
+                args.archivo,
+                ruta_reporte=args.reporte,
+                actualizar_existentes=args.actualizar,
+                simular=args.simular,
+                nombre_hoja=args.hoja,
+            )
+        else:
+            resultado = model.importar_matriculas(
+                args.archivo,
+                ruta_reporte=args.reporte,
+                simular=args.simular,
+                nombre_hoja=args.hoja,
+            )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    icono = "✅" if resultado["exito"] else "❌"
+    print(f"{icono} {resultado['mensaje']} ({resultado['total']} filas leídas)")
+    if resultado["ruta_reporte"]:
+        print(f"📄 Filas rechazadas en: {resultado['ruta_reporte']}")
+
+    return 0 if resultado["exito"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
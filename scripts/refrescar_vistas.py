@@ -0,0 +1,116 @@
+"""
+refrescar_vistas.py - Refresco de las vistas materializadas de reportes
+
+Uso:
+    python scripts/refrescar_vistas.py pendientes [--antiguedad MINUTOS]
+    python scripts/refrescar_vistas.py refrescar [--vista V] [--bloqueante]
+    python scripts/refrescar_vistas.py escuchar [--intervalo MINUTOS]
+    python scripts/refrescar_vistas.py estado
+
+Se recomienda programar "pendientes" cada pocos minutos (cron / Programador
+de tareas), o mantener "escuchar" como servicio para refrescar en cuanto se
+confirman cambios.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.models.vista_materializada_model import (
+    VistaMaterializadaModel,
+    VISTAS_MATERIALIZADAS,
+)
+
+
+def pendientes(model, antiguedad):
+    """Refrescar las vistas marcadas como pendientes"""
+    refrescadas = model.refrescar_pendientes(antiguedad_maxima_minutos=antiguedad)
+    if refrescadas:
+        for nombre in refrescadas:
+            print(f"✅ {nombre} refrescada")
+    else:
+        print("✅ No hay vistas pendientes")
+
+
+def refrescar(model, vistas, concurrente):
+    """Refrescar vistas sin importar su marca"""
+    for nombre in vistas:
+        if model.refrescar(nombre, concurrente=concurrente):
+            print(f"✅ {nombre} refrescada")
+        else:
+            print(f"⚠️  {nombre} no se refrescó")
+
+
+def escuchar(model, intervalo):
+    """Escuchar notificaciones hasta Ctrl+C"""
+    print("👂 Escuchando cambios (Ctrl+C para salir)...")
+    try:
+        model.escuchar(intervalo_minutos=intervalo)
+    except KeyboardInterrupt:
+        print("\n👋 Escucha finalizada")
+
+
+def estado(model):
+    """Mostrar el estado de refresco de cada vista"""
+    for fila in model.obtener_estado():
+        marca = "PENDIENTE" if fila["pendiente"] else "al día"
+        duracion = fila["duracion_ms"] if fila["duracion_ms"] is not None else "-"
+        print(
+            f"  {fila['nombre']:<35} {marca:<10} "
+            f"última: {fila['ultima_actualizacion']}  ({duracion} ms)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Refresco de vistas materializadas de FormaGestPro"
+    )
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_pendientes = subparsers.add_parser(
+        "pendientes", help="Refrescar vistas pendientes"
+    )
+    p_pendientes.add_argument(
+        "--antiguedad",
+        type=int,
+        help="Refrescar también vistas no actualizadas en estos minutos",
+    )
+
+    p_refrescar = subparsers.add_parser("refrescar", help="Refrescar vistas")
+    p_refrescar.add_argument("--vista", choices=list(VISTAS_MATERIALIZADAS))
+    p_refrescar.add_argument(
+        "--bloqueante",
+        action="store_true",
+        help="Refrescar sin CONCURRENTLY (bloquea lecturas, más rápido)",
+    )
+
+    p_escuchar = subparsers.add_parser(
+        "escuchar", help="Refrescar al recibir notificaciones"
+    )
+    p_escuchar.add_argument(
+        "--intervalo", type=int, default=60, help="Minutos entre revisiones periódicas"
+    )
+
+    subparsers.add_parser("estado", help="Mostrar estado de refresco")
+
+    args = parser.parse_args()
+    model = VistaMaterializadaModel()
+
+    if args.comando == "pendientes":
+        pendientes(model, args.antiguedad)
+    elif args.comando == "refrescar":
+        vistas = [args.vista] if args.vista else list(VISTAS_MATERIALIZADAS)
+        refrescar(model, vistas, not args.bloqueante)
+    elif args.comando == "escuchar":
+        escuchar(model, args.intervalo)
+    elif args.comando == "estado":
+        estado(model)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
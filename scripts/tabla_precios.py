@@ -0,0 +1,94 @@
+"""
+tabla_precios.py - Tabla de precios "qué pasa si" por programa, plan y descuento
+
+Uso:
+    python scripts/tabla_precios.py [--programas ID ...] [--cuotas N ...]
+                                    [--descuentos P ...] [--contado]
+                                    [--fecha YYYY-MM-DD] [--salida RUTA]
+
+Para cada programa, número de cuotas y escenario de descuento calcula
+subtotal, descuento, total, cuota y última cuota (exactas al centavo). El
+escenario "regla" aplica la promoción vigente o, con --contado, el
+descuento por pago contado. Sin --salida escribe el CSV por la salida
+estándar.
+"""
+import sys
+import csv
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio raíz al path de Python
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from app.models.programa_academico_model import ProgramasAcademicosModel
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tabla de precios por programa, plan y escenario de descuento"
+    )
+    parser.add_argument("--programas", type=int, nargs="*", help="IDs (por defecto todos)")
+    parser.add_argument("--cuotas", type=int, nargs="*", help="Números de cuotas a simular")
+    parser.add_argument(
+        "--descuentos", type=float, nargs="*", default=[],
+        help="Porcentajes de descuento a evaluar además de la regla del programa",
+    )
+    parser.add_argument("--contado", action="store_true", help="Regla con pago contado")
+    parser.add_argument("--fecha", help="Fecha para la vigencia de promociones")
+    parser.add_argument("--salida", help="Archivo CSV de salida")
+    args = parser.parse_args()
+
+    fecha = datetime.strptime(args.fecha, "%Y-%m-%d").date() if args.fecha else None
+    escenarios = [None] + list(args.descuentos)
+
+    try:
+        tabla = ProgramasAcademicosModel().calcular_costos_lote(
+            programa_ids=args.programas,
+            nros_cuotas=args.cuotas,
+            escenarios=escenarios,
+            pago_contado=args.contado,
+            fecha=fecha,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not tabla["programas"]:
+        print("ℹ️  No hay programas para evaluar")
+        return 0
+
+    archivo = open(args.salida, "w", newline="", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        escritor = csv.writer(archivo)
+        escritor.writerow([
+            "programa_id", "codigo", "escenario", "descuento_porcentaje", "promo_vigente",
+            "subtotal", "descuento", "total", "nro_cuotas", "cuota", "ultima_cuota",
+        ])
+        for e, escenario in enumerate(tabla["escenarios"]):
+            for p, programa in enumerate(tabla["programas"]):
+                for q, nro_cuotas in enumerate(tabla["nros_cuotas"]):
+                    escritor.writerow([
+                        programa["id"],
+                        programa["codigo"],
+                        "regla" if escenario is None else f"{escenario:g}%",
+                        f"{tabla['descuento_porcentaje'][e, p]:g}",
+                        bool(tabla["promo_vigente"][p]),
+                        f"{tabla['subtotal'][p] / 100:.2f}",
+                        f"{tabla['descuento'][e, p] / 100:.2f}",
+                        f"{tabla['total'][e, p] / 100:.2f}",
+                        nro_cuotas,
+                        f"{tabla['cuota'][e, p, q] / 100:.2f}",
+                        f"{tabla['ultima_cuota'][e, p, q] / 100:.2f}",
+                    ])
+    finally:
+        if args.salida:
+            archivo.close()
+            print(f"✅ Tabla escrita en {args.salida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
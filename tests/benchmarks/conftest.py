@@ -0,0 +1,67 @@
+"""
+conftest.py - Fixtures de los benchmarks de rutas críticas
+
+Requieren pytest-benchmark y PostgreSQL (ver tests/conftest.py). Cada
+prueba mide una ruta sobre los datos sintéticos de la sesión y además
+comprueba el número de consultas SQL, que no depende de la máquina.
+
+Línea base y comparación (la misma máquina y escala):
+
+    pytest tests/benchmarks --benchmark-autosave
+    pytest tests/benchmarks --benchmark-compare \\
+        --benchmark-compare-fail=median:25%
+
+--benchmark-save=NOMBRE guarda una línea base con nombre y
+--benchmark-compare=NNNN compara contra una concreta. Los resultados se
+guardan en .benchmarks/ (--benchmark-storage para otro directorio).
+"""
+import pytest
+
+from tests.conftest import apuntar_modelos, soltar_modelos
+
+
+@pytest.fixture
+def modelos_sinteticos(datos_sinteticos):
+    """Apunta los modelos a la base sintética y cuenta consultas"""
+    from app.database.instrumentacion import instrumentacion
+
+    apuntar_modelos(datos_sinteticos["dsn"])
+    anterior = (instrumentacion.habilitada, instrumentacion.umbral_lento_ms,
+                instrumentacion.capturar_explain)
+    # Solo conteo: sin EXPLAIN ni avisos de consultas lentas que alteren los tiempos
+    instrumentacion.configurar(
+        habilitada=True, capturar_explain=False, umbral_lento_ms=float("inf")
+    )
+    try:
+        yield datos_sinteticos
+    finally:
+        instrumentacion.configurar(
+            habilitada=anterior[0], umbral_lento_ms=anterior[1], capturar_explain=anterior[2]
+        )
+        soltar_modelos()
+
+
+@pytest.fixture
+def medir(benchmark, modelos_sinteticos):
+    """
+    Mide una función con benchmark y verifica su presupuesto de consultas
+
+    Uso: medir("estudiantes.search", funcion, max_consultas=1)
+
+    La función se ejecuta una vez de calentamiento y cinco medidas; las
+    consultas de una ejecución quedan en extra_info del resultado guardado.
+    """
+    from app.database.instrumentacion import instrumentacion
+
+    def _medir(nombre, funcion, max_consultas=None):
+        with instrumentacion.pantalla(f"benchmark:{nombre}") as contexto:
+            resultado = funcion()
+        benchmark.extra_info["consultas"] = contexto["consultas"]
+        benchmark.pedantic(funcion, rounds=5, iterations=1, warmup_rounds=1)
+        if max_consultas is not None:
+            assert contexto["consultas"] <= max_consultas, (
+                f"{nombre}: {contexto['consultas']} consultas > {max_consultas}"
+            )
+        return resultado
+
+    return _medir
@@ -0,0 +1,69 @@
+"""
+Benchmarks de búsqueda, paginación y caja sobre datos sintéticos
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("termino", ["Quispe", "María", "Mamani Flores", "zzz"])
+def test_estudiantes_search(medir, termino):
+    from app.models.estudiante_model import EstudianteModel
+
+    modelo = EstudianteModel()
+    resultado = medir("estudiantes.search", lambda: modelo.search(termino), max_consultas=1)
+    if termino == "zzz":
+        assert not resultado
+
+
+def test_estudiantes_search_por_ci(medir, modelos_sinteticos):
+    from app.models.estudiante_model import EstudianteModel
+
+    modelo = EstudianteModel()
+    ci = str(3_000_000 + modelos_sinteticos["cantidades"]["estudiantes"] // 2)
+    resultado = medir("estudiantes.search.ci", lambda: modelo.search(ci), max_consultas=1)
+    assert resultado
+
+
+def test_matriculas_primera_pagina(medir):
+    from app.models.matricula_model import MatriculaModel
+
+    modelo = MatriculaModel()
+    resultado = medir(
+        "matriculas.get_all.primera_pagina",
+        lambda: modelo.get_all(limit=50, offset=0),
+        max_consultas=1,
+    )
+    assert len(resultado) == 50
+
+
+def test_matriculas_pagina_profunda(medir, modelos_sinteticos):
+    from app.models.matricula_model import MatriculaModel
+
+    modelo = MatriculaModel()
+    offset = max(modelos_sinteticos["cantidades"]["matriculas"] - 100, 0)
+    resultado = medir(
+        "matriculas.get_all.pagina_profunda",
+        lambda: modelo.get_all(limit=50, offset=offset),
+        max_consultas=1,
+    )
+    assert len(resultado) == 50
+
+
+def test_caja_calcular_saldo(medir):
+    from app.models.movimiento_caja_model import MovimientoCajaModel
+
+    modelo = MovimientoCajaModel()
+    medir("caja.calcular_saldo", modelo.calcular_saldo, max_consultas=1)
+
+
+def test_caja_resumen_mensual(medir, modelos_sinteticos):
+    from app.models.movimiento_caja_model import MovimientoCajaModel
+
+    fin = modelos_sinteticos["fecha_fin"]
+    modelo = MovimientoCajaModel()
+    medir(
+        "caja.get_resumen_mensual",
+        lambda: modelo.get_resumen_mensual(fin.year, fin.month),
+        max_consultas=2,
+    )
@@ -0,0 +1,79 @@
+"""
+Benchmarks de dashboard, reportes y comprobantes sobre datos sintéticos
+"""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+def _anio(modelos_sinteticos):
+    fin = modelos_sinteticos["fecha_fin"]
+    return date(fin.year, 1, 1).isoformat(), fin.isoformat()
+
+
+def test_dashboard_actualizar_datos(medir):
+    pytest.importorskip("PySide6")
+    from app.controllers.dashboard_controller import DashboardController
+
+    controlador = DashboardController()
+    medir("dashboard.actualizar_datos", controlador.actualizar_datos)
+
+
+def test_reporte_auditoria(medir, modelos_sinteticos):
+    from app.models.auditoria_transacciones_model import AuditoriaTransaccionesModel
+
+    inicio, fin = _anio(modelos_sinteticos)
+    modelo = AuditoriaTransaccionesModel()
+    reporte = medir(
+        "reportes.auditoria",
+        lambda: modelo.generar_reporte_auditoria(inicio, fin, formato="resumen"),
+        max_consultas=1,
+    )
+    assert reporte
+
+
+def test_reporte_gastos(medir, modelos_sinteticos):
+    from app.models.gasto_model import GastoModel
+
+    inicio, fin = _anio(modelos_sinteticos)
+    modelo = GastoModel()
+    reporte = medir(
+        "reportes.gastos",
+        lambda: modelo.generar_reporte_gastos(inicio, fin),
+        max_consultas=2,
+    )
+    assert reporte
+
+
+def test_comprobante_ingreso_pdf(benchmark, tmp_path):
+    pytest.importorskip("reportlab")
+    from services.comprobante_service import ComprobanteService
+
+    detalles = {
+        "movimiento": SimpleNamespace(
+            id=1, fecha=datetime(2025, 6, 1, 10, 30), monto=1250.50,
+            descripcion="Pago de cuota 2 - Diplomado en Finanzas Corporativas",
+        ),
+        "empresa": SimpleNamespace(
+            nombre="CONSULTORA FORMACION CONTINUA S.R.L.", nit="194810025",
+            direccion="Calle Calama Nro 104 piso 1", telefono="+591 67935343",
+        ),
+        "pago": SimpleNamespace(
+            forma_pago="TRANSFERENCIA", nro_comprobante="REC-00000001",
+            nro_cuota=2, nro_transaccion="TX-998877",
+        ),
+        "estudiante": SimpleNamespace(
+            nombres="Ana", apellidos="Quispe Mamani", ci_numero="3000001",
+            ci_expedicion="LP", email="estudiante1@correo.bo",
+        ),
+        "programa": SimpleNamespace(nombre="Diplomado en Finanzas Corporativas"),
+    }
+    ruta = str(tmp_path / "comprobante.pdf")
+    benchmark.pedantic(
+        ComprobanteService.generar_comprobante_ingreso_pdf,
+        args=(detalles, ruta), rounds=5, iterations=1, warmup_rounds=1,
+    )
+    assert (tmp_path / "comprobante.pdf").stat().st_size > 0
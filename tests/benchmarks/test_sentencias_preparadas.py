@@ -0,0 +1,42 @@
+"""
+Benchmark de búsquedas por ID con y sin sentencias preparadas
+
+Las dos variantes quedan en el mismo grupo para compararlas en el informe.
+Se miden dentro de una transacción abierta, que es el estado habitual de
+las conexiones de los modelos (sus SELECT no confirman).
+"""
+import psycopg2.extensions
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+LECTURAS = 200
+
+
+@pytest.mark.parametrize("preparadas", [True, False], ids=["preparadas", "texto"])
+def test_get_by_id_en_transaccion(benchmark, modelos_sinteticos, preparadas):
+    from app.database.sentencias_preparadas import sentencias_preparadas
+    from app.models.estudiante_model import EstudianteModel
+
+    benchmark.group = f"estudiantes.get_by_id x{LECTURAS}"
+    total = modelos_sinteticos["cantidades"]["estudiantes"]
+    ids = [1 + (i * 7919) % total for i in range(LECTURAS)]
+    modelo = EstudianteModel()
+
+    def leer():
+        return [modelo.get_by_id(i) for i in ids]
+
+    anterior = sentencias_preparadas.habilitada
+    sentencias_preparadas.configurar(habilitada=preparadas)
+    try:
+        leer()
+        assert (
+            modelo.connection.get_transaction_status()
+            == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+        resultado = benchmark.pedantic(leer, rounds=5, iterations=1, warmup_rounds=1)
+    finally:
+        sentencias_preparadas.configurar(habilitada=anterior)
+        modelo._close()
+
+    assert all(resultado)
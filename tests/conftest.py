@@ -0,0 +1,213 @@
+"""
+conftest.py - Fixtures compartidos de las pruebas
+
+Las pruebas que necesitan PostgreSQL usan un servidor desechable:
+
+- Por defecto se levanta un cluster temporal con initdb/pg_ctl
+  (tests/datos_sinteticos.py). initdb no se ejecuta como root.
+- Con --pg-dsn se usa un servidor existente, con un usuario que pueda
+  crear bases de datos y desactivar triggers (superusuario). Solo se crean
+  y eliminan bases con prefijo formagest_test_.
+
+Si no hay servidor disponible, esas pruebas se omiten.
+
+Cada prueba de base de datos recibe una base nueva clonada de una plantilla
+con el esquema cargado. Los benchmarks (tests/benchmarks) comparten una
+base con datos sintéticos generados una vez por sesión.
+"""
+import gc
+import os
+import uuid
+import subprocess
+
+import pytest
+
+import psycopg2
+from psycopg2 import pool
+
+from tests.datos_sinteticos import ClusterTemporal, GeneradorDatos, cargar_esquema, conectar
+
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup("formagest", "FormaGestPro")
+    grupo.addoption(
+        "--pg-dsn",
+        default=os.environ.get("FORMAGEST_TEST_DSN"),
+        help="Servidor PostgreSQL existente (DSN libpq); sin él se usa initdb/pg_ctl",
+    )
+    grupo.addoption(
+        "--bench-escala",
+        type=float,
+        default=0.01,
+        help="Escala de los datos sintéticos de los benchmarks (1 = volúmenes completos)",
+    )
+    grupo.addoption(
+        "--bench-semilla",
+        type=int,
+        default=20250101,
+        help="Semilla de los datos sintéticos de los benchmarks",
+    )
+
+
+# ============================================================================
+# SERVIDOR Y BASES DESECHABLES
+# ============================================================================
+
+
+def _dsn_desde_texto(texto: str) -> dict:
+    """Convierte un DSN libpq en el diccionario que usan los modelos"""
+    partes = psycopg2.extensions.parse_dsn(texto)
+    return {
+        "host": partes.get("host", "localhost"),
+        "port": partes.get("port", "5432"),
+        "database": partes.get("dbname") or partes.get("database") or "postgres",
+        "user": partes.get("user", "postgres"),
+        "password": partes.get("password", ""),
+    }
+
+
+def _administrar(dsn: dict, sentencia: str) -> None:
+    """Ejecuta una sentencia fuera de transacción (CREATE/DROP DATABASE)"""
+    conexion = conectar(dsn)
+    conexion.autocommit = True
+    try:
+        with conexion.cursor() as cursor:
+            cursor.execute(sentencia)
+    finally:
+        conexion.close()
+
+
+def _crear_base(servidor: dict, plantilla: str = "template0") -> dict:
+    nombre = f"formagest_test_{uuid.uuid4().hex[:12]}"
+    _administrar(servidor, f"CREATE DATABASE {nombre} TEMPLATE {plantilla} ENCODING 'UTF8'")
+    return dict(servidor, database=nombre)
+
+
+def _eliminar_base(servidor: dict, nombre: str) -> None:
+    _administrar(servidor, f"DROP DATABASE IF EXISTS {nombre} WITH (FORCE)")
+
+
+def apuntar_modelos(dsn: dict) -> None:
+    """Hace que BaseModel y DatabaseConnection usen la base de pruebas"""
+    from app.database.connection import DatabaseConnection
+    from app.models.base_model import BaseModel
+
+    soltar_modelos()
+    pool_pruebas = pool.SimpleConnectionPool(
+        minconn=1,
+        maxconn=10,
+        host=dsn["host"],
+        port=dsn["port"],
+        database=dsn["database"],
+        user=dsn["user"],
+        password=dsn.get("password") or None,
+    )
+    db = DatabaseConnection()
+    db._config = dict(dsn)
+    db._pool = pool_pruebas
+    BaseModel._connection_pool = pool_pruebas
+
+
+def soltar_modelos() -> None:
+    """Cierra el pool de pruebas para poder eliminar la base"""
+    from app.database.connection import DatabaseConnection
+    from app.models.base_model import BaseModel
+
+    # Los modelos que ya no se usan devuelven su conexión antes de cerrar el pool
+    gc.collect()
+    if BaseModel._connection_pool:
+        BaseModel._connection_pool.closeall()
+    BaseModel._connection_pool = None
+    DatabaseConnection()._pool = None
+
+    # Un modelo recolectado tarde puede haber dejado su propio pool en la subclase
+    pendientes = list(BaseModel.__subclasses__())
+    while pendientes:
+        clase = pendientes.pop()
+        pendientes.extend(clase.__subclasses__())
+        if "_connection_pool" in vars(clase):
+            del clase._connection_pool
+
+
+@pytest.fixture(scope="session")
+def servidor_pg(request, tmp_path_factory):
+    """DSN de administración del servidor de pruebas"""
+    texto = request.config.getoption("--pg-dsn")
+    if texto:
+        try:
+            _administrar(_dsn_desde_texto(texto), "SELECT 1")
+        except psycopg2.Error as e:
+            pytest.skip(f"PostgreSQL no disponible en --pg-dsn: {e}")
+        yield _dsn_desde_texto(texto)
+        return
+
+    try:
+        cluster = ClusterTemporal(str(tmp_path_factory.mktemp("pg"))).iniciar()
+    except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+        pytest.skip(f"No se pudo levantar PostgreSQL desechable: {e}")
+    try:
+        yield cluster.dsn
+    finally:
+        cluster.detener()
+
+
+@pytest.fixture(scope="session")
+def plantilla_esquema(servidor_pg):
+    """Base con el esquema vacío, usada como plantilla por base_datos"""
+    dsn = _crear_base(servidor_pg)
+    conexion = conectar(dsn)
+    try:
+        cargar_esquema(conexion)
+    finally:
+        conexion.close()
+    yield dsn["database"]
+    _eliminar_base(servidor_pg, dsn["database"])
+
+
+@pytest.fixture
+def base_datos(servidor_pg, plantilla_esquema):
+    """Base nueva con el esquema cargado; los modelos apuntan a ella"""
+    dsn = _crear_base(servidor_pg, plantilla_esquema)
+    apuntar_modelos(dsn)
+    try:
+        yield dsn
+    finally:
+        soltar_modelos()
+        _eliminar_base(servidor_pg, dsn["database"])
+
+
+@pytest.fixture
+def conexion(base_datos):
+    """Conexión propia a la base de la prueba, para preparar y comprobar datos"""
+    conexion = conectar(base_datos)
+    try:
+        yield conexion
+    finally:
+        conexion.close()
+
+
+@pytest.fixture(scope="session")
+def datos_sinteticos(request, servidor_pg, plantilla_esquema):
+    """
+    Base con datos sintéticos deterministas, generada una vez por sesión
+
+    Returns:
+        dict: dsn, escala y cantidades por tabla
+    """
+    escala = request.config.getoption("--bench-escala")
+    semilla = request.config.getoption("--bench-semilla")
+    dsn = _crear_base(servidor_pg, plantilla_esquema)
+    conexion = conectar(dsn)
+    try:
+        generador = GeneradorDatos(conexion, escala, semilla)
+        generador.generar(informar=lambda *_: None)
+    finally:
+        conexion.close()
+    yield {
+        "dsn": dsn,
+        "escala": escala,
+        "cantidades": generador.cantidades,
+        "fecha_fin": generador.fecha_fin,
+    }
+    soltar_modelos()
+    _eliminar_base(servidor_pg, dsn["database"])
@@ -0,0 +1,578 @@
+"""
+datos_sinteticos.py - Datos sintéticos deterministas y PostgreSQL desechable
+
+Lo usan los fixtures de tests/conftest.py: ClusterTemporal levanta un
+cluster con initdb/pg_ctl en un directorio temporal, cargar_esquema aplica
+database/PgSQL_Scheme.sql y GeneradorDatos carga los datos con COPY.
+
+Volúmenes con escala 1: 100k estudiantes, 300k matrículas, 2M ingresos,
+2M movimientos de caja, 1M registros de auditoría. La misma semilla y
+escala producen siempre los mismos datos.
+"""
+import io
+import os
+import csv
+import time
+import socket
+import random
+import shutil
+import tempfile
+import subprocess
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+
+RUTA_ESQUEMA = Path(__file__).parent.parent / "database" / "PgSQL_Scheme.sql"
+
+# Volúmenes con escala 1
+VOLUMENES = {
+    "usuarios": 50,
+    "docentes": 500,
+    "programas_academicos": 2000,
+    "estudiantes": 100_000,
+    "matriculas": 300_000,
+    "ingresos": 2_000_000,
+    "gastos": 200_000,
+    "movimientos_caja": 2_000_000,
+    "auditoria_transacciones": 1_000_000,
+}
+
+# Mínimos para que las relaciones sigan siendo válidas a escala muy baja
+MINIMOS = {
+    "usuarios": 3,
+    "docentes": 5,
+    "programas_academicos": 10,
+    "estudiantes": 50,
+}
+
+NOMBRES = [
+    "Ana", "Carlos", "María", "José", "Lucía", "Jorge", "Patricia", "Luis",
+    "Carmen", "Miguel", "Rosa", "Juan", "Elena", "Pedro", "Sofía", "Diego",
+    "Valeria", "Fernando", "Gabriela", "Ricardo", "Daniela", "Andrés",
+    "Paola", "Sergio", "Mónica", "Raúl", "Verónica", "Marco", "Claudia",
+    "Javier", "Natalia", "Álvaro", "Lorena", "Hugo", "Silvia", "Óscar",
+    "Adriana", "Pablo", "Roxana", "Víctor", "Beatriz", "Gonzalo", "Karina",
+    "Ramiro", "Tatiana", "Rodrigo", "Susana", "Mauricio", "Jimena", "Edwin",
+    "Ximena", "Wilfredo", "Ingrid", "Freddy", "Marcela", "Germán", "Cecilia",
+    "Rolando", "Fabiola", "Alberto",
+]
+
+APELLIDOS = [
+    "Quispe", "Mamani", "Flores", "Rodríguez", "Choque", "Gutiérrez", "López",
+    "Vargas", "Fernández", "Condori", "García", "Rojas", "Pérez", "Torrez",
+    "Martínez", "Cruz", "Morales", "Limachi", "Ramos", "Castro", "Sánchez",
+    "Huanca", "Vásquez", "Gonzales", "Mendoza", "Ticona", "Aguilar", "Suárez",
+    "Chávez", "Herrera", "Apaza", "Medina", "Salazar", "Ortiz", "Cabrera",
+    "Navarro", "Paredes", "Villca", "Ríos", "Alanoca", "Guzmán", "Cárdenas",
+    "Zeballos", "Mercado", "Arce", "Soliz", "Calle", "Velasco", "Poma",
+    "Callisaya", "Laura", "Nina", "Yupanqui", "Colque", "Coaquira", "Tarqui",
+    "Canaviri", "Copa", "Chura", "Ayala", "Peralta", "Rivera", "Molina",
+    "Escobar", "Valencia", "Miranda", "Pinto", "Rocha", "Terrazas", "Siles",
+    "Zurita", "Montaño", "Urquizo", "Saavedra", "Lazarte", "Iriarte",
+    "Antezana", "Camacho", "Bustillos", "Ledezma",
+]
+
+AREAS = [
+    "Gestión de Proyectos", "Finanzas Corporativas", "Auditoría Interna",
+    "Derecho Tributario", "Marketing Digital", "Recursos Humanos",
+    "Ciencia de Datos", "Salud Ocupacional", "Educación Superior",
+    "Gestión Pública", "Contabilidad Gerencial", "Logística",
+]
+TIPOS_PROGRAMA = ["Diplomado", "Especialidad", "Maestría", "Curso"]
+EXPEDICIONES = ["BE", "CH", "CB", "LP", "OR", "PD", "PT", "SC", "TJ"]
+GRADOS = ["Mtr.", "Mgtr.", "MBA", "MSc", "PhD.", "Dr.", "Dra."]
+FORMAS_PAGO = ["EFECTIVO", "TRANSFERENCIA", "TARJETA", "DEPOSITO", "QR"]
+CATEGORIAS_GASTO = [
+    "PAGO_DOCENTE", "ALQUILER", "SERVICIOS_BASICOS", "MATERIALES", "PUBLICIDAD",
+    "TRANSPORTE", "TECNOLOGIA", "IMPUESTOS", "GASTOS_BANCARIOS", "OTROS",
+]
+ACCIONES_AUDITORIA = ["CREACION"] * 8 + ["MODIFICACION"] * 3 + ["ANULACION", "ELIMINACION"]
+
+
+def volumenes(escala: float) -> dict:
+    """Cantidad de filas por tabla para una escala"""
+    cantidades = {}
+    for tabla, total in VOLUMENES.items():
+        cantidades[tabla] = max(int(total * escala), MINIMOS.get(tabla, 1))
+    # Cada estudiante tiene como máximo 3 matrículas (una por programa distinto)
+    cantidades["matriculas"] = min(cantidades["matriculas"], cantidades["estudiantes"] * 3)
+    return cantidades
+
+
+# ============================================================================
+# CLUSTER DESECHABLE
+# ============================================================================
+
+
+class ClusterTemporal:
+    """Cluster PostgreSQL en un directorio temporal (initdb + pg_ctl)"""
+
+    def __init__(self, directorio: str = None):
+        self.directorio = directorio or tempfile.mkdtemp(prefix="formagest_pg_")
+        self.puerto = None
+        self._bin = self._buscar_binarios()
+
+    @staticmethod
+    def _buscar_binarios() -> Path:
+        """Directorio de initdb/pg_ctl (PATH o pg_config --bindir)"""
+        initdb = shutil.which("initdb")
+        if initdb:
+            return Path(initdb).parent
+        pg_config = shutil.which("pg_config")
+        if pg_config:
+            salida = subprocess.run(
+                [pg_config, "--bindir"], capture_output=True, text=True, check=True
+            )
+            return Path(salida.stdout.strip())
+        raise RuntimeError("No se encontró initdb: instale PostgreSQL o use --pg-dsn")
+
+    @staticmethod
+    def _puerto_libre() -> int:
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+    @property
+    def dsn(self) -> dict:
+        return {
+            "host": "127.0.0.1",
+            "port": str(self.puerto),
+            "database": "postgres",
+            "user": "postgres",
+            "password": "",
+        }
+
+    def iniciar(self) -> "ClusterTemporal":
+        """Crea el cluster y lo inicia"""
+        datos = os.path.join(self.directorio, "datos")
+        subprocess.run(
+            [str(self._bin / "initdb"), "-D", datos, "-U", "postgres",
+             "--auth=trust", "-E", "UTF8", "--locale=C"],
+            check=True, capture_output=True,
+        )
+        self.puerto = self._puerto_libre()
+        opciones = (
+            f"-p {self.puerto} -c listen_addresses=127.0.0.1 "
+            f"-c unix_socket_directories='{self.directorio}' "
+            "-c fsync=off -c synchronous_commit=off -c full_page_writes=off "
+            "-c max_wal_size=4GB -c shared_buffers=256MB"
+        )
+        subprocess.run(
+            [str(self._bin / "pg_ctl"), "-D", datos, "-o", opciones,
+             "-l", os.path.join(self.directorio, "postgres.log"), "-w", "start"],
+            check=True, capture_output=True,
+        )
+        return self
+
+    def detener(self) -> None:
+        """Detiene el cluster y elimina el directorio"""
+        datos = os.path.join(self.directorio, "datos")
+        if os.path.exists(datos):
+            subprocess.run(
+                [str(self._bin / "pg_ctl"), "-D", datos, "-m", "fast", "-w", "stop"],
+                capture_output=True,
+            )
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+def conectar(dsn: dict):
+    """Conexión psycopg2 a partir del diccionario DSN"""
+    return psycopg2.connect(
+        host=dsn["host"], port=dsn["port"], dbname=dsn["database"],
+        user=dsn["user"], password=dsn.get("password") or None,
+    )
+
+
+def cargar_esquema(conexion, ruta: Path = RUTA_ESQUEMA) -> None:
+    """Ejecuta el script de esquema completo"""
+    with open(ruta, "r", encoding="utf-8") as f:
+        script = f.read()
+    with conexion.cursor() as cursor:
+        cursor.execute(script)
+    conexion.commit()
+
+
+# ============================================================================
+# GENERADOR
+# ============================================================================
+
+
+class GeneradorDatos:
+    """Genera y carga con COPY un conjunto de datos determinista"""
+
+    TAMANO_LOTE = 50_000
+
+    def __init__(
+        self,
+        conexion,
+        escala: float = 0.01,
+        semilla: int = 20250101,
+        fecha_fin: date = date(2025, 12, 31),
+        años: int = 3,
+    ):
+        self.conexion = conexion
+        self.escala = escala
+        self.semilla = semilla
+        self.cantidades = volumenes(escala)
+        self.fecha_fin = fecha_fin
+        self.fecha_inicio = date(fecha_fin.year - años + 1, 1, 1)
+        self._segundos = int(
+            (datetime.combine(fecha_fin, datetime.max.time())
+             - datetime.combine(self.fecha_inicio, datetime.min.time())).total_seconds()
+        )
+        self._costos_programa = []
+
+    # ---------- utilidades ----------
+
+    def _rng(self, tabla: str) -> random.Random:
+        """Generador independiente por tabla: cada tabla es reproducible por sí sola"""
+        return random.Random(f"{self.semilla}:{tabla}")
+
+    def _momento(self, rng: random.Random, i: int, n: int) -> datetime:
+        """Fecha y hora creciente con i (IDs aproximadamente cronológicos)"""
+        base = self._segundos * i // max(n, 1)
+        desfase = rng.randint(0, max(self._segundos // max(n, 1), 1))
+        segundos = min(base + desfase, self._segundos - 1)
+        return datetime.combine(self.fecha_inicio, datetime.min.time()) + timedelta(
+            seconds=segundos
+        )
+
+    def _copiar(self, tabla: str, columnas: list, filas) -> int:
+        """Carga filas con COPY en lotes"""
+        sql = f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)"
+        total = 0
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+
+        def enviar():
+            buffer.seek(0)
+            with self.conexion.cursor() as cursor:
+                cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+
+        for fila in filas:
+            escritor.writerow(["" if v is None else v for v in fila])
+            total += 1
+            if total % self.TAMANO_LOTE == 0:
+                enviar()
+        enviar()
+        return total
+
+    def _nombre_persona(self, i: int):
+        """Combinación única (nombres, apellidos) para i"""
+        n_nom = len(NOMBRES)
+        n_ape = len(APELLIDOS)
+        nombres = NOMBRES[i % n_nom]
+        apellidos = (
+            f"{APELLIDOS[(i // n_nom) % n_ape]} "
+            f"{APELLIDOS[(i // (n_nom * n_ape)) % n_ape]}"
+        )
+        vuelta = i // (n_nom * n_ape * n_ape)
+        if vuelta:
+            nombres = f"{nombres} {vuelta}"
+        return nombres, apellidos
+
+    # ---------- tablas ----------
+
+    def _usuarios(self):
+        rng = self._rng("usuarios")
+        roles = ["ADMINISTRADOR", "CAJERO", "COORDINADOR"]
+        # El id 1 es el administrador que crea el esquema
+        for i in range(2, self.cantidades["usuarios"] + 2):
+            nombres, apellidos = self._nombre_persona(i * 7)
+            yield (
+                i, f"usuario{i:03d}", "$sintetico$", f"{nombres} {apellidos}",
+                f"usuario{i:03d}@formagest.bo", roles[i % 3],
+                rng.random() > 0.05,
+            )
+
+    def _docentes(self):
+        rng = self._rng("docentes")
+        for i in range(1, self.cantidades["docentes"] + 1):
+            nombres, apellidos = self._nombre_persona(i * 13 + 5)
+            yield (
+                i, str(9_000_000 + i), rng.choice(EXPEDICIONES), nombres, apellidos,
+                rng.choice(GRADOS), rng.choice(AREAS), rng.randint(80, 300),
+                rng.random() > 0.1,
+            )
+
+    def _programas(self):
+        rng = self._rng("programas_academicos")
+        n_docentes = self.cantidades["docentes"]
+        estados = ["INICIADO"] * 5 + ["PLANIFICADO"] * 3 + ["CONCLUIDO"] * 2 + ["CANCELADO"]
+        for i in range(1, self.cantidades["programas_academicos"] + 1):
+            costo = rng.randrange(1000, 8000, 50)
+            self._costos_programa.append(costo)
+            inicio = self.fecha_inicio + timedelta(days=rng.randint(0, 365 * 3))
+            yield (
+                i, f"PRG-{i:05d}",
+                f"{rng.choice(TIPOS_PROGRAMA)} en {rng.choice(AREAS)} {i}",
+                rng.choice([8, 12, 16, 24, 48]), costo, 10, 500, 500,
+                rng.choice(estados), inicio, rng.randint(1, n_docentes),
+                rng.choice([1, 3, 6, 10]),
+            )
+
+    def _planes_pago(self):
+        for i in range(1, self.cantidades["programas_academicos"] + 1):
+            yield (i, i, "Plan mensual", 6, 30)
+
+    def _estudiantes(self):
+        rng = self._rng("estudiantes")
+        n = self.cantidades["estudiantes"]
+        for i in range(1, n + 1):
+            nombres, apellidos = self._nombre_persona(i)
+            nacimiento = date(1970, 1, 1) + timedelta(days=rng.randint(0, 365 * 35))
+            yield (
+                i, str(3_000_000 + i), rng.choice(EXPEDICIONES), nombres, apellidos,
+                nacimiento, f"7{rng.randint(0, 9_999_999):07d}",
+                f"estudiante{i}@correo.bo", self._momento(rng, i, n),
+                rng.random() > 0.03,
+            )
+
+    def _matriculas(self):
+        rng = self._rng("matriculas")
+        n = self.cantidades["matriculas"]
+        n_est = self.cantidades["estudiantes"]
+        n_prog = self.cantidades["programas_academicos"]
+        paso = n_prog // 3 + 1
+        estados_acad = ["INSCRITO"] * 3 + ["EN_CURSO"] * 4 + ["CONCLUIDO"] * 2 + ["RETIRADO"]
+
+        for k in range(n):
+            estudiante = k % n_est
+            vuelta = k // n_est
+            programa = (estudiante * 31 + vuelta * paso) % n_prog
+            monto_total = self._costos_programa[programa]
+            descuento = round(monto_total * 0.1, 2) if rng.random() < 0.3 else 0
+            cuotas = rng.random() < 0.6
+            yield (
+                k + 1, estudiante + 1, programa + 1,
+                "CUOTAS" if cuotas else "CONTADO", programa + 1 if cuotas else None,
+                monto_total, descuento, monto_total - descuento,
+                rng.choice(estados_acad), self._momento(rng, k, n),
+            )
+
+    def _ingresos(self):
+        rng = self._rng("ingresos")
+        n = self.cantidades["ingresos"]
+        n_mat = self.cantidades["matriculas"]
+        n_usr = self.cantidades["usuarios"] + 1
+        for i in range(1, n + 1):
+            con_matricula = rng.random() < 0.85
+            momento = self._momento(rng, i, n)
+            estado = rng.choices(
+                ["CONFIRMADO", "REGISTRADO", "ANULADO"], weights=[90, 7, 3]
+            )[0]
+            yield (
+                i,
+                "MATRICULA_CUOTA" if con_matricula else "OTRO_INGRESO",
+                rng.randint(1, n_mat) if con_matricula else None,
+                rng.randint(1, 6) if con_matricula else None,
+                momento.date(), rng.randrange(5000, 80000) / 100,
+                "Pago de cuota" if con_matricula else "Ingreso varios",
+                rng.choice(FORMAS_PAGO), estado, f"REC-{i:08d}",
+                rng.randint(1, n_usr), momento,
+            )
+
+    def _gastos(self):
+        rng = self._rng("gastos")
+        n = self.cantidades["gastos"]
+        n_usr = self.cantidades["usuarios"] + 1
+        for i in range(1, n + 1):
+            momento = self._momento(rng, i, n)
+            yield (
+                i, momento.date(), rng.randrange(1000, 500000) / 100,
+                rng.choice(CATEGORIAS_GASTO), f"Gasto sintético {i}",
+                f"Proveedor {rng.randint(1, 400)}", rng.choice(FORMAS_PAGO),
+                f"GASTO-{i:06d}", rng.randint(1, n_usr), momento,
+            )
+
+    def _movimientos_caja(self):
+        rng = self._rng("movimientos_caja")
+        n = self.cantidades["movimientos_caja"]
+        n_ing = self.cantidades["ingresos"]
+        n_gas = self.cantidades["gastos"]
+        n_usr = self.cantidades["usuarios"] + 1
+        for j in range(1, n + 1):
+            momento = self._momento(rng, j, n)
+            if j % 5 == 0:
+                gasto = j // 5
+                origen = ("GASTO", gasto) if gasto <= n_gas else (None, None)
+                tipo = "EGRESO"
+                monto = rng.randrange(1000, 500000) / 100
+            else:
+                ingreso = j - j // 5
+                origen = ("INGRESO", ingreso) if ingreso <= n_ing else (None, None)
+                tipo = "INGRESO"
+                monto = rng.randrange(5000, 80000) / 100
+            yield (
+                j, momento, tipo, monto, origen[0], origen[1],
+                f"Movimiento {tipo.lower()} {j}", rng.randint(1, n_usr),
+            )
+
+    def _auditoria(self):
+        rng = self._rng("auditoria_transacciones")
+        n = self.cantidades["auditoria_transacciones"]
+        n_usr = self.cantidades["usuarios"] + 1
+        n_ing = self.cantidades["ingresos"]
+        n_gas = self.cantidades["gastos"]
+        for i in range(1, n + 1):
+            es_ingreso = rng.random() < 0.8
+            yield (
+                i, self._momento(rng, i, n), rng.randint(1, n_usr),
+                "INGRESO" if es_ingreso else "GASTO",
+                rng.randint(1, n_ing if es_ingreso else n_gas),
+                rng.choice(ACCIONES_AUDITORIA), "Registro sintético",
+            )
+
+    # ---------- carga ----------
+
+    def generar(self, informar=print) -> dict:
+        """
+        Genera y carga todas las tablas sobre una base con el esquema vacío
+
+        Los triggers y las FK se desactivan durante la carga
+        (session_replication_role = replica, requiere superusuario) y los
+        datos derivados se recalculan al final.
+
+        Returns:
+            dict: Filas cargadas por tabla y segundos totales
+        """
+        inicio = time.perf_counter()
+        meses = (self.fecha_fin.year - self.fecha_inicio.year) * 12 + 13
+        cargadas = {}
+
+        with self.conexion.cursor() as cursor:
+            cursor.execute("SET session_replication_role = replica")
+            for tabla in ("movimientos_caja", "auditoria_transacciones"):
+                cursor.execute(
+                    "SELECT COUNT(*) FROM fn_crear_particiones_mensuales(%s, %s, %s)",
+                    (tabla, self.fecha_inicio, meses),
+                )
+
+        pasos = [
+            ("usuarios", ["id", "username", "password_hash", "nombre_completo",
+                          "email", "rol", "activo"], self._usuarios),
+            ("docentes", ["id", "ci_numero", "ci_expedicion", "nombres", "apellidos",
+                          "max_grado_academico", "especialidad", "honorario_hora",
+                          "activo"], self._docentes),
+            ("programas_academicos", ["id", "codigo", "nombre", "duracion_semanas",
+                                      "costo_base", "descuento_contado", "cupos_totales",
+                                      "cupos_disponibles", "estado",
+                                      "fecha_inicio_planificada", "tutor_id",
+                                      "cuotas_mensuales"], self._programas),
+            ("planes_pago", ["id", "programa_id", "nombre", "nro_cuotas",
+                             "intervalo_dias"], self._planes_pago),
+            ("estudiantes", ["id", "ci_numero", "ci_expedicion", "nombres", "apellidos",
+                             "fecha_nacimiento", "telefono", "email", "fecha_registro",
+                             "activo"], self._estudiantes),
+            ("matriculas", ["id", "estudiante_id", "programa_id", "modalidad_pago",
+                            "plan_pago_id", "monto_total", "descuento_aplicado",
+                            "monto_final", "estado_academico", "fecha_matricula"],
+             self._matriculas),
+            ("ingresos", ["id", "tipo_ingreso", "matricula_id", "nro_cuota", "fecha",
+                          "monto", "concepto", "forma_pago", "estado", "nro_comprobante",
+                          "registrado_por", "created_at"], self._ingresos),
+            ("gastos", ["id", "fecha", "monto", "categoria", "descripcion", "proveedor",
+                        "forma_pago", "comprobante_nro", "registrado_por", "created_at"],
+             self._gastos),
+            ("movimientos_caja", ["id", "fecha", "tipo", "monto", "origen_tipo",
+                                  "origen_id", "descripcion", "registrado_por"],
+             self._movimientos_caja),
+            ("auditoria_transacciones", ["id", "fecha_hora", "usuario_id", "origen_tipo",
+                                         "origen_id", "accion", "motivo"],
+             self._auditoria),
+        ]
+
+        for tabla, columnas, filas in pasos:
+            t0 = time.perf_counter()
+            cargadas[tabla] = self._copiar(tabla, columnas, filas())
+            informar(
+                f"  {tabla:<26} {cargadas[tabla]:>10} filas "
+                f"en {time.perf_counter() - t0:6.1f} s"
+            )
+
+        self._derivados()
+        self.conexion.commit()
+
+        cargadas["segundos"] = round(time.perf_counter() - inicio, 1)
+        return cargadas
+
+    def _derivados(self) -> None:
+        """Recalcula secuencias, saldos, contadores, resúmenes y estadísticas"""
+        with self.conexion.cursor() as cursor:
+            for tabla in ("usuarios", "docentes", "programas_academicos", "planes_pago",
+                          "estudiantes", "matriculas", "ingresos", "gastos",
+                          "movimientos_caja", "auditoria_transacciones"):
+                cursor.execute(
+                    f"SELECT setval('seq_{tabla}_id', GREATEST((SELECT MAX(id) FROM {tabla}), 1))"
+                )
+
+            # Monto pagado y estado de pago a partir de los ingresos
+            cursor.execute(
+                """
+                UPDATE matriculas m
+                SET monto_pagado = LEAST(s.total, m.monto_final),
+                    estado_pago = CASE
+                        WHEN s.total >= m.monto_final THEN 'PAGADO'
+                        WHEN s.total > 0 THEN 'PARCIAL'
+                        ELSE 'PENDIENTE'
+                    END
+                FROM (
+                    SELECT matricula_id, SUM(monto) AS total
+                    FROM ingresos
+                    WHERE matricula_id IS NOT NULL AND estado <> 'ANULADO'
+                    GROUP BY matricula_id
+                ) s
+                WHERE s.matricula_id = m.id
+                """
+            )
+            cursor.execute(
+                """
+                UPDATE programas_academicos p
+                SET cupos_totales = GREATEST(p.cupos_totales, c.inscritos),
+                    cupos_disponibles = GREATEST(p.cupos_totales, c.inscritos) - c.inscritos
+                FROM (
+                    SELECT programa_id, COUNT(*) AS inscritos
+                    FROM matriculas GROUP BY programa_id
+                ) c
+                WHERE c.programa_id = p.id
+                """
+            )
+
+            # Contadores de numeración al día
+            cursor.execute(
+                """
+                UPDATE series_numeracion SET ultimo_numero = CASE serie
+                    WHEN 'RECIBO_INGRESO' THEN (SELECT COUNT(*) FROM ingresos)
+                    WHEN 'GASTO' THEN (SELECT COUNT(*) FROM gastos)
+                    ELSE ultimo_numero
+                END
+                """
+            )
+
+            cursor.execute("SET session_replication_role = origin")
+            cursor.execute("SELECT fn_reconstruir_resumen_financiero()")
+            for vista in ("vw_resumen_financiero_programa", "vw_estado_pagos_estudiante",
+                          "vw_ingresos_detallados"):
+                cursor.execute(f"REFRESH MATERIALIZED VIEW {vista}")
+            cursor.execute(
+                "UPDATE vistas_materializadas SET pendiente = FALSE, "
+                "ultima_actualizacion = CURRENT_TIMESTAMP"
+            )
+        self.conexion.commit()
+
+        # ANALYZE fuera de la transacción para que el planificador vea los volúmenes
+        anterior = self.conexion.autocommit
+        self.conexion.autocommit = True
+        with self.conexion.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.conexion.autocommit = anterior
+
@@ -0,0 +1,167 @@
+"""
+Pruebas del escritor de auditoría y de la verificación de la cadena de hash
+"""
+from datetime import date
+
+import psycopg2
+import pytest
+
+from app.models.auditoria_transacciones_model import (
+    AuditoriaWriter,
+    AuditoriaTransaccionesModel,
+)
+from app.models.gasto_model import GastoModel
+
+
+def _evento(origen_id: int, **extra) -> dict:
+    evento = {
+        "usuario_id": 1,
+        "origen_tipo": "GASTO",
+        "origen_id": origen_id,
+        "accion": "CREACION",
+        "motivo": f"Registro de prueba {origen_id}",
+        "datos_nuevos": {"monto": "100.00"},
+    }
+    evento.update(extra)
+    return evento
+
+
+def _escribir(cantidad: int) -> list:
+    escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+    for i in range(1, cantidad + 1):
+        escritor.registrar(_evento(i))
+    return escritor.flush()
+
+
+def test_cadena_de_hash_detecta_registro_alterado(base_datos, conexion):
+    ids = _escribir(5)
+    assert len(ids) == 5
+
+    modelo = AuditoriaTransaccionesModel()
+    resultado = modelo.verificar_integridad(desde_checkpoint=False)
+    assert resultado["estado_general"] == "OK"
+    assert resultado["registros_rotos"] == []
+
+    # Alterar un registro saltando el trigger que prohíbe UPDATE
+    with conexion.cursor() as cursor:
+        cursor.execute("SET session_replication_role = replica")
+        cursor.execute(
+            "UPDATE auditoria_transacciones SET motivo = 'alterado' WHERE id = %s",
+            (ids[2],),
+        )
+    conexion.commit()
+
+    resultado = modelo.verificar_integridad(desde_checkpoint=False)
+    assert resultado["estado_general"] == "REVISAR"
+    assert resultado["registros_rotos"] == [ids[2]]
+
+
+def test_verificacion_desde_checkpoint_revisa_solo_registros_nuevos(base_datos, conexion):
+    _escribir(3)
+    modelo = AuditoriaTransaccionesModel()
+    primero = modelo.verificar_integridad()
+    assert primero["checkpoint_nuevo"]
+
+    ids = _escribir(2)
+    segundo = modelo.verificar_integridad()
+    assert segundo["desde_id"] == primero["checkpoint_nuevo"]["ultimo_id"]
+    assert segundo["estado_general"] == "OK"
+    assert segundo["checkpoint_nuevo"]["ultimo_id"] == ids[-1]
+
+
+def test_escritor_confirma_lote_aunque_la_transaccion_se_revierta(base_datos, conexion):
+    gastos = GastoModel()
+    with pytest.raises(RuntimeError):
+        with gastos.transaction():
+            escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+            escritor.registrar(_evento(1))
+            assert len(escritor.flush()) == 1
+            raise RuntimeError("revertir el bloque")
+
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM auditoria_transacciones")
+        assert cursor.fetchone()[0] == 1
+
+
+def test_escritor_rechaza_eventos_de_usuarios_inexistentes(base_datos, conexion):
+    escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+    valido = escritor.registrar(_evento(1))
+    invalido = escritor.registrar(_evento(2, usuario_id=999))
+
+    ids = escritor.flush()
+
+    assert ids == [valido["id"]]
+    assert "no existe" in invalido["error"]
+    assert escritor.pendientes() == 0
+
+
+def test_reporte_detallado_informa_limite_del_detalle(base_datos):
+    _escribir(5)
+    modelo = AuditoriaTransaccionesModel()
+    modelo.LIMITE_DETALLE_REPORTE = 2
+    hoy = date.today()
+
+    reporte = modelo.generar_reporte_auditoria(hoy, hoy, formato="detallado")
+
+    assert reporte["estadisticas"]["general"]["total_registros"] == 5
+    assert len(reporte["registros_detallados"]) == 2
+    assert reporte["registros_detallados_limite"] == 2
+    assert reporte["registros_detallados_truncado"] is True
+
+    resumen = modelo.generar_reporte_auditoria(hoy, hoy, formato="resumen")
+    assert resumen["registros_detallados"] == []
+    assert resumen["registros_detallados_truncado"] is False
+
+
+def _fallar_una_vez(monkeypatch, escritor):
+    original = escritor._escribir_lote
+    fallos = []
+
+    def escribir(lote):
+        if not fallos:
+            fallos.append(len(lote))
+            raise psycopg2.OperationalError("conexión perdida")
+        return original(lote)
+
+    monkeypatch.setattr(escritor, "_escribir_lote", escribir)
+    return fallos
+
+
+def _contar_registros(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM auditoria_transacciones")
+        total = cursor.fetchone()[0]
+    conexion.commit()
+    return total
+
+
+def test_lote_fallido_no_reencola_eventos_informados_como_fallidos(
+    base_datos, conexion, monkeypatch
+):
+    escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+    _fallar_una_vez(monkeypatch, escritor)
+    diferido = escritor.registrar(_evento(1))
+    inmediato = escritor.registrar(_evento(2), reintentar=False)
+
+    assert escritor.flush() == []
+
+    assert "conexión perdida" in inmediato["error"]
+    assert "error" not in diferido
+    assert escritor.pendientes() == 1
+    assert escritor.flush() == [diferido["id"]]
+    assert _contar_registros(conexion) == 1
+
+
+def test_create_fallido_se_puede_reintentar_sin_duplicar(base_datos, conexion, monkeypatch):
+    escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+    monkeypatch.setattr(AuditoriaWriter, "_instance", escritor)
+    fallos = _fallar_una_vez(monkeypatch, escritor)
+    modelo = AuditoriaTransaccionesModel()
+
+    assert modelo.create(_evento(1)) is None
+    auditoria_id = modelo.create(_evento(1))
+
+    assert fallos == [1]
+    assert auditoria_id
+    assert escritor.pendientes() == 0
+    assert _contar_registros(conexion) == 1
@@ -0,0 +1,92 @@
+"""
+Pruebas de BaseModel: conjuntos de columnas y escritura por lotes
+"""
+import pytest
+
+from app.models.base_model import BaseModel
+
+
+class ModeloPrueba(BaseModel):
+    table_name = "prueba_lotes"
+    column_sets = {"lista": ("clave", "valor")}
+
+
+@pytest.fixture
+def modelo(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            """
+            CREATE TABLE prueba_lotes (
+                id SERIAL PRIMARY KEY,
+                clave TEXT NOT NULL UNIQUE,
+                valor INTEGER NOT NULL
+            )
+            """
+        )
+        cursor.execute("INSERT INTO prueba_lotes (clave, valor) VALUES ('a', 1), ('b', 2)")
+    conexion.commit()
+    modelo = ModeloPrueba()
+    yield modelo
+    modelo._close()
+
+
+# ============ CONJUNTOS DE COLUMNAS ============
+
+
+def test_select_list_resuelve_conjuntos():
+    modelo = ModeloPrueba()
+    assert modelo._select_list("lista", alias="t") == "t.clave, t.valor"
+    assert modelo._select_list(None) == "*"
+    assert modelo._select_list(["id", "clave"]) == "id, clave"
+
+
+@pytest.mark.parametrize("columnas", ["inexistente", "id"])
+def test_conjunto_desconocido_es_error(columnas):
+    modelo = ModeloPrueba()
+    with pytest.raises(ValueError, match="no definido"):
+        modelo._select_list(columnas)
+    with pytest.raises(ValueError, match="no definido"):
+        modelo.get_by_ids([1, 2], columnas)
+
+
+def test_get_by_ids_con_conjunto_agrega_la_clave_primaria(modelo):
+    registros = modelo.get_by_ids([1, 2, None, 1], "lista")
+    assert registros == {
+        1: {"id": 1, "clave": "a", "valor": 1},
+        2: {"id": 2, "clave": "b", "valor": 2},
+    }
+
+
+# ============ ESCRITURA POR LOTES ============
+
+
+def test_upsert_many_reduce_repetidas_a_la_ultima(modelo, conexion):
+    filas = [
+        {"clave": "c", "valor": 10},
+        {"clave": "a", "valor": 11},
+        {"clave": "c", "valor": 12},
+    ]
+
+    resultado = modelo.upsert_many("prueba_lotes", filas, "clave", returning="clave, valor")
+
+    # Una entrada por clave, en la posición de su primera aparición
+    assert [(r["clave"], r["valor"]) for r in resultado] == [("c", 12), ("a", 11)]
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT clave, valor FROM prueba_lotes ORDER BY clave")
+        assert cursor.fetchall() == [("a", 11), ("b", 2), ("c", 12)]
+    conexion.commit()
+
+
+def test_upsert_many_do_nothing_omite_existentes(modelo):
+    filas = [{"clave": "a", "valor": 99}, {"clave": "d", "valor": 4}]
+
+    resultado = modelo.upsert_many(
+        "prueba_lotes", filas, "clave", update_columns=[], returning="clave"
+    )
+
+    assert resultado == ["d"]
+
+
+def test_upsert_many_valida_columna_de_conflicto(modelo):
+    with pytest.raises(ValueError, match="conflicto"):
+        modelo.upsert_many("prueba_lotes", [{"valor": 1}], "clave")
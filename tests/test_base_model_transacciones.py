@@ -0,0 +1,155 @@
+"""
+Pruebas de BaseModel.transaction(): confirmación única al salir, bloques
+anidados como SAVEPOINTs y reversión por excepción, rollback() o error
+"""
+import psycopg2.extensions
+import pytest
+
+from app.models.base_model import BaseModel
+from app.utils.exceptions import TransactionRolledBackException
+
+
+class ModeloPrueba(BaseModel):
+    table_name = "prueba_transacciones"
+
+
+@pytest.fixture
+def modelos(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("CREATE TABLE prueba_transacciones (clave TEXT PRIMARY KEY)")
+    conexion.commit()
+    modelos = (ModeloPrueba(), ModeloPrueba())
+    yield modelos
+    for modelo in modelos:
+        modelo._close()
+
+
+def _insertar(modelo, clave):
+    return modelo.insert("prueba_transacciones", {"clave": clave}, returning="clave")
+
+
+def _claves(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT clave FROM prueba_transacciones ORDER BY clave")
+        claves = [fila[0] for fila in cursor.fetchall()]
+    conexion.commit()
+    return claves
+
+
+def test_confirma_una_vez_al_salir(modelos, conexion):
+    uno, otro = modelos
+    with uno.transaction():
+        assert BaseModel.in_transaction()
+        _insertar(uno, "a")
+        _insertar(otro, "b")  # Otro modelo usa la misma conexión
+        assert _claves(conexion) == []
+    assert not BaseModel.in_transaction()
+    assert _claves(conexion) == ["a", "b"]
+
+
+def test_excepcion_revierte_todo(modelos, conexion):
+    uno, _ = modelos
+    with pytest.raises(RuntimeError):
+        with uno.transaction():
+            _insertar(uno, "a")
+            with uno.transaction():
+                _insertar(uno, "b")
+            raise RuntimeError("revertir")
+    assert _claves(conexion) == []
+
+
+def test_excepcion_en_bloque_anidado_conserva_el_exterior(modelos, conexion):
+    uno, otro = modelos
+    with uno.transaction():
+        _insertar(uno, "a")
+        with pytest.raises(RuntimeError):
+            with otro.transaction():
+                _insertar(otro, "b")
+                raise RuntimeError("revertir solo el interior")
+        _insertar(uno, "c")
+    assert _claves(conexion) == ["a", "c"]
+
+
+def test_anidamiento_profundo(modelos, conexion):
+    uno, _ = modelos
+    with uno.transaction():
+        _insertar(uno, "a")
+        with uno.transaction():
+            _insertar(uno, "b")
+            with pytest.raises(RuntimeError):
+                with uno.transaction():
+                    _insertar(uno, "c")
+                    raise RuntimeError("nivel 3")
+            _insertar(uno, "d")
+    assert _claves(conexion) == ["a", "b", "d"]
+
+
+def test_rollback_en_bloque_anidado_revierte_ese_nivel(modelos, conexion):
+    uno, _ = modelos
+    with uno.transaction():
+        _insertar(uno, "a")
+        with uno.transaction():
+            _insertar(uno, "b")
+            assert uno.rollback()
+            _insertar(uno, "c")  # También se revierte al cerrar el nivel
+        _insertar(uno, "d")
+    assert _claves(conexion) == ["a", "d"]
+
+
+def test_error_de_consulta_en_bloque_anidado_no_anula_el_exterior(modelos, conexion):
+    uno, _ = modelos
+    with uno.transaction():
+        _insertar(uno, "a")
+        with uno.transaction():
+            assert _insertar(uno, "a") is None  # Clave duplicada
+        _insertar(uno, "b")
+    assert _claves(conexion) == ["a", "b"]
+
+
+def test_rollback_en_nivel_exterior_termina_en_rollback(modelos, conexion):
+    uno, _ = modelos
+    with pytest.raises(TransactionRolledBackException):
+        with uno.transaction():
+            _insertar(uno, "a")
+            assert uno.rollback()
+            # La conexión sigue utilizable, pero el bloque termina revertido
+            assert _insertar(uno, "b")
+    assert not BaseModel.in_transaction()
+    assert _claves(conexion) == []
+
+
+def test_error_de_consulta_en_nivel_exterior_lanza_al_salir(modelos, conexion):
+    uno, _ = modelos
+    _insertar(uno, "a")
+    with pytest.raises(TransactionRolledBackException):
+        with uno.transaction():
+            _insertar(uno, "b")
+            assert _insertar(uno, "a") is None  # Clave duplicada
+            _insertar(uno, "c")
+    assert _claves(conexion) == ["a"]
+
+
+def test_trabajo_pendiente_se_confirma_antes_del_bloque(modelos, conexion):
+    uno, _ = modelos
+    uno.execute_query(
+        "INSERT INTO prueba_transacciones (clave) VALUES ('previa')", fetch=False
+    )
+    assert (
+        uno.connection.get_transaction_status()
+        == psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+    )
+    with pytest.raises(RuntimeError):
+        with uno.transaction():
+            _insertar(uno, "a")
+            raise RuntimeError("revertir solo el bloque")
+    assert _claves(conexion) == ["previa"]
+
+
+def test_commit_dentro_del_bloque_no_confirma(modelos, conexion):
+    uno, _ = modelos
+    with pytest.raises(RuntimeError):
+        with uno.transaction():
+            _insertar(uno, "a")
+            assert uno.commit()
+            raise RuntimeError("revertir")
+    assert _claves(conexion) == []
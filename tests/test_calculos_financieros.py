@@ -0,0 +1,110 @@
+"""
+Pruebas de redondeo en centavos: funciones escalares y por lote deben dar
+exactamente los mismos resultados
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from utils.calculos_financieros import (
+    a_centavos,
+    porcentaje_escalado,
+    descuento_centavos,
+    cuotas_centavos,
+    calcular_descuento_exacto,
+)
+
+np = pytest.importorskip("numpy")
+
+from utils.calculos_financieros import (  # noqa: E402
+    a_centavos_lote,
+    porcentaje_escalado_lote,
+    tabla_precios,
+)
+
+
+MONTOS = [0.125, 2.675, 1.005, 0.5, 0.015, 10.0, 3800, 1234.565, -0.125, -2.675, -1.005, 0]
+PORCENTAJES = [7.3684215, 12.5, 0.0000005, 33.333333, 100, 0, -0.0000005]
+
+
+@pytest.mark.parametrize(
+    "monto, esperado",
+    [
+        (0.125, 13),
+        (2.675, 268),
+        (1.005, 101),
+        (-0.125, -13),
+        (-2.675, -268),
+        (Decimal("0.005"), 1),
+        ("19.995", 2000),
+        (3800, 380000),
+    ],
+)
+def test_a_centavos_redondea_mitad_hacia_arriba(monto, esperado):
+    assert a_centavos(monto) == esperado
+
+
+def test_porcentaje_escalado_redondea_mitad_hacia_arriba():
+    assert porcentaje_escalado(7.3684215) == 7368422
+    assert porcentaje_escalado(0.0000005) == 1
+    assert porcentaje_escalado(-0.0000005) == -1
+
+
+def test_a_centavos_lote_coincide_con_escalar():
+    assert a_centavos_lote(MONTOS).tolist() == [a_centavos(m) for m in MONTOS]
+
+
+def test_porcentaje_escalado_lote_coincide_con_escalar():
+    assert porcentaje_escalado_lote(PORCENTAJES).tolist() == [
+        porcentaje_escalado(p) for p in PORCENTAJES
+    ]
+
+
+def test_descuento_exacto_suma_el_monto_base():
+    descuento, final = calcular_descuento_exacto(2.675, 50)
+    assert descuento == 1.34
+    assert round(descuento + final, 2) == 2.68
+
+
+def test_tabla_precios_coincide_con_calculo_escalar():
+    programas = [
+        {
+            "costo_base": 1234.565,
+            "costo_inscripcion": 100.125,
+            "costo_matricula": 0,
+            "descuento_contado": 10,
+            "promocion_activa": False,
+        },
+        {
+            "costo_base": 3800,
+            "costo_inscripcion": 2.675,
+            "costo_matricula": 50.005,
+            "descuento_promocion": 7.3684215,
+            "promocion_activa": True,
+            "promocion_fecha_limite": "2099-12-31",
+        },
+    ]
+    escenarios = [None, 12.5, 33.333333]
+    nros_cuotas = [1, 3, 7]
+
+    tabla = tabla_precios(
+        programas, nros_cuotas, escenarios, pago_contado=True, fecha=date(2025, 1, 1)
+    )
+
+    for p, programa in enumerate(programas):
+        subtotal = sum(
+            a_centavos(programa.get(campo) or 0)
+            for campo in ("costo_base", "costo_inscripcion", "costo_matricula")
+        )
+        assert tabla["subtotal"][p] == subtotal
+        regla = programa.get("descuento_promocion") or programa.get("descuento_contado")
+        for e, escenario in enumerate(escenarios):
+            porcentaje = regla if escenario is None else escenario
+            descuento = descuento_centavos(subtotal, porcentaje_escalado(porcentaje))
+            assert tabla["descuento"][e, p] == descuento
+            assert tabla["total"][e, p] == subtotal - descuento
+            for q, nro in enumerate(nros_cuotas):
+                cuota, ultima = cuotas_centavos(subtotal - descuento, nro)
+                assert tabla["cuota"][e, p, q] == cuota
+                assert tabla["ultima_cuota"][e, p, q] == ultima
@@ -0,0 +1,87 @@
+"""
+Pruebas del tipo Dinero: conversión, aritmética, comparación y hash
+"""
+from decimal import Decimal
+
+import pytest
+
+from utils.dinero import Dinero, CERO
+
+
+def test_de_float_redondea_mitad_hacia_arriba():
+    assert Dinero.de(2.675).centavos == 268
+    assert Dinero.de(1.005).centavos == 101
+    assert Dinero.de(-0.125).centavos == -13
+    assert Dinero.de(0.1 + 0.2).centavos == 30
+
+
+def test_de_otros_tipos():
+    assert Dinero.de(None) is CERO
+    assert Dinero.de(15).centavos == 1500
+    assert Dinero.de(Decimal("19.995")).centavos == 2000
+    assert Dinero.de("1,234.505").centavos == 123451
+    with pytest.raises(TypeError):
+        Dinero.de([1])
+
+
+def test_aritmetica_exacta():
+    a = Dinero.de("10.10")
+    b = Dinero.de("0.20")
+    assert a + b == Dinero(1030)
+    assert a - b == Dinero(990)
+    assert 1 - b == Dinero(80)
+    assert -a == Dinero(-1010)
+    assert abs(-a) == a
+    assert a * 3 == Dinero(3030)
+    assert a * 0.5 == Dinero(505)
+    assert Dinero(3) * Decimal("0.5") == Dinero(2)
+    assert sum([a, b, b]) == Dinero(1050)
+
+
+@pytest.mark.parametrize("operando", [None, "1.00", True, [1]])
+def test_aritmetica_rechaza_tipos_no_numericos(operando):
+    with pytest.raises(TypeError):
+        Dinero(100) + operando
+    with pytest.raises(TypeError):
+        operando - Dinero(100)
+    with pytest.raises(TypeError):
+        Dinero(100) * operando
+
+
+def test_comparaciones():
+    assert Dinero(150) == Decimal("1.5")
+    assert Dinero(150) == 1.5
+    assert Dinero(100) == 1
+    assert Dinero(0) == 0
+    assert Dinero(100) < Dinero(101)
+    assert Dinero(100) <= 1
+    assert Dinero(100) > Decimal("0.99")
+    assert Dinero(100) >= 0.995
+
+
+@pytest.mark.parametrize("operando", [None, "1.00", True])
+def test_comparaciones_con_tipos_no_numericos(operando):
+    assert Dinero(100) != operando
+    assert not (Dinero(100) == operando)
+    with pytest.raises(TypeError):
+        Dinero(100) < operando
+    with pytest.raises(TypeError):
+        Dinero(100) >= operando
+
+
+def test_hash_coherente_con_igualdad():
+    assert hash(Dinero(150)) == hash(Decimal("1.5")) == hash(1.5)
+    assert hash(Dinero(100)) == hash(1)
+    assert {Dinero(150): "a"}[Decimal("1.50")] == "a"
+    assert len({Dinero(100), Dinero.de("1.00"), 1}) == 1
+
+
+def test_aplicar_descuento_y_repartir_suman_el_total():
+    total = Dinero.de("100.01")
+    descuento, final = total.aplicar_descuento(12.5)
+    assert descuento == Dinero(1250)
+    assert descuento + final == total
+
+    cuotas = total.repartir(3)
+    assert cuotas == [Dinero(3334), Dinero(3334), Dinero(3333)]
+    assert sum(cuotas) == total
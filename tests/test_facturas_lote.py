@@ -0,0 +1,106 @@
+"""
+Pruebas de las transiciones de facturas en lote contra el esquema real
+"""
+from app.models.facturas_model import FacturasModel
+
+
+def _insertar_facturas(conexion, estados):
+    ids = []
+    with conexion.cursor() as cursor:
+        for i, estado in enumerate(estados, start=1):
+            cursor.execute(
+                """
+                INSERT INTO facturas (nro_factura, fecha_emision, razon_social,
+                                      subtotal, iva, it, total, estado)
+                VALUES (%s, '2040-01-05', 'Cliente', 100, 0, 0, 100, %s)
+                RETURNING id
+                """,
+                (f"{i:08d}", estado),
+            )
+            ids.append(cursor.fetchone()[0])
+    conexion.commit()
+    return ids
+
+
+def _consultar(conexion, sql, params=None):
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, params)
+        filas = cursor.fetchall()
+    conexion.commit()
+    return filas
+
+
+def test_marcar_exportadas_siat_lote(base_datos, conexion):
+    ids = _insertar_facturas(conexion, ["EMITIDA", "PAGADA", "ANULADA"])
+
+    resultado = FacturasModel().marcar_exportadas_siat_lote(ids, usuario_id=1)
+
+    assert resultado["exito"]
+    assert resultado["actualizadas"] == ids[:2]
+    assert resultado["omitidas"] == [ids[2]]
+    assert resultado["facturas"][0]["nro_factura"] == "00000001"
+    assert _consultar(conexion, "SELECT id FROM facturas WHERE exportada_siat ORDER BY id") == [
+        (ids[0],),
+        (ids[1],),
+    ]
+
+
+def test_marcar_pagadas_lote_registra_movimientos(base_datos, conexion):
+    ids = _insertar_facturas(conexion, ["PENDIENTE", "EMITIDA", "ANULADA"])
+
+    resultado = FacturasModel().marcar_pagadas_lote(
+        ids, forma_pago="QR", referencia="TX-1", usuario_id=1
+    )
+
+    assert resultado["exito"]
+    assert resultado["actualizadas"] == ids[:2]
+    assert resultado["omitidas"] == [ids[2]]
+    assert all(f["movimiento_id"] for f in resultado["facturas"])
+    assert _consultar(conexion, "SELECT estado FROM facturas ORDER BY id") == [
+        ("PAGADA",),
+        ("PAGADA",),
+        ("ANULADA",),
+    ]
+    assert _consultar(
+        conexion,
+        "SELECT origen_id, tipo, monto, descripcion FROM movimientos_caja ORDER BY origen_id",
+    ) == [
+        (ids[0], "INGRESO", 100, "Pago de factura 00000001 - QR (Ref: TX-1)"),
+        (ids[1], "INGRESO", 100, "Pago de factura 00000002 - QR (Ref: TX-1)"),
+    ]
+    assert _consultar(
+        conexion,
+        "SELECT COUNT(*) FROM auditoria_transacciones WHERE origen_tipo = 'FACTURA'",
+    ) == [(2,)]
+
+    # Repetir no registra otro pago
+    repetido = FacturasModel().marcar_pagadas_lote(ids, usuario_id=1)
+    assert repetido["actualizadas"] == []
+    assert _consultar(conexion, "SELECT COUNT(*) FROM movimientos_caja") == [(2,)]
+
+
+def test_anular_facturas_lote_revierte_ingresos(base_datos, conexion):
+    ids = _insertar_facturas(conexion, ["PENDIENTE", "EMITIDA"])
+    modelo = FacturasModel()
+    assert modelo.marcar_pagadas_lote([ids[0]], usuario_id=1)["exito"]
+
+    resultado = modelo.anular_facturas_lote("Error de emisión", ids, usuario_id=1)
+
+    assert resultado["exito"]
+    assert resultado["actualizadas"] == ids
+    assert _consultar(conexion, "SELECT DISTINCT estado FROM facturas") == [("ANULADA",)]
+    assert _consultar(
+        conexion, "SELECT tipo, monto, descripcion FROM movimientos_caja ORDER BY id"
+    ) == [
+        ("INGRESO", 100, "Pago de factura 00000001"),
+        ("EGRESO", 100, "ANULACIÓN de factura 00000001: Error de emisión"),
+    ]
+
+
+def test_transicion_lote_sin_ids_ni_filtro_no_hace_nada(base_datos, conexion):
+    _insertar_facturas(conexion, ["PENDIENTE"])
+
+    resultado = FacturasModel().marcar_pagadas_lote()
+
+    assert not resultado["exito"]
+    assert _consultar(conexion, "SELECT estado FROM facturas") == [("PENDIENTE",)]
@@ -0,0 +1,70 @@
+"""
+Pruebas de BaseModel.insert_checked: traducción de restricciones violadas
+y de referencias faltantes a los mensajes del modelo
+"""
+from app.models.movimiento_caja_model import MovimientoCajaModel
+
+
+def _movimiento(**extra) -> dict:
+    datos = {
+        "fecha": "2040-01-05 10:00:00",
+        "tipo": "INGRESO",
+        "monto": "10.00",
+        "descripcion": "prueba",
+        "registrado_por": 1,
+    }
+    datos.update(extra)
+    return datos
+
+
+def _insertar(datos, mensajes=MovimientoCajaModel.MENSAJES_RESTRICCION):
+    return MovimientoCajaModel().insert_checked(
+        datos, MovimientoCajaModel.REFERENCIAS, mensajes
+    )
+
+
+def test_inserta_y_retorna_id(base_datos):
+    resultado, error = _insertar(_movimiento())
+    assert error is None
+    assert isinstance(resultado, int)
+
+
+def test_restriccion_check_usa_mensaje_del_modelo(base_datos):
+    resultado, error = _insertar(_movimiento(monto="0"))
+    assert resultado is None
+    assert error == "El monto debe ser mayor a 0"
+
+
+def test_restriccion_de_trigger_formatea_los_campos(base_datos):
+    origen = {"origen_tipo": "INGRESO", "origen_id": 7}
+    assert _insertar(_movimiento(**origen))[1] is None
+
+    resultado, error = _insertar(_movimiento(**origen))
+
+    assert resultado is None
+    assert error == "Ya existe un movimiento para el origen INGRESO con ID 7"
+
+
+def test_referencia_faltante_usa_mensaje_de_la_referencia(base_datos, conexion):
+    resultado, error = _insertar(_movimiento(registrado_por=999))
+    assert resultado is None
+    assert error == "Usuario con ID 999 no existe"
+
+    # La condición de la referencia (activo = TRUE) también se comprueba
+    with conexion.cursor() as cursor:
+        cursor.execute("UPDATE usuarios SET activo = FALSE WHERE id = 1")
+    conexion.commit()
+    assert _insertar(_movimiento())[1] == "Usuario con ID 1 no existe"
+
+
+def test_restriccion_sin_mensaje_devuelve_el_del_servidor(base_datos):
+    resultado, error = _insertar(_movimiento(monto="-1"), mensajes={})
+    assert resultado is None
+    assert "ck_movimiento_monto_positivo" in error
+
+
+def test_plantilla_con_campo_ausente_se_devuelve_sin_formatear(base_datos):
+    mensajes = {"ck_movimiento_monto_positivo": "Monto {campo_inexistente} inválido"}
+    resultado, error = _insertar(_movimiento(monto="0"), mensajes=mensajes)
+    assert resultado is None
+    assert error == "Monto {campo_inexistente} inválido"
@@ -0,0 +1,82 @@
+"""
+Pruebas de la captura de planes (EXPLAIN ANALYZE) de la instrumentación
+"""
+import pytest
+
+from app.database.instrumentacion import InstrumentacionConsultas, _es_solo_lectura
+
+
+CONSULTA = "SELECT registrar_efecto()"
+
+
+@pytest.mark.parametrize(
+    "consulta, esperado",
+    [
+        ("SELECT * FROM t WHERE id = %s", True),
+        ("  with x AS (SELECT 1) SELECT * FROM x", True),
+        ("SELECT * FROM t FOR UPDATE", False),
+        ("WITH b AS (DELETE FROM t RETURNING *) SELECT * FROM b", False),
+        ("SELECT nextval('seq_t')", False),
+        ("SELECT setval('seq_t', 5)", False),
+        ("UPDATE t SET a = 1", False),
+    ],
+)
+def test_es_solo_lectura(consulta, esperado):
+    assert _es_solo_lectura(consulta) is esperado
+
+
+@pytest.fixture
+def con_efectos(conexion):
+    """Función que escribe al ejecutarse, invisible para _es_solo_lectura"""
+    with conexion.cursor() as cursor:
+        cursor.execute("CREATE TABLE efectos_explain (id SERIAL, origen TEXT)")
+        cursor.execute(
+            """
+            CREATE FUNCTION registrar_efecto() RETURNS INTEGER AS $$
+            BEGIN
+                INSERT INTO efectos_explain (origen) VALUES ('explain');
+                RETURN 1;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    conexion.commit()
+    return conexion
+
+
+def _capturar(conexion):
+    stats = {"huella": CONSULTA, "plan": None}
+    InstrumentacionConsultas()._capturar_plan(stats, CONSULTA, None, conexion)
+    return stats["plan"]
+
+
+def _origenes(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT origen FROM efectos_explain ORDER BY id")
+        origenes = [fila[0] for fila in cursor.fetchall()]
+    conexion.commit()
+    return origenes
+
+
+def test_plan_en_transaccion_revierte_efectos_y_conserva_trabajo(con_efectos):
+    with con_efectos.cursor() as cursor:
+        cursor.execute("INSERT INTO efectos_explain (origen) VALUES ('pendiente')")
+
+    assert "Result" in _capturar(con_efectos)
+
+    con_efectos.commit()
+    assert _origenes(con_efectos) == ["pendiente"]
+
+
+def test_plan_sin_transaccion_revierte_efectos(con_efectos):
+    assert _capturar(con_efectos)
+    assert _origenes(con_efectos) == []
+
+
+def test_plan_en_autocommit_revierte_efectos(con_efectos):
+    con_efectos.autocommit = True
+    try:
+        assert _capturar(con_efectos)
+        assert _origenes(con_efectos) == []
+    finally:
+        con_efectos.autocommit = False
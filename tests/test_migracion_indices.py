@@ -0,0 +1,56 @@
+"""
+Pruebas de database/migracion_indices_no_unicos.sql sobre una base con las
+restricciones UNIQUE anteriores
+"""
+from pathlib import Path
+
+RUTA_MIGRACION = (
+    Path(__file__).parent.parent / "database" / "migracion_indices_no_unicos.sql"
+)
+
+RESTRICCIONES_ANTERIORES = {
+    "matriculas": ("idx_matricula_estado", "estado_pago, estado_academico"),
+    "ingresos": ("idx_ingreso_matricula", "matricula_id, tipo_ingreso"),
+    "gastos": ("idx_gasto_categoria", "categoria, fecha"),
+}
+
+
+def _indices(conexion):
+    """{nombre: (es_unico, es_restriccion)} de los índices migrados"""
+    nombres = [nombre for nombre, _ in RESTRICCIONES_ANTERIORES.values()]
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, i.indisunique,
+                   EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = c.oid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = ANY(%s)
+            """,
+            (nombres,),
+        )
+        indices = {fila[0]: (fila[1], fila[2]) for fila in cursor.fetchall()}
+    conexion.commit()
+    return indices
+
+
+def test_migracion_convierte_restricciones_en_indices(conexion):
+    # Volver al esquema anterior
+    with conexion.cursor() as cursor:
+        for tabla, (nombre, columnas) in RESTRICCIONES_ANTERIORES.items():
+            cursor.execute(f"DROP INDEX {nombre}")
+            cursor.execute(
+                f"ALTER TABLE {tabla} ADD CONSTRAINT {nombre} UNIQUE ({columnas})"
+            )
+    conexion.commit()
+    assert set(_indices(conexion).values()) == {(True, True)}
+
+    script = RUTA_MIGRACION.read_text(encoding="utf-8")
+    for _ in range(2):  # Idempotente
+        with conexion.cursor() as cursor:
+            cursor.execute(script)
+        conexion.commit()
+
+        indices = _indices(conexion)
+        assert len(indices) == 3
+        assert set(indices.values()) == {(False, False)}
@@ -0,0 +1,100 @@
+"""
+Pruebas de la numeración correlativa por serie
+"""
+import pytest
+
+from app.models.numeracion_model import NumeracionModel, SERIES_NUMERACION
+
+
+@pytest.mark.parametrize("serie", sorted(SERIES_NUMERACION))
+def test_series_apuntan_a_columnas_del_esquema(conexion, serie):
+    definicion = SERIES_NUMERACION[serie]
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = %s AND column_name = %s
+            """,
+            (definicion["tabla"], definicion["columna"]),
+        )
+        assert cursor.fetchone(), f"{definicion['tabla']}.{definicion['columna']} no existe"
+
+
+def test_esquema_inicializa_las_series(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT serie, ultimo_numero FROM series_numeracion ORDER BY serie")
+        assert cursor.fetchall() == [(serie, 0) for serie in sorted(SERIES_NUMERACION)]
+
+
+def test_sincronizar_factura_desde_nro_factura(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO facturas (nro_factura, fecha_emision, razon_social,
+                                  subtotal, iva, it, total)
+            VALUES ('00000041', CURRENT_DATE, 'Cliente', 100, 0, 0, 100)
+            """
+        )
+    conexion.commit()
+
+    modelo = NumeracionModel()
+    assert modelo.sincronizar_serie("FACTURA") == 41
+    assert modelo.siguiente_numero("FACTURA") == "00000042"
+
+
+def test_serie_faltante_se_crea_desde_los_numeros_emitidos(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("DELETE FROM series_numeracion WHERE serie = 'GASTO'")
+        cursor.execute(
+            """
+            INSERT INTO gastos (fecha, monto, categoria, comprobante_nro)
+            VALUES (CURRENT_DATE, 10, 'OTROS', 'GASTO-000007')
+            """
+        )
+    conexion.commit()
+
+    assert NumeracionModel().siguiente_numero("GASTO") == "GASTO-000008"
+
+
+def test_sincronizar_no_retrocede_el_contador(conexion):
+    modelo = NumeracionModel()
+    for _ in range(3):
+        modelo.siguiente_numero("RECIBO_INGRESO")
+
+    assert modelo.sincronizar_serie("RECIBO_INGRESO") == 3
+
+
+def _crear_factura(modelo, **extra):
+    datos = {"fecha_emision": "2040-01-05", "razon_social": "Cliente", "total": 100}
+    datos.update(extra)
+    return modelo.crear_factura(datos)
+
+
+def test_crear_factura_guarda_el_numero_en_nro_factura(conexion):
+    from app.models.facturas_model import FacturasModel
+
+    modelo = FacturasModel()
+    assert _crear_factura(modelo)
+    assert _crear_factura(modelo)
+
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT nro_factura FROM facturas ORDER BY id")
+        assert [fila[0] for fila in cursor.fetchall()] == ["00000001", "00000002"]
+    conexion.commit()
+
+    # El contador coincide con el MAX de la columna que protege
+    assert NumeracionModel().sincronizar_serie("FACTURA") == 2
+    assert modelo.existe_numero_factura("00000002")
+
+
+def test_crear_factura_fallida_no_consume_numero(conexion):
+    from app.models.facturas_model import FacturasModel
+
+    modelo = FacturasModel()
+    assert _crear_factura(modelo, razon_social=None) is None
+    assert _crear_factura(modelo)
+
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT nro_factura FROM facturas")
+        assert cursor.fetchall() == [("00000001",)]
+    conexion.commit()
@@ -0,0 +1,165 @@
+"""
+Pruebas de particiones mensuales: creación con filas en DEFAULT, retención
+y unicidad de origen en movimientos_caja
+"""
+import threading
+
+import psycopg2
+import pytest
+
+from app.models.particion_model import ParticionModel
+
+
+def _insertar_movimientos(conexion, fechas, origen_tipo=None, primer_origen=1):
+    with conexion.cursor() as cursor:
+        for i, fecha in enumerate(fechas):
+            cursor.execute(
+                """
+                INSERT INTO movimientos_caja (fecha, tipo, monto, origen_tipo, origen_id, descripcion)
+                VALUES (%s, 'INGRESO', 10, %s, %s, 'prueba')
+                """,
+                (fecha, origen_tipo, primer_origen + i if origen_tipo else None),
+            )
+    conexion.commit()
+
+
+def _particiones_con_filas(conexion, tabla):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text, COUNT(*) FROM {tabla} GROUP BY 1 ORDER BY 1"
+        )
+        filas = dict(cursor.fetchall())
+    conexion.commit()
+    return filas
+
+
+def _saldo_resumen(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            "SELECT COALESCE(SUM(total), 0) FROM resumen_financiero WHERE fuente = 'MOVIMIENTO'"
+        )
+        saldo = cursor.fetchone()[0]
+    conexion.commit()
+    return saldo
+
+
+def test_crear_particion_mueve_filas_de_default(base_datos, conexion):
+    _insertar_movimientos(conexion, ["2040-01-05", "2040-01-20", "2040-02-03"])
+    assert _particiones_con_filas(conexion, "movimientos_caja") == {
+        "movimientos_caja_default": 3
+    }
+    saldo = _saldo_resumen(conexion)
+
+    nombres = ParticionModel().crear_particiones("movimientos_caja", "2040-01-01", 1)
+
+    assert nombres == ["movimientos_caja_p2040_01"]
+    assert _particiones_con_filas(conexion, "movimientos_caja") == {
+        "movimientos_caja_default": 1,
+        "movimientos_caja_p2040_01": 2,
+    }
+    # Mover filas entre particiones no altera el resumen
+    assert _saldo_resumen(conexion) == saldo
+
+
+def test_mover_auditoria_de_default_conserva_la_cadena(base_datos, conexion):
+    from app.models.auditoria_transacciones_model import (
+        AuditoriaWriter,
+        AuditoriaTransaccionesModel,
+    )
+
+    escritor = AuditoriaWriter(tamano_lote=1000, intervalo_flush=0)
+    for i in range(1, 4):
+        escritor.registrar(
+            {
+                "fecha_hora": f"2040-01-1{i} 10:00:00",
+                "usuario_id": 1,
+                "origen_tipo": "GASTO",
+                "origen_id": i,
+                "accion": "CREACION",
+                "motivo": "prueba",
+            }
+        )
+    assert len(escritor.flush()) == 3
+
+    ParticionModel().crear_particiones("auditoria_transacciones", "2040-01-01", 1)
+
+    assert _particiones_con_filas(conexion, "auditoria_transacciones") == {
+        "auditoria_transacciones_p2040_01": 3
+    }
+    resultado = AuditoriaTransaccionesModel().verificar_integridad(desde_checkpoint=False)
+    cadena = next(v for v in resultado["verificaciones"] if v["nombre"] == "Cadena de hash")
+    assert cadena["estado"] == "OK"
+    assert resultado["registros_rotos"] == []
+
+
+def test_crear_particion_existente_no_hace_nada(base_datos, conexion):
+    modelo = ParticionModel()
+    assert modelo.crear_particiones("movimientos_caja", "2040-01-01", 1)
+    assert modelo.crear_particiones("movimientos_caja", "2040-01-01", 1) == [
+        "movimientos_caja_p2040_01"
+    ]
+
+
+def test_retencion_elimina_filas_antiguas_de_default(base_datos, conexion):
+    _insertar_movimientos(conexion, ["2001-03-10", "2001-04-02", "2001-06-15"])
+
+    resultado = ParticionModel().aplicar_retencion("movimientos_caja", "2001-06-20")
+
+    assert resultado["filas_default"] == 2
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT fecha::date::text FROM movimientos_caja")
+        assert [fila[0] for fila in cursor.fetchall()] == ["2001-06-15"]
+
+
+def test_retencion_solo_desprender_no_borra_default(base_datos, conexion):
+    _insertar_movimientos(conexion, ["2001-03-10"])
+
+    resultado = ParticionModel().aplicar_retencion(
+        "movimientos_caja", "2001-06-20", eliminar=False
+    )
+
+    assert resultado["filas_default"] == 0
+    assert _particiones_con_filas(conexion, "movimientos_caja") == {
+        "movimientos_caja_default": 1
+    }
+
+
+def test_origen_duplicado_concurrente_se_rechaza(base_datos, conexion):
+    from tests.datos_sinteticos import conectar
+
+    otra = conectar(base_datos)
+    errores = []
+
+    def insertar_en_otra():
+        try:
+            _insertar_movimientos(otra, ["2040-01-05"], origen_tipo="INGRESO", primer_origen=7)
+        except psycopg2.Error as e:
+            otra.rollback()
+            errores.append(e)
+
+    try:
+        # La primera transacción queda abierta con la fila sin confirmar
+        with conexion.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO movimientos_caja (fecha, tipo, monto, origen_tipo, origen_id, descripcion)
+                VALUES ('2040-01-04', 'INGRESO', 10, 'INGRESO', 7, 'prueba')
+                """
+            )
+
+        hilo = threading.Thread(target=insertar_en_otra)
+        hilo.start()
+        hilo.join(timeout=1)
+        assert hilo.is_alive(), "la segunda inserción debe esperar al advisory lock"
+
+        conexion.commit()
+        hilo.join(timeout=10)
+        assert not hilo.is_alive()
+    finally:
+        otra.close()
+
+    assert len(errores) == 1
+    assert errores[0].diag.constraint_name == "uk_movimiento_origen"
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM movimientos_caja WHERE origen_id = 7")
+        assert cursor.fetchone()[0] == 1
@@ -0,0 +1,81 @@
+"""
+Pruebas del resumen financiero mantenido por triggers frente a la
+retención de movimientos de caja
+"""
+from app.models.movimiento_caja_model import MovimientoCajaModel
+from app.models.particion_model import ParticionModel
+from app.models.resumen_financiero_model import ResumenFinancieroModel
+
+
+def _insertar(conexion, filas):
+    with conexion.cursor() as cursor:
+        for fecha, tipo, monto in filas:
+            cursor.execute(
+                """
+                INSERT INTO movimientos_caja (fecha, tipo, monto, descripcion)
+                VALUES (%s, %s, %s, 'prueba')
+                """,
+                (fecha, tipo, monto),
+            )
+    conexion.commit()
+
+
+def _saldo():
+    return MovimientoCajaModel().calcular_saldo()["saldo_actual"]
+
+
+def test_retencion_no_altera_el_saldo(base_datos, conexion):
+    _insertar(conexion, [("2001-03-10", "INGRESO", 100), ("2001-04-02", "EGRESO", 30),
+                         ("2001-07-01", "INGRESO", 5)])
+    assert _saldo() == 75.0
+
+    resultado = ParticionModel().aplicar_retencion("movimientos_caja", "2001-06-20")
+
+    assert resultado["filas_default"] == 2
+    assert _saldo() == 75.0
+
+
+def test_reconstruir_conserva_movimientos_archivados(base_datos, conexion):
+    _insertar(conexion, [("2001-03-10", "INGRESO", 100), ("2001-07-01", "INGRESO", 5)])
+    ParticionModel().aplicar_retencion("movimientos_caja", "2001-06-20")
+
+    resumen = ResumenFinancieroModel()
+    assert resumen.reconstruir() is not None
+    assert _saldo() == 105.0
+
+    assert resumen.reconstruir(conservar_archivado=False) is not None
+    assert _saldo() == 5.0
+
+
+def test_borrado_normal_descuenta_del_saldo(base_datos, conexion):
+    _insertar(conexion, [("2001-03-10", "INGRESO", 100), ("2001-03-11", "INGRESO", 20)])
+
+    with conexion.cursor() as cursor:
+        cursor.execute("DELETE FROM movimientos_caja WHERE monto = 20")
+    conexion.commit()
+
+    assert _saldo() == 100.0
+
+
+def test_borrado_de_archivo_por_la_tabla_padre_no_descuenta(base_datos, conexion):
+    from app.models.archivador_model import ArchivadorModel
+
+    _insertar(conexion, [("2001-03-10", "INGRESO", 100), ("2001-07-01", "INGRESO", 5)])
+
+    eliminadas = ArchivadorModel().eliminar_por_lotes(
+        "movimientos_caja", "fecha < %s", ("2001-06-01",), id_max=10**9
+    )
+
+    assert eliminadas == 1
+    assert _saldo() == 105.0
+
+
+def test_egresos_cuentan_como_gastos(base_datos, conexion):
+    _insertar(conexion, [("2001-03-10 09:00", "INGRESO", 100), ("2001-03-10 18:00", "EGRESO", 30)])
+    modelo = MovimientoCajaModel()
+
+    saldo = modelo.calcular_saldo()
+    dia = modelo.get_resumen_por_dia("2001-03-10")
+
+    assert (saldo["total_ingresos"], saldo["total_gastos"], saldo["saldo_actual"]) == (100.0, 30.0, 70.0)
+    assert (dia["ingresos"], dia["gastos"], dia["saldo_dia"]) == (100.0, 30.0, 70.0)
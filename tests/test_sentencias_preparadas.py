@@ -0,0 +1,171 @@
+"""
+Pruebas de las sentencias preparadas: traducción de marcadores y
+reintento cuando el servidor pierde la sentencia
+"""
+import psycopg2.errors
+import psycopg2.extensions
+import pytest
+
+from app.database.sentencias_preparadas import SentenciasPreparadas
+
+
+# ============ TRADUCCIÓN ============
+
+
+def test_traducir_numera_los_marcadores():
+    nombre, texto = SentenciasPreparadas()._traducir(
+        "SELECT * FROM t WHERE a = %s AND b > %s", 2
+    )
+    assert nombre.startswith("fgp_")
+    assert texto == "SELECT * FROM t WHERE a = $1 AND b > $2"
+
+
+def test_traducir_convierte_porcentajes_escapados():
+    _, texto = SentenciasPreparadas()._traducir("SELECT * FROM t WHERE a LIKE 'x%%' AND b = %s", 1)
+    assert texto == "SELECT * FROM t WHERE a LIKE 'x%' AND b = $1"
+
+
+def test_traducir_sin_parametros_deja_el_texto():
+    consulta = "SELECT * FROM t WHERE a LIKE 'x%%'"
+    assert SentenciasPreparadas()._traducir(consulta, 0)[1] == consulta
+
+
+@pytest.mark.parametrize(
+    "consulta, num_params",
+    [
+        ("SELECT * FROM t WHERE a = %(a)s", 1),
+        ("SELECT * FROM t WHERE a = %s", 2),
+        ("SELECT * FROM t WHERE a = %s AND b = %s", 1),
+    ],
+)
+def test_traducir_rechaza_consultas_no_preparables(consulta, num_params):
+    assert SentenciasPreparadas()._traducir(consulta, num_params) is None
+
+
+def test_traducir_nombra_por_huella():
+    a, b = SentenciasPreparadas(), SentenciasPreparadas()
+    consulta = "SELECT * FROM t WHERE a = %s"
+    assert a._traducir(consulta, 1)[0] == b._traducir(consulta, 1)[0]
+    assert a._traducir(consulta, 1)[0] != a._traducir(consulta + " ", 1)[0]
+
+
+# ============ EJECUCIÓN ============
+
+
+@pytest.fixture
+def tabla_prueba(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("CREATE TABLE prueba_preparadas (id INTEGER PRIMARY KEY, nombre TEXT)")
+        cursor.execute("INSERT INTO prueba_preparadas VALUES (1, 'uno')")
+    conexion.commit()
+    return conexion
+
+
+CONSULTA = "SELECT * FROM prueba_preparadas WHERE id = %s"
+
+
+def _contar(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM prueba_preparadas")
+        return cursor.fetchone()[0]
+
+
+def test_reprepara_sin_transaccion_pendiente(tabla_prueba):
+    registro = SentenciasPreparadas()
+    with tabla_prueba.cursor() as cursor:
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        tabla_prueba.commit()
+        cursor.execute("DEALLOCATE ALL")
+        tabla_prueba.commit()
+
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        assert cursor.fetchall() == [(1, "uno")]
+    assert registro.estadisticas["repreparadas"] == 1
+
+
+def _nueva_transaccion(registro, conexion):
+    """Confirma y avisa al registro, como hace BaseModel.commit()"""
+    conexion.commit()
+    registro.fin_transaccion(conexion)
+
+
+def test_reprepara_dentro_de_la_transaccion_sin_perder_trabajo(tabla_prueba):
+    registro = SentenciasPreparadas()
+    with tabla_prueba.cursor() as cursor:
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        _nueva_transaccion(registro, tabla_prueba)
+        cursor.execute("INSERT INTO prueba_preparadas VALUES (2, 'dos')")
+        cursor.execute("DEALLOCATE ALL")
+
+        assert registro.ejecutar(cursor, CONSULTA, (2,))
+        assert cursor.fetchall() == [(2, "dos")]
+    assert registro.estadisticas["repreparadas"] == 1
+    tabla_prueba.commit()
+    assert _contar(tabla_prueba) == 2
+
+
+def test_reprepara_si_la_tabla_cambia_de_columnas(tabla_prueba):
+    registro = SentenciasPreparadas()
+    with tabla_prueba.cursor() as cursor:
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        _nueva_transaccion(registro, tabla_prueba)
+        cursor.execute("INSERT INTO prueba_preparadas VALUES (2, 'dos')")
+        cursor.execute("ALTER TABLE prueba_preparadas ADD COLUMN extra INTEGER DEFAULT 0")
+
+        assert registro.ejecutar(cursor, CONSULTA, (2,))
+        assert cursor.fetchall() == [(2, "dos", 0)]
+    tabla_prueba.commit()
+    assert _contar(tabla_prueba) == 2
+
+
+def test_cambio_de_columnas_tras_ejecutar_en_la_misma_transaccion_se_propaga(tabla_prueba):
+    registro = SentenciasPreparadas()
+    with tabla_prueba.cursor() as cursor:
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        cursor.execute("ALTER TABLE prueba_preparadas ADD COLUMN extra INTEGER DEFAULT 0")
+
+        with pytest.raises(psycopg2.errors.FeatureNotSupported):
+            registro.ejecutar(cursor, CONSULTA, (1,))
+    tabla_prueba.rollback()
+
+
+class _CursorRegistro(psycopg2.extensions.cursor):
+    sentencias: list = []
+
+    def execute(self, query, vars=None):
+        self.sentencias.append(query)
+        return super().execute(query, vars)
+
+
+def test_solo_la_primera_ejecucion_en_la_transaccion_usa_savepoint(tabla_prueba):
+    registro = SentenciasPreparadas()
+    with tabla_prueba.cursor() as cursor:
+        assert registro.ejecutar(cursor, CONSULTA, (1,))
+        _nueva_transaccion(registro, tabla_prueba)
+
+    tabla_prueba.cursor_factory = _CursorRegistro
+    _CursorRegistro.sentencias = []
+    with tabla_prueba.cursor() as cursor:
+        cursor.execute("INSERT INTO prueba_preparadas VALUES (2, 'dos')")
+        for id_ in (1, 2, 1):
+            assert registro.ejecutar(cursor, CONSULTA, (id_,))
+            assert cursor.fetchall()
+    tabla_prueba.rollback()
+
+    ejecutadas = _CursorRegistro.sentencias[1:]
+    assert ejecutadas[0].startswith("SAVEPOINT fgp_ejecutar; EXECUTE")
+    assert ejecutadas[1] == "RELEASE SAVEPOINT fgp_ejecutar"
+    assert all(s.startswith("EXECUTE") for s in ejecutadas[2:])
+    assert len(ejecutadas) == 4
+
+
+def test_sin_transaccion_no_usa_savepoint(tabla_prueba):
+    registro = SentenciasPreparadas()
+    tabla_prueba.cursor_factory = _CursorRegistro
+    _CursorRegistro.sentencias = []
+    with tabla_prueba.cursor() as cursor:
+        for _ in range(2):
+            assert registro.ejecutar(cursor, CONSULTA, (1,))
+            tabla_prueba.commit()
+
+    assert not any("SAVEPOINT fgp_ejecutar" in s for s in _CursorRegistro.sentencias)
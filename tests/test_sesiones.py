@@ -0,0 +1,198 @@
+"""
+Pruebas de los almacenes de sesiones (memoria y tabla UNLOGGED), de su
+selección desde database.ini y de la caché de usuarios de UsuariosModel
+"""
+import configparser
+import time
+
+import pytest
+
+from app.models.sesiones_model import AlmacenSesionesMemoria, AlmacenSesionesPostgres
+from app.models.usuarios_model import UsuariosModel
+
+
+def _consultar(conexion, sql, params=None):
+    with conexion.cursor() as cursor:
+        cursor.execute(sql, params)
+        filas = cursor.fetchall()
+    conexion.commit()
+    return filas
+
+
+@pytest.fixture
+def usuario_id(conexion):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO usuarios (username, password_hash, nombre_completo, rol) "
+            "VALUES ('ana', 'x', 'Ana Pérez', 'ADMINISTRADOR'), "
+            "       ('luis', 'x', 'Luis Rojas', 'COORDINADOR') RETURNING id"
+        )
+        ids = [fila[0] for fila in cursor.fetchall()]
+    conexion.commit()
+    return ids[1]
+
+
+@pytest.fixture
+def almacen_original():
+    """Restaura el almacén de UsuariosModel al terminar la prueba"""
+    anterior = UsuariosModel._session_store
+    yield
+    if UsuariosModel._session_store is not anterior:
+        UsuariosModel._session_store.detener_purga()
+        if isinstance(UsuariosModel._session_store, AlmacenSesionesPostgres):
+            UsuariosModel._session_store._close()
+    UsuariosModel._session_store = anterior
+    UsuariosModel._usuarios_cache.limpiar()
+
+
+# ============ ALMACÉN EN MEMORIA ============
+
+
+def test_memoria_expira_por_inactividad():
+    almacen = AlmacenSesionesMemoria(ttl_segundos=0.05)
+    almacen.crear("t1", 1, {"ip": "10.0.0.1"})
+
+    assert almacen.obtener("t1")["data"] == {"ip": "10.0.0.1"}
+    time.sleep(0.1)
+    assert almacen.obtener("t1") is None
+
+
+def test_memoria_obtener_renueva_la_expiracion():
+    almacen = AlmacenSesionesMemoria(ttl_segundos=0.3)
+    almacen.crear("t1", 1, {})
+
+    for _ in range(3):
+        time.sleep(0.2)
+        assert almacen.obtener("t1") is not None
+
+
+def test_memoria_purga_solo_vencidas():
+    almacen = AlmacenSesionesMemoria(ttl_segundos=0.05)
+    almacen.crear("vieja", 1, {})
+    time.sleep(0.1)
+    almacen.crear("nueva", 1, {})
+
+    assert almacen.purgar() == 1
+    assert almacen.obtener("nueva") is not None
+    assert almacen.eliminar_usuario(1) == 1
+
+
+# ============ ALMACÉN POSTGRES (UNLOGGED) ============
+
+
+@pytest.fixture
+def almacen_pg(usuario_id):
+    almacen = AlmacenSesionesPostgres(ttl_segundos=3600)
+    yield almacen
+    almacen._close()
+
+
+def _vencer(conexion, token):
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            "UPDATE sesiones SET expira_en = NOW() - INTERVAL '1 second' "
+            "WHERE token_hash = %s",
+            (AlmacenSesionesPostgres._hash_token(token),),
+        )
+    conexion.commit()
+
+
+def test_postgres_guarda_solo_el_hash_del_token(almacen_pg, usuario_id, conexion):
+    assert almacen_pg.crear("t1", usuario_id, {"ip": "10.0.0.1"})
+
+    sesion = almacen_pg.obtener("t1")
+
+    assert sesion["usuario_id"] == usuario_id
+    assert sesion["data"] == {"ip": "10.0.0.1"}
+    assert _consultar(conexion, "SELECT token_hash FROM sesiones") == [
+        (AlmacenSesionesPostgres._hash_token("t1"),)
+    ]
+
+
+def test_postgres_expira(almacen_pg, usuario_id, conexion):
+    almacen_pg.crear("t1", usuario_id, {})
+    _vencer(conexion, "t1")
+
+    assert almacen_pg.obtener("t1") is None
+
+
+def test_postgres_obtener_renueva_la_expiracion(almacen_pg, usuario_id, conexion):
+    almacen_pg.crear("t1", usuario_id, {})
+    with conexion.cursor() as cursor:
+        cursor.execute("UPDATE sesiones SET expira_en = NOW() + INTERVAL '1 minute'")
+    conexion.commit()
+
+    assert almacen_pg.obtener("t1") is not None
+    assert _consultar(
+        conexion, "SELECT expira_en > NOW() + INTERVAL '59 minutes' FROM sesiones"
+    ) == [(True,)]
+
+
+def test_postgres_purga_solo_vencidas(almacen_pg, usuario_id, conexion):
+    almacen_pg.crear("vieja", usuario_id, {})
+    almacen_pg.crear("nueva", usuario_id, {})
+    _vencer(conexion, "vieja")
+
+    assert almacen_pg.purgar() == 1
+    assert almacen_pg.obtener("nueva") is not None
+    assert almacen_pg.eliminar_usuario(usuario_id) == 1
+
+
+# ============ CONFIGURACIÓN ============
+
+
+def _ini(texto):
+    config = configparser.ConfigParser()
+    config.read_string(texto)
+    return config
+
+
+def test_ini_elige_el_almacen_postgres(base_datos, almacen_original):
+    UsuariosModel.configurar_sesiones_desde_ini(
+        _ini("[sesiones]\nalmacen = postgres\nttl_segundos = 60\nintervalo_purga = 0\n")
+    )
+
+    almacen = UsuariosModel()._sesiones
+    assert isinstance(almacen, AlmacenSesionesPostgres)
+    assert almacen.ttl_segundos == 60
+    assert almacen._hilo_purga is None
+
+
+@pytest.mark.parametrize("texto", ["", "[sesiones]\nalmacen = redis\n"])
+def test_ini_sin_almacen_valido_usa_memoria(texto, almacen_original):
+    UsuariosModel._session_store = None
+
+    UsuariosModel.configurar_sesiones_desde_ini(_ini(texto))
+
+    assert isinstance(UsuariosModel()._sesiones, AlmacenSesionesMemoria)
+
+
+# ============ CACHÉ DE USUARIOS ============
+
+
+@pytest.fixture
+def modelo(usuario_id, almacen_original):
+    UsuariosModel.configurar_almacen_sesiones(AlmacenSesionesMemoria(), None)
+    modelo = UsuariosModel()
+    yield modelo
+    modelo._close()
+
+
+def test_update_invalida_la_cache(modelo, usuario_id):
+    token = modelo.create_session(usuario_id, {})
+    assert modelo.validate_session(token)["nombre_completo"] == "Luis Rojas"
+
+    assert modelo.update(usuario_id, {"nombre_completo": "Luis Rojas Vaca"})
+
+    assert modelo.validate_session(token)["nombre_completo"] == "Luis Rojas Vaca"
+
+
+def test_delete_invalida_la_cache_y_las_sesiones(modelo, usuario_id):
+    token = modelo.create_session(usuario_id, {})
+    assert modelo.validate_session(token)
+    assert UsuariosModel._usuarios_cache.get(usuario_id)
+
+    assert modelo.delete(usuario_id)
+
+    assert UsuariosModel._usuarios_cache.get(usuario_id) is None
+    assert modelo.validate_session(token) is None
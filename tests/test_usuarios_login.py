@@ -0,0 +1,130 @@
+"""
+Pruebas del login asíncrono: UsuariosModel.authenticate_async, hash
+ficticio calculado en el pool y UsuariosController.login_async
+"""
+import threading
+
+import pytest
+
+from app.models.seguridad_passwords import LimitadorIntentos, generar_hash
+from app.models.usuarios_model import UsuariosModel
+
+ITERACIONES = 1000
+
+
+@pytest.fixture
+def usuarios(base_datos, conexion, monkeypatch):
+    """Usuario 'ana' con contraseña 'Secreta123' y costo de hash bajo"""
+    monkeypatch.setattr(UsuariosModel, "_iteraciones_hash", ITERACIONES)
+    monkeypatch.setattr(UsuariosModel, "_parametros_cargados", True)
+    monkeypatch.setattr(UsuariosModel, "_hash_ficticio", None)
+    monkeypatch.setattr(UsuariosModel, "_limitador_intentos", LimitadorIntentos())
+    with conexion.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO usuarios (username, password_hash, nombre_completo) "
+            "VALUES ('ana', %s, 'Ana Pérez')",
+            (generar_hash("Secreta123", "sal", "sha256", ITERACIONES),),
+        )
+    conexion.commit()
+    modelo = UsuariosModel()
+    yield modelo
+    modelo._close()
+
+
+@pytest.fixture
+def controlador(usuarios):
+    # app.controllers importa controladores que requieren SQLAlchemy
+    pytest.importorskip("sqlalchemy")
+    from app.controllers.usuarios_controller import UsuariosController
+
+    controlador = UsuariosController()
+    yield controlador
+    controlador._usuarios_model._close()
+
+
+def _registrar_hilos_hash_ficticio(monkeypatch):
+    """Anota el hilo de cada cálculo del hash ficticio"""
+    monkeypatch.setattr(UsuariosModel, "_hash_ficticio", None)
+    hilos = []
+    original = UsuariosModel._get_hash_ficticio
+
+    def registrar(modelo):
+        hilos.append(threading.current_thread().name)
+        return original(modelo)
+
+    monkeypatch.setattr(UsuariosModel, "_get_hash_ficticio", registrar)
+    return hilos
+
+
+# ============ MODELO ============
+
+
+def test_authenticate_async(usuarios):
+    usuario = usuarios.authenticate_async("ana", "Secreta123").result(10)
+
+    assert usuario["username"] == "ana"
+    assert "password_hash" not in usuario
+    assert usuarios.authenticate_async("ana", "Otra123").result(10) is None
+
+
+def test_precalcular_hash_ficticio_usa_el_pool(usuarios, monkeypatch):
+    hilos = _registrar_hilos_hash_ficticio(monkeypatch)
+
+    usuarios.precalcular_hash_ficticio().result(10)
+
+    assert UsuariosModel._hash_ficticio is not None
+    assert len(hilos) == 1 and hilos[0].startswith("hash-password")
+
+
+def test_usuario_inexistente_verifica_en_el_pool(usuarios, monkeypatch):
+    hilos = _registrar_hilos_hash_ficticio(monkeypatch)
+
+    assert usuarios.authenticate("nadie", "Secreta123") is None
+
+    # Sin precálculo, el hash ficticio se calcula en el pool y no en el hilo
+    # que llama
+    assert len(hilos) == 1 and hilos[0].startswith("hash-password")
+
+
+# ============ CONTROLADOR ============
+
+
+def _login_async(controlador, username, password):
+    terminado = threading.Event()
+    resultado = {}
+
+    def callback(exito, mensaje, usuario):
+        resultado.update(
+            exito=exito, mensaje=mensaje, usuario=usuario, hilo=threading.current_thread()
+        )
+        terminado.set()
+
+    controlador.login_async(username, password, callback)
+    assert terminado.wait(10)
+    return resultado
+
+
+def test_login_async_llama_al_callback_desde_el_hilo_de_login(controlador):
+    resultado = _login_async(controlador, "ana", "Secreta123")
+
+    assert resultado["exito"]
+    assert resultado["mensaje"] == "Bienvenido, Ana Pérez"
+    assert "password_hash" not in resultado["usuario"]
+    assert resultado["hilo"] is not threading.current_thread()
+    assert controlador.current_user["username"] == "ana"
+
+
+def test_login_async_rechaza_contraseña_incorrecta(controlador):
+    resultado = _login_async(controlador, "ana", "Otra123")
+
+    assert not resultado["exito"]
+    assert resultado["usuario"] is None
+    assert controlador.current_user is None
+
+
+def test_login_async_sin_datos_no_consulta(controlador):
+    resultado = {}
+    futuro = controlador.login_async("", "x", lambda *r: resultado.update(r=r))
+
+    assert futuro is None
+    assert resultado["r"][0] is False
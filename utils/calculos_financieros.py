@@ -1,5 +1,69 @@
 # utils/calculos_financieros.py
+"""
+Cálculos financieros en centavos enteros.
+
+Los montos se convierten a centavos (int) y los porcentajes a millonésimas
+de punto porcentual antes de operar, y se redondea una sola vez, mitad hacia
+arriba. Las funciones escalares y las versiones por lote (NumPy, sección
+CÁLCULOS POR LOTE) aplican exactamente las mismas operaciones, por lo que
+dan resultados idénticos centavo a centavo.
+"""
 import math
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    import numpy as np
+
+    NUMPY_SUPPORT = True
+except ImportError:
+    NUMPY_SUPPORT = False
+
+# Porcentajes en millonésimas de punto: 7.368421% -> 7368421
+ESCALA_PORCENTAJE = 1_000_000
+
+
+def _escalar_mitad_arriba(valor, decimales):
+    """
+    Escala un valor por 10**decimales y redondea mitad hacia arriba (los
+    empates se alejan de cero: 0.125 -> 13, -0.125 -> -13).
+
+    Se parte de la representación decimal del valor (str), así un float como
+    2.675 se redondea como se escribe y no como se almacena en binario.
+    """
+    return int(Decimal(str(valor)).scaleb(decimales).to_integral_value(ROUND_HALF_UP))
+
+
+def a_centavos(monto):
+    """Convierte un monto (float, int, Decimal, str o Dinero) a centavos enteros"""
+    centavos = getattr(monto, "centavos", None)
+    if centavos is not None:
+        return centavos
+    return _escalar_mitad_arriba(monto, 2)
+
+
+def porcentaje_escalado(porcentaje):
+    """Convierte un porcentaje a millonésimas de punto porcentual (int)"""
+    return _escalar_mitad_arriba(porcentaje, 6)
+
+
+def _dividir_redondeando(numerador, denominador):
+    """División entera de no negativos con redondeo mitad hacia arriba"""
+    return (2 * numerador + denominador) // (2 * denominador)
+
+
+def descuento_centavos(base_centavos, porcentaje_esc):
+    """Descuento en centavos de un monto en centavos y un porcentaje escalado"""
+    return _dividir_redondeando(base_centavos * porcentaje_esc, 100 * ESCALA_PORCENTAJE)
+
+
+def cuotas_centavos(total_centavos, numero_cuotas):
+    """
+    Divide un monto en centavos en cuotas.
+    Devuelve: (cuota, ultima_cuota); la última absorbe el redondeo y
+    cuota * (n - 1) + ultima_cuota == total_centavos.
+    """
+    cuota = _dividir_redondeando(total_centavos, numero_cuotas)
+    return cuota, total_centavos - cuota * (numero_cuotas - 1)
 
 def calcular_descuento_exacto(monto_base, porcentaje):
     """
@@ -9,26 +73,11 @@ def calcular_descuento_exacto(monto_base, porcentaje):
     if porcentaje < 0 or porcentaje > 100:
         raise ValueError("El porcentaje debe estar entre 0 y 100")
     
-    # Calcular el descuento exacto
-    descuento_exacto = monto_base * (porcentaje / 100)
-    
-    # Redondear a 2 decimales (centavos) usando round half up
-    descuento_redondeado = round(descuento_exacto + 1e-10, 2)
-    
-    # Calcular monto final
-    monto_final = monto_base - descuento_redondeado
-    
-    # Asegurar que el monto final tenga exactamente 2 decimales
-    monto_final = round(monto_final + 1e-10, 2)
-    
-    # Verificar que la suma sea consistente
-    if abs((descuento_redondeado + monto_final) - monto_base) > 0.01:
-        # Ajustar para que sumen exactamente
-        diferencia = monto_base - (descuento_redondeado + monto_final)
-        monto_final += diferencia
-        monto_final = round(monto_final, 2)
+    # Operar en centavos: descuento + monto_final == monto_base siempre
+    base = a_centavos(monto_base)
+    descuento = descuento_centavos(base, porcentaje_escalado(porcentaje))
     
-    return descuento_redondeado, monto_final
+    return descuento / 100, (base - descuento) / 100
 
 def calcular_porcentaje_para_monto_final(monto_base, monto_final_deseado):
     """
@@ -55,7 +104,7 @@ def formatear_moneda(monto):
 
 def redondear_a_entero_cercano(monto):
     """Redondea al entero más cercano (para mostrar montos sin decimales)"""
-    return round(monto + 1e-10)
+    return _dividir_redondeando(a_centavos(monto), 100)
 
 def calcular_monto_cuota(monto_total, numero_cuotas):
     """
@@ -65,27 +114,154 @@ def calcular_monto_cuota(monto_total, numero_cuotas):
     if numero_cuotas <= 0:
         raise ValueError("El número de cuotas debe ser mayor a 0")
     
-    # Calcular cuota exacta
-    cuota_exacta = monto_total / numero_cuotas
+    # Cuotas iguales redondeadas; la última absorbe la diferencia
+    cuota, ultima = cuotas_centavos(a_centavos(monto_total), numero_cuotas)
     
-    # Redondear a 2 decimales
-    cuota_redondeada = round(cuota_exacta + 1e-10, 2)
-    
-    # Calcular diferencia por redondeo
-    total_redondeado = cuota_redondeada * numero_cuotas
-    diferencia = monto_total - total_redondeado
-    
-    # Ajustar la última cuota si hay diferencia
-    if abs(diferencia) > 0.01:
-        cuota_redondeada = monto_total / numero_cuotas
-        # Distribuir la diferencia en la última cuota
-        cuotas = [round(cuota_redondeada, 2)] * (numero_cuotas - 1)
-        ultima_cuota = monto_total - sum(cuotas)
-        cuotas.append(round(ultima_cuota, 2))
-        return cuotas
-    else:
-        return [cuota_redondeada] * numero_cuotas
+    return [cuota / 100] * (numero_cuotas - 1) + [ultima / 100]
 
 def verificar_suma_correcta(monto_base, descuento, monto_final):
     """Verifica que el descuento + monto final sumen el monto base"""
-    return abs((descuento + monto_final) - monto_base) < 0.01
\ No newline at end of file
+    return abs((descuento + monto_final) - monto_base) < 0.01
+
+# ============================================================
+# CÁLCULOS POR LOTE (NumPy)
+# ============================================================
+# Mismas operaciones que las funciones escalares, sobre arreglos int64 de
+# centavos. Los montos deben ser menores a 1.000.000 para que los productos
+# intermedios quepan en int64.
+
+def _requerir_numpy():
+    if not NUMPY_SUPPORT:
+        raise ValueError("Cálculos por lote no disponibles: instale 'numpy'")
+
+
+def _escalar_mitad_arriba_lote(valores, escala):
+    """
+    Versión por lote de _escalar_mitad_arriba.
+
+    El producto se redondea primero a 6 decimales para descartar el error
+    binario (2.675 * 100 = 267.49999999999997) y luego se aplica mitad hacia
+    arriba alejándose de cero, igual que ROUND_HALF_UP en las escalares.
+    np.rint no sirve: redondea los empates al par (0.125 -> 12).
+    """
+    _requerir_numpy()
+    escalados = np.round(np.asarray(valores, dtype=np.float64) * escala, 6)
+    return (np.sign(escalados) * np.floor(np.abs(escalados) + 0.5)).astype(np.int64)
+
+
+def a_centavos_lote(montos):
+    """Convierte un arreglo de montos a centavos (int64)"""
+    return _escalar_mitad_arriba_lote(montos, 100)
+
+
+def porcentaje_escalado_lote(porcentajes):
+    """Convierte un arreglo de porcentajes a millonésimas de punto (int64)"""
+    return _escalar_mitad_arriba_lote(porcentajes, ESCALA_PORCENTAJE)
+
+
+def calcular_descuentos_lote(montos_base, porcentajes):
+    """
+    Versión por lote de calcular_descuento_exacto (con broadcasting).
+    Devuelve: (descuentos, montos_finales) en centavos
+    """
+    return _descuentos_centavos_lote(a_centavos_lote(montos_base), porcentajes)
+
+
+def _descuentos_centavos_lote(base_centavos, porcentajes):
+    _requerir_numpy()
+    porcentajes = np.asarray(porcentajes, dtype=np.float64)
+    if np.any((porcentajes < 0) | (porcentajes > 100)):
+        raise ValueError("El porcentaje debe estar entre 0 y 100")
+    
+    descuentos = descuento_centavos(base_centavos, porcentaje_escalado_lote(porcentajes))
+    return descuentos, base_centavos - descuentos
+
+
+def calcular_cuotas_lote(totales_centavos, numeros_cuotas):
+    """
+    Versión por lote de calcular_monto_cuota (con broadcasting).
+    Devuelve: (cuotas, ultimas_cuotas) en centavos
+    """
+    _requerir_numpy()
+    numeros_cuotas = np.asarray(numeros_cuotas, dtype=np.int64)
+    if np.any(numeros_cuotas <= 0):
+        raise ValueError("El número de cuotas debe ser mayor a 0")
+    
+    return cuotas_centavos(np.asarray(totales_centavos, dtype=np.int64), numeros_cuotas)
+
+
+def promociones_vigentes_lote(promocion_activa, promocion_fecha_limite, fecha):
+    """Promoción activa con fecha límite no vencida (sin fecha límite no aplica)"""
+    _requerir_numpy()
+    limites = np.array(
+        [np.datetime64(str(f)[:10]) if f else np.datetime64("NaT") for f in promocion_fecha_limite],
+        dtype="datetime64[D]",
+    )
+    activas = np.asarray(promocion_activa, dtype=bool)
+    return activas & (np.datetime64(str(fecha)[:10]) <= limites)
+
+
+def tabla_precios(programas, nros_cuotas, escenarios=None, pago_contado=False, fecha=None):
+    """
+    Tabla de precios de varios programas, planes y escenarios de descuento.
+
+    programas: filas con costo_base, costo_inscripcion, costo_matricula,
+        descuento_contado, promocion_activa, descuento_promocion y
+        promocion_fecha_limite (como las lee ProgramasAcademicosModel)
+    nros_cuotas: números de cuotas a simular
+    escenarios: porcentajes de descuento a evaluar; None en la lista
+        aplica la regla del programa (promoción vigente o, si no hay
+        promoción activa, descuento por pago contado)
+
+    Devuelve un dict de arreglos en centavos, con P programas,
+    E escenarios y Q números de cuotas:
+        subtotal (P), promo_vigente (P), descuento_porcentaje (E, P),
+        descuento (E, P), total (E, P), cuota (E, P, Q), ultima_cuota (E, P, Q)
+    """
+    _requerir_numpy()
+    from datetime import date
+    
+    escenarios = [None] if escenarios is None else list(escenarios)
+    fecha = fecha or date.today()
+    
+    def columna(campo):
+        return [p.get(campo) or 0 for p in programas]
+    
+    subtotal = (
+        a_centavos_lote(columna("costo_base"))
+        + a_centavos_lote(columna("costo_inscripcion"))
+        + a_centavos_lote(columna("costo_matricula"))
+    )
+    promo_activa = np.array([bool(p.get("promocion_activa")) for p in programas], dtype=bool)
+    promo_vigente = promociones_vigentes_lote(
+        promo_activa, [p.get("promocion_fecha_limite") for p in programas], fecha
+    )
+    
+    # Regla del programa: la promoción activa desplaza al descuento contado
+    regla = np.where(
+        promo_vigente,
+        np.asarray(columna("descuento_promocion"), dtype=np.float64),
+        np.where(
+            ~promo_activa & bool(pago_contado),
+            np.asarray(columna("descuento_contado"), dtype=np.float64),
+            0.0,
+        ),
+    )
+    porcentajes = np.stack(
+        [regla if e is None else np.full(len(programas), float(e)) for e in escenarios]
+    )
+    
+    descuentos, totales = _descuentos_centavos_lote(subtotal, porcentajes)
+    cuotas, ultimas = calcular_cuotas_lote(
+        totales[:, :, np.newaxis], np.asarray(nros_cuotas)[np.newaxis, np.newaxis, :]
+    )
+    
+    return {
+        "subtotal": subtotal,
+        "promo_vigente": promo_vigente,
+        "descuento_porcentaje": porcentajes,
+        "descuento": descuentos,
+        "total": totales,
+        "cuota": cuotas,
+        "ultima_cuota": ultimas,
+    }
@@ -0,0 +1,272 @@
+# utils/dinero.py
+"""
+Tipo monetario inmutable respaldado por centavos enteros.
+
+Dinero guarda un único int (centavos) y opera sin Decimal ni float: la suma
+y la resta son exactas y el producto por un factor redondea una sola vez,
+mitad hacia arriba, con las mismas reglas que utils.calculos_financieros.
+
+Se convierte desde Decimal (valores de columnas NUMERIC) sin pasar por
+str, se adapta a psycopg2 como literal NUMERIC y puede leerse directamente
+desde columnas NUMERIC con registrar_tipo_dinero().
+"""
+import operator
+from decimal import Decimal, ROUND_HALF_UP
+
+from utils.calculos_financieros import (
+    porcentaje_escalado,
+    descuento_centavos,
+    cuotas_centavos,
+)
+
+try:
+    import psycopg2.extensions as _ext
+
+    PSYCOPG2_SUPPORT = True
+except ImportError:
+    PSYCOPG2_SUPPORT = False
+
+
+class Dinero:
+    """Monto en bolivianos guardado como centavos enteros"""
+
+    __slots__ = ("_centavos",)
+
+    def __init__(self, centavos=0):
+        object.__setattr__(self, "_centavos", int(centavos))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Dinero es inmutable")
+
+    __delattr__ = __setattr__
+
+    # ---------- construcción ----------
+
+    @classmethod
+    def de(cls, valor):
+        """
+        Crea un Dinero desde Dinero, Decimal, int, float, str o None
+
+        Los int son bolivianos (no centavos); use Dinero(centavos) para
+        centavos. Los valores con más de 2 decimales se redondean mitad
+        hacia arriba.
+        """
+        if isinstance(valor, Dinero):
+            return valor
+        if valor is None:
+            return CERO
+        if isinstance(valor, Decimal):
+            return cls(valor.scaleb(2).to_integral_value(ROUND_HALF_UP))
+        if isinstance(valor, int):
+            return cls(valor * 100)
+        if isinstance(valor, float):
+            # Desde su representación decimal: 2.675 -> 2.68 (no 2.67)
+            return cls.de(Decimal(str(valor)))
+        if isinstance(valor, str):
+            return cls.desde_texto(valor)
+        raise TypeError(f"No se puede convertir {type(valor).__name__} a Dinero")
+
+    @classmethod
+    def desde_texto(cls, texto):
+        """Interpreta '1234.5', '-0.05' o '1,234.50' sin pasar por Decimal"""
+        texto = texto.strip().replace(",", "")
+        negativo = texto.startswith("-")
+        entero, _, fraccion = texto.lstrip("+-").partition(".")
+        if not (entero or fraccion) or not (entero + fraccion).isdigit():
+            raise ValueError(f"Monto inválido: {texto!r}")
+
+        centavos = int(entero or 0) * 100 + int((fraccion[:2] or "0").ljust(2, "0"))
+        if len(fraccion) > 2 and fraccion[2] >= "5":
+            centavos += 1
+        return cls(-centavos if negativo else centavos)
+
+    # ---------- conversión ----------
+
+    @property
+    def centavos(self):
+        return self._centavos
+
+    def a_decimal(self):
+        """Decimal con 2 decimales"""
+        return Decimal(self._centavos).scaleb(-2)
+
+    def __float__(self):
+        return self._centavos / 100
+
+    def __int__(self):
+        return int(self._centavos / 100)
+
+    def __str__(self):
+        signo = "-" if self._centavos < 0 else ""
+        entero, centavos = divmod(abs(self._centavos), 100)
+        return f"{signo}{entero}.{centavos:02d}"
+
+    def __repr__(self):
+        return f"Dinero('{self}')"
+
+    def __format__(self, especificacion):
+        if not especificacion:
+            return str(self)
+        return format(self.a_decimal(), especificacion)
+
+    def __hash__(self):
+        # Igual que el número equivalente: Dinero('1.50') == Decimal('1.5') == 1.5
+        return hash(self.a_decimal())
+
+    def __bool__(self):
+        return self._centavos != 0
+
+    # ---------- aritmética ----------
+
+    @staticmethod
+    def _otro(valor):
+        """
+        Centavos de un operando numérico, o None si no se admite
+
+        Se aceptan Dinero, int, Decimal y float; None, str y bool no se
+        convierten implícitamente (el 0 permite usar sum()).
+        """
+        if isinstance(valor, Dinero):
+            return valor._centavos
+        if isinstance(valor, bool) or not isinstance(valor, (int, Decimal, float)):
+            return None
+        if valor == 0:
+            return 0
+        return Dinero.de(valor)._centavos
+
+    def __add__(self, otro):
+        centavos = self._otro(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(self._centavos + centavos)
+
+    __radd__ = __add__
+
+    def __sub__(self, otro):
+        centavos = self._otro(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(self._centavos - centavos)
+
+    def __rsub__(self, otro):
+        centavos = self._otro(otro)
+        if centavos is None:
+            return NotImplemented
+        return Dinero(centavos - self._centavos)
+
+    def __neg__(self):
+        return Dinero(-self._centavos)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dinero(abs(self._centavos))
+
+    def __mul__(self, factor):
+        """Producto por un número; redondea una vez, mitad hacia arriba"""
+        if isinstance(factor, (Dinero, bool)) or not isinstance(factor, (int, Decimal, float)):
+            return NotImplemented
+        if isinstance(factor, int):
+            return Dinero(self._centavos * factor)
+        return Dinero(
+            (Decimal(self._centavos) * Decimal(str(factor))).to_integral_value(ROUND_HALF_UP)
+        )
+
+    __rmul__ = __mul__
+
+    # ---------- comparación ----------
+
+    def _comparar(self, otro, operacion):
+        centavos = self._otro(otro)
+        if centavos is None:
+            return NotImplemented
+        return operacion(self._centavos, centavos)
+
+    def __eq__(self, otro):
+        return self._comparar(otro, operator.eq)
+
+    def __lt__(self, otro):
+        return self._comparar(otro, operator.lt)
+
+    def __le__(self, otro):
+        return self._comparar(otro, operator.le)
+
+    def __gt__(self, otro):
+        return self._comparar(otro, operator.gt)
+
+    def __ge__(self, otro):
+        return self._comparar(otro, operator.ge)
+
+    # ---------- operaciones financieras ----------
+
+    def porcentaje(self, porcentaje):
+        """Monto del porcentaje indicado (mismo redondeo que calcular_descuento_exacto)"""
+        signo = -1 if self._centavos < 0 else 1
+        return Dinero(
+            signo * descuento_centavos(abs(self._centavos), porcentaje_escalado(porcentaje))
+        )
+
+    def aplicar_descuento(self, porcentaje):
+        """
+        Descuento y monto final
+        Devuelve: (descuento, monto_final); descuento + monto_final == self
+        """
+        if porcentaje < 0 or porcentaje > 100:
+            raise ValueError("El porcentaje debe estar entre 0 y 100")
+        descuento = self.porcentaje(porcentaje)
+        return descuento, self - descuento
+
+    def repartir(self, numero_cuotas):
+        """
+        Divide el monto en cuotas exactas al centavo
+
+        Cuotas iguales redondeadas y la última absorbe la diferencia (mismo
+        criterio que calcular_monto_cuota); la suma es exactamente el monto.
+        """
+        if numero_cuotas <= 0:
+            raise ValueError("El número de cuotas debe ser mayor a 0")
+        if self._centavos < 0:
+            return [-c for c in (-self).repartir(numero_cuotas)]
+
+        cuota, ultima = cuotas_centavos(self._centavos, numero_cuotas)
+        return [Dinero(cuota)] * (numero_cuotas - 1) + [Dinero(ultima)]
+
+    def formatear(self, simbolo="Bs."):
+        """Texto con separador de miles: 'Bs. 1,234.50'"""
+        return f"{simbolo} {self:,.2f}".strip()
+
+
+CERO = Dinero(0)
+
+
+# ============================================================
+# INTEGRACIÓN CON PSYCOPG2
+# ============================================================
+
+if PSYCOPG2_SUPPORT:
+
+    def _adaptar_dinero(valor):
+        """Dinero como literal NUMERIC en las consultas"""
+        return _ext.AsIs(f"'{valor}'::numeric")
+
+    _ext.register_adapter(Dinero, _adaptar_dinero)
+
+    def _leer_dinero(texto, cursor):
+        return None if texto is None else Dinero.desde_texto(texto)
+
+    # OID 1700 = numeric (incluye DECIMAL(p,s))
+    DINERO = _ext.new_type((1700,), "DINERO", _leer_dinero)
+
+
+def registrar_tipo_dinero(alcance):
+    """
+    Hace que las columnas NUMERIC de una conexión o cursor se lean como Dinero
+
+    El texto que envía el servidor se convierte directamente a centavos,
+    sin crear un Decimal intermedio. Usar con cursores o conexiones
+    dedicados a montos: afecta a todas las columnas NUMERIC.
+    """
+    if not PSYCOPG2_SUPPORT:
+        raise ValueError("psycopg2 no está disponible")
+    _ext.register_type(DINERO, alcance)